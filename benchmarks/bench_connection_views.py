@@ -0,0 +1,114 @@
+import itertools
+import time
+
+from benchmarks.synthetic_networks import get_acas_like_layer_sizes, get_random_layer_matrices
+from src.Layer import Layer
+from src.MarabouDataManagers.NNetReader import InMemoryNNetReader
+from src.Network import Network
+from src.Nodes.ARNode import ARNode
+from src.Nodes.GlobalNode import GlobalNode
+
+"""
+compares going over the connections of a fully activated acas like network with the connection data iterators
+(which create a list for each connection) and with the views over the connections, for the 2 patterns the hot loops
+use: going over all the connections of every node, and going over all the pairs of outgoing connections of every
+arnode (as decide_best_arnodes_to_merge does)
+
+python -m benchmarks.bench_connection_views
+"""
+
+NUMBER_OF_REPETITIONS = 3
+ACAS_PROPERTY = 2
+
+
+def time_function(function_to_time):
+    best_time = float('inf')
+    for _ in range(NUMBER_OF_REPETITIONS):
+        start = time.perf_counter()
+        function_to_time()
+        best_time = min(best_time, time.perf_counter() - start)
+
+    return best_time
+
+
+def get_all_nodes_and_arnodes(network):
+    all_nodes = []
+    for layer in network.layers:
+        for table_number in Layer.OVERALL_ARNODE_TABLES:
+            all_nodes.extend(layer.get_iterator_for_all_nodes_for_table(False, table_number))
+            all_nodes.extend(layer.get_iterator_for_all_nodes_for_table(True, table_number))
+
+    return all_nodes
+
+
+def sum_weights_with_iterator(all_nodes):
+    total = 0
+    for node in all_nodes:
+        for direction in [GlobalNode.INCOMING_EDGE_DIRECTION, GlobalNode.OUTGOING_EDGE_DIRECTION]:
+            for _, _, weight, node_connected_to in node.get_iterator_for_connections_data(direction):
+                total += weight
+
+    return total
+
+
+def sum_weights_with_view(all_nodes):
+    total = 0
+    for node in all_nodes:
+        for direction in [GlobalNode.INCOMING_EDGE_DIRECTION, GlobalNode.OUTGOING_EDGE_DIRECTION]:
+            for _, _, weights, references in node.get_view_over_connections(direction):
+                for weight, node_connected_to in zip(weights, references):
+                    total += weight
+
+    return total
+
+
+def get_maximal_difference_of_pairs_with_iterator(arnodes):
+    maximal_difference = 0
+    for arnode in arnodes:
+        for connection_data_1, connection_data_2 in arnode.get_combinations_iterator_over_connections(
+                GlobalNode.OUTGOING_EDGE_DIRECTION, 2):
+            maximal_difference = max(maximal_difference, abs(connection_data_1[2] - connection_data_2[2]))
+
+    return maximal_difference
+
+
+def get_maximal_difference_of_pairs_with_view(arnodes):
+    maximal_difference = 0
+    for arnode in arnodes:
+        for _, keys_in_table, weights, _ in arnode.get_view_over_connections(GlobalNode.OUTGOING_EDGE_DIRECTION):
+            for (_, weight_1), (_, weight_2) in itertools.combinations(zip(keys_in_table, weights), 2):
+                maximal_difference = max(maximal_difference, abs(weight_1 - weight_2))
+
+    return maximal_difference
+
+
+def main():
+    configurations = [(50, 6), (100, 6)]
+
+    print(f'{"width":>6}{"depth":>6}{"pattern":>16}{"iterator":>11}{"view":>9}{"speedup":>9}')
+    for width, number_of_hidden_layers in configurations:
+        layer_sizes = get_acas_like_layer_sizes(width, number_of_hidden_layers)
+        weights, biases, bounds = get_random_layer_matrices(layer_sizes)
+        network = Network(InMemoryNNetReader(weights, biases, *bounds), ACAS_PROPERTY)
+        network.fully_activate_the_entire_network()
+
+        all_nodes = get_all_nodes_and_arnodes(network)
+        arnodes = [node for node in all_nodes if isinstance(node, ARNode)]
+
+        patterns = [('all edges', lambda: sum_weights_with_iterator(all_nodes),
+                     lambda: sum_weights_with_view(all_nodes)),
+                    ('pairs of edges', lambda: get_maximal_difference_of_pairs_with_iterator(arnodes),
+                     lambda: get_maximal_difference_of_pairs_with_view(arnodes))]
+        for name_of_pattern, with_iterator, with_view in patterns:
+            assert with_iterator() == with_view()
+            iterator_time = time_function(with_iterator)
+            view_time = time_function(with_view)
+            print(f'{width:>6}{number_of_hidden_layers:>6}{name_of_pattern:>16}{iterator_time:>10.3f}s'
+                  f'{view_time:>8.3f}s{iterator_time / view_time:>8.1f}x')
+
+        decide_time = time_function(network.decide_best_arnodes_to_merge)
+        print(f'{width:>6}{number_of_hidden_layers:>6}{"decide merge":>16}{"":>11}{decide_time:>8.3f}s')
+
+
+if __name__ == '__main__':
+    main()
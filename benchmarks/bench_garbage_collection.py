@@ -0,0 +1,69 @@
+import gc
+import time
+
+from benchmarks.synthetic_networks import get_acas_like_layer_sizes, get_random_layer_matrices
+from src.GarbageCollectionManager import GarbageCollectionManager
+from src.MarabouDataManagers.NNetReader import InMemoryNNetReader
+from src.Network import Network
+
+"""
+compares the time spent in garbage collections with the collector left as is and with a managed collector (see
+GarbageCollectionManager), in the phases of a cegar run on acas like networks: building and fully activating the
+network, and merging arnodes
+
+python -m benchmarks.bench_garbage_collection
+"""
+
+ACAS_PROPERTY = 2
+NUMBER_OF_MERGES = 10
+
+
+def run_phases(nnet_reader, garbage_collection_manager):
+    """
+    :return: a map between the name of every phase and its total time in seconds
+    """
+    time_by_phase = {}
+
+    start = time.perf_counter()
+    with garbage_collection_manager.phase('construction', is_bulk_construction=True):
+        network = Network(nnet_reader, ACAS_PROPERTY)
+        network.fully_activate_the_entire_network()
+    garbage_collection_manager.freeze_existing_objects()
+    time_by_phase['construction'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    with garbage_collection_manager.phase('abstraction'):
+        for _ in range(NUMBER_OF_MERGES):
+            network.merge_list_of_arnodes(*network.decide_best_arnodes_to_merge())
+    time_by_phase['abstraction'] = time.perf_counter() - start
+
+    return time_by_phase
+
+
+def main():
+    configurations = [(50, 6), (100, 6)]
+
+    print(f'{"width":>6}{"depth":>6}{"managed":>9}{"phase":>14}{"total":>9}{"in gc":>9}{"collections":>13}')
+    for width, number_of_hidden_layers in configurations:
+        layer_sizes = get_acas_like_layer_sizes(width, number_of_hidden_layers)
+        weights, biases, bounds = get_random_layer_matrices(layer_sizes)
+        nnet_reader = InMemoryNNetReader(weights, biases, *bounds)
+
+        for should_manage_collection in [False, True]:
+            gc.collect()
+            garbage_collection_manager = GarbageCollectionManager(should_manage_collection)
+            try:
+                time_by_phase = run_phases(nnet_reader, garbage_collection_manager)
+            finally:
+                # let the next run start from the same state of the collector
+                garbage_collection_manager.release()
+
+            report = garbage_collection_manager.get_report()
+            for name_of_phase, total_time in time_by_phase.items():
+                print(f'{width:>6}{number_of_hidden_layers:>6}{str(should_manage_collection):>9}{name_of_phase:>14}'
+                      f'{total_time:>8.3f}s{report[name_of_phase]["seconds_in_collections"]:>8.3f}s'
+                      f'{report[name_of_phase]["number_of_collections"]:>13}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+import random
+import time
+
+from src.BitmapIDManager import BitmapIDManager
+from src.IDManager import IDManager
+
+"""
+compares IDManager with BitmapIDManager under the churn of a long cegar run.
+the ids of a network are given first, then every merge gives back the 2 ids of each of the arnodes merged and takes 2
+ids for the new arnode, and every split gives back the 2 ids of the arnode split and takes 2 ids for each of the new
+arnodes. the ids given back are spread over all the ids, and there are more merges than splits (as when abstracting),
+so the free ids have more and more holes. only the cycles are timed
+
+python -m benchmarks.bench_id_manager_churn
+"""
+
+NUMBER_OF_REPETITIONS = 3
+NUMBER_OF_CYCLES = 5000
+MAXIMAL_NUMBER_OF_ARNODES_IN_CYCLE = 4
+PROBABILITY_OF_MERGE = 0.7
+
+
+def run_churn(id_manager_class, number_of_ids_in_network, seed):
+    """
+    :return: a pair of (the time the cycles took, the list of all the ids taken by the cycles in order, so the results
+    of the classes can be compared)
+    """
+    random_generator = random.Random(seed)
+    id_manager = id_manager_class()
+    ids_taken = []
+
+    pairs_of_ids_in_use = [(id_manager.get_new_id(), id_manager.get_new_id())
+                           for _ in range(number_of_ids_in_network // 2)]
+    start = time.perf_counter()
+    for _ in range(NUMBER_OF_CYCLES):
+        number_of_arnodes = random_generator.randint(2, MAXIMAL_NUMBER_OF_ARNODES_IN_CYCLE)
+        is_merge = random_generator.random() < PROBABILITY_OF_MERGE
+        number_of_arnodes_killed, number_of_arnodes_created = (number_of_arnodes, 1) if is_merge else \
+            (1, number_of_arnodes)
+
+        for _ in range(number_of_arnodes_killed):
+            index_of_pair = random_generator.randrange(len(pairs_of_ids_in_use))
+            pairs_of_ids_in_use[index_of_pair], pairs_of_ids_in_use[-1] = \
+                pairs_of_ids_in_use[-1], pairs_of_ids_in_use[index_of_pair]
+            global_incoming_id, global_outgoing_id = pairs_of_ids_in_use.pop()
+            id_manager.give_id_back(global_incoming_id)
+            id_manager.give_id_back(global_outgoing_id)
+
+        for _ in range(number_of_arnodes_created):
+            pair_of_ids = (id_manager.get_new_id(), id_manager.get_new_id())
+            pairs_of_ids_in_use.append(pair_of_ids)
+            ids_taken.extend(pair_of_ids)
+
+    return time.perf_counter() - start, ids_taken
+
+
+def main():
+    print(f'{"ids":>9}{"cycles":>8}{"ranges":>10}{"bitmap":>10}{"speedup":>9}')
+    for number_of_ids_in_network in [10000, 100000, 1000000]:
+        times = []
+        results = []
+        for id_manager_class in [IDManager, BitmapIDManager]:
+            best_time = float('inf')
+            for _ in range(NUMBER_OF_REPETITIONS):
+                time_of_cycles, result = run_churn(id_manager_class, number_of_ids_in_network, seed=0)
+                best_time = min(best_time, time_of_cycles)
+            times.append(best_time)
+            results.append(result)
+
+        assert results[0] == results[1]
+        print(f'{number_of_ids_in_network:>9}{NUMBER_OF_CYCLES:>8}{times[0]:>9.3f}s{times[1]:>9.3f}s'
+              f'{times[0] / times[1]:>8.1f}x')
+
+
+if __name__ == '__main__':
+    main()
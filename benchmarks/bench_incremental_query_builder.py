@@ -0,0 +1,120 @@
+import time
+
+import src.MarabouDataManagers.IncrementalInputQueryBuilder as incremental_input_query_builder_module
+import src.MarabouDataManagers.InputQueryFacade as input_query_facade_module
+from benchmarks.synthetic_networks import get_acas_like_layer_sizes, get_random_layer_matrices
+from src.MarabouDataManagers.GlobalDataManager import GlobalDataManager
+from src.MarabouDataManagers.IncrementalInputQueryBuilder import IncrementalInputQueryBuilder
+from src.MarabouDataManagers.InputQueryFacade import InputQueryFacade
+from src.MarabouDataManagers.NNetReader import InMemoryNNetReader
+from src.Network import Network
+
+"""
+compares building the query of the current network from scratch after every merge
+(InputQueryFacade.get_new_compact_marabou_input_query_object) with building it with an IncrementalInputQueryBuilder,
+which applies only the changes the merge made (and the equations of its neighbors calculated again), on an acas like
+network with about 10k equations.
+both build a new marabou input query and add every equation to it, so the mock marabou (whose input query does nothing
+when an equation is added to it) does not measure them fairly. if maraboupy is installed, the queries are built with
+its MarabouCore instead of the mock.
+the equations of the mock marabou do not keep their addends, so the network is built with equations which keep them,
+as the equations of maraboupy.MarabouUtils do
+
+python -m benchmarks.bench_incremental_query_builder
+"""
+
+try:
+    from maraboupy import MarabouCore
+
+    NAME_OF_MARABOU_CORE = 'maraboupy'
+except ImportError:
+    from Mock.maraboupy import MarabouCore
+
+    NAME_OF_MARABOU_CORE = 'the mock marabou, adding an equation to its input query costs nothing'
+
+ACAS_PROPERTY = 2
+WIDTH = 45
+NUMBER_OF_HIDDEN_LAYERS = 30
+NUMBER_OF_MERGES = 10
+
+
+class EquationWhichKeepsAddends:
+    def __init__(self):
+        # the mock marabou accepts any equation type
+        self.EquationType = getattr(MarabouCore.Equation, 'EQ', 1)
+        self.addendList = []
+        self.scalar = 0
+
+    def addAddend(self, weight, id):
+        self.addendList.append((weight, id))
+
+    def setScalar(self, bias):
+        self.scalar = bias
+
+
+class InputQueryFacadeWithEquationsWhichKeepAddends(InputQueryFacade):
+    @staticmethod
+    def get_new_equation():
+        return EquationWhichKeepsAddends()
+
+
+def main():
+    layer_sizes = get_acas_like_layer_sizes(WIDTH, NUMBER_OF_HIDDEN_LAYERS)
+    weights, biases, bounds = get_random_layer_matrices(layer_sizes)
+    nnet_reader = InMemoryNNetReader(weights, biases, *bounds)
+
+    print(f'the queries are built with {NAME_OF_MARABOU_CORE}')
+    input_query_facade_module.MarabouCore = MarabouCore
+    incremental_input_query_builder_module.MarabouCore = MarabouCore
+
+    GlobalDataManager.INPUT_QUERY_CLASS = InputQueryFacadeWithEquationsWhichKeepAddends
+    try:
+        network = Network(nnet_reader, ACAS_PROPERTY)
+        network.fully_activate_the_entire_network()
+    finally:
+        GlobalDataManager.INPUT_QUERY_CLASS = InputQueryFacade
+    global_network_manager = network.global_network_manager
+    input_query = global_network_manager.input_query
+    input_ids = global_network_manager.get_input_nodes_global_incoming_ids()
+    output_ids = global_network_manager.get_output_nodes_global_incoming_ids()
+
+    builder = IncrementalInputQueryBuilder(input_query, input_ids, output_ids)
+    start = time.perf_counter()
+    builder.build()
+    first_build_time = time.perf_counter() - start
+    print(f'{len(input_query.equations)} equations, first incremental build {first_build_time:.3f}s')
+
+    print(f'{"merge":>6}{"journal":>9}{"from scratch":>14}{"incremental":>13}{"variables":>11}{"free":>6}')
+    total_time_from_scratch = 0
+    total_incremental_time = 0
+    for merge_number in range(NUMBER_OF_MERGES):
+        network.merge_list_of_arnodes(*network.decide_best_arnodes_to_merge())
+        # as before every verification, the equations of the neighbors of the merged arnodes are calculated again
+        network._create_valid_equations_for_all_nodes_without_valid_equations()
+        length_of_journal = len(input_query.journal) if input_query.journal is not None else 'full'
+
+        start = time.perf_counter()
+        _, global_ids_of_variables_from_scratch = input_query.get_new_compact_marabou_input_query_object(input_ids,
+                                                                                                         output_ids)
+        time_from_scratch = time.perf_counter() - start
+
+        start = time.perf_counter()
+        _, global_ids_of_variables = builder.build()
+        incremental_time = time.perf_counter() - start
+
+        global_ids_of_live_variables = [global_id for global_id in global_ids_of_variables
+                                        if global_id != IncrementalInputQueryBuilder.NO_GLOBAL_ID]
+        assert sorted(global_ids_of_live_variables) == global_ids_of_variables_from_scratch
+
+        total_time_from_scratch += time_from_scratch
+        total_incremental_time += incremental_time
+        number_of_free_variables = len(global_ids_of_variables) - len(global_ids_of_live_variables)
+        print(f'{merge_number:>6}{length_of_journal:>9}{time_from_scratch:>13.4f}s{incremental_time:>12.4f}s'
+              f'{len(global_ids_of_variables):>11}{number_of_free_variables:>6}')
+
+    print(f'total {total_time_from_scratch:.3f}s from scratch, {total_incremental_time:.3f}s incremental, '
+          f'{total_time_from_scratch / total_incremental_time:.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,99 @@
+import time
+
+from benchmarks.synthetic_networks import get_acas_like_layer_sizes, get_random_layer_matrices
+from src.MarabouDataManagers.GlobalDataManager import GlobalDataManager
+from src.MarabouDataManagers.InputQueryFacade import InputQueryFacade
+from src.MarabouDataManagers.NNetReader import InMemoryNNetReader
+from src.Network import Network
+
+"""
+compares the stores of the equations and relu constraints of InputQueryFacade (dicts, which add and remove in O(1))
+with the lists it used before (which are scanned on every removal), in the refinement loop of a cegar run on an acas
+like network with about 10k equations. every merge recalculates the equations of the arnodes it changes and of their
+neighbors, so every one of them removes and adds equations and relu constraints, and so does every split.
+only the merges and the splits are timed, not deciding which arnodes to merge or split
+
+python -m benchmarks.bench_input_query_stores
+"""
+
+ACAS_PROPERTY = 2
+WIDTH = 45
+NUMBER_OF_HIDDEN_LAYERS = 30
+NUMBER_OF_MERGES = 10
+NUMBER_OF_SPLITS = 10
+
+
+class ListInputQueryFacade(InputQueryFacade):
+    """
+    the stores InputQueryFacade had before, lists which are scanned on every removal
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.equations = []
+        self.relu_constraints = []
+
+    def addEquation(self, equation):
+        self.equations.append(equation)
+
+    def removeEquation(self, equation):
+        if equation in self.equations:
+            self.equations.remove(equation)
+
+    def addReluConstraint(self, id1, id2):
+        self.relu_constraints.append((id1, id2))
+
+    def removeReluConstraint(self, id1, id2):
+        if (id1, id2) in self.relu_constraints:
+            self.relu_constraints.remove((id1, id2))
+
+
+def run_refinement_loop(nnet_reader, input_query_class):
+    """
+    :return: a tuple of (the number of equations after the network was activated, the time the merges took, the time
+    the splits took, the relu constraints left at the end so the results of the classes can be compared)
+    """
+    GlobalDataManager.INPUT_QUERY_CLASS = input_query_class
+    try:
+        network = Network(nnet_reader, ACAS_PROPERTY)
+        network.fully_activate_the_entire_network()
+    finally:
+        GlobalDataManager.INPUT_QUERY_CLASS = InputQueryFacade
+    input_query = network.global_network_manager.input_query
+    number_of_equations = len(input_query.equations)
+
+    merges_time = 0
+    for _ in range(NUMBER_OF_MERGES):
+        arnodes_to_merge = network.decide_best_arnodes_to_merge()
+        start = time.perf_counter()
+        network.merge_list_of_arnodes(*arnodes_to_merge)
+        merges_time += time.perf_counter() - start
+
+    splits_time = 0
+    for _ in range(NUMBER_OF_SPLITS):
+        arnode_to_split = network.decide_best_arnodes_to_split()
+        start = time.perf_counter()
+        network.split_arnode(*arnode_to_split)
+        splits_time += time.perf_counter() - start
+
+    return number_of_equations, merges_time, splits_time, list(input_query.relu_constraints)
+
+
+def main():
+    layer_sizes = get_acas_like_layer_sizes(WIDTH, NUMBER_OF_HIDDEN_LAYERS)
+    weights, biases, bounds = get_random_layer_matrices(layer_sizes)
+    nnet_reader = InMemoryNNetReader(weights, biases, *bounds)
+
+    print(f'{"store":>7}{"equations":>11}{"merges":>10}{"splits":>10}')
+    results = []
+    for name, input_query_class in [('lists', ListInputQueryFacade), ('dicts', InputQueryFacade)]:
+        number_of_equations, merges_time, splits_time, relu_constraints = run_refinement_loop(nnet_reader,
+                                                                                             input_query_class)
+        results.append(relu_constraints)
+        print(f'{name:>7}{number_of_equations:>11}{merges_time:>9.3f}s{splits_time:>9.3f}s')
+
+    assert results[0] == results[1]
+
+
+if __name__ == '__main__':
+    main()
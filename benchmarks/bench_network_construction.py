@@ -0,0 +1,97 @@
+import time
+
+from benchmarks.synthetic_networks import get_acas_like_layer_sizes, get_random_layer_matrices
+from src.Layer import Layer
+from src.MarabouDataManagers.NNetReader import InMemoryNNetReader
+from src.Network import Network
+
+"""
+compares building a Network layer by layer in bulk with building it one node and one edge at a time,
+on synthetic acas like networks of growing width and depth
+
+python -m benchmarks.bench_network_construction
+"""
+
+NUMBER_OF_REPETITIONS = 3
+ACAS_PROPERTY = 1
+
+
+class NetworkBuiltNodeByNode(Network):
+    """
+    a Network which creates its nodes the way Network did before the bulk construction path, kept here only to
+    compare against
+    """
+
+    def _initialize_nodes_in_all_layers(self, nnet_reader_object):
+        previous_layer_nodes_map = {}
+        first_layer_nodes_map = {}
+        last_layer_nodes_map = {}
+
+        for current_layer_number in range(len(self.layers)):
+            current_layer = self.layers[current_layer_number]
+            current_layer_nodes_map = {}
+
+            biases_of_current_layer = nnet_reader_object.get_bias_vector(current_layer_number)
+            for node_index in range(len(biases_of_current_layer)):
+                current_layer_nodes_map[node_index] = current_layer.create_new_node(biases_of_current_layer[node_index])
+
+            if current_layer_number != Network.LOCATION_OF_FIRST_LAYER:
+                row_pointers, column_indices, values = nnet_reader_object.get_nonzero_connections(current_layer_number)
+                for node_index, node_key in current_layer_nodes_map.items():
+                    list_of_pairs_of_keys_and_weights = [(previous_layer_nodes_map[column_indices[k]], values[k])
+                                                         for k in range(row_pointers[node_index],
+                                                                        row_pointers[node_index + 1])]
+                    current_layer.add_or_edit_neighbors_to_node_in_unprocessed_table_by_bulk(
+                        node_key, Layer.INCOMING_LAYER_DIRECTION, list_of_pairs_of_keys_and_weights)
+
+            if current_layer_number == Network.LOCATION_OF_FIRST_LAYER:
+                first_layer_nodes_map = current_layer_nodes_map
+            if current_layer_number == len(self.layers) - 1:
+                last_layer_nodes_map = current_layer_nodes_map
+            previous_layer_nodes_map = current_layer_nodes_map
+
+        first_layer = self.layers[Network.LOCATION_OF_FIRST_LAYER]
+        for node_index, node_key in first_layer_nodes_map.items():
+            first_layer.set_lower_and_upper_bound_for_node(False, Layer.INDEX_OF_UNPROCESSED_TABLE, node_key,
+                                                           nnet_reader_object.inputMinimums[node_index],
+                                                           nnet_reader_object.inputMaximums[node_index])
+
+        for i in range(Network.LOCATION_OF_FIRST_LAYER + 1, len(self.layers)):
+            self.layers[i].calculate_equation_and_constraint_for_all_nodes_in_table(False,
+                                                                                    Layer.INDEX_OF_UNPROCESSED_TABLE)
+
+        return first_layer_nodes_map, last_layer_nodes_map
+
+
+def time_function(function_to_time):
+    best_time = float('inf')
+    for _ in range(NUMBER_OF_REPETITIONS):
+        start = time.perf_counter()
+        function_to_time()
+        best_time = min(best_time, time.perf_counter() - start)
+
+    return best_time
+
+
+def main():
+    configurations = [(width, number_of_hidden_layers)
+                      for number_of_hidden_layers in [2, 6]
+                      for width in [50, 100, 200, 400]]
+
+    print(f'{"width":>6}{"depth":>6}{"edges":>10}{"node by node":>14}{"bulk":>10}{"speedup":>10}{"us/edge":>10}')
+    for width, number_of_hidden_layers in configurations:
+        layer_sizes = get_acas_like_layer_sizes(width, number_of_hidden_layers)
+        weights, biases, bounds = get_random_layer_matrices(layer_sizes)
+        nnet_reader = InMemoryNNetReader(weights, biases, *bounds)
+        number_of_edges = sum(layer_sizes[i] * layer_sizes[i + 1] for i in range(len(layer_sizes) - 1))
+
+        node_by_node_time = time_function(lambda: NetworkBuiltNodeByNode(nnet_reader, ACAS_PROPERTY))
+        bulk_time = time_function(lambda: Network(nnet_reader, ACAS_PROPERTY))
+
+        print(f'{width:>6}{number_of_hidden_layers:>6}{number_of_edges:>10}{node_by_node_time:>13.3f}s'
+              f'{bulk_time:>9.3f}s{node_by_node_time / bulk_time:>9.1f}x'
+              f'{bulk_time / number_of_edges * 1e6:>10.2f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,55 @@
+import os
+import tempfile
+import time
+
+from benchmarks.synthetic_networks import get_acas_like_layer_sizes, write_random_nnet_file
+from src.MarabouDataManagers.NNetArchive import NNetArchive
+from src.MarabouDataManagers.NNetReader import NNetReader
+
+"""
+compares loading each network of an ACAS-Xu like family (45 networks of the same topology) from its own .nnet file,
+from its own binary sidecar, and from a view into a single NNetArchive
+
+python -m benchmarks.bench_nnet_archive
+"""
+
+NUMBER_OF_NETWORKS = 45
+
+
+def time_function(function_to_time):
+    start = time.perf_counter()
+    function_to_time()
+    return time.perf_counter() - start
+
+
+def main():
+    layer_sizes = get_acas_like_layer_sizes(50, 6)
+
+    with tempfile.TemporaryDirectory() as directory:
+        nnet_file_names = [os.path.join(directory, f'network_{i}.nnet') for i in range(NUMBER_OF_NETWORKS)]
+        for i, nnet_file_name in enumerate(nnet_file_names):
+            write_random_nnet_file(nnet_file_name, layer_sizes, seed=i)
+            NNetReader(nnet_file_name, use_binary_cache=True)  # writes the sidecar
+
+        archive_file_name = os.path.join(directory, 'networks.nnetarchive')
+        NNetArchive.pack(nnet_file_names, archive_file_name)
+
+        text_time = time_function(lambda: [NNetReader(nnet_file_name, use_binary_cache=False)
+                                           for nnet_file_name in nnet_file_names])
+        sidecar_time = time_function(lambda: [NNetReader(nnet_file_name, use_binary_cache=True)
+                                              for nnet_file_name in nnet_file_names])
+
+        def load_from_archive():
+            archive = NNetArchive(archive_file_name)
+            return [archive.get_network(i) for i in range(archive.get_number_of_networks())]
+
+        archive_time = time_function(load_from_archive)
+
+    print(f'loading {NUMBER_OF_NETWORKS} networks of layer sizes {layer_sizes}')
+    print(f'{"text files":<16}{text_time:>9.4f}s')
+    print(f'{"sidecars":<16}{sidecar_time:>9.4f}s')
+    print(f'{"archive":<16}{archive_time:>9.4f}s')
+
+
+if __name__ == '__main__':
+    main()
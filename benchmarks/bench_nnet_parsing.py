@@ -0,0 +1,106 @@
+import os
+import tempfile
+import time
+import tracemalloc
+
+from benchmarks.synthetic_networks import write_random_nnet_file
+from src.MarabouDataManagers.NNetReader import NNetReader
+
+"""
+compares the bulk text parser of NNetReader with the line by line parser it replaced, and with a warm load from the
+binary sidecar, on wide synthetic networks
+
+python -m benchmarks.bench_nnet_parsing
+"""
+
+NUMBER_OF_REPETITIONS = 3
+
+
+def parse_with_line_by_line_parser(file_name):
+    """
+    the parser NNetReader used before the bulk parser, kept here only to compare against
+    :return: the nested weights and biases lists
+    """
+    with open(file_name) as f:
+        line = f.readline()
+        while line[0:2] == "//":
+            line = f.readline()
+        numLayers, inputSize, outputSize, maxLayersize = [int(x) for x in line.strip().split(",")[:-1]]
+        line = f.readline()
+        layerSizes = [int(x) for x in line.strip().split(",")[:-1]]
+        for _ in range(5):
+            f.readline()
+
+        weights = []
+        biases = []
+        for layernum in range(numLayers):
+            previousLayerSize = layerSizes[layernum]
+            currentLayerSize = layerSizes[layernum + 1]
+            weights.append([])
+            biases.append([])
+            for i in range(currentLayerSize):
+                line = f.readline()
+                aux = [float(x) for x in line.strip().split(",")[:-1]]
+                weights[layernum].append([])
+                for j in range(previousLayerSize):
+                    weights[layernum][i].append(aux[j])
+            for i in range(currentLayerSize):
+                line = f.readline()
+                x = float(line.strip().split(",")[0])
+                biases[layernum].append(x)
+
+    return weights, biases
+
+
+def time_function(function_to_time):
+    best_time = float('inf')
+    for _ in range(NUMBER_OF_REPETITIONS):
+        start = time.perf_counter()
+        function_to_time()
+        best_time = min(best_time, time.perf_counter() - start)
+
+    return best_time
+
+
+def measure_retained_memory(function_to_measure):
+    """
+    :return: the number of bytes still allocated by the result of the given function after it returns
+    """
+    tracemalloc.start()
+    result = function_to_measure()
+    retained_memory, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return retained_memory
+
+
+def main():
+    configurations = [[5, 300, 300, 300, 5],
+                      [5, 1000, 1000, 5],
+                      [5, 2000, 2000, 5]]
+
+    print(f'{"layer sizes":<28}{"line by line":>14}{"bulk":>10}{"speedup":>10}{"sidecar":>10}'
+          f'{"MB lists":>10}{"MB bulk":>10}')
+    with tempfile.TemporaryDirectory() as directory:
+        for layer_sizes in configurations:
+            file_name = os.path.join(directory, 'network.nnet')
+            write_random_nnet_file(file_name, layer_sizes)
+
+            line_by_line_time = time_function(lambda: parse_with_line_by_line_parser(file_name))
+            bulk_time = time_function(lambda: NNetReader(file_name, use_binary_cache=False))
+
+            NNetReader(file_name, use_binary_cache=True)  # writes the sidecar
+            sidecar_time = time_function(lambda: NNetReader(file_name, use_binary_cache=True))
+            os.remove(file_name + '.bin')
+
+            line_by_line_memory = measure_retained_memory(lambda: parse_with_line_by_line_parser(file_name))
+            bulk_memory = measure_retained_memory(lambda: NNetReader(file_name, use_binary_cache=False))
+            os.remove(file_name)
+
+            print(f'{str(layer_sizes):<28}{line_by_line_time:>13.3f}s{bulk_time:>9.3f}s'
+                  f'{line_by_line_time / bulk_time:>9.1f}x{sidecar_time:>9.4f}s'
+                  f'{line_by_line_memory / 2 ** 20:>10.1f}{bulk_memory / 2 ** 20:>10.1f}')
+
+
+if __name__ == '__main__':
+    main()
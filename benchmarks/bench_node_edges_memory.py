@@ -0,0 +1,76 @@
+import gc
+import time
+import tracemalloc
+
+from benchmarks.synthetic_networks import get_acas_like_layer_sizes, get_random_layer_matrices
+from src.ArrayNodeEdges import ArrayNodeEdges
+from src.Layer import Layer
+from src.MarabouDataManagers.NNetReader import InMemoryNNetReader
+from src.Network import Network
+from src.NodeEdges import NodeEdges
+from src.Nodes.Node import Node
+
+"""
+compares the memory taken by a fully preprocessed acas like network when the node edges are held by NodeEdges and
+when they are held by ArrayNodeEdges
+
+python -m benchmarks.bench_node_edges_memory
+"""
+
+ACAS_PROPERTY = 2
+
+
+def get_number_of_edges_in_network(network):
+    """
+    :return: the number of edges held by all the nodes in the network, counting each edge once for each of its sides
+    """
+    number_of_edges = 0
+    for layer in network.layers:
+        for table_number in range(Layer.NUMBER_OF_REGULAR_TABLES_THAT_DO_NOT_SUPPORT_DELETION):
+            for node in layer.get_iterator_for_all_nodes_for_table(False, table_number):
+                number_of_edges += node.get_number_of_connections(Node.INCOMING_EDGE_DIRECTION)
+                number_of_edges += node.get_number_of_connections(Node.OUTGOING_EDGE_DIRECTION)
+
+    return number_of_edges
+
+
+def measure_preprocessed_network(nnet_reader, edges_manager_class):
+    """
+    :return: a tuple of (bytes allocated by the network, number of edges, seconds it took to build and preprocess)
+    """
+    Node.EDGES_MANAGER_CLASS = edges_manager_class
+    try:
+        gc.collect()
+        tracemalloc.start()
+        start = time.perf_counter()
+        network = Network(nnet_reader, ACAS_PROPERTY)
+        network.preprocess_the_entire_network()
+        elapsed_time = time.perf_counter() - start
+        gc.collect()
+        allocated_bytes, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    finally:
+        Node.EDGES_MANAGER_CLASS = NodeEdges
+
+    return allocated_bytes, get_number_of_edges_in_network(network), elapsed_time
+
+
+def main():
+    configurations = [(50, 6), (100, 6), (200, 6)]
+
+    print(f'{"width":>6}{"depth":>6}{"edges":>10}{"class":>16}{"MB":>10}{"bytes/edge":>12}{"time":>9}')
+    for width, number_of_hidden_layers in configurations:
+        layer_sizes = get_acas_like_layer_sizes(width, number_of_hidden_layers)
+        weights, biases, bounds = get_random_layer_matrices(layer_sizes)
+        nnet_reader = InMemoryNNetReader(weights, biases, *bounds)
+
+        for edges_manager_class in [NodeEdges, ArrayNodeEdges]:
+            allocated_bytes, number_of_edges, elapsed_time = measure_preprocessed_network(nnet_reader,
+                                                                                          edges_manager_class)
+            print(f'{width:>6}{number_of_hidden_layers:>6}{number_of_edges:>10}{edges_manager_class.__name__:>16}'
+                  f'{allocated_bytes / 2 ** 20:>10.1f}{allocated_bytes / number_of_edges:>12.1f}'
+                  f'{elapsed_time:>8.2f}s')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,167 @@
+import itertools
+import random
+import sys
+import time
+
+from benchmarks.synthetic_networks import get_acas_like_layer_sizes, get_random_layer_matrices
+from src.MarabouDataManagers.NNetReader import InMemoryNNetReader
+from src.Network import Network
+from src.PackedLocations import pack_location, pack_pair_of_keys_in_table
+
+"""
+measures the packed int locations against the tuple locations they replaced.
+
+the micro benchmark compares the 3 structures which moved to packed locations, with tuple keys and with packed keys:
+the map of the pairs of arnodes in decide_best_arnodes_to_merge, the set of the nodes without valid equations in the
+global data manager, and the map of the arnodes connected to in ARNode._recalculate_edges_in_direction (which uses
+the location each node packs when it moves, so only the lookups are measured).
+the macro benchmark times the refinement steps which use them on an acas like network.
+
+python -m benchmarks.bench_packed_locations
+"""
+
+NUMBER_OF_REPETITIONS = 3
+ACAS_PROPERTY = 2
+NUMBER_OF_MERGES = 10
+
+
+def time_function(function_to_time):
+    best_time = float('inf')
+    for _ in range(NUMBER_OF_REPETITIONS):
+        start = time.perf_counter()
+        function_to_time()
+        best_time = min(best_time, time.perf_counter() - start)
+
+    return best_time
+
+
+def fill_map_of_pairs_with_tuples(keys_in_table, weights):
+    map_of_pairs_to_m = {}
+    for (key_in_table_1, weight_1), (key_in_table_2, weight_2) in \
+            itertools.combinations(zip(keys_in_table, weights), 2):
+        key_of_pair = (0, key_in_table_1, 0, key_in_table_2)
+        m = abs(weight_1 - weight_2)
+        m_of_pair = map_of_pairs_to_m.get(key_of_pair)
+        if m_of_pair is None or m > m_of_pair:
+            map_of_pairs_to_m[key_of_pair] = m
+
+    return map_of_pairs_to_m
+
+
+def fill_map_of_pairs_with_packed_pairs(keys_in_table, weights):
+    map_of_pairs_to_m = {}
+    packed_pairs_with_first_keys = [pack_pair_of_keys_in_table(0, key_in_table, 0) for key_in_table in keys_in_table]
+    for (packed_pair_with_first_key, _, weight_1), (_, key_in_table_2, weight_2) in \
+            itertools.combinations(zip(packed_pairs_with_first_keys, keys_in_table, weights), 2):
+        key_of_pair = packed_pair_with_first_key | key_in_table_2
+        m = abs(weight_1 - weight_2)
+        m_of_pair = map_of_pairs_to_m.get(key_of_pair)
+        if m_of_pair is None or m > m_of_pair:
+            map_of_pairs_to_m[key_of_pair] = m
+
+    return map_of_pairs_to_m
+
+
+def get_size_of_keys_in_bytes(map_or_set):
+    return sum(sys.getsizeof(key) for key in map_or_set)
+
+
+def run_micro_benchmark():
+    random.seed(0)
+    number_of_keys = 1000
+    keys_in_table = list(range(number_of_keys))
+    weights = [random.uniform(-1, 1) for _ in keys_in_table]
+
+    print('micro')
+    print(f'{"structure":>28}{"tuple":>10}{"packed":>10}{"speedup":>9}{"tuple key B":>13}{"packed key B":>14}')
+
+    def print_result(name, with_tuples, with_packed, keys_with_tuples, keys_with_packed):
+        tuple_time = time_function(with_tuples)
+        packed_time = time_function(with_packed)
+        print(f'{name:>28}{tuple_time:>9.3f}s{packed_time:>9.3f}s{tuple_time / packed_time:>8.2f}x'
+              f'{get_size_of_keys_in_bytes(keys_with_tuples) / len(keys_with_tuples):>13.0f}'
+              f'{get_size_of_keys_in_bytes(keys_with_packed) / len(keys_with_packed):>14.0f}')
+
+    print_result('map of pairs to m',
+                 lambda: fill_map_of_pairs_with_tuples(keys_in_table, weights),
+                 lambda: fill_map_of_pairs_with_packed_pairs(keys_in_table, weights),
+                 fill_map_of_pairs_with_tuples(keys_in_table, weights),
+                 fill_map_of_pairs_with_packed_pairs(keys_in_table, weights))
+
+    # the set of invalid equations is checked for every node. the packed locations are kept in a separate set for
+    # each code, so the location each node packs when it moves is looked up as it is
+    locations = [(layer_number, table_number, key_in_table)
+                 for layer_number in range(8) for table_number in range(4) for key_in_table in range(number_of_keys)]
+    packed_locations = [pack_location(*location) for location in locations]
+    set_of_tuples = set(location + (1,) for location in locations[::3])
+    set_of_packed = set(packed_locations[::3])
+
+    def check_tuples():
+        for layer_number, table_number, key_in_table in locations:
+            (layer_number, table_number, key_in_table, 1) in set_of_tuples
+
+    def check_packed():
+        for packed_location in packed_locations:
+            packed_location in set_of_packed
+
+    print_result('invalid equations set', check_tuples, check_packed, set_of_tuples, set_of_packed)
+
+    # a map of the arnodes connected to, the tuple is created by get_location while the packed location is read
+    locations_in_layer = [(table_number, key_in_table) for _, table_number, key_in_table in locations[:4 * 1000]]
+    packed_locations_in_layer = packed_locations[:4 * 1000]
+
+    def map_with_tuples():
+        map_of_weights = {}
+        for _ in range(10):
+            for table_number, key_in_table in locations_in_layer:
+                location = (table_number, key_in_table)
+                if location in map_of_weights:
+                    map_of_weights[location] += 1
+                else:
+                    map_of_weights[location] = 1
+
+    def map_with_packed():
+        map_of_weights = {}
+        for _ in range(10):
+            for packed_location in packed_locations_in_layer:
+                if packed_location in map_of_weights:
+                    map_of_weights[packed_location] += 1
+                else:
+                    map_of_weights[packed_location] = 1
+
+    print_result('map of weights', map_with_tuples, map_with_packed, locations_in_layer, packed_locations_in_layer)
+
+
+def run_macro_benchmark():
+    configurations = [(50, 6), (100, 6)]
+
+    print('macro')
+    print(f'{"width":>6}{"depth":>6}{"full activation":>17}{"decide merge":>14}{"merges":>10}')
+    for width, number_of_hidden_layers in configurations:
+        layer_sizes = get_acas_like_layer_sizes(width, number_of_hidden_layers)
+        weights, biases, bounds = get_random_layer_matrices(layer_sizes)
+        nnet_reader = InMemoryNNetReader(weights, biases, *bounds)
+
+        network = Network(nnet_reader, ACAS_PROPERTY)
+        start = time.perf_counter()
+        network.fully_activate_the_entire_network()
+        full_activation_time = time.perf_counter() - start
+
+        decide_time = time_function(network.decide_best_arnodes_to_merge)
+
+        start = time.perf_counter()
+        for _ in range(NUMBER_OF_MERGES):
+            network.merge_list_of_arnodes(*network.decide_best_arnodes_to_merge())
+        merges_time = time.perf_counter() - start
+
+        print(f'{width:>6}{number_of_hidden_layers:>6}{full_activation_time:>16.3f}s{decide_time:>13.3f}s'
+              f'{merges_time:>9.3f}s')
+
+
+def main():
+    run_micro_benchmark()
+    run_macro_benchmark()
+
+
+if __name__ == '__main__':
+    main()
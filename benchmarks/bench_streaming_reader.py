@@ -0,0 +1,57 @@
+import os
+import tempfile
+import time
+import tracemalloc
+
+from benchmarks.synthetic_networks import write_random_nnet_file
+from src.MarabouDataManagers.NNetReader import NNetReader
+from src.MarabouDataManagers.NNetStreamingReader import NNetStreamingReader
+from src.Network import Network
+
+"""
+compares the peak memory of building a Network from an NNetReader, which holds the entire network, with building it
+from an NNetStreamingReader, which holds a single layer at a time
+
+python -m benchmarks.bench_streaming_reader
+"""
+
+ACAS_PROPERTY = 1
+
+
+def measure_peak_memory_and_time(function_to_measure):
+    """
+    :return: a pair of (the peak number of bytes allocated while the function ran, the time it took)
+    """
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = function_to_measure()
+    elapsed_time = time.perf_counter() - start
+    _, peak_memory = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return peak_memory, elapsed_time
+
+
+def main():
+    configurations = [[5, 300, 300, 300, 300, 5],
+                      [5, 800, 800, 5],
+                      [5, 300, 300, 300, 300, 300, 300, 300, 300, 5]]
+
+    print(f'{"layer sizes":<36}{"MB reader":>10}{"MB stream":>10}{"s reader":>10}{"s stream":>10}')
+    with tempfile.TemporaryDirectory() as directory:
+        for layer_sizes in configurations:
+            file_name = os.path.join(directory, 'network.nnet')
+            write_random_nnet_file(file_name, layer_sizes)
+
+            reader_memory, reader_time = measure_peak_memory_and_time(
+                lambda: Network(NNetReader(file_name, use_binary_cache=False), ACAS_PROPERTY))
+            streaming_memory, streaming_time = measure_peak_memory_and_time(
+                lambda: Network(NNetStreamingReader(file_name), ACAS_PROPERTY))
+            os.remove(file_name)
+
+            print(f'{str(layer_sizes)[:35]:<36}{reader_memory / 2 ** 20:>10.1f}{streaming_memory / 2 ** 20:>10.1f}'
+                  f'{reader_time:>9.2f}s{streaming_time:>9.2f}s')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+import random
+
+"""
+helpers for creating synthetic networks for the benchmarks
+
+run the benchmarks from the root of the repository, for example
+python -m benchmarks.bench_nnet_parsing
+"""
+
+
+def write_random_nnet_file(file_name, layer_sizes, seed=0, probability_of_zero_weight=0.0):
+    """
+    writes a random fully connected network in the .nnet format
+
+    :param file_name:
+    :param layer_sizes: the sizes of all the layers, including the input and output layers
+    :param seed: the seed for the random weights
+    :param probability_of_zero_weight: the probability that each weight would be exactly 0
+    """
+    random_generator = random.Random(seed)
+    input_size = layer_sizes[0]
+
+    def to_line(values):
+        return ",".join(values) + ",\n"
+
+    with open(file_name, 'w') as f:
+        f.write("// synthetic network created by benchmarks/synthetic_networks.py\n")
+        f.write(to_line([str(len(layer_sizes) - 1), str(input_size), str(layer_sizes[-1]), str(max(layer_sizes))]))
+        f.write(to_line([str(size) for size in layer_sizes]))
+        f.write("0,\n")
+        f.write(to_line(["-1.0"] * input_size))
+        f.write(to_line(["1.0"] * input_size))
+        f.write(to_line(["0.0"] * (input_size + 1)))
+        f.write(to_line(["1.0"] * (input_size + 1)))
+
+        for layer_number in range(1, len(layer_sizes)):
+            for _ in range(layer_sizes[layer_number]):
+                row = []
+                for _ in range(layer_sizes[layer_number - 1]):
+                    if random_generator.random() < probability_of_zero_weight:
+                        row.append("0.0")
+                    else:
+                        row.append("%.8f" % random_generator.uniform(-1, 1))
+                f.write(to_line(row))
+            for _ in range(layer_sizes[layer_number]):
+                f.write("%.8f,\n" % random_generator.uniform(-1, 1))
+
+
+def get_acas_like_layer_sizes(width, number_of_hidden_layers):
+    """
+    :return: layer sizes with the acas input and output sizes (5 inputs and 5 outputs) and the given hidden layers
+    """
+    return [5] + [width] * number_of_hidden_layers + [5]
+
+
+def get_random_layer_matrices(layer_sizes, seed=0):
+    """
+    :param layer_sizes: the sizes of all the layers, including the input and output layers
+    :param seed: the seed for the random weights
+    :return: a tuple of (weights, biases, bounds) of a random fully connected network, in the form
+    Network.from_layer_matrices expects
+    """
+    random_generator = random.Random(seed)
+    weights = []
+    biases = []
+    for layer_number in range(1, len(layer_sizes)):
+        weights.append([[random_generator.uniform(-1, 1) for _ in range(layer_sizes[layer_number - 1])]
+                        for _ in range(layer_sizes[layer_number])])
+        biases.append([random_generator.uniform(-1, 1) for _ in range(layer_sizes[layer_number])])
+
+    input_size = layer_sizes[0]
+    bounds = ([-1.0] * input_size, [1.0] * input_size)
+    return weights, biases, bounds
@@ -0,0 +1,215 @@
+import array
+import itertools
+import sys
+
+from src.NodeEdges import NodeEdges
+
+
+class ArrayNodeEdges(NodeEdges):
+    """
+    a NodeEdges which keeps its connections in compact parallel arrays instead of a tuple for each connection.
+
+    all the connections of the object (from all the tables) are held in 4 parallel arrays of keys, table numbers,
+    weights (as float64) and references to the nodes connected to, and for each table a map between a key in the table
+    and the slot of its connection in the arrays.
+    a connection is deleted by moving the last connection into its slot, so add, edit and delete are all O(1)
+    (amortized).
+
+    the maps are kept in self.list_of_tables, so all the methods of NodeEdges which only check if a connection exists
+    or count the connections work as they are.
+    to use it instead of NodeEdges set Node.EDGES_MANAGER_CLASS = ArrayNodeEdges before creating the network
+    """
+    __slots__ = ('keys', 'table_numbers', 'weights', 'references')
+
+    def __init__(self, number_of_tables_in_layer_connected_to, layer_number_connected_to, relocation_counter):
+        super().__init__(number_of_tables_in_layer_connected_to, layer_number_connected_to, relocation_counter)
+
+        # self.list_of_tables[table_number][key_in_table] = slot of the connection in the arrays below
+        self.keys = array.array('q')
+        self.table_numbers = array.array('b')
+        self.weights = array.array('d')
+        self.references = []
+
+    def _add_connection_to_new_slot(self, table_number, key_in_table, weight, node_connected_to):
+        self.list_of_tables[table_number][key_in_table] = len(self.references)
+        self.keys.append(key_in_table)
+        self.table_numbers.append(table_number)
+        self.weights.append(weight)
+        self.references.append(node_connected_to)
+
+    def _update_locations_of_connections(self):
+        # the slots of the connections stay the same, only their keys and table numbers change
+        list_of_tables = [{} for _ in range(self.number_of_tables_in_layer_connected_to)]
+        for slot, node_connected_to in enumerate(self.references):
+            # as in NodeEdges._update_locations_of_connections
+            node_connected_to.check_if_killed_and_raise_error_if_is()
+            table_number = node_connected_to.get_table_number()
+            key_in_table = node_connected_to.get_key_in_table()
+            list_of_tables[table_number][key_in_table] = slot
+            self.keys[slot] = key_in_table
+            self.table_numbers[slot] = table_number
+
+        self.list_of_tables = list_of_tables
+
+    def get_size_in_bytes(self):
+        """
+        :return: the number of bytes taken by this object and the containers it holds the connections in.
+        the nodes connected to are not counted
+        """
+        size_in_bytes = sys.getsizeof(self) + sys.getsizeof(self.list_of_tables)
+        for table in self.list_of_tables:
+            size_in_bytes += sys.getsizeof(table)
+        for container in [self.keys, self.table_numbers, self.weights, self.references]:
+            size_in_bytes += sys.getsizeof(container)
+
+        return size_in_bytes
+
+    def add_or_edit_connection(self, table_number, key_in_table, weight, node_connected_to):
+        """
+        if a connection already exist between a node and the node we are given it overrides its data with the
+        given data. otherwise it simply adds the connection data
+        :param table_number:
+        :param key_in_table:
+        :param weight:
+        :param node_connected_to:
+        """
+        self._check_valid_table_number_and_raise_error_if_not(table_number)
+        self._update_locations_of_connections_if_needed()
+
+        slot = self.list_of_tables[table_number].get(key_in_table)
+        if slot is None:
+            self._add_connection_to_new_slot(table_number, key_in_table, weight, node_connected_to)
+        else:
+            self.weights[slot] = weight
+            self.references[slot] = node_connected_to
+
+    def add_or_edit_connections_by_bulk(self, table_number, keys_in_table, weights, nodes_connected_to):
+        """
+        the same as calling add_or_edit_connection for each (key_in_table, weight, node_connected_to) triplet
+        :param table_number:
+        :param keys_in_table: a sequence of keys in the table
+        :param weights: a sequence of weights of the same length
+        :param nodes_connected_to: a sequence of nodes of the same length
+        """
+        self._check_valid_table_number_and_raise_error_if_not(table_number)
+        self._update_locations_of_connections_if_needed()
+
+        current_table_map = self.list_of_tables[table_number]
+        if len(current_table_map) == 0:
+            # the common case when the network is built, all the connections are new and the slots can be given
+            # in one go
+            first_slot = len(self.references)
+            current_table_map.update(zip(keys_in_table, itertools.count(first_slot)))
+            if len(current_table_map) == len(keys_in_table):
+                self.keys.extend(keys_in_table)
+                self.table_numbers.extend(itertools.repeat(table_number, len(keys_in_table)))
+                self.weights.extend(weights)
+                self.references.extend(nodes_connected_to)
+                return
+
+            # the keys were not unique, fall back to adding them one by one
+            current_table_map.clear()
+
+        for key_in_table, weight, node_connected_to in zip(keys_in_table, weights, nodes_connected_to):
+            self.add_or_edit_connection(table_number, key_in_table, weight, node_connected_to)
+
+    def find_weight_of_connection(self, table_number, key_in_table):
+        self._check_valid_table_number_and_raise_error_if_not(table_number)
+        self._check_if_connection_exist_and_raise_error_if_not(table_number, key_in_table)
+
+        return self.weights[self.list_of_tables[table_number][key_in_table]]
+
+    def get_connection_data_for_neighbor(self, table_number, key_in_table):
+        self._check_if_connection_exist_and_raise_error_if_not(table_number, key_in_table)
+
+        slot = self.list_of_tables[table_number][key_in_table]
+        return [table_number, key_in_table, self.weights[slot], self.references[slot]]
+
+    def delete_connection(self, table_number, key_in_table):
+        """
+        :param table_number:
+        :param key_in_table:
+        :return: the (weight, node_connected_to) of the connection deleted
+        """
+        self._check_valid_table_number_and_raise_error_if_not(table_number)
+        self._check_if_connection_exist_and_raise_error_if_not(table_number, key_in_table)
+
+        slot = self.list_of_tables[table_number].pop(key_in_table)
+        weight = self.weights[slot]
+        node_connected_to = self.references[slot]
+
+        # move the last connection into the slot which was freed
+        last_slot = len(self.references) - 1
+        if slot != last_slot:
+            key_of_last_connection = self.keys[last_slot]
+            table_number_of_last_connection = self.table_numbers[last_slot]
+
+            self.keys[slot] = key_of_last_connection
+            self.table_numbers[slot] = table_number_of_last_connection
+            self.weights[slot] = self.weights[last_slot]
+            self.references[slot] = self.references[last_slot]
+            self.list_of_tables[table_number_of_last_connection][key_of_last_connection] = slot
+
+        del self.keys[last_slot]
+        del self.table_numbers[last_slot]
+        del self.weights[last_slot]
+        del self.references[last_slot]
+
+        return weight, node_connected_to
+
+    def delete_connections_by_bulk(self, list_of_locations):
+        # every deletion moves a connection to another slot, so they are simply done one by one
+        for table_number, key_in_table in list_of_locations:
+            self.delete_connection(table_number, key_in_table)
+
+    def delete_all_connections(self):
+        """
+        the same as NodeEdges.delete_all_connections
+        """
+        super().delete_all_connections()
+        del self.keys[:]
+        del self.table_numbers[:]
+        del self.weights[:]
+        self.references.clear()
+
+    def get_iterator_over_connections(self):
+        """
+        :return: an iterator on the connections data which is of the form
+        [table_number, key_in_table, weight, reference_to_node_connected_to]
+
+        the iterator guarantees order in increasing table_number but does not guarantee order in key_in_table
+        """
+        self._update_locations_of_connections_if_needed()
+
+        weights = self.weights
+        references = self.references
+        for current_table_number in range(len(self.list_of_tables)):
+            for key_in_table, slot in self.list_of_tables[current_table_number].items():
+                yield [current_table_number, key_in_table, weights[slot], references[slot]]
+
+    def get_view_over_connections(self):
+        """
+        :return: the same as NodeEdges.get_view_over_connections
+        """
+        self._update_locations_of_connections_if_needed()
+
+        get_weight = self.weights.__getitem__
+        get_reference = self.references.__getitem__
+
+        return [(table_number, table.keys(), map(get_weight, table.values()), map(get_reference, table.values()))
+                for table_number, table in enumerate(self.list_of_tables) if len(table) != 0]
+
+    def get_combinations_iterator_over_connections(self, r):
+        """
+        :param r: the r that would be given to itertools.combinations
+        :return: the same as NodeEdges.get_combinations_iterator_over_connections
+        """
+        self._update_locations_of_connections_if_needed()
+
+        weights = self.weights
+        references = self.references
+        for current_table_number in range(len(self.list_of_tables)):
+            current_table_map = self.list_of_tables[current_table_number]
+            for r_tuple_of_items in itertools.combinations(current_table_map.items(), r):
+                yield [[current_table_number, key_in_table, weights[slot], references[slot]]
+                       for key_in_table, slot in r_tuple_of_items]
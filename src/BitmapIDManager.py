@@ -0,0 +1,186 @@
+from src.IDManager import IDManager
+
+
+class BitmapIDManager(IDManager):
+    """
+    an IDManager which gives and takes back ids in O(log n), no matter how many holes there are.
+
+    IDManager keeps the ranges of free ids in a sorted list, so giving an id back inserts into the list and costs
+    O(number of ranges). this class keeps
+    1) the smallest id which was never given (the start of the last range [a, infinity] of IDManager)
+    2) a bitmap of the holes, the free ids smaller than it, with summary levels above it: bit i of a word in level
+    k + 1 is set if word i under it in level k is not 0. so the smallest hole is found by going down from the single
+    word of the top level, one word in each level, which takes O(log_64 n)
+
+    the ids are given and taken back exactly as IDManager gives and takes them, and the ranges of IDManager can be
+    built with get_ranges. to use it set GlobalDataManager.ID_MANAGER_CLASS = BitmapIDManager before creating the
+    network
+    """
+    BITS_IN_WORD = 64
+    BITS_OF_INDEX_IN_WORD = 6
+    MASK_OF_INDEX_IN_WORD = BITS_IN_WORD - 1
+
+    def __init__(self):
+        # the ranges of IDManager are not used
+        super().__init__()
+        self.ranges = None
+
+        self.smallest_id_never_given = 0
+        self.number_of_holes = 0
+        # self.levels_of_holes[0] is the bitmap of the holes, and self.levels_of_holes[-1] always has a single word
+        self.levels_of_holes = [[0]]
+
+    def _make_room_for_hole(self, hole_id):
+        """
+        adds words to the levels (and levels above the top level) until the bitmap is large enough to hold hole_id
+        """
+        index_of_word = hole_id >> BitmapIDManager.BITS_OF_INDEX_IN_WORD
+        level_number = 0
+        while True:
+            level = self.levels_of_holes[level_number]
+            if index_of_word >= len(level):
+                level.extend([0] * (index_of_word + 1 - len(level)))
+
+            if level_number == len(self.levels_of_holes) - 1:
+                if len(level) == 1:
+                    return
+                # the top level has more than a single word, so a new level is needed above it. its bits are those
+                # of the words which are not 0 in the top level
+                new_top_level = [0] * (((len(level) - 1) >> BitmapIDManager.BITS_OF_INDEX_IN_WORD) + 1)
+                for index_of_word_in_level, word in enumerate(level):
+                    if word != 0:
+                        new_top_level[index_of_word_in_level >> BitmapIDManager.BITS_OF_INDEX_IN_WORD] |= \
+                            1 << (index_of_word_in_level & BitmapIDManager.MASK_OF_INDEX_IN_WORD)
+                self.levels_of_holes.append(new_top_level)
+
+            index_of_word >>= BitmapIDManager.BITS_OF_INDEX_IN_WORD
+            level_number += 1
+
+    def _add_hole(self, hole_id):
+        self._make_room_for_hole(hole_id)
+
+        index_in_level = hole_id
+        for level in self.levels_of_holes:
+            index_of_word = index_in_level >> BitmapIDManager.BITS_OF_INDEX_IN_WORD
+            word = level[index_of_word]
+            level[index_of_word] = word | (1 << (index_in_level & BitmapIDManager.MASK_OF_INDEX_IN_WORD))
+            if word != 0:
+                # the levels above already know this word is not 0
+                break
+            index_in_level = index_of_word
+
+        self.number_of_holes += 1
+
+    def _remove_hole(self, hole_id):
+        index_in_level = hole_id
+        for level in self.levels_of_holes:
+            index_of_word = index_in_level >> BitmapIDManager.BITS_OF_INDEX_IN_WORD
+            word = level[index_of_word] & ~(1 << (index_in_level & BitmapIDManager.MASK_OF_INDEX_IN_WORD))
+            level[index_of_word] = word
+            if word != 0:
+                # the levels above should still know this word is not 0
+                break
+            index_in_level = index_of_word
+
+        self.number_of_holes -= 1
+
+    def _check_if_id_is_hole(self, id_to_check):
+        level = self.levels_of_holes[0]
+        index_of_word = id_to_check >> BitmapIDManager.BITS_OF_INDEX_IN_WORD
+        return index_of_word < len(level) and \
+            (level[index_of_word] >> (id_to_check & BitmapIDManager.MASK_OF_INDEX_IN_WORD)) & 1 == 1
+
+    def _get_smallest_hole(self):
+        """
+        assumes there is at least one hole
+        """
+        index_in_level = 0
+        for level_number in range(len(self.levels_of_holes) - 1, -1, -1):
+            word = self.levels_of_holes[level_number][index_in_level]
+            # the index of the lowest bit which is set in the word
+            index_in_level = (index_in_level << BitmapIDManager.BITS_OF_INDEX_IN_WORD) | \
+                ((word & -word).bit_length() - 1)
+
+        return index_in_level
+
+    def check_if_ranges_has_holes(self):
+        return self.number_of_holes != 0
+
+    def get_new_id(self):
+        if self.number_of_holes != 0:
+            to_return = self._get_smallest_hole()
+            self._remove_hole(to_return)
+            return to_return
+
+        to_return = self.smallest_id_never_given
+        self.smallest_id_never_given += 1
+        return to_return
+
+    def get_new_ids(self, number_of_ids):
+        """
+        :param number_of_ids:
+        :return: the same as IDManager.get_new_ids
+        """
+        ids_to_return = []
+        while self.number_of_holes != 0 and len(ids_to_return) < number_of_ids:
+            hole_id = self._get_smallest_hole()
+            self._remove_hole(hole_id)
+            ids_to_return.append(hole_id)
+
+        number_of_ids_never_given_to_take = number_of_ids - len(ids_to_return)
+        ids_to_return.extend(range(self.smallest_id_never_given,
+                                   self.smallest_id_never_given + number_of_ids_never_given_to_take))
+        self.smallest_id_never_given += number_of_ids_never_given_to_take
+
+        return ids_to_return
+
+    def give_ids_back(self, ids_returned):
+        # every id is given back in O(log n) anyway
+        for id_returned in ids_returned:
+            self.give_id_back(id_returned)
+
+    def give_id_back(self, id_returned):
+        """
+        :param id_returned: an id that should be marked as available
+        as in IDManager, it is trusted that the id was given before and was not given back since
+        """
+        if id_returned != self.smallest_id_never_given - 1:
+            self._add_hole(id_returned)
+            return
+
+        # the id is merged into the last range, and so are the holes right below it. each of those holes was added by
+        # a call to this function, so the loop takes O(log n) for each call on average
+        self.smallest_id_never_given -= 1
+        while self.number_of_holes != 0 and self._check_if_id_is_hole(self.smallest_id_never_given - 1):
+            self.smallest_id_never_given -= 1
+            self._remove_hole(self.smallest_id_never_given)
+
+    def get_smallest_available_id(self):
+        if self.number_of_holes != 0:
+            return self._get_smallest_hole()
+        return self.smallest_id_never_given
+
+    def get_maximum_id_used(self):
+        return self.smallest_id_never_given - 1
+
+    def get_ranges(self):
+        """
+        :return: the ranges of free ids in the form IDManager keeps them, a, b, c, d, ..., infinity.
+        it goes over all the holes, so it should only be used for debugging and testing
+        """
+        ranges = []
+        level = self.levels_of_holes[0]
+        for index_of_word, word in enumerate(level):
+            while word != 0:
+                lowest_bit = word & -word
+                hole_id = (index_of_word << BitmapIDManager.BITS_OF_INDEX_IN_WORD) | (lowest_bit.bit_length() - 1)
+                if len(ranges) != 0 and ranges[-1] == hole_id:
+                    ranges[-1] = hole_id + 1
+                else:
+                    ranges.extend([hole_id, hole_id + 1])
+                word ^= lowest_bit
+
+        # the id right below the smallest id never given is never a hole, see give_id_back
+        ranges.extend([self.smallest_id_never_given, float('inf')])
+
+        return ranges
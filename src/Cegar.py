@@ -2,63 +2,104 @@
 this class would be use to implement the various cegar algorithms
 and to interface with general marabou
 """
+from src.GarbageCollectionManager import GarbageCollectionManager
 from src.Network import Network
 
 
-def run_cegar_naive(nnet_reader_object, which_acas_output):
+def run_cegar_naive(nnet_reader_object, which_acas_output, preprocessed_network_cache=None,
+                    garbage_collection_manager=None):
     """
     naive algorithm
     abstracts all the way and only then starts to refine back
+
+    :param preprocessed_network_cache: an optional PreprocessedNetworkCache. if given, the fully activated network is
+    loaded from it instead of being built (and is saved to it the first time)
+    :param garbage_collection_manager: an optional GarbageCollectionManager. if given, the garbage collector is
+    managed by it, and the time spent in collections in each phase can be taken from it after the run
     """
-    network = Network(nnet_reader_object, which_acas_output)
-    network.fully_activate_the_entire_network()
+    if garbage_collection_manager is None:
+        garbage_collection_manager = GarbageCollectionManager(should_manage_collection=False)
+
+    try:
+        with garbage_collection_manager.phase('construction', is_bulk_construction=True):
+            if preprocessed_network_cache is None:
+                network = Network(nnet_reader_object, which_acas_output)
+                network.fully_activate_the_entire_network()
+            else:
+                network = preprocessed_network_cache.get_fully_activated_network(nnet_reader_object,
+                                                                                 which_acas_output)
+        # the original network was saved when the network was created, and the nodes killed by the activation were
+        # already freed
+        garbage_collection_manager.freeze_existing_objects()
+
+        # merge all arnodes
+        with garbage_collection_manager.phase('abstraction'):
+            while True:
+                try:
+                    layer_number, table_number, list_of_keys_of_arnodes_to_merge = \
+                        network.decide_best_arnodes_to_merge()
+                    network.merge_list_of_arnodes(layer_number, table_number, list_of_keys_of_arnodes_to_merge)
+                except:
+                    break
 
-    # merge all arnodes
-    while True:
-        try:
-            layer_number, table_number, list_of_keys_of_arnodes_to_merge = network.decide_best_arnodes_to_merge()
-            network.merge_list_of_arnodes(layer_number, table_number, list_of_keys_of_arnodes_to_merge)
-        except:
-            break
+        with garbage_collection_manager.phase('refinement'):
+            while True:
+                result = network.check_if_network_is_sat_or_unsat()
+                if result == network.CODE_FOR_SAT:
+                    print('SAT')
+                    break
+                elif result == network.CODE_FOR_UNSAT:
+                    print('UNSAT')
+                    break
 
-    while True:
-        result = network.check_if_network_is_sat_or_unsat()
-        if result == network.CODE_FOR_SAT:
-            print('SAT')
-            break
-        elif result == network.CODE_FOR_UNSAT:
-            print('UNSAT')
-            break
+                # we have a spurious counter example
+                layer_number, table_number, key_in_table, partition_of_arnode_inner_nodes = \
+                    network.decide_best_arnodes_to_merge()
+                network.split_arnode(layer_number, table_number, key_in_table, partition_of_arnode_inner_nodes)
+    finally:
+        garbage_collection_manager.release()
 
-        # we have a spurious counter example
-        layer_number, table_number, key_in_table, partition_of_arnode_inner_nodes = network.decide_best_arnodes_to_merge()
-        network.split_arnode(layer_number, table_number, key_in_table, partition_of_arnode_inner_nodes)
 
+def run_cegar_guy_way(nnet_reader_object, which_acas_output, number_of_layers_to_transfer_into_cegar_layer,
+                      garbage_collection_manager=None):
+    """
+    :param garbage_collection_manager: the same as in run_cegar_naive
+    """
+    if garbage_collection_manager is None:
+        garbage_collection_manager = GarbageCollectionManager(should_manage_collection=False)
 
-def run_cegar_guy_way(nnet_reader_object, which_acas_output, number_of_layers_to_transfer_into_cegar_layer):
-    # merge all arnodes in all the layers the user wishes to apply cegar too
-    network = Network(nnet_reader_object, which_acas_output)
+    try:
+        with garbage_collection_manager.phase('construction', is_bulk_construction=True):
+            network = Network(nnet_reader_object, which_acas_output)
 
-    network.preprocess_more_layers(number_of_layers_to_transfer_into_cegar_layer + 1)
-    network.forward_activate_more_layers(number_of_layers_to_transfer_into_cegar_layer + 1)
-    network.fully_activate_more_layers(number_of_layers_to_transfer_into_cegar_layer)
+            # merge all arnodes in all the layers the user wishes to apply cegar too
+            network.preprocess_more_layers(number_of_layers_to_transfer_into_cegar_layer + 1)
+            network.forward_activate_more_layers(number_of_layers_to_transfer_into_cegar_layer + 1)
+            network.fully_activate_more_layers(number_of_layers_to_transfer_into_cegar_layer)
+        garbage_collection_manager.freeze_existing_objects()
 
-    while True:
-        try:
-            layer_number, table_number, list_of_keys_of_arnodes_to_merge = network.decide_best_arnodes_to_merge()
-            network.merge_list_of_arnodes(layer_number, table_number, list_of_keys_of_arnodes_to_merge)
-        except:
-            break
+        with garbage_collection_manager.phase('abstraction'):
+            while True:
+                try:
+                    layer_number, table_number, list_of_keys_of_arnodes_to_merge = \
+                        network.decide_best_arnodes_to_merge()
+                    network.merge_list_of_arnodes(layer_number, table_number, list_of_keys_of_arnodes_to_merge)
+                except:
+                    break
 
-    while True:
-        result = network.check_if_network_is_sat_or_unsat()
-        if result == network.CODE_FOR_SAT:
-            print('SAT')
-            break
-        elif result == network.CODE_FOR_UNSAT:
-            print('UNSAT')
-            break
+        with garbage_collection_manager.phase('refinement'):
+            while True:
+                result = network.check_if_network_is_sat_or_unsat()
+                if result == network.CODE_FOR_SAT:
+                    print('SAT')
+                    break
+                elif result == network.CODE_FOR_UNSAT:
+                    print('UNSAT')
+                    break
 
-        # we have a spurious counter example
-        layer_number, table_number, key_in_table, partition_of_arnode_inner_nodes = network.decide_best_arnodes_to_merge()
-        network.split_arnode(layer_number, table_number, key_in_table, partition_of_arnode_inner_nodes)
\ No newline at end of file
+                # we have a spurious counter example
+                layer_number, table_number, key_in_table, partition_of_arnode_inner_nodes = \
+                    network.decide_best_arnodes_to_merge()
+                network.split_arnode(layer_number, table_number, key_in_table, partition_of_arnode_inner_nodes)
+    finally:
+        garbage_collection_manager.release()
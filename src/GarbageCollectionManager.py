@@ -0,0 +1,124 @@
+import contextlib
+import gc
+import time
+
+"""
+the network is a graph full of reference cycles (every connection is held by both of the nodes it connects, and every
+arnode points to its inner nodes which point back to it), and building it allocates millions of containers. python
+cyclic garbage collector runs a collection whenever enough containers were allocated, and its full collections go
+over every container in the process. so while the network is built and activated the collector goes over the growing
+network again and again, although almost nothing it finds is garbage.
+
+a managed run avoids that:
+1) the collector is disabled while the network is built, preprocessed and activated (bulk construction phases).
+2) the network built is frozen (gc.freeze), so the collections later on do not go over it at all.
+the nodes killed afterwards are still freed, since the nodes break their own reference cycles when they are
+killed (see the destructors of the node classes), so their reference counts drop to 0 without the collector.
+the frozen objects are unfrozen by release at the end of the run, so the network (which is full of reference cycles)
+can be collected once the run is over.
+3) while refining, the youngest generation threshold is raised, since merges and splits allocate many short lived
+containers which are freed by their reference counts anyway.
+
+in both a managed and a non managed run the collections in each phase are counted and timed, see get_report
+"""
+
+
+class GarbageCollectionManager:
+    # the threshold of the youngest generation in refinement phases of a managed run. the default of python is 700
+    MANAGED_THRESHOLD_OF_YOUNGEST_GENERATION = 50000
+
+    def __init__(self, should_manage_collection=True):
+        """
+        :param should_manage_collection: if false, the collector is left as is and only the collections are measured
+        """
+        self.should_manage_collection = should_manage_collection
+
+        self.name_of_current_phase = None
+        self.start_time_of_current_collection = None
+        self.objects_were_frozen = False
+        # map between the name of a phase and [number of collections, seconds spent in collections,
+        # number of objects collected]
+        self.collections_data_by_phase = {}
+
+    def _callback(self, stage_of_collection, info):
+        if stage_of_collection == 'start':
+            self.start_time_of_current_collection = time.perf_counter()
+            return
+
+        collections_data = self.collections_data_by_phase[self.name_of_current_phase]
+        collections_data[0] += 1
+        collections_data[1] += time.perf_counter() - self.start_time_of_current_collection
+        collections_data[2] += info['collected']
+
+    @contextlib.contextmanager
+    def phase(self, name_of_phase, is_bulk_construction=False):
+        """
+        the collections which take place inside the with block are counted in the given phase.
+        phases can not be nested
+
+        :param name_of_phase: the name the collections would be reported under. phases with the same name are
+        counted together
+        :param is_bulk_construction: should be true if the phase builds or activates the network and false if it
+        refines the network. in a managed run, the collector is disabled in bulk construction phases, and its youngest
+        generation threshold is raised in other phases
+        """
+        if self.name_of_current_phase is not None:
+            raise Exception("phases can not be nested")
+
+        self.name_of_current_phase = name_of_phase
+        self.collections_data_by_phase.setdefault(name_of_phase, [0, 0.0, 0])
+
+        collector_was_enabled = gc.isenabled()
+        previous_thresholds = gc.get_threshold()
+        if self.should_manage_collection:
+            if is_bulk_construction:
+                gc.disable()
+            else:
+                gc.set_threshold(GarbageCollectionManager.MANAGED_THRESHOLD_OF_YOUNGEST_GENERATION,
+                                 *previous_thresholds[1:])
+
+        gc.callbacks.append(self._callback)
+        try:
+            yield
+        finally:
+            gc.callbacks.remove(self._callback)
+            if self.should_manage_collection:
+                gc.set_threshold(*previous_thresholds)
+                if collector_was_enabled:
+                    gc.enable()
+
+            self.name_of_current_phase = None
+
+    def freeze_existing_objects(self):
+        """
+        in a managed run, moves all the objects which exist now to a generation which the collector never goes over.
+        it should be called once the original network was built and saved (see
+        GlobalNetworkManager.save_current_network_as_original_network), because from then on most of the objects
+        in the process live until the end of the run.
+        note that a frozen object which is left in a reference cycle is never freed, so it should not be called
+        before objects which are known to be garbage were freed
+        """
+        if self.should_manage_collection:
+            gc.freeze()
+            self.objects_were_frozen = True
+
+    def release(self):
+        """
+        must be called at the end of a run (even if it failed). unfreezes the objects frozen by
+        freeze_existing_objects, otherwise they, and every reference cycle among them, would never be collected.
+        note that gc.unfreeze unfreezes every frozen object in the process, not only the ones this manager froze
+        """
+        if self.objects_were_frozen:
+            gc.unfreeze()
+            self.objects_were_frozen = False
+
+    def get_report(self):
+        """
+        :return: a map between the name of every phase and a map with the keys
+        'number_of_collections', 'seconds_in_collections', 'number_of_objects_collected'
+        """
+        return {name_of_phase: {'number_of_collections': number_of_collections,
+                                'seconds_in_collections': seconds_in_collections,
+                                'number_of_objects_collected': number_of_objects_collected}
+                for name_of_phase, (number_of_collections, seconds_in_collections, number_of_objects_collected)
+                in self.collections_data_by_phase.items()}
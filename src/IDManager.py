@@ -22,7 +22,7 @@ class IDManager:
         """
         self.ranges = [0, float('inf')]
 
-    def _check_if_ranges_has_holes(self):
+    def check_if_ranges_has_holes(self):
         """
         :return: true if the range of free ids has holes in it, i.e. if self.ranges is not
         of the form [a, infinity]
@@ -68,6 +68,64 @@ class IDManager:
 
         return to_return
 
+    def get_new_ids(self, number_of_ids):
+        """
+        the same as calling get_new_id number_of_ids times, but whole ranges are taken at once and the ranges are
+        updated once
+        :param number_of_ids:
+        :return: a list of the ids, in increasing order
+        """
+        ids_to_return = []
+        index_of_range = 0
+        while len(ids_to_return) < number_of_ids:
+            start_of_range = self.ranges[index_of_range]
+            end_of_range = self.ranges[index_of_range + 1]
+            number_of_ids_to_take = min(end_of_range - start_of_range, number_of_ids - len(ids_to_return))
+            ids_to_return.extend(range(start_of_range, start_of_range + number_of_ids_to_take))
+
+            if start_of_range + number_of_ids_to_take == end_of_range:
+                # the range is finished
+                index_of_range += 2
+            else:
+                self.ranges[index_of_range] = start_of_range + number_of_ids_to_take
+
+        if index_of_range != 0:
+            self.ranges = self.ranges[index_of_range:]
+
+        return ids_to_return
+
+    def give_ids_back(self, ids_returned):
+        """
+        the same as calling give_id_back for each of the ids, but the ranges are rebuilt once, in a single pass which
+        merges the ranges with the sorted ids
+        :param ids_returned: ids which should be marked as available, without duplicates
+        """
+        new_ranges = []
+        index_of_range = 0
+        for id_returned in sorted(ids_returned):
+            # first copy the ranges which start before the id
+            while self.ranges[index_of_range] < id_returned:
+                self._append_range(new_ranges, self.ranges[index_of_range], self.ranges[index_of_range + 1])
+                index_of_range += 2
+            self._append_range(new_ranges, id_returned, id_returned + 1)
+
+        for i in range(index_of_range, len(self.ranges), 2):
+            self._append_range(new_ranges, self.ranges[i], self.ranges[i + 1])
+
+        self.ranges = new_ranges
+
+    @staticmethod
+    def _append_range(ranges, start_of_range, end_of_range):
+        """
+        appends the range [start_of_range, end_of_range] to the end of the given ranges, and merges it with the last
+        range if they are adjacent
+        """
+        if len(ranges) != 0 and ranges[-1] == start_of_range:
+            ranges[-1] = end_of_range
+        else:
+            ranges.append(start_of_range)
+            ranges.append(end_of_range)
+
     def give_id_back(self, id_returned):
         """
         :param id_returned: an id that should be marked as available
@@ -97,6 +155,19 @@ class IDManager:
                 # delete the irrelevant range end and begin
                 self.ranges = self.ranges[:index_inserted] + self.ranges[index_inserted + 2:]
 
+    def get_smallest_available_id(self):
+        """
+        :return: the id the next call to get_new_id would return
+        """
+        return self.ranges[0]
+
+    def get_ranges(self):
+        """
+        :return: a copy of the ranges of free ids, a, b, c, d, ..., infinity
+        """
+        # copy is slow
+        return [self.ranges[i] for i in range(len(self.ranges))]
+
     def get_maximum_id_used(self):
         """
         :return: the maximum id that was given away
@@ -1,5 +1,4 @@
 from src.Nodes.GlobalNode import GlobalNode
-from src.NodeEdges import NodeEdges
 from src.Tables.TableDoesntSupportsDeletion import TableDoesntSupportsDeletion
 from src.Tables.ARNodeTable import *
 
@@ -46,6 +45,10 @@ class Layer:
         self.layer_is_inner = False
         self._set_is_inner()
 
+        # if not None, the connections with tiny weights are pruned when the nodes of the layer are split by their type
+        # (see WeightPruner)
+        self.weight_pruner = None
+
         # initialize the regular_node_tables
         # to preserve assumption (2) the first 4 tables must have indices of 0-3 in order, as such give the first table
         # an index of 0 and the create_table_below_of_same_type function of the table class would take care of
@@ -70,6 +73,9 @@ class Layer:
     def set_next_layer(self, pointer_to_next_layer):
         self.next_layer = pointer_to_next_layer
 
+    def set_weight_pruner(self, weight_pruner):
+        self.weight_pruner = weight_pruner
+
     def _set_is_inner(self):
         if self.previous_layer == Layer.NO_POINTER_TO_ADJACENT_LAYER or \
                 self.next_layer == Layer.NO_POINTER_TO_ADJACENT_LAYER:
@@ -231,6 +237,74 @@ class Layer:
         node_to_add_connection_to = self.get_unprocessed_node_by_key(node_key)
         node_to_add_connection_to.add_or_edit_neighbors_by_bulk(direction_of_connection, list_of_connection_data)
 
+    def create_new_nodes_connected_to_previous_layer_by_bulk(self, biases_for_nodes,
+                                                             keys_of_nodes_in_previous_layer=None,
+                                                             nonzero_connections=None):
+        """
+        creates a new node in the unprocessed table for each of the given biases, and connects all of them to the nodes
+        in the unprocessed table of the previous layer.
+        this gives the same result as calling create_new_node for each node and then
+        add_or_edit_neighbors_to_node_in_unprocessed_table_by_bulk for each node, but each node is visited once when
+        connecting the layers, instead of once for every edge it has
+
+        :param biases_for_nodes: the biases of the new nodes
+        :param keys_of_nodes_in_previous_layer: a sequence such that keys_of_nodes_in_previous_layer[j] is the key
+        of the j'th node of the previous layer in its unprocessed table
+        :param nonzero_connections: a tuple of row_pointers, column_indices, values as returned by
+        NNetReader.get_nonzero_connections, such that the incoming connections of the i'th new node are
+        column_indices[row_pointers[i]:row_pointers[i + 1]] with the matching values as weights.
+        if None the new nodes are not connected to anything
+        :return: a list of the keys of the new nodes in the unprocessed table, in the order of the given biases
+        """
+        new_nodes = self.regular_node_tables[Layer.INDEX_OF_UNPROCESSED_TABLE].create_new_nodes_and_add_to_table_by_bulk(
+            Layer.NUMBER_OF_OVERALL_TABLES,
+            Layer.NUMBER_OF_OVERALL_TABLES,
+            biases_for_nodes,
+            self.global_data_manager)
+        keys_of_new_nodes = [new_node.get_key_in_table() for new_node in new_nodes]
+
+        if nonzero_connections is None:
+            return keys_of_new_nodes
+
+        # to preserve assumption (3) edges are only added between nodes in the unprocessed tables
+        row_pointers, column_indices, values = nonzero_connections
+        nodes_in_previous_layer = [self.previous_layer.get_unprocessed_node_by_key(key)
+                                   for key in keys_of_nodes_in_previous_layer]
+
+        # the outgoing connections of the previous layer nodes are gathered while going over the incoming connections
+        # of the new nodes, and then added to each node of the previous layer at once
+        outgoing_keys = [[] for _ in nodes_in_previous_layer]
+        outgoing_weights = [[] for _ in nodes_in_previous_layer]
+        outgoing_nodes = [[] for _ in nodes_in_previous_layer]
+
+        for i, new_node in enumerate(new_nodes):
+            start, end = row_pointers[i], row_pointers[i + 1]
+            columns = column_indices[start:end]
+            weights = values[start:end]
+
+            new_node.add_or_edit_one_sided_neighbors_in_table_by_bulk(
+                Layer.INCOMING_LAYER_DIRECTION,
+                Layer.INDEX_OF_UNPROCESSED_TABLE,
+                [keys_of_nodes_in_previous_layer[j] for j in columns],
+                weights,
+                [nodes_in_previous_layer[j] for j in columns])
+
+            key_of_new_node = keys_of_new_nodes[i]
+            for j, weight in zip(columns, weights):
+                outgoing_keys[j].append(key_of_new_node)
+                outgoing_weights[j].append(weight)
+                outgoing_nodes[j].append(new_node)
+
+        for j, node_in_previous_layer in enumerate(nodes_in_previous_layer):
+            node_in_previous_layer.add_or_edit_one_sided_neighbors_in_table_by_bulk(
+                Layer.OUTGOING_LAYER_DIRECTION,
+                Layer.INDEX_OF_UNPROCESSED_TABLE,
+                outgoing_keys[j],
+                outgoing_weights[j],
+                outgoing_nodes[j])
+
+        return keys_of_new_nodes
+
     @staticmethod
     def get_split_edge_data_by_types(node):
         """
@@ -245,16 +319,6 @@ class Layer:
         so that list[i] would contain all the connection data for outgoing edges that should go to the node we will
         create in regular_node_tables[i].
         """
-        data_for_nodes_we_are_pos_linked_to = []
-        data_for_nodes_we_are_neg_linked_to = []
-
-        for outgoing_edges_data in node.get_iterator_for_connections_data(GlobalNode.OUTGOING_EDGE_DIRECTION):
-            weight_of_connection = outgoing_edges_data[NodeEdges.INDEX_OF_WEIGHT_IN_DATA]
-            if weight_of_connection >= 0:
-                data_for_nodes_we_are_pos_linked_to.append(outgoing_edges_data)
-            else:
-                data_for_nodes_we_are_neg_linked_to.append(outgoing_edges_data)
-
         # data_for_nodes_we_are_pos_inc_linked_to would be the list at location 0
         # data_for_nodes_we_are_pos_dec_linked_to would be the list at location 1
         # data_for_nodes_we_are_neg_inc_linked_to would be the list at location 2
@@ -262,29 +326,30 @@ class Layer:
         split_data_by_types = [[] for _ in range(Layer.NUMBER_OF_REGULAR_TABLES_THAT_DO_NOT_SUPPORT_DELETION)]
 
         # according to assumption (2) the table number would correspond to the type of nodes they contain
-        table_number_location_in_data = NodeEdges.INDEX_OF_TABLE_NUMBER_IN_DATA
         inc_table_numbers = [Layer.INDEX_OF_POS_INC_TABLE, Layer.INDEX_OF_NEG_INC_TABLE]
         dec_table_numbers = [Layer.INDEX_OF_POS_DEC_TABLE, Layer.INDEX_OF_NEG_DEC_TABLE]
 
-        for outgoing_edges_data in data_for_nodes_we_are_pos_linked_to:
-            table_number = outgoing_edges_data[table_number_location_in_data]
+        # all the nodes in a table are of the same type, so the lists the connections to them go to are decided once
+        # for each table, and the connections are gone over using the view over the connections
+        for table_number, keys_in_table, weights, references in node.get_view_over_connections(
+                GlobalNode.OUTGOING_EDGE_DIRECTION):
             if table_number in inc_table_numbers:
-                split_data_by_types[0].append(outgoing_edges_data)
+                data_for_pos_linked_nodes = split_data_by_types[0]
+                data_for_neg_linked_nodes = split_data_by_types[3]
             elif table_number in dec_table_numbers:
-                split_data_by_types[1].append(outgoing_edges_data)
+                data_for_pos_linked_nodes = split_data_by_types[1]
+                data_for_neg_linked_nodes = split_data_by_types[2]
             else:
                 raise Exception("some of the nodes that this node is connected to by an outgoing connection were not "
                                 "preprocessed")
 
-        for outgoing_edges_data in data_for_nodes_we_are_neg_linked_to:
-            table_number = outgoing_edges_data[table_number_location_in_data]
-            if table_number in inc_table_numbers:
-                split_data_by_types[3].append(outgoing_edges_data)
-            elif table_number in dec_table_numbers:
-                split_data_by_types[2].append(outgoing_edges_data)
-            else:
-                raise Exception("some of the nodes that this node is connected to by an outgoing connection were not "
-                                "preprocessed")
+            for key_in_table, weight_of_connection, node_connected_to in zip(keys_in_table, weights, references):
+                if weight_of_connection >= 0:
+                    data_for_pos_linked_nodes.append([table_number, key_in_table, weight_of_connection,
+                                                      node_connected_to])
+                else:
+                    data_for_neg_linked_nodes.append([table_number, key_in_table, weight_of_connection,
+                                                      node_connected_to])
 
         return split_data_by_types
 
@@ -317,7 +382,15 @@ class Layer:
 
         unprocessed_table = self.regular_node_tables[Layer.INDEX_OF_UNPROCESSED_TABLE]
         node = unprocessed_table.get_node_by_key(node_key_in_unprocessed_table)
-        original_node_bias = node.get_node_bias()
+
+        incoming_edges_data = node.get_a_list_of_all_connections_data(GlobalNode.INCOMING_EDGE_DIRECTION)
+        lower_bias = upper_bias = node.get_node_bias()
+        if self.weight_pruner is not None:
+            # the new nodes do not get the pruned connections. instead the new inc nodes take the upper end of the
+            # bias interval and the new dec nodes take its lower end, so the new nodes would over-approximate the node
+            # in the direction of their type
+            incoming_edges_data, lower_bias, upper_bias = self.weight_pruner.prune_incoming_connections(
+                self.layer_number, node.get_node_bias(), incoming_edges_data)
 
         # before continuing, since the node is about to be removed, we first remove the node global variables,
         # including the node global id. we do so at this stage to create as little gaps as possible in the id manager
@@ -334,11 +407,15 @@ class Layer:
         for i in range(len(edge_data_split_by_type)):
             if len(edge_data_split_by_type[i]) != 0:
                 current_table = self.regular_node_tables[i]
+                if i in [Layer.INDEX_OF_POS_INC_TABLE, Layer.INDEX_OF_NEG_INC_TABLE]:
+                    bias_of_new_node = upper_bias
+                else:
+                    bias_of_new_node = lower_bias
                 # from assumption (1) all layers have the same number of layers
                 new_node = current_table.create_new_node_and_add_to_table(
                     Layer.NUMBER_OF_OVERALL_TABLES,
                     Layer.NUMBER_OF_OVERALL_TABLES,
-                    original_node_bias,
+                    bias_of_new_node,
                     self.global_data_manager)
 
                 nodes_created[i] = new_node
@@ -349,7 +426,6 @@ class Layer:
                                                                      GlobalNode.OUTGOING_EDGE_DIRECTION,
                                                                      edge_data_split_by_type[i])
         # now add all the incoming edges to all the nodes created
-        incoming_edges_data = node.get_a_list_of_all_connections_data(GlobalNode.INCOMING_EDGE_DIRECTION)
         for i in range(len(nodes_created)):
             if nodes_created[i] is not None:
                 current_table = self.regular_node_tables[i]
@@ -370,19 +446,31 @@ class Layer:
             if nodes_created[i] is not None:
                 self._create_arnode_for_node(nodes_created[i])
 
-    def _handle_preprocess_of_entire_outer_layers(self):
-        # from assumption (9) we will simply move the nodes to the pos-inc table
-        table_to_move_to = self.regular_node_tables[Layer.INDEX_OF_POS_INC_TABLE]
+    def relocate_nodes_from_unprocessed_table_by_bulk(self, list_of_node_keys, table_number):
+        """
+        moves the given nodes from the unprocessed table to the given table in one operation, so each neighbor of the
+        nodes would re-key its connections to them once, no matter how many of them it is connected to
 
+        :param list_of_node_keys: keys of nodes in the unprocessed table
+        :param table_number: the table to move the nodes to
+        :return: a list of the nodes moved, in the order of the given keys
+        """
+        table_to_move_to = self.regular_node_tables[table_number]
         unprocessed_table = self.regular_node_tables[Layer.INDEX_OF_UNPROCESSED_TABLE]
-        for unprocessed_node_key in unprocessed_table.get_list_of_all_keys():
-            # remove node from unprocessed table and move it to its new table
-            new_node_key = unprocessed_table.remove_node_from_table_and_relocate_to_other_table(
-                unprocessed_node_key,
-                table_to_move_to)
 
-            node = table_to_move_to.get_node_by_key(new_node_key)
+        new_node_keys = unprocessed_table.remove_nodes_from_table_and_relocate_to_other_table_by_bulk(
+            list_of_node_keys,
+            table_to_move_to)
+
+        return [table_to_move_to.get_node_by_key(new_node_key) for new_node_key in new_node_keys]
 
+    def _handle_preprocess_of_entire_outer_layers(self):
+        # from assumption (9) we will simply move the nodes to the pos-inc table
+        unprocessed_table = self.regular_node_tables[Layer.INDEX_OF_UNPROCESSED_TABLE]
+        nodes_moved = self.relocate_nodes_from_unprocessed_table_by_bulk(unprocessed_table.get_list_of_all_keys(),
+                                                                         Layer.INDEX_OF_POS_INC_TABLE)
+
+        for node in nodes_moved:
             # now create a corresponding arnode for the node
             # note that from conclusion (2), even though its safe to create the arnode for now, it might
             # not be safe to forward activate or fully activate the arnode, since the node it surrounds might
@@ -517,6 +605,15 @@ class Layer:
                                                                       should_recalculate_bounds,
                                                                       function_to_calculate_arnode_bias)
 
+    def compact_keys_of_arnode_tables(self):
+        """
+        makes the keys of the arnodes in each arnode table exactly 0, 1, ..., n-1, after they were left sparse by
+        merges and splits
+        :return: a list which holds for each arnode table a map between the previous key and the new key of every
+        arnode which was moved
+        """
+        return [arnode_table.compact_keys() for arnode_table in self.arnode_tables]
+
     def set_lower_and_upper_bound_for_node(self, is_arnode, table_number, key_in_table, lower_bound, upper_bound):
         """
         :param is_arnode: a boolean, if true would search for the node in the arnode tables
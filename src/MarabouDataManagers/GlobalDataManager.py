@@ -1,5 +1,7 @@
 from src.IDManager import IDManager
 from src.MarabouDataManagers.InputQueryFacade import InputQueryFacade
+from src.PackedLocations import unpack_location
+from src.RelocationCounter import RelocationCounter
 
 """
 manage some of the global data which is required for the marabou system
@@ -13,65 +15,63 @@ manage some of the global data which is required for the marabou system
 """
 
 
-class GlobalDataManager(IDManager):
+class GlobalDataManager:
     UNSAT = False
     SAT = True
 
     CODE_FOR_NODE = 0
     CODE_FOR_ARNODE = 1
 
+    # the class which keeps the free ids. it can be replaced by any class with the interface of IDManager (for example
+    # BitmapIDManager, which takes ids back in O(log n) no matter how many holes there are) before the network is
+    # created
+    ID_MANAGER_CLASS = IDManager
+    # the class which keeps the equations, constraints and bounds of the network. it can be replaced by a subclass of
+    # InputQueryFacade before the network is created
+    INPUT_QUERY_CLASS = InputQueryFacade
+
     def __init__(self):
         """
         this class would give available ids in increasing order
         """
-        super().__init__()
+        self.id_manager = self.ID_MANAGER_CLASS()
 
-        self.input_query = InputQueryFacade()
+        self.input_query = self.INPUT_QUERY_CLASS()
 
-        # this set would hold triplets of the form (layer_number, table_number, key_in_table, SOME_CODE)
-        # for nodes that dont have valid equations.
-        # the CODE would be either CODE_FOR_NODE or CODE_FOR_ARNODE
-        # if this set is not empty, then the solving process can not take place
-        self.set_of_nodes_locations_that_dont_have_valid_equations = set([])
+        # for each code, the set of the locations (packed by pack_location, see node.get_packed_location) of the nodes
+        # of that code that dont have valid equations. the code is CODE_FOR_NODE or CODE_FOR_ARNODE, which are 0 and 1,
+        # so the list is indexed by is_arnode.
+        # if those sets are not empty, then the solving process can not take place
+        self.sets_of_packed_locations_of_nodes_that_dont_have_valid_equations = [set([]), set([])]
 
-    def add_location_of_node_that_dont_have_valid_equation(self, layer_number, table_number, key_in_table,
-                                                           is_arnode):
-        if is_arnode:
-            self.set_of_nodes_locations_that_dont_have_valid_equations.add(
-                (layer_number, table_number, key_in_table, GlobalDataManager.CODE_FOR_ARNODE))
-        else:
-            self.set_of_nodes_locations_that_dont_have_valid_equations.add(
-                (layer_number, table_number, key_in_table, GlobalDataManager.CODE_FOR_NODE))
+        # the relocations of the nodes are counted separately for every network (see NodeEdges), and every network has
+        # its own global data manager
+        self.relocation_counter = RelocationCounter()
+
+    def add_location_of_node_that_dont_have_valid_equation(self, packed_location_of_node, is_arnode):
+        """
+        :param packed_location_of_node: as returned by node.get_packed_location()
+        :param is_arnode:
+        """
+        self.sets_of_packed_locations_of_nodes_that_dont_have_valid_equations[is_arnode].add(packed_location_of_node)
 
-    def check_if_node_has_invalid_equations(self, layer_number, table_number, key_in_table, is_arnode):
+    def get_relocation_counter(self):
+        return self.relocation_counter
+
+    def check_if_node_has_invalid_equations(self, packed_location_of_node, is_arnode):
         """
-        :param layer_number:
-        :param table_number:
-        :param key_in_table:
+        :param packed_location_of_node: as returned by node.get_packed_location()
         :param is_arnode:
         :return: true if the given node has an invalid equation
         """
-        if is_arnode:
-            return (layer_number,
-                    table_number,
-                    key_in_table,
-                    GlobalDataManager.CODE_FOR_ARNODE) in self.set_of_nodes_locations_that_dont_have_valid_equations
-        else:
-            return (layer_number,
-                    table_number,
-                    key_in_table,
-                    GlobalDataManager.CODE_FOR_NODE) in self.set_of_nodes_locations_that_dont_have_valid_equations
+        return packed_location_of_node in self.sets_of_packed_locations_of_nodes_that_dont_have_valid_equations[
+            is_arnode]
 
-    def remove_location_of_node_that_dont_have_valid_equation(self, layer_number, table_number, key_in_table,
-                                                              is_arnode):
+    def remove_location_of_node_that_dont_have_valid_equation(self, packed_location_of_node, is_arnode):
         # discard ignores removal of items that are not in the set, so if we are given a node which is not listed
         # we simply ignore it
-        if is_arnode:
-            self.set_of_nodes_locations_that_dont_have_valid_equations.discard(
-                (layer_number, table_number, key_in_table, GlobalDataManager.CODE_FOR_ARNODE))
-        else:
-            self.set_of_nodes_locations_that_dont_have_valid_equations.discard(
-                (layer_number, table_number, key_in_table, GlobalDataManager.CODE_FOR_NODE))
+        self.sets_of_packed_locations_of_nodes_that_dont_have_valid_equations[is_arnode].discard(
+            packed_location_of_node)
 
     def get_new_equation(self):
         return self.input_query.get_new_equation()
@@ -111,12 +111,19 @@ class GlobalDataManager(IDManager):
         where CODE = CODE_FOR_NODE if the node is a regular node
         and CODE = CODE_FOR_ARNODE if the node is an arnode
         """
-        return list(self.set_of_nodes_locations_that_dont_have_valid_equations)
+        return [unpack_location(packed_location) + (code,)
+                for code, set_of_packed_locations in enumerate(
+                    self.sets_of_packed_locations_of_nodes_that_dont_have_valid_equations)
+                for packed_location in set_of_packed_locations]
+
+    def get_number_of_nodes_that_dont_have_valid_equations(self):
+        return sum(len(set_of_packed_locations)
+                   for set_of_packed_locations in self.sets_of_packed_locations_of_nodes_that_dont_have_valid_equations)
 
     def _set_artificial_bounds_on_a_hole_id(self, hole_id):
         """
         :param hole_id: an id that is currently in the range of possible ids to give, such that its presence makes
-        a hole in self.ranges
+        a hole in the ranges of the id manager
         it artificially sets a bound of 0,0 on it
         """
         self.input_query.setLowerBound(hole_id, 0)
@@ -125,14 +132,21 @@ class GlobalDataManager(IDManager):
     def _remove_artificial_bounds_on_a_hole_id(self, hole_id):
         """
         :param hole_id: an id that is currently in the range of possible ids to give, such that its presence makes
-        a hole in self.ranges
+        a hole in the ranges of the id manager
         removes the artificial bounds that were set on the hole id
         """
         self.input_query.removeBounds(hole_id)
 
+    def get_maximum_id_used(self):
+        """
+        :return: the maximum id that was given away
+        if no ids were given it returns -1
+        """
+        return self.id_manager.get_maximum_id_used()
+
     def get_new_id(self):
-        ranges_had_holes = self._check_if_ranges_has_holes()
-        to_return = super().get_new_id()
+        ranges_had_holes = self.id_manager.check_if_ranges_has_holes()
+        to_return = self.id_manager.get_new_id()
 
         if ranges_had_holes:
             # then the id we are going to return is a hole id.
@@ -153,10 +167,11 @@ class GlobalDataManager(IDManager):
         classes, so be very careful if you want to change it (if you clean the id some function might not work)
         """
 
-        length_of_ranges_before_insertion = len(self.ranges)
-        largest_available_id_before_insertion = self.ranges[IDManager.LOCATION_OF_LARGEST_AVAILABLE_ID]
+        ranges_had_holes_before_insertion = self.id_manager.check_if_ranges_has_holes()
+        # the start of the last range of free ids, [a, infinity]
+        largest_available_id_before_insertion = self.id_manager.get_maximum_id_used() + 1
 
-        super().give_id_back(id_returned)
+        self.id_manager.give_id_back(id_returned)
 
         # now there are a couple of checks to make.
         # first check if the id_returned merged the 2 final ranges
@@ -164,11 +179,11 @@ class GlobalDataManager(IDManager):
         # if that happened then we can reduce the number of hole ids
         # (for example, in the state [0,1,5,9,10,max] we held ids 5,6,7,8 as hole ids, and after inserting 9
         # the hole ids 5,6,7,8,9 need to be erased
-        if length_of_ranges_before_insertion > IDManager.LENGTH_OF_SIMPLE_RANGE:
-            # if the length_of_ranges_before_insertion was 2 then we couldn't have "merge the 2 final ranges"
+        if ranges_had_holes_before_insertion:
+            # if the ranges had no holes then we couldn't have "merge the 2 final ranges"
             # since there were no 2 final ranges.
             # so this subsequence would only run when there is a possibility of merger.
-            current_largest_available_id = self.ranges[IDManager.LOCATION_OF_LARGEST_AVAILABLE_ID]
+            current_largest_available_id = self.id_manager.get_maximum_id_used() + 1
             if largest_available_id_before_insertion != current_largest_available_id:
                 # then the final range [a, max] was changed, and the only way it could have changed is by merging
                 # the 2 final ranges. so we get rid of all unnecessary variables
@@ -177,6 +192,61 @@ class GlobalDataManager(IDManager):
                     self._remove_artificial_bounds_on_a_hole_id(i)
         else:
             # check for holes
-            if len(self.ranges) != IDManager.LENGTH_OF_SIMPLE_RANGE:
+            if self.id_manager.check_if_ranges_has_holes():
                 # the inserted id should be treated as a hole id
                 self._set_artificial_bounds_on_a_hole_id(id_returned)
+
+    def get_new_ids(self, number_of_ids):
+        """
+        the same as calling get_new_id number_of_ids times, but the ids are taken from the id manager in one operation
+        :param number_of_ids:
+        :return: a list of the ids, in increasing order
+        """
+        largest_available_id_before_taking = self.id_manager.get_maximum_id_used() + 1
+        ids_to_return = self.id_manager.get_new_ids(number_of_ids)
+
+        # the ids smaller than the start of the last range of free ids were hole ids
+        for id_to_return in ids_to_return:
+            if id_to_return < largest_available_id_before_taking:
+                self._remove_artificial_bounds_on_a_hole_id(id_to_return)
+
+        return ids_to_return
+
+    def give_ids_back(self, ids_returned):
+        """
+        the same as calling give_id_back for each of the ids in the given order, but the artificial bounds of the hole
+        ids are updated in a single pass at the end.
+        as in give_id_back, the ids should be "cleaned" before they are given back
+
+        :param ids_returned: ids which should be marked as available, without duplicates
+        """
+        if len(ids_returned) == 0:
+            return
+
+        # the start of the last range of free ids, [a, infinity]
+        largest_available_id_before_insertion = self.id_manager.get_maximum_id_used() + 1
+
+        # give_id_back sets artificial bounds only on an id which makes a hole when there were no holes, so which ids
+        # get them depends on the order of the ids. if there is a hole smaller than all the ids, it would remain a
+        # hole while the ids are given back (the last range can not grow over it without growing over smaller ids), so
+        # none of the ids would get artificial bounds and the ids can be given back in one operation
+        ids_which_made_the_first_hole = []
+        if self.id_manager.check_if_ranges_has_holes() and \
+                self.id_manager.get_smallest_available_id() < min(ids_returned):
+            self.id_manager.give_ids_back(ids_returned)
+        else:
+            for id_returned in ids_returned:
+                ranges_had_holes = self.id_manager.check_if_ranges_has_holes()
+                self.id_manager.give_id_back(id_returned)
+                if not ranges_had_holes and self.id_manager.check_if_ranges_has_holes():
+                    ids_which_made_the_first_hole.append(id_returned)
+
+        # the ids which were merged into the last range are no longer hole ids. this includes every hole id which got
+        # artificial bounds and was merged into the last range later on
+        current_largest_available_id = self.id_manager.get_maximum_id_used() + 1
+        for i in range(current_largest_available_id, largest_available_id_before_insertion):
+            self._remove_artificial_bounds_on_a_hole_id(i)
+
+        for hole_id in ids_which_made_the_first_hole:
+            if hole_id < current_largest_available_id:
+                self._set_artificial_bounds_on_a_hole_id(hole_id)
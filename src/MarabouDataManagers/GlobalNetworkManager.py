@@ -1,4 +1,5 @@
 from src.MarabouDataManagers.GlobalDataManager import GlobalDataManager
+from src.MarabouDataManagers.IncrementalInputQueryBuilder import IncrementalInputQueryBuilder
 from Mock.maraboupy import MarabouCore
 # in real implementation replace with "from maraboupy import MarabouCore"
 
@@ -14,10 +15,22 @@ class GlobalNetworkManager(GlobalDataManager):
     CODE_FOR_ORIGINAL_NETWORK = 0
     CODE_FOR_CURRENT_NETWORK = 1
 
+    # if true, only the live variables of a query are given to the solver, under the variables 0, 1, ..., n-1, and
+    # the assignments it returns are mapped back to global ids
+    # (see InputQueryFacade.get_new_compact_marabou_input_query_object). otherwise every global id up to the maximum
+    # id used is given to the solver as a variable, including the ids which are not in use
+    SHOULD_COMPACT_VARIABLES_OF_QUERIES = True
+    # if true (and the queries are compacted), verify builds the queries of the current network with an
+    # IncrementalInputQueryBuilder, which keeps the marabou equations between verifications and creates new marabou
+    # equations only for the equations added since the last verification
+    SHOULD_BUILD_QUERIES_INCREMENTALLY = True
+
     def __init__(self):
         super().__init__()
 
         self.counter_example_of_last_verification_attempt = None
+        # created on the first verification, see verify
+        self.incremental_query_builder = None
 
         self.input_query_of_original_network = None
         self.input_nodes_global_incoming_ids = []
@@ -48,7 +61,7 @@ class GlobalNetworkManager(GlobalDataManager):
         you can get an iterator over all the nodes which dont have a valid equation using the function
         get_list_of_nodes_that_dont_have_valid_equations
         """
-        return len(self.set_of_nodes_locations_that_dont_have_valid_equations) == 0
+        return self.get_number_of_nodes_that_dont_have_valid_equations() == 0
 
     def save_current_network_as_original_network(self, input_nodes_global_incoming_ids,
                                                  output_nodes_global_incoming_ids):
@@ -79,6 +92,58 @@ class GlobalNetworkManager(GlobalDataManager):
         self.input_nodes_global_incoming_ids = input_nodes_global_incoming_ids
         self.output_nodes_global_incoming_ids = output_nodes_global_incoming_ids
 
+    def set_original_network(self, input_query_of_original_network, input_nodes_global_incoming_ids,
+                             output_nodes_global_incoming_ids):
+        """
+        the same as save_current_network_as_original_network, but the input query of the original network is given
+        instead of being copied from the current input query.
+        it is used when a network which was saved is built again (see PreprocessedNetworkCache), since the current
+        input query of the saved network is no longer that of its original network
+
+        :param input_query_of_original_network:
+        :param input_nodes_global_incoming_ids:
+        :param output_nodes_global_incoming_ids:
+        """
+        self.input_query_of_original_network = input_query_of_original_network
+        self.input_nodes_global_incoming_ids = input_nodes_global_incoming_ids
+        self.output_nodes_global_incoming_ids = output_nodes_global_incoming_ids
+
+    def _solve_input_query(self, input_query_to_solve):
+        """
+        :param input_query_to_solve: an InputQueryFacade
+        :return: the map of the form (node_global_id -> value it got) which we get from the MarabouCore.solve
+        function, with the variables mapped back to global ids if the query was compacted.
+        the query of the current network is built by self.incremental_query_builder if
+        SHOULD_BUILD_QUERIES_INCREMENTALLY is true
+        """
+        options = None  ########################### check what are those options
+        filename_to_save_log_in = ""
+
+        if not GlobalNetworkManager.SHOULD_COMPACT_VARIABLES_OF_QUERIES:
+            map_of_node_to_value, stats = MarabouCore.solve(
+                input_query_to_solve.get_new_marabou_input_query_object(self.get_maximum_id_used(),
+                                                                        self.input_nodes_global_incoming_ids,
+                                                                        self.output_nodes_global_incoming_ids),
+                options,
+                filename_to_save_log_in)
+            return map_of_node_to_value
+
+        if GlobalNetworkManager.SHOULD_BUILD_QUERIES_INCREMENTALLY and input_query_to_solve is self.input_query:
+            if self.incremental_query_builder is None:
+                self.incremental_query_builder = IncrementalInputQueryBuilder(self.input_query,
+                                                                              self.input_nodes_global_incoming_ids,
+                                                                              self.output_nodes_global_incoming_ids)
+            marabou_input_query, global_ids_of_variables = self.incremental_query_builder.build()
+        else:
+            marabou_input_query, global_ids_of_variables = \
+                input_query_to_solve.get_new_compact_marabou_input_query_object(self.input_nodes_global_incoming_ids,
+                                                                                self.output_nodes_global_incoming_ids)
+        map_of_variable_to_value, stats = MarabouCore.solve(marabou_input_query, options, filename_to_save_log_in)
+
+        # the free variables of an incremental build have no global id
+        return {global_ids_of_variables[variable]: value for variable, value in map_of_variable_to_value.items()
+                if global_ids_of_variables[variable] != IncrementalInputQueryBuilder.NO_GLOBAL_ID}
+
     def run_network_on_input(self, code_for_network_to_run_eval_on,
                              map_of_input_nodes_global_ids_to_values):
         """
@@ -111,14 +176,7 @@ class GlobalNetworkManager(GlobalDataManager):
             input_query_to_eval.setLowerBound(node_global_id, value_given)
             input_query_to_eval.setUpperBound(node_global_id, value_given)
 
-        options = None  ########################### check what are those options
-        filename_to_save_log_in = ""
-        map_of_node_to_value, stats = MarabouCore.solve(
-            input_query_to_eval.get_new_marabou_input_query_object(self.get_maximum_id_used(),
-                                                                   self.input_nodes_global_incoming_ids,
-                                                                   self.output_nodes_global_incoming_ids),
-            options,
-            filename_to_save_log_in)
+        map_of_node_to_value = self._solve_input_query(input_query_to_eval)
 
         return map_of_node_to_value
 
@@ -136,16 +194,8 @@ class GlobalNetworkManager(GlobalDataManager):
         if not self.check_if_can_run_current_network():
             raise Exception("can not verify since there are nodes with invalid equations")
 
-        options = None  ########################### check what are those options
-        filename_to_save_log_in = ""
-
         # if I understand correctly this is a map of "node_global_id -> value it got"
-        self.counter_example_of_last_verification_attempt, stats = \
-            MarabouCore.solve(self.input_query.get_new_marabou_input_query_object(self.get_maximum_id_used(),
-                                                                                  self.input_nodes_global_incoming_ids,
-                                                                                  self.output_nodes_global_incoming_ids),
-                              options,
-                              filename_to_save_log_in)
+        self.counter_example_of_last_verification_attempt = self._solve_input_query(self.input_query)
 
         if len(self.counter_example_of_last_verification_attempt) > 0:
             # there is a SAT solution
@@ -176,14 +226,7 @@ class GlobalNetworkManager(GlobalDataManager):
             input_query_to_eval.setLowerBound(node_global_id, value_given)
             input_query_to_eval.setUpperBound(node_global_id, value_given)
 
-        options = None  ########################### check what are those options
-        filename_to_save_log_in = ""
-        map_of_node_to_value, stats = MarabouCore.solve(
-            input_query_to_eval.get_new_marabou_input_query_object(self.get_maximum_id_used(),
-                                                                   self.input_nodes_global_incoming_ids,
-                                                                   self.output_nodes_global_incoming_ids),
-            options,
-            filename_to_save_log_in)
+        map_of_node_to_value = self._solve_input_query(input_query_to_eval)
 
         if len(self.counter_example_of_last_verification_attempt) > 0:
             # there is a SAT solution
@@ -0,0 +1,258 @@
+import heapq
+
+from Mock.maraboupy import MarabouCore
+# in real implementation replace with "from maraboupy import MarabouCore"
+from src.MarabouDataManagers.InputQueryFacade import InputQueryFacade
+
+
+class IncrementalInputQueryBuilder:
+    """
+    builds marabou input queries of an InputQueryFacade again and again, as the network is verified after every merge
+    or split.
+    InputQueryFacade.get_new_compact_marabou_input_query_object goes over every equation, relu constraint and bound
+    and creates a new marabou equation for every equation, although a merge or a split only changes the equations of
+    a handful of nodes. this class keeps the query in the form given to the solver: a marabou equation for every
+    equation, the variables of every relu constraint and the bounds of every variable. between builds it reads the
+    changes made to the input query from its journal (see InputQueryFacade.start_journal) and applies only them.
+
+    note that every build still creates a new marabou input query and adds to it every equation, relu constraint and
+    bound kept, since the marabou input query can not remove an equation (or a constraint) once it was added. what is
+    saved is creating the marabou equations, which is most of the work: the input query keeps a copy of every equation
+    added to it, so the marabou equations kept are added to every query built as they are.
+    loading a query file kept up to date instead (MarabouCore.loadQuery) is slower than that, since marabou parses
+    every equation in the file again.
+
+    like get_new_compact_marabou_input_query_object only the live variables are given to the solver. but the
+    variable of a global id does not change as long as the global id is live, so the marabou equations kept stay
+    valid. when a global id is no longer live its variable becomes free and is given to the next global id which
+    becomes live. free variables get the bounds 0, 0, like the ids which are not in use (see GlobalDataManager).
+
+    the entire input query is gone over again (which also removes the free variables) if there were too many changes
+    to keep in the journal, or if there are too many free variables
+    """
+    # the global id of a free variable
+    NO_GLOBAL_ID = -1
+
+    # the journal is dropped if it has more changes than this fraction of the number of equations (and at least
+    # MINIMAL_MAXIMAL_JOURNAL_LENGTH changes are always kept)
+    MAXIMAL_FRACTION_OF_CHANGES_IN_JOURNAL = 0.25
+    MINIMAL_MAXIMAL_JOURNAL_LENGTH = 64
+    # the entire input query is gone over again if more than this fraction of the variables are free
+    MAXIMAL_FRACTION_OF_FREE_VARIABLES = 0.25
+
+    def __init__(self, input_query, input_nodes_global_incoming_ids, output_nodes_global_incoming_ids):
+        """
+        :param input_query: the InputQueryFacade to build queries of. from the first build on, its journal is used
+        by this builder, so no one else should start the journal of this input query
+        :param input_nodes_global_incoming_ids:
+        :param output_nodes_global_incoming_ids:
+        from assumptions (5) and (6) the input and output global ids never change, so they are given once
+        """
+        self.input_query = input_query
+        self.input_nodes_global_incoming_ids = input_nodes_global_incoming_ids
+        self.output_nodes_global_incoming_ids = output_nodes_global_incoming_ids
+
+        self.number_of_builds_from_entire_input_query = 0
+        self.number_of_builds_from_journal = 0
+
+        self._reset()
+
+    def _reset(self):
+        # the keys of the 2 maps below are in the order the equations and relu constraints were added, which is also
+        # their order in the input query
+        self.marabou_equation_of_equation = {}
+        self.variables_of_relu_constraint = {}
+
+        self.variable_of_global_id = {}
+        # the global id of every variable, or NO_GLOBAL_ID if it is free
+        self.global_ids_of_variables = []
+        # a heap of the free variables
+        self.free_variables = []
+        # a global id is live as long as it has references. each of the equations and relu constraints it appears in
+        # counts as a reference, and so does being an input or an output node, and having bounds which can not be
+        # satisfied (see InputQueryFacade.get_global_ids_of_live_variables)
+        self.number_of_references_to_global_id = {}
+        self.global_ids_with_bounds_which_can_not_be_satisfied = set()
+
+        self.lower_bound_of_variable = {}
+        self.upper_bound_of_variable = {}
+
+    def _update_bounds_of_variable(self, global_id, variable):
+        lower_bound = self.input_query.lowerBounds.get(global_id)
+        if lower_bound is None:
+            self.lower_bound_of_variable.pop(variable, None)
+        else:
+            self.lower_bound_of_variable[variable] = lower_bound
+
+        upper_bound = self.input_query.upperBounds.get(global_id)
+        if upper_bound is None:
+            self.upper_bound_of_variable.pop(variable, None)
+        else:
+            self.upper_bound_of_variable[variable] = upper_bound
+
+    def _add_reference(self, global_id):
+        """
+        :return: the variable of the global id. if the global id was not live, it is given a variable
+        """
+        number_of_references = self.number_of_references_to_global_id.get(global_id, 0)
+        self.number_of_references_to_global_id[global_id] = number_of_references + 1
+        if number_of_references != 0:
+            return self.variable_of_global_id[global_id]
+
+        if len(self.free_variables) != 0:
+            variable = heapq.heappop(self.free_variables)
+            self.global_ids_of_variables[variable] = global_id
+        else:
+            variable = len(self.global_ids_of_variables)
+            self.global_ids_of_variables.append(global_id)
+        self.variable_of_global_id[global_id] = variable
+        self._update_bounds_of_variable(global_id, variable)
+
+        return variable
+
+    def _remove_reference(self, global_id):
+        number_of_references = self.number_of_references_to_global_id[global_id] - 1
+        if number_of_references != 0:
+            self.number_of_references_to_global_id[global_id] = number_of_references
+            return
+
+        # the global id is no longer live, so its variable is freed
+        del self.number_of_references_to_global_id[global_id]
+        variable = self.variable_of_global_id.pop(global_id)
+        self.global_ids_of_variables[variable] = IncrementalInputQueryBuilder.NO_GLOBAL_ID
+        heapq.heappush(self.free_variables, variable)
+        self.lower_bound_of_variable.pop(variable, None)
+        self.upper_bound_of_variable.pop(variable, None)
+
+    def _add_equation(self, equation):
+        if equation in self.marabou_equation_of_equation:
+            return
+
+        marabou_equation = MarabouCore.Equation(equation.EquationType)
+        for (c, v) in equation.addendList:
+            marabou_equation.addAddend(c, self._add_reference(v))
+        marabou_equation.setScalar(equation.scalar)
+        self.marabou_equation_of_equation[equation] = marabou_equation
+
+    def _remove_equation(self, equation):
+        if self.marabou_equation_of_equation.pop(equation, None) is None:
+            return
+
+        # the addends of an equation do not change once it was added to the input query
+        for (c, v) in equation.addendList:
+            self._remove_reference(v)
+
+    def _add_relu_constraint(self, relu_constraint):
+        if relu_constraint in self.variables_of_relu_constraint:
+            return
+
+        self.variables_of_relu_constraint[relu_constraint] = (self._add_reference(relu_constraint[0]),
+                                                              self._add_reference(relu_constraint[1]))
+
+    def _remove_relu_constraint(self, relu_constraint):
+        if self.variables_of_relu_constraint.pop(relu_constraint, None) is None:
+            return
+
+        self._remove_reference(relu_constraint[0])
+        self._remove_reference(relu_constraint[1])
+
+    def _update_bounds(self, global_id):
+        bounds_can_not_be_satisfied = self.input_query.check_if_bounds_can_not_be_satisfied(global_id)
+        if bounds_can_not_be_satisfied and global_id not in self.global_ids_with_bounds_which_can_not_be_satisfied:
+            self.global_ids_with_bounds_which_can_not_be_satisfied.add(global_id)
+            self._add_reference(global_id)
+        elif not bounds_can_not_be_satisfied and global_id in self.global_ids_with_bounds_which_can_not_be_satisfied:
+            self.global_ids_with_bounds_which_can_not_be_satisfied.remove(global_id)
+            self._remove_reference(global_id)
+
+        variable = self.variable_of_global_id.get(global_id)
+        if variable is not None:
+            self._update_bounds_of_variable(global_id, variable)
+
+    def _apply_journal(self, journal):
+        for code_of_change, changed in journal:
+            if code_of_change == InputQueryFacade.CODE_FOR_ADDED_EQUATION:
+                self._add_equation(changed)
+            elif code_of_change == InputQueryFacade.CODE_FOR_REMOVED_EQUATION:
+                self._remove_equation(changed)
+            elif code_of_change == InputQueryFacade.CODE_FOR_ADDED_RELU_CONSTRAINT:
+                self._add_relu_constraint(changed)
+            elif code_of_change == InputQueryFacade.CODE_FOR_REMOVED_RELU_CONSTRAINT:
+                self._remove_relu_constraint(changed)
+            else:
+                self._update_bounds(changed)
+
+    def _apply_entire_input_query(self):
+        self._reset()
+
+        # the input and output global ids are live as long as the builder exists
+        for global_id in self.input_nodes_global_incoming_ids:
+            self._add_reference(global_id)
+        for global_id in self.output_nodes_global_incoming_ids:
+            self._add_reference(global_id)
+
+        for equation in self.input_query.equations:
+            self._add_equation(equation)
+        for relu_constraint in self.input_query.relu_constraints:
+            self._add_relu_constraint(relu_constraint)
+
+        # the bounds of the global ids which are live were taken when they were given a variable. a global id without
+        # a lower bound always has bounds which can be satisfied
+        for global_id in self.input_query.lowerBounds:
+            if self.input_query.check_if_bounds_can_not_be_satisfied(global_id):
+                self.global_ids_with_bounds_which_can_not_be_satisfied.add(global_id)
+                self._add_reference(global_id)
+
+    def _get_new_marabou_input_query_object(self):
+        ipq = MarabouCore.InputQuery()
+        ipq.setNumberOfVariables(len(self.global_ids_of_variables))
+
+        for inputIndex, inputVar in enumerate(self.input_nodes_global_incoming_ids):
+            ipq.markInputVariable(self.variable_of_global_id[inputVar], inputIndex)
+
+        for outputIndex, outputVar in enumerate(self.output_nodes_global_incoming_ids):
+            ipq.markOutputVariable(self.variable_of_global_id[outputVar], outputIndex)
+
+        for marabou_equation in self.marabou_equation_of_equation.values():
+            ipq.addEquation(marabou_equation)
+
+        for variable_1, variable_2 in self.variables_of_relu_constraint.values():
+            MarabouCore.addReluConstraint(ipq, variable_1, variable_2)
+
+        for variable, lower_bound in self.lower_bound_of_variable.items():
+            ipq.setLowerBound(variable, lower_bound)
+
+        for variable, upper_bound in self.upper_bound_of_variable.items():
+            ipq.setUpperBound(variable, upper_bound)
+
+        for variable in self.free_variables:
+            ipq.setLowerBound(variable, 0)
+            ipq.setUpperBound(variable, 0)
+
+        return ipq
+
+    def build(self):
+        """
+        :return: a pair of (a marabou input query of the input query as it is now, a list which holds at index i the
+        global id of variable i, or NO_GLOBAL_ID if variable i is free). the variables in an assignment returned by
+        the solver can be mapped back to global ids using the list, after skipping the free variables
+        """
+        journal = self.input_query.journal
+        if journal is None:
+            self._apply_entire_input_query()
+            self.number_of_builds_from_entire_input_query += 1
+        else:
+            self._apply_journal(journal)
+            if len(self.free_variables) > \
+                    IncrementalInputQueryBuilder.MAXIMAL_FRACTION_OF_FREE_VARIABLES * len(self.global_ids_of_variables):
+                self._apply_entire_input_query()
+                self.number_of_builds_from_entire_input_query += 1
+            else:
+                self.number_of_builds_from_journal += 1
+
+        self.input_query.start_journal(
+            max(IncrementalInputQueryBuilder.MINIMAL_MAXIMAL_JOURNAL_LENGTH,
+                int(IncrementalInputQueryBuilder.MAXIMAL_FRACTION_OF_CHANGES_IN_JOURNAL *
+                    len(self.marabou_equation_of_equation))))
+
+        return self._get_new_marabou_input_query_object(), list(self.global_ids_of_variables)
@@ -8,14 +8,74 @@ class InputQueryFacade:
     INFINITE_UPPER_BOUND = REALLY_BIG_NUMBER
     INFINITE_LOWER_BOUND = -REALLY_BIG_NUMBER
 
+    # the codes of the changes kept in the journal (see start_journal)
+    CODE_FOR_ADDED_EQUATION = 0
+    CODE_FOR_REMOVED_EQUATION = 1
+    CODE_FOR_ADDED_RELU_CONSTRAINT = 2
+    CODE_FOR_REMOVED_RELU_CONSTRAINT = 3
+    CODE_FOR_CHANGED_BOUNDS = 4
+
     def __init__(self):
-        self.equList = []
-        self.reluList = []
+        # the equations and the relu constraints are kept as the keys of dicts (with None values), so they are added
+        # and removed in O(1) and are iterated over in the order they were added, as lists would be.
+        # every equation object and every pair of ids is added once (each node adds its own equation and the relu
+        # constraint between its own 2 ids), so nothing is lost by keeping each of them once
+        self.equations = {}
+        self.relu_constraints = {}
         self.lowerBounds = dict()
         self.upperBounds = dict()
 
+        # a list of pairs of (code of change, the equation, the pair of ids of the relu constraint or the global id
+        # whose bounds changed), of all the changes made since start_journal was last called.
+        # it is None if start_journal was never called or if there were more than maximal_journal_length changes,
+        # which means that whoever reads the journal should go over the entire input query again
+        self.journal = None
+        self.maximal_journal_length = 0
+
+    @property
+    def equList(self):
+        """
+        the name the equations had when they were kept in a list, for code written against it
+        :return: a new list of the equations, in the order they were added. changing it does not change the query
+        """
+        return list(self.equations)
+
+    @property
+    def reluList(self):
+        """
+        the name the relu constraints had when they were kept in a list, for code written against it
+        :return: a new list of the pairs of ids of the relu constraints, in the order they were added. changing it
+        does not change the query
+        """
+        return list(self.relu_constraints)
+
+    def start_journal(self, maximal_journal_length):
+        """
+        from now on every change made to the input query is kept in self.journal, so whoever keeps a copy of the input
+        query in another form (see IncrementalInputQueryBuilder) can apply only the changes to it.
+        if it is called when a journal exists, the journal is emptied
+
+        :param maximal_journal_length: once there are more changes than that, the journal is dropped (set to None),
+        since applying them one by one is not faster than going over the entire input query
+        """
+        self.journal = []
+        self.maximal_journal_length = maximal_journal_length
+
+    def _add_change_to_journal(self, code_of_change, changed):
+        if len(self.journal) == self.maximal_journal_length:
+            self.journal = None
+            return
+        self.journal.append((code_of_change, changed))
+
     def copy(self):
-        copy.deepcopy(self)
+        """
+        :return: a deep copy of the input query. the copy has no journal, since whoever reads the journal of this input
+        query keeps track of this input query and not of its copies
+        """
+        input_query_copy = copy.deepcopy(self)
+        input_query_copy.journal = None
+        input_query_copy.maximal_journal_length = 0
+        return input_query_copy
 
     def get_new_marabou_input_query_object(self, number_of_nodes, input_nodes_global_incoming_ids,
                                            output_nodes_global_incoming_ids):
@@ -30,7 +90,7 @@ class InputQueryFacade:
         for outputIndex, outputVar in enumerate(output_nodes_global_incoming_ids):
             ipq.markOutputVariable(outputVar, outputIndex)
 
-        for e in self.equList:
+        for e in self.equations:
             eq = MarabouCore.Equation(e.EquationType)
             for (c, v) in e.addendList:
                 assert v < number_of_nodes
@@ -38,7 +98,7 @@ class InputQueryFacade:
             eq.setScalar(e.scalar)
             ipq.addEquation(eq)
 
-        for r in self.reluList:
+        for r in self.relu_constraints:
             ################################################ assert r[1] < number_of_nodes and r[0] < number_of_nodes
             MarabouCore.addReluConstraint(ipq, r[0], r[1])
 
@@ -52,12 +112,86 @@ class InputQueryFacade:
 
         return ipq
 
+    def check_if_bounds_can_not_be_satisfied(self, node_global_incoming_id):
+        return self.lowerBounds.get(node_global_incoming_id, InputQueryFacade.INFINITE_LOWER_BOUND) > \
+            self.upperBounds.get(node_global_incoming_id, InputQueryFacade.INFINITE_UPPER_BOUND)
+
+    def get_global_ids_of_live_variables(self, input_nodes_global_incoming_ids, output_nodes_global_incoming_ids):
+        """
+        a variable is live if it is an input or an output variable, if it appears in an equation or a relu
+        constraint, or if its bounds can not be satisfied. any other variable (for example a hole id, which only has
+        the artificial bounds 0,0, see GlobalDataManager) can take any value between its bounds without affecting the
+        rest of the query, so it can be left out of the query without changing its result
+        :return: a sorted list of the global ids of the live variables
+        """
+        global_ids_of_live_variables = set(input_nodes_global_incoming_ids)
+        global_ids_of_live_variables.update(output_nodes_global_incoming_ids)
+        for e in self.equations:
+            for (c, v) in e.addendList:
+                global_ids_of_live_variables.add(v)
+        for r in self.relu_constraints:
+            global_ids_of_live_variables.add(r[0])
+            global_ids_of_live_variables.add(r[1])
+
+        for l in self.lowerBounds:
+            if l not in global_ids_of_live_variables and self.check_if_bounds_can_not_be_satisfied(l):
+                global_ids_of_live_variables.add(l)
+
+        return sorted(global_ids_of_live_variables)
+
+    def get_new_compact_marabou_input_query_object(self, input_nodes_global_incoming_ids,
+                                                   output_nodes_global_incoming_ids):
+        """
+        the same as get_new_marabou_input_query_object, but only the live variables (see
+        get_global_ids_of_live_variables) are given to the solver, and they are given the variables 0, 1, ..., n-1 by
+        the order of their global ids. so the query does not have a variable for every global id ever used
+
+        :return: a pair of (the marabou input query, a list which holds at index i the global id of variable i). the
+        variables in an assignment returned by the solver can be mapped back to global ids using the list
+        """
+        global_ids_of_variables = self.get_global_ids_of_live_variables(input_nodes_global_incoming_ids,
+                                                                        output_nodes_global_incoming_ids)
+        variable_of_global_id = {global_id: variable for variable, global_id in enumerate(global_ids_of_variables)}
+
+        ipq = MarabouCore.InputQuery()
+        ipq.setNumberOfVariables(len(global_ids_of_variables))
+
+        for inputIndex, inputVar in enumerate(input_nodes_global_incoming_ids):
+            ipq.markInputVariable(variable_of_global_id[inputVar], inputIndex)
+
+        for outputIndex, outputVar in enumerate(output_nodes_global_incoming_ids):
+            ipq.markOutputVariable(variable_of_global_id[outputVar], outputIndex)
+
+        for e in self.equations:
+            eq = MarabouCore.Equation(e.EquationType)
+            for (c, v) in e.addendList:
+                eq.addAddend(c, variable_of_global_id[v])
+            eq.setScalar(e.scalar)
+            ipq.addEquation(eq)
+
+        for r in self.relu_constraints:
+            MarabouCore.addReluConstraint(ipq, variable_of_global_id[r[0]], variable_of_global_id[r[1]])
+
+        # the bounds of the variables which are not live are dropped
+        for l in self.lowerBounds:
+            if l in variable_of_global_id:
+                ipq.setLowerBound(variable_of_global_id[l], self.lowerBounds[l])
+
+        for u in self.upperBounds:
+            if u in variable_of_global_id:
+                ipq.setUpperBound(variable_of_global_id[u], self.upperBounds[u])
+
+        return ipq, global_ids_of_variables
+
     def addEquation(self, equation):
-        self.equList.append(equation)
+        self.equations[equation] = None
+        if self.journal is not None:
+            self._add_change_to_journal(InputQueryFacade.CODE_FOR_ADDED_EQUATION, equation)
 
     def removeEquation(self, equation):
-        if equation in self.equList:
-            self.equList.remove(equation)
+        self.equations.pop(equation, None)
+        if self.journal is not None:
+            self._add_change_to_journal(InputQueryFacade.CODE_FOR_REMOVED_EQUATION, equation)
 
     def setLowerBound(self, node_global_incoming_id, lower_bound):
         """
@@ -70,6 +204,8 @@ class InputQueryFacade:
             self.lowerBounds[node_global_incoming_id] = lower_bound
         else:
             self.lowerBounds[node_global_incoming_id] = InputQueryFacade.INFINITE_LOWER_BOUND
+        if self.journal is not None:
+            self._add_change_to_journal(InputQueryFacade.CODE_FOR_CHANGED_BOUNDS, node_global_incoming_id)
 
     def setUpperBound(self, node_global_incoming_id, upper_bound):
         """
@@ -82,6 +218,8 @@ class InputQueryFacade:
             self.upperBounds[node_global_incoming_id] = upper_bound
         else:
             self.upperBounds[node_global_incoming_id] = InputQueryFacade.INFINITE_UPPER_BOUND
+        if self.journal is not None:
+            self._add_change_to_journal(InputQueryFacade.CODE_FOR_CHANGED_BOUNDS, node_global_incoming_id)
 
     def getLowerBound(self, node_global_incoming_id):
         """
@@ -123,13 +261,18 @@ class InputQueryFacade:
             del self.upperBounds[node_global_incoming_id]
         except KeyError:
             pass
+        if self.journal is not None:
+            self._add_change_to_journal(InputQueryFacade.CODE_FOR_CHANGED_BOUNDS, node_global_incoming_id)
 
     def addReluConstraint(self, id1, id2):
-        self.reluList.append((id1, id2))
+        self.relu_constraints[(id1, id2)] = None
+        if self.journal is not None:
+            self._add_change_to_journal(InputQueryFacade.CODE_FOR_ADDED_RELU_CONSTRAINT, (id1, id2))
 
     def removeReluConstraint(self, id1, id2):
-        if (id1, id2) in self.reluList:
-            self.reluList.remove((id1, id2))
+        self.relu_constraints.pop((id1, id2), None)
+        if self.journal is not None:
+            self._add_change_to_journal(InputQueryFacade.CODE_FOR_REMOVED_RELU_CONSTRAINT, (id1, id2))
 
     @staticmethod
     def get_new_equation():
@@ -0,0 +1,225 @@
+import array
+import json
+import mmap
+import os
+import struct
+import sys
+
+from src.MarabouDataManagers.NNetReader import NNetReader
+
+"""
+an archive of many .nnet networks which share the same topology, for example the 45 ACAS-Xu networks.
+
+the archive is a single binary file which is memory mapped once. the header, the layer sizes and the input bounds,
+means and ranges are stored once for all the networks, and each network has a block of the same size which holds
+its weights and biases, so switching between networks is only a matter of pointing into another block.
+
+the layout of the archive is (all integers are little endian int64, all floats are float64 in the byte order of the
+machine that wrote the file, which is recorded in the header):
+MAGIC
+number of header integers
+header integers:
+    format version, 1 if the floats are little endian and 0 otherwise,
+    number of networks, length of the names block,
+    numLayers, inputSize, outputSize, maxLayersize, symmetric,
+    number of layer sizes, layerSizes...,
+    lengths of inputMinimums, inputMaximums, inputMeans, inputRanges
+names block: the names of the networks as a json list, padded with spaces to a multiple of 8 bytes
+inputMinimums, inputMaximums, inputMeans, inputRanges
+for each network: for each layer the weights block (row major) and then the biases block
+"""
+
+
+class ArchivedNNetReader(NNetReader):
+    def __init__(self, archive, index_of_network):
+        """
+        an NNetReader compatible view of a single network in an NNetArchive.
+        the weights and biases are memoryviews into the memory mapped archive, nothing is copied or read from disk
+
+        :param archive: the NNetArchive
+        :param index_of_network:
+        """
+        flat_weights, flat_biases = archive._get_weights_and_biases_of_network(index_of_network)
+
+        self.file_name = archive.file_name
+        self.name_of_network = archive.names_of_networks[index_of_network]
+        self._set_network_data(archive.numLayers, list(archive.layerSizes), archive.inputSize, archive.outputSize,
+                               archive.maxLayersize, archive.symmetric,
+                               list(archive.inputMinimums), list(archive.inputMaximums),
+                               list(archive.inputMeans), list(archive.inputRanges),
+                               flat_weights, flat_biases)
+
+
+class NNetArchive:
+    MAGIC = b'NNETARC\x00'
+    FORMAT_VERSION = 1
+
+    SIZE_OF_INT = 8
+    SIZE_OF_FLOAT = 8
+
+    def __init__(self, file_name):
+        """
+        memory maps the given archive. the mapping is read only, so all the processes which open the same archive
+        share its pages
+
+        :param file_name: an archive written by NNetArchive.pack
+        """
+        self.file_name = file_name
+
+        with open(file_name, 'rb') as f:
+            # the mapping stays valid after the file is closed
+            self.mapped_file = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        whole_buffer = memoryview(self.mapped_file)
+
+        magic_length = len(NNetArchive.MAGIC)
+        if bytes(whole_buffer[:magic_length]) != NNetArchive.MAGIC:
+            raise Exception(f"{file_name} is not an nnet archive")
+
+        offset = magic_length
+        number_of_header_integers, = struct.unpack_from('<q', whole_buffer, offset)
+        offset += NNetArchive.SIZE_OF_INT
+        header_integers = struct.unpack_from('<%dq' % number_of_header_integers, whole_buffer, offset)
+        offset += NNetArchive.SIZE_OF_INT * number_of_header_integers
+
+        format_version, floats_are_little_endian = header_integers[0], header_integers[1]
+        if format_version != NNetArchive.FORMAT_VERSION:
+            raise Exception(f"{file_name} was written with an unsupported version of the archive format")
+        if floats_are_little_endian != int(sys.byteorder == 'little'):
+            raise Exception(f"{file_name} was written on a machine with a different byte order")
+
+        number_of_networks, length_of_names_block = header_integers[2], header_integers[3]
+        self.numLayers, self.inputSize, self.outputSize, self.maxLayersize, self.symmetric = header_integers[4:9]
+        number_of_layer_sizes = header_integers[9]
+        self.layerSizes = list(header_integers[10:10 + number_of_layer_sizes])
+        lengths_of_input_data = header_integers[10 + number_of_layer_sizes:]
+
+        self.names_of_networks = json.loads(bytes(whole_buffer[offset:offset + length_of_names_block]))
+        offset += length_of_names_block
+
+        input_data = []
+        for length in lengths_of_input_data:
+            end = offset + length * NNetArchive.SIZE_OF_FLOAT
+            input_data.append(whole_buffer[offset:end].cast('d').tolist())
+            offset = end
+        self.inputMinimums, self.inputMaximums, self.inputMeans, self.inputRanges = input_data
+
+        # the weights and biases of every network take the same number of floats
+        self.sizes_of_blocks_of_layer = []
+        for layer_number in range(self.numLayers):
+            current_layer_size = self.layerSizes[layer_number + 1]
+            self.sizes_of_blocks_of_layer.append((current_layer_size * self.layerSizes[layer_number],
+                                                  current_layer_size))
+        self.size_of_block_of_network = NNetArchive.SIZE_OF_FLOAT * sum(
+            number_of_weights + number_of_biases for number_of_weights, number_of_biases in
+            self.sizes_of_blocks_of_layer)
+
+        self.offset_of_first_network = offset
+        if len(whole_buffer) != offset + number_of_networks * self.size_of_block_of_network or \
+                len(self.names_of_networks) != number_of_networks:
+            raise Exception(f"{file_name} is truncated or corrupted")
+
+    def get_number_of_networks(self):
+        return len(self.names_of_networks)
+
+    def get_names_of_networks(self):
+        return list(self.names_of_networks)
+
+    def get_index_of_network(self, name_of_network):
+        """
+        :param name_of_network: the name the network was packed with (the base name of its .nnet file)
+        :return: the index of the network in the archive
+        """
+        if name_of_network not in self.names_of_networks:
+            raise Exception(f"there is no network named {name_of_network} in the archive")
+        return self.names_of_networks.index(name_of_network)
+
+    def _get_weights_and_biases_of_network(self, index_of_network):
+        """
+        :param index_of_network:
+        :return: a pair of (flat_weights, flat_biases) of the given network, as memoryviews into the archive
+        """
+        if not 0 <= index_of_network < self.get_number_of_networks():
+            raise Exception("there is no such network in the archive")
+
+        whole_buffer = memoryview(self.mapped_file)
+        offset = self.offset_of_first_network + index_of_network * self.size_of_block_of_network
+
+        flat_weights = []
+        flat_biases = []
+        for number_of_weights, number_of_biases in self.sizes_of_blocks_of_layer:
+            end = offset + number_of_weights * NNetArchive.SIZE_OF_FLOAT
+            flat_weights.append(whole_buffer[offset:end].cast('d'))
+            offset = end
+
+            end = offset + number_of_biases * NNetArchive.SIZE_OF_FLOAT
+            flat_biases.append(whole_buffer[offset:end].cast('d'))
+            offset = end
+
+        return flat_weights, flat_biases
+
+    def get_network(self, index_of_network):
+        """
+        :param index_of_network:
+        :return: an NNetReader compatible object of the given network, which can be given to the Network class
+        """
+        return ArchivedNNetReader(self, index_of_network)
+
+    @staticmethod
+    def pack(nnet_file_names, archive_file_name):
+        """
+        packs the given networks into a single archive.
+        the archive is written to a temporary file first and then moved into place, so that processes which open the
+        archive never see a partially written one
+
+        :param nnet_file_names: .nnet files which all have the same layer sizes and the same input bounds,
+        means and ranges
+        :param archive_file_name:
+        """
+        if len(nnet_file_names) == 0:
+            raise Exception("can not pack an empty list of networks")
+
+        # all the networks are read before writing anything, so that a network which does not match the others
+        # would not leave a partial archive behind
+        readers = [NNetReader(nnet_file_name, use_binary_cache=False) for nnet_file_name in nnet_file_names]
+
+        def get_shared_data(reader):
+            return (reader.numLayers, reader.layerSizes, reader.inputSize, reader.outputSize, reader.maxLayersize,
+                    reader.symmetric,
+                    reader.inputMinimums, reader.inputMaximums, reader.inputMeans, reader.inputRanges)
+
+        shared_data = get_shared_data(readers[0])
+        for nnet_file_name, reader in zip(nnet_file_names, readers):
+            if get_shared_data(reader) != shared_data:
+                raise Exception(f"{nnet_file_name} does not have the same topology and input data as "
+                                f"{nnet_file_names[0]}")
+
+        first_reader = readers[0]
+        lists_of_input_data = [first_reader.inputMinimums, first_reader.inputMaximums,
+                               first_reader.inputMeans, first_reader.inputRanges]
+
+        names_block = json.dumps([os.path.basename(nnet_file_name) for nnet_file_name in nnet_file_names]).encode()
+        names_block += b' ' * (-len(names_block) % NNetArchive.SIZE_OF_INT)
+
+        header_integers = [NNetArchive.FORMAT_VERSION, int(sys.byteorder == 'little'),
+                           len(readers), len(names_block),
+                           first_reader.numLayers, first_reader.inputSize, first_reader.outputSize,
+                           first_reader.maxLayersize, first_reader.symmetric,
+                           len(first_reader.layerSizes)]
+        header_integers.extend(first_reader.layerSizes)
+        header_integers.extend([len(lis) for lis in lists_of_input_data])
+
+        temporary_file_name = f'{archive_file_name}.{os.getpid()}.tmp'
+        with open(temporary_file_name, 'wb') as f:
+            f.write(NNetArchive.MAGIC)
+            f.write(struct.pack('<q', len(header_integers)))
+            f.write(struct.pack('<%dq' % len(header_integers), *header_integers))
+            f.write(names_block)
+            for lis in lists_of_input_data:
+                f.write(array.array('d', lis).tobytes())
+
+            for reader in readers:
+                for layer_number in range(reader.numLayers):
+                    f.write(bytes(reader.flat_weights[layer_number]))
+                    f.write(bytes(reader.flat_biases[layer_number]))
+
+        os.replace(temporary_file_name, archive_file_name)
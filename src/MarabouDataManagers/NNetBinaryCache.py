@@ -0,0 +1,241 @@
+import array
+import hashlib
+import mmap
+import os
+import struct
+import sys
+
+"""
+a binary sidecar for .nnet files
+
+parsing the text .nnet file is slow, and the same networks are loaded over and over again.
+so the first time a network is parsed we dump it into a compact binary file next to the .nnet file, and from then on
+we memory map that binary file instead of parsing the text file.
+since the file is mapped read only, all the processes that load the same network share its pages.
+
+the layout of the binary file is (all integers are little endian int64, all floats are float64 in the byte order of
+the machine that wrote the file, which is recorded in the header):
+MAGIC
+number of header integers
+header integers:
+    format version, 1 if the floats are little endian and 0 otherwise,
+    size of the source file, mtime of the source file in nanoseconds,
+    numLayers, inputSize, outputSize, maxLayersize, symmetric,
+    number of layer sizes, layerSizes...,
+    lengths of inputMinimums, inputMaximums, inputMeans, inputRanges
+sha256 of the source file contents (32 bytes)
+inputMinimums, inputMaximums, inputMeans, inputRanges
+for each layer: the weights block (row major, current_layer_size x previous_layer_size) and then the biases block
+
+all the blocks start at offsets which are multiples of 8, so they can be viewed as float64 arrays without copying
+"""
+
+
+class NNetBinaryCache:
+    SIDECAR_SUFFIX = '.bin'
+    MAGIC = b'NNETBIN\x00'
+    FORMAT_VERSION = 1
+
+    SIZE_OF_INT = 8
+    SIZE_OF_FLOAT = 8
+    SIZE_OF_DIGEST = 32
+
+    # the source key is not meaningful for binary files which are not a sidecar of some .nnet file
+    NO_SOURCE_KEY = (0, 0, bytes(SIZE_OF_DIGEST))
+
+    def __init__(self, nnet_file_name):
+        """
+        :param nnet_file_name: the text .nnet file this cache is a sidecar of
+        """
+        self.nnet_file_name = nnet_file_name
+        self.sidecar_file_name = nnet_file_name + NNetBinaryCache.SIDECAR_SUFFIX
+
+    @staticmethod
+    def _get_digest_of_file(file_name):
+        digest = hashlib.sha256()
+        with open(file_name, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                digest.update(chunk)
+
+        return digest.digest()
+
+    def _get_source_key(self):
+        """
+        :return: a tuple of (size, mtime in nanoseconds, sha256 digest) of the .nnet file
+        """
+        source_stat = os.stat(self.nnet_file_name)
+        return source_stat.st_size, source_stat.st_mtime_ns, NNetBinaryCache._get_digest_of_file(self.nnet_file_name)
+
+    @staticmethod
+    def serialize_network(nnet_reader, source_key=NO_SOURCE_KEY):
+        """
+        :param nnet_reader: an NNetReader (or a compatible object) holding the network
+        :param source_key: a tuple of (size, mtime in nanoseconds, sha256 digest) of the file the network was read from
+        :return: the bytes of a binary file which holds the given network
+        """
+        source_size, source_mtime_ns, source_digest = source_key
+        lists_of_input_data = [nnet_reader.inputMinimums, nnet_reader.inputMaximums,
+                               nnet_reader.inputMeans, nnet_reader.inputRanges]
+
+        header_integers = [NNetBinaryCache.FORMAT_VERSION, int(sys.byteorder == 'little'),
+                           source_size, source_mtime_ns,
+                           nnet_reader.numLayers, nnet_reader.inputSize, nnet_reader.outputSize,
+                           nnet_reader.maxLayersize, nnet_reader.symmetric,
+                           len(nnet_reader.layerSizes)]
+        header_integers.extend(nnet_reader.layerSizes)
+        header_integers.extend([len(lis) for lis in lists_of_input_data])
+
+        chunks = [NNetBinaryCache.MAGIC,
+                  struct.pack('<q', len(header_integers)),
+                  struct.pack('<%dq' % len(header_integers), *header_integers),
+                  source_digest]
+
+        for lis in lists_of_input_data:
+            chunks.append(array.array('d', lis).tobytes())
+
+        for layer_number in range(nnet_reader.numLayers):
+            chunks.append(bytes(nnet_reader.flat_weights[layer_number]))
+            chunks.append(bytes(nnet_reader.flat_biases[layer_number]))
+
+        return b''.join(chunks)
+
+    @staticmethod
+    def deserialize_network(buffer):
+        """
+        :param buffer: an object supporting the buffer protocol (for example an mmap object) which holds a binary file
+        as written by serialize_network
+        :return: None if the buffer does not hold a valid binary file, otherwise a pair of
+        (source_key, arguments for NNetReader._set_network_data)
+        the weights and biases are memoryviews into the given buffer, nothing is copied
+        """
+        whole_buffer = memoryview(buffer)
+        magic_length = len(NNetBinaryCache.MAGIC)
+        if len(whole_buffer) < magic_length + NNetBinaryCache.SIZE_OF_INT or \
+                bytes(whole_buffer[:magic_length]) != NNetBinaryCache.MAGIC:
+            return None
+
+        offset = magic_length
+        number_of_header_integers, = struct.unpack_from('<q', whole_buffer, offset)
+        offset += NNetBinaryCache.SIZE_OF_INT
+        try:
+            header_integers = struct.unpack_from('<%dq' % number_of_header_integers, whole_buffer, offset)
+        except struct.error:
+            # the binary file is truncated
+            return None
+        offset += NNetBinaryCache.SIZE_OF_INT * number_of_header_integers
+        if len(header_integers) < 10 or offset + NNetBinaryCache.SIZE_OF_DIGEST > len(whole_buffer):
+            return None
+
+        format_version, floats_are_little_endian = header_integers[0], header_integers[1]
+        if format_version != NNetBinaryCache.FORMAT_VERSION or \
+                floats_are_little_endian != int(sys.byteorder == 'little'):
+            return None
+
+        source_size, source_mtime_ns = header_integers[2], header_integers[3]
+        numLayers, inputSize, outputSize, maxLayersize, symmetric = header_integers[4:9]
+        number_of_layer_sizes = header_integers[9]
+        layerSizes = list(header_integers[10:10 + number_of_layer_sizes])
+        lengths_of_input_data = header_integers[10 + number_of_layer_sizes:]
+
+        source_digest = bytes(whole_buffer[offset:offset + NNetBinaryCache.SIZE_OF_DIGEST])
+        offset += NNetBinaryCache.SIZE_OF_DIGEST
+
+        def take_floats(number_of_floats):
+            nonlocal offset
+            end = offset + number_of_floats * NNetBinaryCache.SIZE_OF_FLOAT
+            if end > len(whole_buffer):
+                raise ValueError("binary file is truncated")
+            floats = whole_buffer[offset:end].cast('d')
+            offset = end
+            return floats
+
+        try:
+            inputMinimums, inputMaximums, inputMeans, inputRanges = \
+                [take_floats(length).tolist() for length in lengths_of_input_data]
+
+            flat_weights = []
+            flat_biases = []
+            for layer_number in range(numLayers):
+                previous_layer_size = layerSizes[layer_number]
+                current_layer_size = layerSizes[layer_number + 1]
+                flat_weights.append(take_floats(current_layer_size * previous_layer_size))
+                flat_biases.append(take_floats(current_layer_size))
+        except ValueError:
+            return None
+
+        source_key = (source_size, source_mtime_ns, source_digest)
+        network_data = (numLayers, layerSizes, inputSize, outputSize, maxLayersize, symmetric,
+                        inputMinimums, inputMaximums, inputMeans, inputRanges,
+                        flat_weights, flat_biases)
+
+        return source_key, network_data
+
+    def load_into_reader(self, nnet_reader):
+        """
+        memory maps the sidecar file and fills the given reader with its data
+
+        :param nnet_reader:
+        :return: true if the sidecar exists and is up to date with the .nnet file, false otherwise
+        (in which case the reader was not changed)
+        """
+        try:
+            source_stat = os.stat(self.nnet_file_name)
+            with open(self.sidecar_file_name, 'rb') as f:
+                # the mapping stays valid after the file is closed
+                mapped_file = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            # ValueError is raised when trying to map an empty file
+            return False
+
+        deserialized = NNetBinaryCache.deserialize_network(mapped_file)
+        if deserialized is None:
+            return False
+
+        source_key, network_data = deserialized
+        source_size, source_mtime_ns, source_digest = source_key
+        if source_size != source_stat.st_size:
+            return False
+
+        # a matching size and mtime is considered enough, so warm loads do not need to read the .nnet file at all.
+        # if only the mtime changed (for example the file was copied or touched) we fall back to comparing the contents,
+        # and if they match the sidecar is written again with the new mtime, so the next loads would not compare them
+        mtime_changed = source_mtime_ns != source_stat.st_mtime_ns
+        if mtime_changed and source_digest != NNetBinaryCache._get_digest_of_file(self.nnet_file_name):
+            return False
+
+        nnet_reader._set_network_data(*network_data)
+        if mtime_changed:
+            self.save_reader(nnet_reader, (source_stat.st_size, source_stat.st_mtime_ns, source_digest))
+
+        return True
+
+    def save_reader(self, nnet_reader, source_key=None):
+        """
+        writes the network held by the given reader into the sidecar file.
+        the file is written to a temporary file first and then moved into place, so that other processes never see a
+        partially written sidecar (and the processes which memory mapped the previous sidecar keep their mapping).
+        failing to write the sidecar (for example because the directory is read only) is not an error, the next load
+        would simply parse the text file again.
+
+        :param nnet_reader:
+        :param source_key: None by default.
+        the (size, mtime in nanoseconds, sha256 digest) of the .nnet file, if the caller already knows it.
+        otherwise it is calculated from the .nnet file
+        :return: true if the sidecar was written
+        """
+        temporary_file_name = f'{self.sidecar_file_name}.{os.getpid()}.tmp'
+        try:
+            if source_key is None:
+                source_key = self._get_source_key()
+            data = NNetBinaryCache.serialize_network(nnet_reader, source_key)
+            with open(temporary_file_name, 'wb') as f:
+                f.write(data)
+            os.replace(temporary_file_name, self.sidecar_file_name)
+        except OSError:
+            try:
+                os.remove(temporary_file_name)
+            except OSError:
+                pass
+            return False
+
+        return True
@@ -1,69 +1,185 @@
+import array
+import itertools
+import json
+import mmap
+
+from src.MarabouDataManagers.NNetBinaryCache import NNetBinaryCache
+
+
 class NNetReader:
-    def __init__(self, file_name):
-        # copied from the MarabouNetworkNNet class in marabou
+    def __init__(self, file_name, use_binary_cache=False):
+        """
+        :param file_name: the .nnet file to load
+        :param use_binary_cache: false by default.
+        if true, the reader would first try to memory map the binary sidecar of the given file (see NNetBinaryCache).
+        if there is no up to date sidecar, the text file is parsed and a sidecar is written for the next loads.
+        the sidecar is written next to the given file, so it is off by default to not leave files in the directories
+        of the networks without being asked to
+
+        the weights and biases of each layer are held in a flat float64 buffer (row major), which is either an
+        array.array (when the text file was parsed) or a memoryview into the memory mapped sidecar
+        """
+        self.file_name = file_name
+
+        binary_cache = NNetBinaryCache(file_name)
+        if use_binary_cache and binary_cache.load_into_reader(self):
+            return
+
+        self._parse_text_file(file_name)
+
+        if use_binary_cache:
+            binary_cache.save_reader(self)
+
+    def _parse_text_file(self, file_name):
+        """
+        parses the text .nnet file in one buffered pass, see _parse_header and _parse_layer
+        """
         with open(file_name) as f:
-            line = f.readline()
-            cnt = 1
-            while line[0:2] == "//":
-                line = f.readline()
-                cnt += 1
-            # numLayers does't include the input layer!
-            numLayers, inputSize, outputSize, maxLayersize = [int(x) for x in line.strip().split(",")[:-1]]
-            line = f.readline()
-
-            # input layer size, layer1size, layer2size...
-            layerSizes = [int(x) for x in line.strip().split(",")[:-1]]
-
-            line = f.readline()
-            symmetric = int(line.strip().split(",")[0])
-
-            line = f.readline()
-            inputMinimums = [float(x) for x in line.strip().split(",")[:-1]]
-
-            line = f.readline()
-            inputMaximums = [float(x) for x in line.strip().split(",")[:-1]]
-
-            line = f.readline()
-            inputMeans = [float(x) for x in line.strip().split(",")[:-1]]
-
-            line = f.readline()
-            inputRanges = [float(x) for x in line.strip().split(",")[:-1]]
-
-            weights = []
-            biases = []
-            for layernum in range(numLayers):
-
-                previousLayerSize = layerSizes[layernum]
-                currentLayerSize = layerSizes[layernum + 1]
-                # weights
-                weights.append([])
-                biases.append([])
-                # weights
-                for i in range(currentLayerSize):
-                    line = f.readline()
-                    aux = [float(x) for x in line.strip().split(",")[:-1]]
-                    weights[layernum].append([])
-                    for j in range(previousLayerSize):
-                        weights[layernum][i].append(aux[j])
-                # biases
-                for i in range(currentLayerSize):
-                    line = f.readline()
-                    x = float(line.strip().split(",")[0])
-                    biases[layernum].append(x)
-
-            self.numLayers = numLayers
-            self.layerSizes = layerSizes
-            self.inputSize = inputSize
-            self.outputSize = outputSize
-            self.maxLayersize = maxLayersize
-            self.inputMinimums = inputMinimums
-            self.inputMaximums = inputMaximums
-            self.inputMeans = inputMeans
-            self.inputRanges = inputRanges
-            self.weights = weights
-            self.biases = biases
-
-            self.number_of_nodes_in_network = sum(self.layerSizes)
+            lines = iter(f.read().split('\n'))
+
+        numLayers, layerSizes, inputSize, outputSize, maxLayersize, symmetric, \
+            inputMinimums, inputMaximums, inputMeans, inputRanges = NNetReader._parse_header(lines)
+
+        flat_weights = []
+        flat_biases = []
+        for layer_number in range(numLayers):
+            layer_weights, layer_biases = NNetReader._parse_layer(lines, layerSizes[layer_number],
+                                                                  layerSizes[layer_number + 1],
+                                                                  f"layer {layer_number + 1} in {file_name}")
+            flat_weights.append(layer_weights)
+            flat_biases.append(layer_biases)
+
+        self._set_network_data(numLayers, layerSizes, inputSize, outputSize, maxLayersize, symmetric,
+                               inputMinimums, inputMaximums, inputMeans, inputRanges,
+                               flat_weights, flat_biases)
+
+    @staticmethod
+    def _parse_header(lines):
+        """
+        parses the header like the MarabouNetworkNNet class in marabou parses it
+        :param lines: an iterator over the lines of the .nnet file, it is advanced to the first line of the weights
+        :return: a tuple of (numLayers, layerSizes, inputSize, outputSize, maxLayersize, symmetric,
+        inputMinimums, inputMaximums, inputMeans, inputRanges)
+        """
+        line = next(lines)
+        while line[0:2] == "//":
+            line = next(lines)
+
+        def parse_header_line(function_to_convert_with, line_to_parse):
+            return [function_to_convert_with(x) for x in line_to_parse.strip().split(",")[:-1]]
+
+        # numLayers does't include the input layer!
+        numLayers, inputSize, outputSize, maxLayersize = parse_header_line(int, line)
+
+        # input layer size, layer1size, layer2size...
+        layerSizes = parse_header_line(int, next(lines))
+
+        symmetric = int(next(lines).strip().split(",")[0])
+
+        inputMinimums = parse_header_line(float, next(lines))
+        inputMaximums = parse_header_line(float, next(lines))
+        inputMeans = parse_header_line(float, next(lines))
+        inputRanges = parse_header_line(float, next(lines))
+
+        return numLayers, layerSizes, inputSize, outputSize, maxLayersize, symmetric, \
+            inputMinimums, inputMaximums, inputMeans, inputRanges
+
+    @staticmethod
+    def _parse_layer(lines, previous_layer_size, current_layer_size, description_of_layer):
+        """
+        the weights of the layer are converted in bulk: all the rows of the layer are joined into one string which is
+        split and converted into a single flat float64 array, instead of converting and appending the weights one by one
+        :param lines: an iterator over the lines of the .nnet file, it is advanced to the first line of the next layer
+        :param previous_layer_size:
+        :param current_layer_size:
+        :param description_of_layer: used in the error raised if the layer is malformed
+        :return: a pair of (flat weights, biases) of the layer, as float64 arrays
+        """
+        # the rows usually end with a comma, but the final comma is optional. it is dropped from every row, so joining
+        # the rows with commas gives one comma separated list of all the weights of the layer
+        rows = [row.strip().rstrip(',') for row in itertools.islice(lines, current_layer_size)]
+        layer_weights = NNetReader._convert_comma_separated_values_to_array(','.join(rows))
+        if len(layer_weights) != current_layer_size * previous_layer_size:
+            # some rows hold more values than the previous layer size, so fall back to taking the first
+            # previous_layer_size values of each row
+            layer_weights = array.array('d')
+            for row in rows:
+                layer_weights.extend(map(float, row.split(",")[:previous_layer_size]))
+            if len(layer_weights) != current_layer_size * previous_layer_size:
+                raise Exception(f"the weights of {description_of_layer} are malformed")
+
+        bias_rows = itertools.islice(lines, current_layer_size)
+        layer_biases = array.array('d', [float(row.strip().split(",")[0]) for row in bias_rows])
+        if len(layer_biases) != current_layer_size:
+            raise Exception(f"the biases of {description_of_layer} are malformed")
+
+        return layer_weights, layer_biases
+
+    @staticmethod
+    def _convert_comma_separated_values_to_array(text):
+        """
+        :param text: comma separated floats, which may end with a comma (and possibly whitespace after it)
+        :return: an array.array of the floats
+        """
+        text = text.rstrip()
+        if text.endswith(','):
+            text = text[:-1]
+        try:
+            # the json decoder converts all the numbers in c, which is noticeably faster than splitting the text and
+            # calling float on each token
+            values = array.array('d')
+            values.fromlist(json.loads('[' + text + ']'))
+            return values
+        except ValueError:
+            # the numbers are not in a form json accepts (for example ".5" or "inf")
+            return array.array('d', map(float, text.split(",")))
+
+    def _set_network_data(self, numLayers, layerSizes, inputSize, outputSize, maxLayersize, symmetric,
+                          inputMinimums, inputMaximums, inputMeans, inputRanges,
+                          flat_weights, flat_biases):
+        """
+        :param flat_weights: a list which holds for each layer (not including the input layer) a flat float64 buffer of
+        its weights, such that the weight between the i'th node in the layer and the j'th node in the previous layer
+        is at flat_weights[layer][i * previous_layer_size + j]
+        :param flat_biases: a list which holds for each layer (not including the input layer) a flat float64 buffer
+        of its biases
+        """
+        self.numLayers = numLayers
+        self.layerSizes = layerSizes
+        self.inputSize = inputSize
+        self.outputSize = outputSize
+        self.maxLayersize = maxLayersize
+        self.symmetric = symmetric
+        self.inputMinimums = inputMinimums
+        self.inputMaximums = inputMaximums
+        self.inputMeans = inputMeans
+        self.inputRanges = inputRanges
+        self.flat_weights = flat_weights
+        self.flat_biases = flat_biases
+
+        self.number_of_nodes_in_network = sum(self.layerSizes)
+
+    @property
+    def weights(self):
+        """
+        :return: the weights as nested lists, weights[layer][i][j], like the MarabouNetworkNNet class holds them.
+        those lists are built on every call, so do not use this in loops, use get_weight_of_connection instead
+        """
+        weights = []
+        for layer_number in range(self.numLayers):
+            previous_layer_size = self.layerSizes[layer_number]
+            flat_layer_weights = self.flat_weights[layer_number]
+            weights.append([list(flat_layer_weights[i * previous_layer_size:(i + 1) * previous_layer_size])
+                            for i in range(self.layerSizes[layer_number + 1])])
+
+        return weights
+
+    @property
+    def biases(self):
+        """
+        :return: the biases as nested lists, biases[layer][i]. those lists are built on every call
+        """
+        return [list(flat_layer_biases) for flat_layer_biases in self.flat_biases]
 
     def get_bias_for_node(self, layer_number, index_of_node_in_layer):
         """
@@ -82,7 +198,7 @@ class NNetReader:
         if layer_number == 0:
             # input layer nodes have no bias
             return 0
-        return self.biases[layer_number - 1][index_of_node_in_layer]
+        return self.flat_biases[layer_number - 1][index_of_node_in_layer]
 
     def get_weight_of_connection(self, layer_number, index_of_node_in_layer, index_of_node_in_previous_layer):
         """
@@ -98,7 +214,69 @@ class NNetReader:
         # LOCATION_OF_WEIGHTS = 0
         # return matrix[layer_number][LOCATION_OF_WEIGHTS][index_of_node_in_layer][index_of_node_in_previous_layer]
 
-        return self.weights[layer_number - 1][index_of_node_in_layer][index_of_node_in_previous_layer]
+        previous_layer_size = self.layerSizes[layer_number - 1]
+        return self.flat_weights[layer_number - 1][index_of_node_in_layer * previous_layer_size +
+                                                   index_of_node_in_previous_layer]
+
+    def get_weight_matrix(self, layer_number):
+        """
+        :param layer_number: a layer which is not the input layer
+        :return: a list of rows, such that row i holds the weights of the connections between the i'th node in the
+        given layer and all the nodes in the previous layer.
+        the rows are views into the reader buffers, nothing is copied, so do not change them
+        """
+        previous_layer_size = self.layerSizes[layer_number - 1]
+        flat_layer_weights = memoryview(self.flat_weights[layer_number - 1])
+        return [flat_layer_weights[i * previous_layer_size:(i + 1) * previous_layer_size]
+                for i in range(self.layerSizes[layer_number])]
+
+    def get_bias_vector(self, layer_number):
+        """
+        :param layer_number:
+        :return: a sequence of the biases of all the nodes in the given layer
+        """
+        if layer_number == 0:
+            # input layer nodes have no bias
+            return array.array('d', bytes(8 * self.layerSizes[0]))
+        return self.flat_biases[layer_number - 1]
+
+    def get_nonzero_connections(self, layer_number):
+        """
+        :param layer_number: a layer which is not the input layer
+        :return: the connections with a non zero weight between the given layer and the previous layer in a CSR form,
+        a tuple of (row_pointers, column_indices, values).
+        the connections of the i'th node in the given layer are
+        column_indices[row_pointers[i]:row_pointers[i + 1]] - the indices of the nodes in the previous layer
+        values[row_pointers[i]:row_pointers[i + 1]] - the weights of the connections
+        """
+        return NNetReader._get_nonzero_connections_of_rows(self.get_weight_matrix(layer_number))
+
+    @staticmethod
+    def _get_nonzero_connections_of_rows(rows):
+        """
+        :param rows: the rows of a weight matrix
+        :return: the non zero weights of the matrix in a CSR form, see get_nonzero_connections
+        """
+        row_pointers = array.array('q', [0])
+        column_indices = array.array('q')
+        values = array.array('d')
+        for row in rows:
+            indices_of_nonzero_weights = [j for j, weight in enumerate(row) if weight != 0]
+            column_indices.extend(indices_of_nonzero_weights)
+            values.extend([row[j] for j in indices_of_nonzero_weights])
+            row_pointers.append(len(column_indices))
+
+        return row_pointers, column_indices, values
+
+    def get_iterator_over_layers(self):
+        """
+        :return: an iterator which yields for each layer, starting from the input layer, a tuple of
+        (layer_number, biases, nonzero_connections) where biases is as returned by get_bias_vector and
+        nonzero_connections is as returned by get_nonzero_connections (None for the input layer)
+        """
+        yield 0, self.get_bias_vector(0), None
+        for layer_number in range(1, self.numLayers + 1):
+            yield layer_number, self.get_bias_vector(layer_number), self.get_nonzero_connections(layer_number)
 
     def get_number_of_nodes_in_network(self):
         return self.number_of_nodes_in_network
@@ -108,3 +286,107 @@ class NNetReader:
 
     def get_number_of_nodes_in_layer(self, layer_index):
         return self.layerSizes[layer_index]
+
+
+class InMemoryNNetReader(NNetReader):
+    def __init__(self, weights, biases, input_minimums, input_maximums):
+        """
+        an NNetReader compatible object for a network which is given as matrices instead of a .nnet file
+
+        :param weights: a list which holds for each layer (not including the input layer) its weights, either as
+        a dense matrix (a list of rows, such that row i holds the weights of the connections between the i'th node in
+        the layer and all the nodes in the previous layer) or as a sparse matrix in a CSR form
+        (a tuple of row_pointers, column_indices, values as returned by NNetReader.get_nonzero_connections)
+        :param biases: a list which holds for each layer (not including the input layer) the biases of its nodes
+        :param input_minimums: lower bounds on the input nodes
+        :param input_maximums: upper bounds on the input nodes
+        """
+        if len(weights) != len(biases):
+            raise Exception("there should be a weights matrix and a biases vector for each layer")
+        if len(input_minimums) != len(input_maximums):
+            raise Exception("there should be a lower bound and an upper bound for each input node")
+
+        self.file_name = None
+
+        layerSizes = [len(input_minimums)] + [len(layer_biases) for layer_biases in biases]
+
+        # if a layer was given in a CSR form we keep it so that get_nonzero_connections would not need to scan the
+        # dense matrix for it
+        self.given_nonzero_connections = {}
+
+        flat_weights = []
+        for layer_number in range(len(weights)):
+            previous_layer_size = layerSizes[layer_number]
+            current_layer_size = layerSizes[layer_number + 1]
+            layer_weights = weights[layer_number]
+
+            if isinstance(layer_weights, tuple):
+                row_pointers, column_indices, values = layer_weights
+                if len(row_pointers) != current_layer_size + 1:
+                    raise Exception(f"the sparse weights of layer {layer_number + 1} do not match its biases")
+
+                flat_layer_weights = array.array('d', bytes(8 * current_layer_size * previous_layer_size))
+                for i in range(current_layer_size):
+                    row_offset = i * previous_layer_size
+                    for k in range(row_pointers[i], row_pointers[i + 1]):
+                        flat_layer_weights[row_offset + column_indices[k]] = values[k]
+                # explicit zeros are dropped, like get_nonzero_connections does for dense matrices
+                nonzero_row_pointers = array.array('q', [0])
+                nonzero_column_indices = array.array('q')
+                nonzero_values = array.array('d')
+                for i in range(current_layer_size):
+                    for k in range(row_pointers[i], row_pointers[i + 1]):
+                        if values[k] != 0:
+                            nonzero_column_indices.append(column_indices[k])
+                            nonzero_values.append(values[k])
+                    nonzero_row_pointers.append(len(nonzero_column_indices))
+                self.given_nonzero_connections[layer_number + 1] = (nonzero_row_pointers,
+                                                                    nonzero_column_indices,
+                                                                    nonzero_values)
+            else:
+                if len(layer_weights) != current_layer_size:
+                    raise Exception(f"the weights of layer {layer_number + 1} do not match its biases")
+
+                flat_layer_weights = array.array('d')
+                for row in layer_weights:
+                    if len(row) != previous_layer_size:
+                        raise Exception(f"the weights of layer {layer_number + 1} do not match the previous layer")
+                    flat_layer_weights.extend(row)
+
+            flat_weights.append(flat_layer_weights)
+
+        flat_biases = [array.array('d', layer_biases) for layer_biases in biases]
+
+        # the means and ranges are only used for normalizing inputs, which the matrices are assumed to not need
+        self._set_network_data(len(weights), layerSizes, layerSizes[0], layerSizes[-1], max(layerSizes), 0,
+                               list(input_minimums), list(input_maximums),
+                               [0.0] * (layerSizes[0] + 1), [1.0] * (layerSizes[0] + 1),
+                               flat_weights, flat_biases)
+
+    def get_nonzero_connections(self, layer_number):
+        if layer_number in self.given_nonzero_connections:
+            return self.given_nonzero_connections[layer_number]
+        return super().get_nonzero_connections(layer_number)
+
+
+class BinaryNNetReader(NNetReader):
+    def __init__(self, file_name):
+        """
+        an NNetReader compatible object for a standalone binary network file, as written by
+        NNetWriter.write_binary_file (the same format as the NNetBinaryCache sidecar).
+        the file is memory mapped, the weights and biases are memoryviews into it
+
+        :param file_name:
+        """
+        self.file_name = file_name
+
+        with open(file_name, 'rb') as f:
+            # the mapping stays valid after the file is closed
+            mapped_file = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        deserialized = NNetBinaryCache.deserialize_network(mapped_file)
+        if deserialized is None:
+            raise Exception(f"{file_name} is not a valid binary network file")
+
+        _, network_data = deserialized
+        self._set_network_data(*network_data)
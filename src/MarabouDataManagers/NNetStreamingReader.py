@@ -0,0 +1,61 @@
+import array
+
+from src.MarabouDataManagers.NNetReader import NNetReader
+
+"""
+a reader for .nnet files which are too large to hold in memory as a whole.
+
+NNetStreamingReader reads only the header when it is created, and then reads the layers one at a time, so at any
+moment only a single layer of the network is held by the reader.
+it supports the part of the NNetReader interface the Network class uses (the header attributes,
+get_number_of_layers_in_network and get_iterator_over_layers), so a Network can be built from it directly,
+and the peak memory of building the network is about one layer plus the network itself.
+"""
+
+
+class NNetStreamingReader:
+    def __init__(self, file_name):
+        """
+        :param file_name: the .nnet file to load
+        """
+        self.file_name = file_name
+
+        with open(file_name) as f:
+            self.numLayers, self.layerSizes, self.inputSize, self.outputSize, self.maxLayersize, self.symmetric, \
+                self.inputMinimums, self.inputMaximums, self.inputMeans, self.inputRanges = \
+                NNetReader._parse_header(f)
+
+        self.number_of_nodes_in_network = sum(self.layerSizes)
+
+    def get_iterator_over_layers(self):
+        """
+        reads the file again on every call, and yields the layers as it reads them.
+        each layer is dropped by the reader as soon as the next one is read.
+
+        :return: an iterator which yields for each layer, starting from the input layer, a tuple of
+        (layer_number, biases, nonzero_connections), see NNetReader.get_iterator_over_layers
+        """
+        with open(self.file_name) as f:
+            NNetReader._parse_header(f)
+
+            # input layer nodes have no bias
+            yield 0, array.array('d', bytes(8 * self.layerSizes[0])), None
+            for layer_number in range(1, self.numLayers + 1):
+                previous_layer_size = self.layerSizes[layer_number - 1]
+                current_layer_size = self.layerSizes[layer_number]
+                layer_weights, layer_biases = NNetReader._parse_layer(f, previous_layer_size, current_layer_size,
+                                                                      f"layer {layer_number} in {self.file_name}")
+
+                rows = [memoryview(layer_weights)[i * previous_layer_size:(i + 1) * previous_layer_size]
+                        for i in range(current_layer_size)]
+                nonzero_connections = NNetReader._get_nonzero_connections_of_rows(rows)
+
+                # drop the dense weights before handing the layer over, only the non zero weights are kept
+                del rows, layer_weights
+                yield layer_number, layer_biases, nonzero_connections
+
+    def get_number_of_nodes_in_network(self):
+        return self.number_of_nodes_in_network
+
+    def get_number_of_layers_in_network(self):
+        return self.numLayers
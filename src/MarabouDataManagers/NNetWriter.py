@@ -0,0 +1,68 @@
+import os
+
+from src.MarabouDataManagers.NNetBinaryCache import NNetBinaryCache
+
+"""
+writes networks held by an NNetReader (or a compatible object, for example the one returned by
+Network.get_abstract_network_as_nnet_reader) to disk, either as a text .nnet file or as a binary file.
+a text file can be read back with NNetReader and a binary file with BinaryNNetReader.
+"""
+
+
+class NNetWriter:
+    @staticmethod
+    def _write_atomically(file_name, data):
+        """
+        writes the data into a temporary file and then moves it into place, so that readers never see a partially
+        written file
+        """
+        temporary_file_name = f'{file_name}.{os.getpid()}.tmp'
+        mode = 'wb' if isinstance(data, bytes) else 'w'
+        with open(temporary_file_name, mode) as f:
+            f.write(data)
+        os.replace(temporary_file_name, file_name)
+
+    @staticmethod
+    def get_nnet_file_contents(nnet_reader):
+        """
+        :param nnet_reader:
+        :return: the text of a .nnet file which holds the network. the floats are written with repr, so reading the
+        file back gives exactly the same network
+        """
+        def to_line(values):
+            return ",".join(values) + ",\n"
+
+        def floats_to_line(values):
+            return to_line(map(repr, values))
+
+        lines = ["// written by NNetWriter\n",
+                 to_line(map(str, [nnet_reader.numLayers, nnet_reader.inputSize, nnet_reader.outputSize,
+                                   nnet_reader.maxLayersize])),
+                 to_line(map(str, nnet_reader.layerSizes)),
+                 to_line([str(nnet_reader.symmetric)]),
+                 floats_to_line(nnet_reader.inputMinimums),
+                 floats_to_line(nnet_reader.inputMaximums),
+                 floats_to_line(nnet_reader.inputMeans),
+                 floats_to_line(nnet_reader.inputRanges)]
+
+        for layer_number in range(1, nnet_reader.numLayers + 1):
+            lines.extend([floats_to_line(row.tolist()) for row in nnet_reader.get_weight_matrix(layer_number)])
+            lines.extend([floats_to_line([bias]) for bias in nnet_reader.get_bias_vector(layer_number)])
+
+        return ''.join(lines)
+
+    @staticmethod
+    def write_nnet_file(nnet_reader, file_name):
+        """
+        :param nnet_reader:
+        :param file_name: the .nnet file to write
+        """
+        NNetWriter._write_atomically(file_name, NNetWriter.get_nnet_file_contents(nnet_reader))
+
+    @staticmethod
+    def write_binary_file(nnet_reader, file_name):
+        """
+        :param nnet_reader:
+        :param file_name: the binary file to write
+        """
+        NNetWriter._write_atomically(file_name, NNetBinaryCache.serialize_network(nnet_reader))
@@ -0,0 +1,95 @@
+from multiprocessing import shared_memory
+
+from src.MarabouDataManagers.NNetBinaryCache import NNetBinaryCache
+from src.MarabouDataManagers.NNetReader import NNetReader
+
+"""
+a store which holds a network in shared memory, so that many worker processes can use it without each of them
+reading and parsing the .nnet file into its own memory.
+
+the parent process creates the store once from an NNetReader, and passes the store name to the workers.
+each worker attaches to the store by its name and gets an NNetReader compatible object whose weights and biases are
+views into the shared memory, so nothing is copied and the memory used by the network does not grow with the number
+of workers.
+the network is held in the same binary format as the NNetBinaryCache sidecar.
+"""
+
+
+class SharedNNetReader(NNetReader):
+    def __init__(self, shared_weight_store):
+        """
+        an NNetReader compatible view of the network in a SharedWeightStore.
+        the view keeps the store attached for as long as it lives
+
+        :param shared_weight_store:
+        """
+        self.file_name = None
+        self.shared_weight_store = shared_weight_store
+
+        deserialized = NNetBinaryCache.deserialize_network(shared_weight_store.shared_memory.buf)
+        if deserialized is None:
+            raise Exception(f"the shared memory {shared_weight_store.get_name()} does not hold a network")
+
+        _, network_data = deserialized
+        self._set_network_data(*network_data)
+
+
+class SharedWeightStore:
+    def __init__(self, shared_memory_object, is_owner):
+        """
+        do not call this constructor directly, use SharedWeightStore.create or SharedWeightStore.attach
+
+        :param shared_memory_object: a multiprocessing.shared_memory.SharedMemory object
+        :param is_owner: true if this store created the shared memory, and so is responsible to unlink it
+        """
+        self.shared_memory = shared_memory_object
+        self.is_owner = is_owner
+
+    @staticmethod
+    def create(nnet_reader, name=None):
+        """
+        should be called once, by the parent process
+
+        :param nnet_reader: an NNetReader (or a compatible object) holding the network
+        :param name: the name of the shared memory, if None a unique name would be chosen
+        :return: a SharedWeightStore which owns a new shared memory holding the network
+        """
+        data = NNetBinaryCache.serialize_network(nnet_reader)
+        shared_memory_object = shared_memory.SharedMemory(name=name, create=True, size=len(data))
+        shared_memory_object.buf[:len(data)] = data
+
+        return SharedWeightStore(shared_memory_object, is_owner=True)
+
+    @staticmethod
+    def attach(name):
+        """
+        should be called by the workers, which should be processes started by multiprocessing (for example the
+        processes of a multiprocessing.Pool) from the process which created the store
+
+        :param name: the name of a store created by SharedWeightStore.create, as returned by get_name
+        :return: a SharedWeightStore attached to the existing shared memory
+        """
+        # the workers are expected to be started by multiprocessing from the process which created the store, so they
+        # share its resource tracker, and the shared memory is unlinked only by the owner (or by the tracker when
+        # the owner dies without closing the store)
+        shared_memory_object = shared_memory.SharedMemory(name=name)
+
+        return SharedWeightStore(shared_memory_object, is_owner=False)
+
+    def get_name(self):
+        return self.shared_memory.name
+
+    def get_reader(self):
+        """
+        :return: an NNetReader compatible object whose weights and biases are views into the shared memory
+        """
+        return SharedNNetReader(self)
+
+    def close(self):
+        """
+        detaches this process from the shared memory, and if this store is the owner also frees the shared memory.
+        all the readers returned by get_reader (and every network data taken from them) must be released before
+        """
+        self.shared_memory.close()
+        if self.is_owner:
+            self.shared_memory.unlink()
@@ -1,6 +1,13 @@
+import itertools
+
 from src.Layer import Layer
 from src.MarabouDataManagers.GlobalNetworkManager import GlobalNetworkManager
+from src.MarabouDataManagers.NNetReader import InMemoryNNetReader
+from src.MarabouDataManagers.NNetWriter import NNetWriter
 from src.NodeEdges import NodeEdges
+from src.PackedLocations import pack_pair_of_keys_in_table, unpack_pair_of_keys_in_table
+from src.Nodes.ARNode import ARNode
+from src.WeightPruner import WeightPruner
 from src.Nodes.GlobalNode import GlobalNode
 
 
@@ -38,11 +45,13 @@ class Network:
     CODE_FOR_UNSAT = 1
     CODE_FOR_SPURIOUS_COUNTEREXAMPLE = 2
 
-    def __init__(self, nnet_reader_object, which_acas_output):
+    def __init__(self, nnet_reader_object, which_acas_output, pruning_threshold=None):
         """
         :param nnet_reader_object:
         an nnet_reader object which has loaded into itself the network and the requested bounds on the network
         input nodes.
+        for networks which are too large to be held in memory twice (once by the reader and once by this class) use an
+        NNetStreamingReader, which gives the network its layers one at a time.
         this network class would convert that nnet_reader_object into an inner representation of multiple layers,
         tables and node classes, which are built for the purpose of supporting the abstraction refinement
 
@@ -52,12 +61,26 @@ class Network:
         the network class would need to convert the bounds to a form that cegar know how to deal with, a task which was
         not covered in the paper).
         however, we do support adding the output bounds for the AcasNnet, which are hardcoded into this class.
+
+        :param pruning_threshold: None by default.
+        if given, when a layer is preprocessed the connections into it whose absolute weight is smaller than the
+        threshold are pruned, and their possible contribution is folded into the biases of the nodes they went into
+        (see WeightPruner), so the abstraction remains an over-approximation of the given network.
+        the layers which were not preprocessed keep all their connections, so the network which is saved to
+        evaluate counterexamples is the given network. the connections into the output layer are never pruned,
+        since the output nodes are not split by their type.
+        the number of connections pruned can be retrieved with get_number_of_connections_pruned_in_each_layer
         """
-        self.global_network_manager = GlobalNetworkManager()
+        weight_pruner = None
+        if pruning_threshold is not None:
+            weight_pruner = WeightPruner(pruning_threshold,
+                                         nnet_reader_object.inputMinimums,
+                                         nnet_reader_object.inputMaximums)
 
-        self.layers = []
-        # more layers can be added later since we might need to change the output to fit cegar expected network
-        self._initialize_layers(nnet_reader_object)
+        # more layers can be added later since we might need to change the output to fit cegar expected network.
+        # the nnet_reader_object does not count the input layer
+        self._initialize_network_without_nodes(GlobalNetworkManager(), weight_pruner,
+                                               nnet_reader_object.get_number_of_layers_in_network() + 1)
 
         first_layer_nodes_map, last_layer_nodes_map = self._initialize_nodes_in_all_layers(nnet_reader_object)
 
@@ -70,6 +93,9 @@ class Network:
                                                                              first_layer_nodes_map)
 
         self.output_bounds_were_set = False
+        # the layers after this one are added by hard_code_acas_output_properties. they are not part of the given
+        # network, and are treated differently when the network is exported (see get_abstract_network_as_nnet_reader)
+        self.last_layer_of_given_network = len(self.layers) - 1
         output_nodes_global_incoming_ids = self.hard_code_acas_output_properties(last_layer_nodes_map,
                                                                                  which_acas_output)
 
@@ -91,6 +117,63 @@ class Network:
         self.global_network_manager.save_current_network_as_original_network(input_nodes_global_incoming_ids,
                                                                              output_nodes_global_incoming_ids)
 
+    @staticmethod
+    def create_network_without_nodes(global_network_manager, number_of_layers, last_layer_of_given_network,
+                                     last_layer_not_preprocessed, last_layer_not_forward_activated,
+                                     last_layer_not_fully_activated, weight_pruner=None):
+        """
+        creates a network whose layers have no nodes. it is used to build again a network which was built by the
+        constructor and then saved (see PreprocessedNetworkCache): the caller adds the nodes to the layers, and fills
+        the global network manager with their equations, constraints and bounds and with the original network
+
+        :param global_network_manager: a new GlobalNetworkManager
+        :param number_of_layers:
+        :param last_layer_of_given_network:
+        :param last_layer_not_preprocessed:
+        :param last_layer_not_forward_activated:
+        :param last_layer_not_fully_activated:
+        :param weight_pruner: the WeightPruner of the network, or None if it was built without a pruning_threshold
+        :return: the network created
+        """
+        network = Network.__new__(Network)
+        network._initialize_network_without_nodes(global_network_manager, weight_pruner, number_of_layers)
+
+        # the constructor does not return a network whose output bounds were not set
+        network.output_bounds_were_set = True
+        network.last_layer_of_given_network = last_layer_of_given_network
+        network.last_layer_not_preprocessed = last_layer_not_preprocessed
+        network.last_layer_not_forward_activated = last_layer_not_forward_activated
+        network.last_layer_not_fully_activated = last_layer_not_fully_activated
+
+        return network
+
+    @staticmethod
+    def from_layer_matrices(weights, biases, bounds, which_acas_output, pruning_threshold=None):
+        """
+        creates a network directly from the matrices of its layers, without going through a .nnet file
+
+        :param weights: a list which holds for each layer (not including the input layer) its weights, either as a
+        dense matrix or as a sparse matrix in a CSR form. see InMemoryNNetReader for the exact format
+        :param biases: a list which holds for each layer (not including the input layer) the biases of its nodes
+        :param bounds: a pair of (lower bounds, upper bounds) on the input nodes
+        :param which_acas_output: as in the constructor
+        :param pruning_threshold: as in the constructor
+        :return: the network created
+        """
+        input_minimums, input_maximums = bounds
+        return Network(InMemoryNNetReader(weights, biases, input_minimums, input_maximums), which_acas_output,
+                       pruning_threshold)
+
+    def get_number_of_connections_pruned_in_each_layer(self):
+        """
+        :return: a map between a layer number and a pair of
+        (number of connections pruned, number of connections before pruning).
+        the map is empty if the network was built without a pruning_threshold
+        """
+        if self.weight_pruner is None:
+            return {}
+        return self.weight_pruner.get_number_of_connections_pruned_in_each_layer()
+
     def _layer_node_map_to_global_ids(self, layer_number, layer_nodes_map):
         """
         :param layer_number:
@@ -105,13 +188,21 @@ class Network:
         # we don't need the index of the node in the conceptual layer
         for _, key_in_the_unprocessed_table in layer_nodes_map.items():
             node = current_layer.get_unprocessed_node_by_key(key_in_the_unprocessed_table)
-            to_return.append(node.get_global_incoming_id)
+            to_return.append(node.get_global_incoming_id())
 
         return to_return
 
-    def _initialize_layers(self, nnet_reader_object):
-        number_of_layers_in_network = nnet_reader_object.get_number_of_layers_in_network()
+    def _initialize_network_without_nodes(self, global_network_manager, weight_pruner, number_of_layers):
+        self.global_network_manager = global_network_manager
+        self.weight_pruner = weight_pruner
 
+        self.layers = []
+        self._initialize_layers(number_of_layers)
+        if self.weight_pruner is not None:
+            for layer in self.layers:
+                layer.set_weight_pruner(self.weight_pruner)
+
+    def _initialize_layers(self, number_of_layers):
         first_layer = Layer(Network.LOCATION_OF_FIRST_LAYER,
                             self.global_network_manager,
                             Layer.NO_POINTER_TO_ADJACENT_LAYER,
@@ -119,7 +210,7 @@ class Network:
         self.layers.append(first_layer)
         # at this point we assert self.layers.index(first_layer) == Network.LOCATION_OF_FIRST_LAYER
 
-        for i in range(1, number_of_layers_in_network + 1):
+        for i in range(1, number_of_layers):
             self.layers.append(self.layers[i - 1].create_next_layer())
 
     def _initialize_nodes_in_all_layers(self, nnet_reader_object):
@@ -136,45 +227,44 @@ class Network:
         # from assumption (2) every node created would be added to the unprocessed table of its layer so its enough to
         # save those keys, since we wont move any node to other tables before finishing creating the entire network
         current_layer_nodes_map = {}
-        previous_layer_nodes_map = {}
+
+        # the keys of the nodes of the previous layer, ordered by their index in the conceptual layer
+        keys_of_nodes_in_previous_layer = []
 
         # save the first and last layer maps for later, we'll need them
         first_layer_nodes_map = {}
         last_layer_nodes_map = {}
 
-        # first, initialize all the nodes and their connections
-        for current_layer_number in range(len(self.layers)):
+        # first, initialize all the nodes and their connections, one whole layer at a time.
+        # the layers are taken from the reader one by one, so a streaming reader never needs to hold the entire
+        # network in memory
+        for current_layer_number, biases_of_current_layer, nonzero_connections in \
+                nnet_reader_object.get_iterator_over_layers():
             current_layer = self.layers[current_layer_number]
-            number_of_nodes_in_current_layer = nnet_reader_object.get_number_of_nodes_in_layer(current_layer_number)
-
-            # first create all the nodes in the layer
-            for current_node_number_in_conceptual_layer in range(number_of_nodes_in_current_layer):
-                bias_for_new_node = nnet_reader_object.get_bias_for_node(current_layer_number,
-                                                                         current_node_number_in_conceptual_layer)
-                current_layer_nodes_map[current_node_number_in_conceptual_layer] = current_layer.create_new_node(
-                    bias_for_new_node)
-
-            # next connect all the nodes in the current layer to the nodes from the previous layer
-            # we do not connect nodes which are connected to each other with weight 0
-            for current_node_index_in_conceptual_layer, current_node_key_in_unprocessed_table in current_layer_nodes_map.items():
-                # go over each node in the current layer and create a list of all its connections to
-                # nodes in the previous layer
-                list_of_pairs_of_keys_and_weights = []
-                for a_node_index_in_previous_layer, the_key_in_unprocessed_table_of_node_in_previous_layer \
-                        in previous_layer_nodes_map.items():
-                    weight_of_connection = nnet_reader_object.get_weight_of_connection(current_layer_number,
-                                                                                       current_node_index_in_conceptual_layer,
-                                                                                       a_node_index_in_previous_layer)
-                    if weight_of_connection != 0:
-                        list_of_pairs_of_keys_and_weights.append(
-                            (the_key_in_unprocessed_table_of_node_in_previous_layer,
-                             weight_of_connection))
-
-                # now that we have a list of weights, add all the connections to the current node
-                current_layer.add_or_edit_neighbors_to_node_in_unprocessed_table_by_bulk(
-                    current_node_key_in_unprocessed_table,
-                    Layer.INCOMING_LAYER_DIRECTION,
-                    list_of_pairs_of_keys_and_weights)
+
+            # create all the nodes in the layer and connect them to the nodes from the previous layer
+            # we do not connect nodes which are connected to each other with weight 0, those are already filtered out
+            # by the reader. the input layer has no connections (nonzero_connections is None)
+            keys_of_new_nodes = current_layer.create_new_nodes_connected_to_previous_layer_by_bulk(
+                biases_of_current_layer,
+                keys_of_nodes_in_previous_layer,
+                nonzero_connections)
+
+            if self.weight_pruner is not None:
+                # the pruner needs bounds on the values of the nodes of every layer before its next layer is split
+                if nonzero_connections is None:
+                    lower_bounds, upper_bounds = self.weight_pruner.get_bounds_of_input_layer()
+                else:
+                    lower_bounds, upper_bounds = self.weight_pruner.get_bounds_of_layer(
+                        biases_of_current_layer,
+                        nonzero_connections,
+                        is_output_layer=(current_layer_number == len(self.layers) - 1))
+                for key_in_unprocessed_table, lower_bound, upper_bound in zip(keys_of_new_nodes, lower_bounds,
+                                                                              upper_bounds):
+                    current_layer.get_unprocessed_node_by_key(key_in_unprocessed_table).set_bounds_of_value(
+                        lower_bound, upper_bound)
+
+            current_layer_nodes_map = dict(enumerate(keys_of_new_nodes))
 
             # now we finished creating all connections between this layer and the previous one
             if current_layer_number == Network.LOCATION_OF_FIRST_LAYER:
@@ -182,9 +272,7 @@ class Network:
             if current_layer_number == len(self.layers) - 1:
                 last_layer_nodes_map = current_layer_nodes_map
 
-            # set previous_layer_nodes_map to be current_layer_nodes_map before continuing the loop
-            previous_layer_nodes_map = current_layer_nodes_map
-            current_layer_nodes_map = {}
+            keys_of_nodes_in_previous_layer = keys_of_new_nodes
 
         # at this point we created all the nodes and their connections
         # now create the bounds on all input nodes (which reside in layer 0)
@@ -532,7 +620,7 @@ class Network:
         """
 
         def function_to_calc_bias_for_arnode(list_of_inner_nodes):
-            return sum(list_of_inner_nodes)
+            return sum(node.get_node_bias() for node in list_of_inner_nodes)
 
         return function_to_calc_bias_for_arnode
 
@@ -589,43 +677,43 @@ class Network:
             current_layer_number = i + 1
             previous_layer = self.layers[i]
             # I would save a map that would tell me for each pair of nodes in the current_layer the value of m
-            # a pair would be accessible using (table_num1, key_in_table1, table_num2, key_in_table2)
+            # a pair would be accessible using pack_pair_of_keys_in_table(table_num, key_in_table1, key_in_table2)
             map_of_pairs_to_m = {}
 
             for table_number in Layer.OVERALL_ARNODE_TABLES:
                 # go through all arnodes in this table
                 is_arnode = True
                 for arnode in previous_layer.get_iterator_for_all_nodes_for_table(is_arnode, table_number):
-                    # for each arnode find all the pairs of arnodes its connected to by an outgoing connection
-                    for connection_data_pair in arnode.get_combinations_iterator_over_connections(
-                            GlobalNode.OUTGOING_EDGE_DIRECTION, 2):
-
-                        connection_data_1, connection_data_2 = connection_data_pair
-                        weight_of_connection_1 = connection_data_1[NodeEdges.INDEX_OF_WEIGHT_IN_DATA]
-                        weight_of_connection_2 = connection_data_2[NodeEdges.INDEX_OF_WEIGHT_IN_DATA]
+                    # for each arnode find all the pairs of arnodes its connected to by an outgoing connection.
+                    # the pairs are taken from the view over the connections, so no connection data list is created
+                    # for each arnode in the pair
+                    for table_number_of_pair, keys_in_table, weights, _ in arnode.get_view_over_connections(
+                            GlobalNode.OUTGOING_EDGE_DIRECTION):
 
                         # note that at this point we assume that arnodes in one type of table (for example pos-inc)
                         # connects only to arnodes that reside in the same type of table (in other layers)
                         # I'm sure it should follow from the layer assumptions.
-                        # if you disagree you could assert that the table number as returned
-                        # in the connection data, is never changing and always equal to table_number
-                        """
-                        if you wish to test
-                        assert connection_data_1[NodeEdges.INDEX_OF_TABLE_NUMBER_IN_DATA] == \
-                               weight_of_connection_2[NodeEdges.INDEX_OF_TABLE_NUMBER_IN_DATA] == table_number
-                        """
-
-                        m = abs(weight_of_connection_1 - weight_of_connection_2)
-
-                        key_of_pair_in_map_of_pairs = (connection_data_1[NodeEdges.INDEX_OF_TABLE_NUMBER_IN_DATA],
-                                                       connection_data_1[NodeEdges.INDEX_OF_KEY_IN_TABLE_IN_DATA],
-                                                       connection_data_2[NodeEdges.INDEX_OF_TABLE_NUMBER_IN_DATA],
-                                                       connection_data_2[NodeEdges.INDEX_OF_KEY_IN_TABLE_IN_DATA])
-
-                        if key_of_pair_in_map_of_pairs not in map_of_pairs_to_m \
-                                or m > map_of_pairs_to_m[key_of_pair_in_map_of_pairs]:
-                            # save for each pair of arnodes in the current layer its biggest m
-                            map_of_pairs_to_m[key_of_pair_in_map_of_pairs] = m
+                        # if you disagree you could assert that table_number_of_pair is always equal to table_number
+                        keys_in_table = list(keys_in_table)
+
+                        # the packed pair of (key_in_table_1, key_in_table_2) is the packed pair of (key_in_table_1, 0)
+                        # with key_in_table_2 in its lowest bits, so the first part is packed once for each key
+                        packed_pairs_with_first_keys = [
+                            pack_pair_of_keys_in_table(table_number_of_pair, key_in_table, 0)
+                            for key_in_table in keys_in_table]
+
+                        for (packed_pair_with_first_key, _, weight_of_connection_1), \
+                                (_, key_in_table_2, weight_of_connection_2) in \
+                                itertools.combinations(zip(packed_pairs_with_first_keys, keys_in_table, weights), 2):
+
+                            m = abs(weight_of_connection_1 - weight_of_connection_2)
+
+                            key_of_pair_in_map_of_pairs = packed_pair_with_first_key | key_in_table_2
+
+                            m_of_pair = map_of_pairs_to_m.get(key_of_pair_in_map_of_pairs)
+                            if m_of_pair is None or m > m_of_pair:
+                                # save for each pair of arnodes in the current layer its biggest m
+                                map_of_pairs_to_m[key_of_pair_in_map_of_pairs] = m
 
             # now we want to find the best pair in the current layer
             # the best pair would have the minimum m
@@ -647,10 +735,8 @@ class Network:
             raise Exception("no arnode set found that is legible for merging")
 
         # now you have the best pair to merge in the network so return the pair attributes
-        # best_pair data is of the form (table_num1, key_in_table1, table_num2, key_in_table2)
-        # and they should have the same table number
-        table_number = best_pair[0]
-        pairs_indices_in_table = [best_pair[1], best_pair[3]]
+        table_number, key_in_table_1, key_in_table_2 = unpack_pair_of_keys_in_table(best_pair)
+        pairs_indices_in_table = [key_in_table_1, key_in_table_2]
 
         return layer_of_best_pair, table_number, pairs_indices_in_table
 
@@ -703,25 +789,22 @@ class Network:
                         # the weight of connection of this node to its neighbor,
                         # and
                         # the weight of connection of the current arnode to the arnode that contains that neighbor.
-                        for incoming_connection_data in node.get_iterator_for_connections_data():
-                            incoming_node = incoming_connection_data[
-                                NodeEdges.INDEX_OF_REFERENCE_TO_NODE_CONNECTED_TO_IN_DATA]
-                            weight_of_connection_between_the_nodes = incoming_connection_data[
-                                NodeEdges.INDEX_OF_WEIGHT_IN_DATA]
-
-                            arnode_incoming_is_nested_in = incoming_node.get_pointer_to_ar_node_nested_in()
-                            weight_of_connection_between_the_arnodes = \
-                                arnode_incoming_is_nested_in.get_weight_of_connection_to_neighbor(
-                                    GlobalNode.OUTGOING_EDGE_DIRECTION, current_arnode.get_location())
-
-                            diff = abs(
-                                weight_of_connection_between_the_arnodes - weight_of_connection_between_the_nodes)
-
-                            if diff > best_arnode_to_split_m:
-                                best_arnode_to_split_m = diff
-                                best_arnode_to_split = current_arnode
-                                index_in_inner_nodes_to_take_out_of_arnode = j
-                                layer_number_of_best_arnode = layer_num
+                        for _, _, weights, references in node.get_view_over_connections(
+                                GlobalNode.INCOMING_EDGE_DIRECTION):
+                            for weight_of_connection_between_the_nodes, incoming_node in zip(weights, references):
+                                arnode_incoming_is_nested_in = incoming_node.get_pointer_to_ar_node_nested_in()
+                                weight_of_connection_between_the_arnodes = \
+                                    arnode_incoming_is_nested_in.get_weight_of_connection_to_neighbor(
+                                        GlobalNode.OUTGOING_EDGE_DIRECTION, current_arnode.get_location())
+
+                                diff = abs(
+                                    weight_of_connection_between_the_arnodes - weight_of_connection_between_the_nodes)
+
+                                if diff > best_arnode_to_split_m:
+                                    best_arnode_to_split_m = diff
+                                    best_arnode_to_split = current_arnode
+                                    index_in_inner_nodes_to_take_out_of_arnode = j
+                                    layer_number_of_best_arnode = layer_num
 
         if best_arnode_to_split is None:
             raise Exception("no arnode found that is legible for splitting")
@@ -762,6 +845,15 @@ class Network:
                                                function_to_calculate_merger_of_outgoing_edges,
                                                function_to_calculate_arnode_bias)
 
+    def compact_keys_of_arnode_tables(self):
+        """
+        after many merges and splits the keys in the arnode tables have holes. this makes the keys in every arnode
+        table exactly 0, 1, ..., n-1 again. the arnodes moved keep all their connections and equations.
+        note that it changes the locations of arnodes, so locations taken before calling it are no longer valid
+        :return: a list which holds for each layer the list returned by Layer.compact_keys_of_arnode_tables
+        """
+        return [layer.compact_keys_of_arnode_tables() for layer in self.layers]
+
     def _create_valid_equations_for_all_nodes_without_valid_equations(self):
         """
         creates valid equations for all nodes which do not have valid equations
@@ -774,6 +866,178 @@ class Network:
                 is_arnode = (node_code == self.global_network_manager.CODE_FOR_ARNODE)
                 layer.calculate_equation_and_constraint_for_a_specific_node(is_arnode, table_number, key_in_table)
 
+    def memory_report(self):
+        """
+        measures the memory taken by the nodes, arnodes and edges of the network, in order to decide how many workers
+        can run on a machine.
+        the sizes are taken with sys.getsizeof, so they include the objects of the network but not the data they share
+        with other objects (for example the global data manager or the nodes an edge points to)
+
+        :return: a list which holds for each layer a map with the following keys
+        'number_of_nodes', 'bytes_per_node' - the regular nodes in the layer, without their edges
+        'number_of_arnodes', 'bytes_per_arnode' - the arnodes in the layer, without their edges
+        'number_of_edges', 'bytes_per_edge' - the edges held by the nodes and arnodes of the layer. every connection is
+        held by both of the nodes it connects, so it is counted once in each of their layers
+        'total_bytes'
+        a per item size is 0 if the layer has no such items
+        """
+        def get_size_per_item(size_in_bytes, number_of_items):
+            if number_of_items == 0:
+                return 0
+            return size_in_bytes / number_of_items
+
+        report = []
+        for layer in self.layers:
+            number_of_nodes = 0
+            bytes_of_nodes = 0
+            number_of_arnodes = 0
+            bytes_of_arnodes = 0
+            number_of_edges = 0
+            bytes_of_edges = 0
+
+            for is_arnode, table_numbers in [(False, range(Layer.NUMBER_OF_OVERALL_TABLES)),
+                                             (True, Layer.OVERALL_ARNODE_TABLES)]:
+                for table_number in table_numbers:
+                    for node in layer.get_iterator_for_all_nodes_for_table(is_arnode, table_number):
+                        if is_arnode:
+                            number_of_arnodes += 1
+                            bytes_of_arnodes += node.get_size_in_bytes_without_edges()
+                        else:
+                            number_of_nodes += 1
+                            bytes_of_nodes += node.get_size_in_bytes_without_edges()
+
+                        number_of_edges += node.get_number_of_connections(GlobalNode.INCOMING_EDGE_DIRECTION)
+                        number_of_edges += node.get_number_of_connections(GlobalNode.OUTGOING_EDGE_DIRECTION)
+                        bytes_of_edges += node.get_size_in_bytes_of_edges()
+
+            report.append({'number_of_nodes': number_of_nodes,
+                           'bytes_per_node': get_size_per_item(bytes_of_nodes, number_of_nodes),
+                           'number_of_arnodes': number_of_arnodes,
+                           'bytes_per_arnode': get_size_per_item(bytes_of_arnodes, number_of_arnodes),
+                           'number_of_edges': number_of_edges,
+                           'bytes_per_edge': get_size_per_item(bytes_of_edges, number_of_edges),
+                           'total_bytes': bytes_of_nodes + bytes_of_arnodes + bytes_of_edges})
+
+        return report
+
+    def get_abstract_network_as_nnet_reader(self):
+        """
+        the network must be fully activated (the input layer is never fully activated, from assumption (3))
+
+        :return: an NNetReader compatible object which holds the current abstract network, that is the arnodes of all
+        the layers with their edges and biases, and the bounds on the input nodes.
+        the nodes of each layer are ordered by the arnode table they reside in and then by their key in that table.
+        since the nodes of the outer layers all reside in the pos-inc table in the order they were created, the input
+        and output nodes keep their original order.
+        a .nnet file applies a relu to every layer but the last, while the y nodes of the given network and the nodes
+        of the layers added after them (hard_code_acas_output_properties adds one) have no relu. so the affine maps of
+        the y layer and of all the added layers are composed into a single affine map, and the nodes of the last added
+        layer (for example the differences between the ys) are the output layer of the exported network.
+        note that the .nnet format has no place for the output bounds, so those are not included
+        """
+        if self.last_layer_not_fully_activated != Network.LOCATION_OF_FIRST_LAYER:
+            raise Exception("only a fully activated network can be exported")
+
+        input_lower_bounds = []
+        input_upper_bounds = []
+        weights = []
+        biases = []
+
+        # maps the location of an arnode in the previous layer to its index in the exported layer
+        indices_of_arnodes_in_previous_layer = {}
+        for layer in self.layers:
+            arnodes = [arnode for table_number in Layer.OVERALL_ARNODE_TABLES
+                       for arnode in layer.get_iterator_for_all_nodes_for_table(True, table_number)]
+
+            if layer.layer_number == Network.LOCATION_OF_FIRST_LAYER:
+                # from assumption (5) the input nodes keep their global ids, and their bounds are kept by those ids
+                for arnode in arnodes:
+                    inner_nodes = arnode.get_inner_nodes()
+                    if len(inner_nodes) != 1:
+                        raise Exception("input nodes can not be merged")
+                    global_id_of_input_node = inner_nodes[0].get_global_incoming_id()
+                    input_lower_bounds.append(self.global_network_manager.getLowerBound(global_id_of_input_node))
+                    input_upper_bounds.append(self.global_network_manager.getUpperBound(global_id_of_input_node))
+            else:
+                row_pointers = [0]
+                column_indices = []
+                values = []
+                for arnode in arnodes:
+                    for table_number, key_in_table, weight, _ in arnode.get_iterator_for_connections_data(
+                            ARNode.INCOMING_EDGE_DIRECTION):
+                        column_indices.append(indices_of_arnodes_in_previous_layer[(table_number, key_in_table)])
+                        values.append(weight)
+                    row_pointers.append(len(column_indices))
+
+                weights.append((row_pointers, column_indices, values))
+                biases.append([arnode.get_node_bias() for arnode in arnodes])
+
+            indices_of_arnodes_in_previous_layer = {arnode.get_location(): i for i, arnode in enumerate(arnodes)}
+
+        # weights[i] and biases[i] belong to layer i + 1
+        index_of_y_layer = self.last_layer_of_given_network - 1
+        while len(weights) - 1 != index_of_y_layer:
+            # the y layer is composed with the layer after it, and the result is the y layer of the next iteration
+            y_layer_weights = weights.pop(index_of_y_layer)
+            y_layer_biases = biases.pop(index_of_y_layer)
+            weights[index_of_y_layer], biases[index_of_y_layer] = \
+                Network._compose_affine_maps(y_layer_weights, y_layer_biases, weights[index_of_y_layer],
+                                             biases[index_of_y_layer])
+
+        return InMemoryNNetReader(weights, biases, input_lower_bounds, input_upper_bounds)
+
+    @staticmethod
+    def _compose_affine_maps(first_weights, first_biases, second_weights, second_biases):
+        """
+        :param first_weights: the weights of the first affine map, in a CSR form
+        :param first_biases:
+        :param second_weights: the weights of the second affine map, in a CSR form. its columns are the rows of the
+        first affine map
+        :param second_biases:
+        :return: a pair of (weights in a CSR form, biases) of the affine map which applies the first affine map and
+        then the second one, without a relu in between
+        """
+        first_row_pointers, first_column_indices, first_values = first_weights
+        second_row_pointers, second_column_indices, second_values = second_weights
+
+        row_pointers = [0]
+        column_indices = []
+        values = []
+        biases = []
+        for i in range(len(second_biases)):
+            weight_of_column = {}
+            bias = second_biases[i]
+            for k in range(second_row_pointers[i], second_row_pointers[i + 1]):
+                j = second_column_indices[k]
+                weight = second_values[k]
+                bias += weight * first_biases[j]
+                for m in range(first_row_pointers[j], first_row_pointers[j + 1]):
+                    column = first_column_indices[m]
+                    weight_of_column[column] = weight_of_column.get(column, 0) + weight * first_values[m]
+
+            for column in sorted(weight_of_column):
+                column_indices.append(column)
+                values.append(weight_of_column[column])
+            row_pointers.append(len(column_indices))
+            biases.append(bias)
+
+        return (row_pointers, column_indices, values), biases
+
+    def export_abstract_network(self, file_name, binary=False):
+        """
+        writes the current abstract network (see get_abstract_network_as_nnet_reader) to disk, so that it can be
+        solved or kept without this object
+
+        :param file_name:
+        :param binary: false by default, in which case a text .nnet file is written (read it with NNetReader).
+        if true, a binary file is written (read it with BinaryNNetReader)
+        """
+        nnet_reader = self.get_abstract_network_as_nnet_reader()
+        if binary:
+            NNetWriter.write_binary_file(nnet_reader, file_name)
+        else:
+            NNetWriter.write_nnet_file(nnet_reader, file_name)
+
     def check_if_network_is_sat_or_unsat(self):
         """
         this function check whether the network is sat, unsat, or has a spurious counter example
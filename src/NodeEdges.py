@@ -1,5 +1,7 @@
 # maybe make this an inner class inside the node class
 import itertools
+import operator
+import sys
 
 
 class NodeEdges:
@@ -8,6 +10,10 @@ class NodeEdges:
     i.e. it will only hold either outgoing or incoming edges
     it would work under the assumptions detailed in the ASSUMPTIONS file
     """
+    # every node holds 2 of those objects, so they do not have a __dict__
+    __slots__ = ('number_of_tables_in_layer_connected_to', 'list_of_tables',
+                 'layer_number_connected_to', 'relocation_counter', 'number_of_relocations_seen')
+
     LOCATION_OF_WEIGHT_IN_MAP = 0
     LOCATION_OF_REFERENCE_IN_MAP = 1
 
@@ -17,22 +23,61 @@ class NodeEdges:
     INDEX_OF_WEIGHT_IN_DATA = 2
     INDEX_OF_REFERENCE_TO_NODE_CONNECTED_TO_IN_DATA = 3
 
-    def __init__(self, number_of_tables_in_layer_connected_to):
+    def __init__(self, number_of_tables_in_layer_connected_to, layer_number_connected_to, relocation_counter):
         self.number_of_tables_in_layer_connected_to = number_of_tables_in_layer_connected_to
 
         # for tables which support deletion, we will use a list of unordered maps
         # such that map[key_in_table] = (weight of edge, reference to the node connected to)
         self.list_of_tables = [{} for _ in range(number_of_tables_in_layer_connected_to)]
 
+        # the nodes we are connected to do not tell us when they change their location. instead, whenever the
+        # number of relocations in their layer (counted by the RelocationCounter of the network) is not the one we saw
+        # last, we find their new locations through the references we hold to them
+        self.layer_number_connected_to = layer_number_connected_to
+        self.relocation_counter = relocation_counter
+        self.number_of_relocations_seen = relocation_counter.get_number_of_relocations_in_layer(
+            layer_number_connected_to)
+
+    def get_relocation_counter(self):
+        return self.relocation_counter
+
+    def _update_locations_of_connections_if_needed(self):
+        """
+        if some nodes in the layer we are connected to changed their location since we last checked, re-key all our
+        connections by the current locations of the nodes connected to.
+        every method which receives or returns locations calls this first
+        """
+        number_of_relocations = self.relocation_counter.get_number_of_relocations_in_layer(
+            self.layer_number_connected_to)
+        if number_of_relocations != self.number_of_relocations_seen:
+            number_of_connections = self.get_number_of_connections()
+            self._update_locations_of_connections()
+            self.number_of_relocations_seen = number_of_relocations
+            # every node connected to has a location of its own, so no two connections can be re-keyed to the same
+            # location
+            if self.get_number_of_connections() != number_of_connections:
+                raise AssertionError("some connections were re-keyed to the same location")
+
+    def _update_locations_of_connections(self):
+        list_of_tables = [{} for _ in range(self.number_of_tables_in_layer_connected_to)]
+        for table in self.list_of_tables:
+            for data in table.values():
+                node_connected_to = data[NodeEdges.LOCATION_OF_REFERENCE_IN_MAP]
+                # a node removes itself from its neighbors before it is killed, so its location is never stale
+                node_connected_to.check_if_killed_and_raise_error_if_is()
+                list_of_tables[node_connected_to.get_table_number()][node_connected_to.get_key_in_table()] = data
+
+        self.list_of_tables = list_of_tables
+
     def has_no_connections(self):
         """
         :return: true if the NodeEdges object has no connections
         """
         for table in self.list_of_tables:
             if len(table) != 0:
-                return True
+                return False
 
-        return False
+        return True
 
     def get_number_of_connections(self):
         number_of_connections = 0
@@ -40,6 +85,20 @@ class NodeEdges:
             number_of_connections += len(table)
         return number_of_connections
 
+    def get_size_in_bytes(self):
+        """
+        :return: the number of bytes taken by this object and the containers it holds the connections in.
+        the weights are counted for every connection, even if the same weight object is shared by some connections,
+        and the nodes connected to are not counted
+        """
+        size_in_bytes = sys.getsizeof(self) + sys.getsizeof(self.list_of_tables)
+        for table in self.list_of_tables:
+            size_in_bytes += sys.getsizeof(table)
+            for data in table.values():
+                size_in_bytes += sys.getsizeof(data) + sys.getsizeof(data[NodeEdges.LOCATION_OF_WEIGHT_IN_MAP])
+
+        return size_in_bytes
+
     def get_number_of_tables_in_layer_connected_to(self):
         return self.number_of_tables_in_layer_connected_to
 
@@ -49,6 +108,7 @@ class NodeEdges:
 
     def check_if_connection_exist(self, table_number, key_in_table):
         self._check_valid_table_number_and_raise_error_if_not(table_number)
+        self._update_locations_of_connections_if_needed()
 
         return key_in_table in self.list_of_tables[table_number]
 
@@ -67,9 +127,24 @@ class NodeEdges:
         :param node_connected_to:
         """
         self._check_valid_table_number_and_raise_error_if_not(table_number)
+        self._update_locations_of_connections_if_needed()
 
         self.list_of_tables[table_number][key_in_table] = (weight, node_connected_to)
 
+    def add_or_edit_connections_by_bulk(self, table_number, keys_in_table, weights, nodes_connected_to):
+        """
+        the same as calling add_or_edit_connection for each (key_in_table, weight, node_connected_to) triplet, but
+        the table is updated in a single pass
+        :param table_number:
+        :param keys_in_table: a sequence of keys in the table
+        :param weights: a sequence of weights of the same length
+        :param nodes_connected_to: a sequence of nodes of the same length
+        """
+        self._check_valid_table_number_and_raise_error_if_not(table_number)
+        self._update_locations_of_connections_if_needed()
+
+        self.list_of_tables[table_number].update(zip(keys_in_table, zip(weights, nodes_connected_to)))
+
     def find_weight_of_connection(self, table_number, key_in_table):
         self._check_valid_table_number_and_raise_error_if_not(table_number)
         self._check_if_connection_exist_and_raise_error_if_not(table_number, key_in_table)
@@ -98,6 +173,26 @@ class NodeEdges:
         del self.list_of_tables[table_number][key_in_table]
         return weight, node_connected_to
 
+    def delete_connections_by_bulk(self, list_of_locations):
+        """
+        the same as calling delete_connection for each (table_number, key_in_table) pair
+        :param list_of_locations: a list of (table_number, key_in_table) pairs of existing connections
+        """
+        self._update_locations_of_connections_if_needed()
+
+        list_of_tables = self.list_of_tables
+        for table_number, key_in_table in list_of_locations:
+            self._check_valid_table_number_and_raise_error_if_not(table_number)
+            if list_of_tables[table_number].pop(key_in_table, None) is None:
+                raise Exception("no such connection")
+
+    def delete_all_connections(self):
+        """
+        deletes all the connections in place, without checking anything and without creating new containers
+        """
+        for table in self.list_of_tables:
+            table.clear()
+
     def move_connection(self, previous_table_number, previous_key_in_table, new_table_number, new_key_in_table,
                         override_existing_connection=False):
         """
@@ -130,12 +225,35 @@ class NodeEdges:
 
         the iterator guarantees order in increasing table_number but does not guarantee order in key_in_table
         """
+        self._update_locations_of_connections_if_needed()
+
         for current_table_number in range(len(self.list_of_tables)):
             for key_in_table, data in self.list_of_tables[current_table_number].items():
                 weight = data[NodeEdges.LOCATION_OF_WEIGHT_IN_MAP]
                 reference_to_node_connected_to = data[NodeEdges.LOCATION_OF_REFERENCE_IN_MAP]
                 yield [current_table_number, key_in_table, weight, reference_to_node_connected_to]
 
+    def get_view_over_connections(self):
+        """
+        a read only view over the connections, for loops which go over many connections.
+        unlike get_iterator_over_connections, going over the view does not create a new list for each connection.
+
+        :return: a list which holds for each table that has connections a tuple of
+        (table_number, keys_in_table, weights, references_to_nodes_connected_to)
+        where the last 3 are iterables over the connections in the table, in the same order. they are meant to be
+        zipped together, for example
+        for table_number, keys_in_table, weights, references in node_edges.get_view_over_connections():
+            for key_in_table, weight, reference in zip(keys_in_table, weights, references):
+        the iterables can be gone over only once, and only as long as the connections were not changed
+        """
+        self._update_locations_of_connections_if_needed()
+
+        get_weight = operator.itemgetter(NodeEdges.LOCATION_OF_WEIGHT_IN_MAP)
+        get_reference = operator.itemgetter(NodeEdges.LOCATION_OF_REFERENCE_IN_MAP)
+
+        return [(table_number, table.keys(), map(get_weight, table.values()), map(get_reference, table.values()))
+                for table_number, table in enumerate(self.list_of_tables) if len(table) != 0]
+
     def get_combinations_iterator_over_connections(self, r):
         """
 
@@ -160,6 +278,8 @@ class NodeEdges:
         so when transferring the code to cpp, you could just copy it from there if you want.
         but I think that this kind of function should have implementations in many cpp libraries
         """
+        self._update_locations_of_connections_if_needed()
+
         for current_table_number in range(len(self.list_of_tables)):
             current_table_map = self.list_of_tables[current_table_number]
             # a map is an iterable in python which iterate through its keys
@@ -1,4 +1,5 @@
-from src.NodeEdges import NodeEdges
+import sys
+
 from src.Nodes.GlobalNode import GlobalNode
 
 
@@ -18,6 +19,8 @@ class ARNode(GlobalNode):
     if so, then the arnode takes care to notice those actions. if the arnode does not do anything about some actions,
     then it means that they do not affect the arnode.
     """
+    __slots__ = ('first_node_in_starting_nodes', 'location_of_ar_node_nested_in', 'inner_nodes', 'activation_status')
+
     # I want to first create the different arnodes and only after finishing creating them, activating them.
     # this is required to preserve assumption (1) because arnodes can not be created in another way which still
     # preserves it.
@@ -72,7 +75,8 @@ class ARNode(GlobalNode):
             layer_number,
             table_number, key_in_table,
             GlobalNode.NO_BIAS,
-            GlobalNode.NO_GLOBAL_ID, GlobalNode.NO_GLOBAL_ID, GlobalNode.NO_REFERENCE)
+            GlobalNode.NO_GLOBAL_ID, GlobalNode.NO_GLOBAL_ID, GlobalNode.NO_REFERENCE,
+            self.first_node_in_starting_nodes.get_relocation_counter())
 
         self.location_of_ar_node_nested_in = self.get_location()
 
@@ -89,16 +93,23 @@ class ARNode(GlobalNode):
 
         self.activation_status = ARNode.NOT_ACTIVATED_STATUS
 
-    def destructor(self):
+    def destructor(self, remove_this_node_from_neighbors_lists=True):
         # first go over the list of nodes got and reset their arnode owner
         for node in self.inner_nodes:
             node.reset_ar_node_nested_in()
 
-        super().destructor()
+        super().destructor(remove_this_node_from_neighbors_lists)
 
     def get_inner_nodes(self):
         return self.inner_nodes
 
+    def get_size_in_bytes_without_edges(self):
+        """
+        :return: the number of bytes taken by the arnode itself and its list of inner nodes (but not the inner nodes
+        themselves), not including its edges
+        """
+        return super().get_size_in_bytes_without_edges() + sys.getsizeof(self.inner_nodes)
+
     def get_global_incoming_id(self):
         # preserve assumption (8)
         if self.activation_status == ARNode.FULLY_ACTIVATED_STATUS:
@@ -114,27 +125,21 @@ class ARNode(GlobalNode):
     def check_if_node_equation_is_valid(self):
         # preserve assumption (8)
         if self.activation_status == ARNode.FULLY_ACTIVATED_STATUS:
-            return not self.global_data_manager.check_if_node_has_invalid_equations(self.layer_number,
-                                                                                    self.table_number,
-                                                                                    self.key_in_table,
+            return not self.global_data_manager.check_if_node_has_invalid_equations(self.packed_location,
                                                                                     is_arnode=True)
         return self.first_node_in_starting_nodes.check_if_node_equation_is_valid()
 
     def set_global_equation_to_invalid(self):
         # preserve assumption (8)
         if self.activation_status == ARNode.FULLY_ACTIVATED_STATUS:
-            return self.global_data_manager.add_location_of_node_that_dont_have_valid_equation(self.layer_number,
-                                                                                               self.table_number,
-                                                                                               self.key_in_table,
+            return self.global_data_manager.add_location_of_node_that_dont_have_valid_equation(self.packed_location,
                                                                                                is_arnode=True)
         self.first_node_in_starting_nodes.set_global_equation_to_invalid()
 
     def _set_global_equation_to_valid(self):
         # preserve assumption (8)
         if self.activation_status == ARNode.FULLY_ACTIVATED_STATUS:
-            return self.global_data_manager.remove_location_of_node_that_dont_have_valid_equation(self.layer_number,
-                                                                                                  self.table_number,
-                                                                                                  self.key_in_table,
+            return self.global_data_manager.remove_location_of_node_that_dont_have_valid_equation(self.packed_location,
                                                                                                   is_arnode=True)
         self.first_node_in_starting_nodes._set_global_equation_to_valid()
 
@@ -150,6 +155,18 @@ class ARNode(GlobalNode):
             return super().set_node_bias(bias)
         return self.first_node_in_starting_nodes.set_node_bias(bias)
 
+    def check_if_has_constraint(self):
+        # preserve assumption (8)
+        if self.activation_status == ARNode.FULLY_ACTIVATED_STATUS:
+            return super().check_if_has_constraint()
+        return self.first_node_in_starting_nodes.check_if_has_constraint()
+
+    def get_equation(self):
+        # preserve assumption (8)
+        if self.activation_status == ARNode.FULLY_ACTIVATED_STATUS:
+            return super().get_equation()
+        return self.first_node_in_starting_nodes.get_equation()
+
     def check_if_have_global_id(self):
         # preserve assumption (8)
         if self.activation_status == ARNode.FULLY_ACTIVATED_STATUS:
@@ -193,6 +210,26 @@ class ARNode(GlobalNode):
     def get_activation_status(self):
         return self.activation_status
 
+    def restore_activation_status(self, activation_status, bias, global_incoming_id, global_outgoing_id):
+        """
+        makes the arnode hold the activation status it had when the network was saved, without activating it again
+        (see PreprocessedNetworkCache).
+        the bias and the global ids are used only if the arnode was fully activated, otherwise from assumption (8) they
+        are those of its first inner node. the equation of a fully activated arnode is restored by
+        restore_equation_constraint_and_bounds, after its activation status is restored
+        :param activation_status:
+        :param bias:
+        :param global_incoming_id:
+        :param global_outgoing_id:
+        """
+        self.activation_status = activation_status
+        if activation_status == ARNode.FULLY_ACTIVATED_STATUS:
+            # as in _take_control_over_inner_nodes_global_values
+            self.global_data_manager = self.first_node_in_starting_nodes.global_data_manager
+            self.bias = bias
+            self.global_incoming_id = global_incoming_id
+            self.global_outgoing_id = global_outgoing_id
+
     def _take_control_over_inner_nodes_global_values(self, function_to_calculate_arnode_bias,
                                                      should_recalculate_bounds):
         """
@@ -268,7 +305,6 @@ class ARNode(GlobalNode):
             self.global_incoming_id, self.global_outgoing_id = inner_nodes_that_still_have_global_variables[
                 0].remove_id_equation_and_constraint(return_id=False)
         else:
-            self.global_incoming_id = self.global_data_manager.get_new_id()
             # now check if the arnode should have only 1 id or 2
             # from assumption (2) all inner nodes are in the same table
             # from assumption (11) it means that all inner nodes are from the same layer
@@ -276,8 +312,9 @@ class ARNode(GlobalNode):
             # so it suffices to check only the first inner node
             should_create_2_global_ids = self.first_node_in_starting_nodes.check_if_node_is_inner()
             if should_create_2_global_ids:
-                self.global_outgoing_id = self.global_data_manager.get_new_id()
+                self.global_incoming_id, self.global_outgoing_id = self.global_data_manager.get_new_ids(2)
             else:
+                self.global_incoming_id = self.global_data_manager.get_new_id()
                 self.global_outgoing_id = self.global_incoming_id
 
         # calculate the arnode equation and constraints
@@ -318,29 +355,29 @@ class ARNode(GlobalNode):
         using this function. if the function returns false we would raise an Exception
         """
         # first go over all arnodes we are connected to and create a map of
-        # arnode_location -> [reference_to_arnode, [list of weights we are connected to this arnode with]]
+        # packed arnode_location -> [reference_to_arnode, [list of weights we are connected to this arnode with]]
         # by assumption (6) all nodes we are connected to via an outgoing connection reside in the same layer and
         # as such the arnode_location is a unique identifier for it
         map_of_weights = {}
         for node in self.inner_nodes:
-            for edge_data in node.get_iterator_for_connections_data(direction_of_connection):
-                _, _, weight, node_connected_to = edge_data
-                arnode_connected_to = node_connected_to.get_pointer_to_ar_node_nested_in()
-                if arnode_connected_to == GlobalNode.NO_REFERENCE:
-                    # assumption (1) is violated, we can't find an arnode to link to
-                    raise AssertionError("can not calculate edge because a connection can not link into any"
-                                         "existent arnode")
+            for _, _, weights, references in node.get_view_over_connections(direction_of_connection):
+                for weight, node_connected_to in zip(weights, references):
+                    arnode_connected_to = node_connected_to.get_pointer_to_ar_node_nested_in()
+                    if arnode_connected_to == GlobalNode.NO_REFERENCE:
+                        # assumption (1) is violated, we can't find an arnode to link to
+                        raise AssertionError("can not calculate edge because a connection can not link into any"
+                                             "existent arnode")
 
-                if not function_to_verify_arnode_neighbors_with(arnode_connected_to):
-                    raise AssertionError("failed screening via function")
+                    if not function_to_verify_arnode_neighbors_with(arnode_connected_to):
+                        raise AssertionError("failed screening via function")
 
-                location_of_arnode_connected_to = arnode_connected_to.get_location()
+                    location_of_arnode_connected_to = arnode_connected_to.get_packed_location()
 
-                # now check if we have seen the arnode before or not and update the map_of_weights accordingly
-                if location_of_arnode_connected_to in map_of_weights:
-                    map_of_weights[location_of_arnode_connected_to][1].append(weight)
-                else:
-                    map_of_weights[location_of_arnode_connected_to] = [arnode_connected_to, [weight]]
+                    # now check if we have seen the arnode before or not and update the map_of_weights accordingly
+                    if location_of_arnode_connected_to in map_of_weights:
+                        map_of_weights[location_of_arnode_connected_to][1].append(weight)
+                    else:
+                        map_of_weights[location_of_arnode_connected_to] = [arnode_connected_to, [weight]]
 
         # now the final weight would be the result of the activation of the
         # function_to_calculate_merger_of_outgoing_edges on
@@ -374,13 +411,13 @@ class ARNode(GlobalNode):
 
         direction_of_connection = GlobalNode.OUTGOING_EDGE_DIRECTION
         for node in self.inner_nodes:
-            for edge_data in node.get_iterator_for_connections_data(direction_of_connection):
-                _, _, _, node_connected_to = edge_data
-                arnode_connected_to = node_connected_to.get_pointer_to_ar_node_nested_in()
-                if arnode_connected_to == GlobalNode.NO_REFERENCE:
-                    # assumption (1) is violated, we can't find an arnode to link to
-                    raise AssertionError("can not activate arnode because an outgoing connection can not link into any "
-                                         "existent arnode")
+            for _, _, _, references in node.get_view_over_connections(direction_of_connection):
+                for node_connected_to in references:
+                    arnode_connected_to = node_connected_to.get_pointer_to_ar_node_nested_in()
+                    if arnode_connected_to == GlobalNode.NO_REFERENCE:
+                        # assumption (1) is violated, we can't find an arnode to link to
+                        raise AssertionError("can not activate arnode because an outgoing connection can not link "
+                                             "into any existent arnode")
 
     def forward_activate_arnode(self, function_to_calculate_merger_of_outgoing_edges):
         """
@@ -442,30 +479,30 @@ class ARNode(GlobalNode):
         our_location = self.get_location()
         direction_of_connection = GlobalNode.INCOMING_EDGE_DIRECTION
         for node in self.inner_nodes:
-            for edge_data in node.get_iterator_for_connections_data(direction_of_connection):
-                _, _, _, node_connected_to = edge_data
-                arnode_connected_to = node_connected_to.get_pointer_to_ar_node_nested_in()
-                if arnode_connected_to == GlobalNode.NO_REFERENCE:
-                    # assumption (1) is violated, we can't find an arnode to link to
-                    raise AssertionError("can not activate arnode because an incoming connection can not link into any"
-                                         "existent arnode")
-
-                # if an node is connected to us by an edge that is outgoing from us it means that for him we are
-                # an incoming connection,m and vice versa
-                if not arnode_connected_to.check_if_neighbor_exists(-direction_of_connection, our_location):
-                    raise AssertionError("arnode that should be connected to this arnode was not connected. can not "
-                                         "fully activate arnode")
-
-                if arnode_connected_to.get_activation_status() == ARNode.NOT_ACTIVATED_STATUS:
-                    raise AssertionError("can not fully activate arnode since an incoming connection is not "
-                                         "forward activated")
+            for _, _, _, references in node.get_view_over_connections(direction_of_connection):
+                for node_connected_to in references:
+                    arnode_connected_to = node_connected_to.get_pointer_to_ar_node_nested_in()
+                    if arnode_connected_to == GlobalNode.NO_REFERENCE:
+                        # assumption (1) is violated, we can't find an arnode to link to
+                        raise AssertionError("can not activate arnode because an incoming connection can not link "
+                                             "into any existent arnode")
+
+                    # if an node is connected to us by an edge that is outgoing from us it means that for him we are
+                    # an incoming connection,m and vice versa
+                    if not arnode_connected_to.check_if_neighbor_exists(-direction_of_connection, our_location):
+                        raise AssertionError("arnode that should be connected to this arnode was not connected. can "
+                                             "not fully activate arnode")
+
+                    if arnode_connected_to.get_activation_status() == ARNode.NOT_ACTIVATED_STATUS:
+                        raise AssertionError("can not fully activate arnode since an incoming connection is not "
+                                             "forward activated")
 
         # check that all arnodes we are connected to by an outgoing connection are fully activated
-        for connections_data in self.get_iterator_for_connections_data(GlobalNode.OUTGOING_EDGE_DIRECTION):
-            arnode_connected_to = connections_data[NodeEdges.INDEX_OF_REFERENCE_TO_NODE_CONNECTED_TO_IN_DATA]
-            if arnode_connected_to.get_activation_status() != ARNode.FULLY_ACTIVATED_STATUS:
-                raise AssertionError("can not fully activate arnode since an outgoing connection is not "
-                                     "fully activated")
+        for _, _, _, references in self.get_view_over_connections(GlobalNode.OUTGOING_EDGE_DIRECTION):
+            for arnode_connected_to in references:
+                if arnode_connected_to.get_activation_status() != ARNode.FULLY_ACTIVATED_STATUS:
+                    raise AssertionError("can not fully activate arnode since an outgoing connection is not "
+                                         "fully activated")
 
         return True
 
@@ -1,5 +1,4 @@
 from src.Nodes.Node import Node
-from src.NodeEdges import NodeEdges
 
 """
 this class is the a wrapper around the node class which enables
@@ -8,6 +7,9 @@ the node class to also have global variables which relate to the marabou system
 
 
 class GlobalNode(Node):
+    __slots__ = ('global_incoming_id', 'global_outgoing_id', 'node_is_inner', 'global_data_manager', 'equation',
+                 'bias', 'lower_bound_of_value', 'upper_bound_of_value', 'has_constraint', 'has_bounds')
+
     NO_GLOBAL_ID = -1
     # when you implement this in cpp have another way to check if the pointer is valid. I remember we saw some way to
     # have the pointer be null or 0 in cpp
@@ -21,12 +23,14 @@ class GlobalNode(Node):
                  table_number, key_in_table,
                  bias,
                  global_incoming_id, global_outgoing_id,
-                 global_data_manager):
+                 global_data_manager,
+                 relocation_counter):
 
         super().__init__(number_of_tables_in_previous_layer,
                          number_of_tables_in_next_layer,
                          layer_number,
-                         table_number, key_in_table)
+                         table_number, key_in_table,
+                         relocation_counter)
         # each node which is not an input or and output node would be represented by 2 system nodes, which would be
         # connected by a relu activation function. those nodes ids are given to the node as incoming_id and outgoing_id.
         # if a node is an input or output node, the incoming_id should be equal to the outgoing_id
@@ -53,14 +57,20 @@ class GlobalNode(Node):
         # the node lives, because the arnodes which take over this node would use this node bias to calculate their own
         # bias
 
+        # bounds on the value this node gives to the next layer (after its relu), for every input within the input
+        # bounds. they are only calculated when connections with tiny weights are pruned (see WeightPruner), which
+        # needs them to bound what the pruned connections could have contributed
+        self.lower_bound_of_value = float('-inf')
+        self.upper_bound_of_value = float('inf')
+
         # each node would manage the constraint between its 2 global IDs. if the ids are the same, no constraint would
         # be added
         self.has_constraint = False
         # if we set bounds on this node, this would be set to true
         self.has_bounds = False
 
-    def destructor(self):
-        super().destructor()
+    def destructor(self, remove_this_node_from_neighbors_lists=True):
+        super().destructor(remove_this_node_from_neighbors_lists)
 
         # its actually better computationally to first remove all the neighbors and only then remove
         # yourself from the global system - that way you wont need to notice all the neighbors that youre
@@ -82,20 +92,34 @@ class GlobalNode(Node):
     def check_if_has_bounds(self):
         return self.has_bounds
 
+    def check_if_has_constraint(self):
+        return self.has_constraint
+
+    def get_equation(self):
+        return self.equation
+
+    def restore_equation_constraint_and_bounds(self, equation, has_constraint, has_bounds):
+        """
+        makes the node hold the equation, constraint and bounds it held when the network was saved, without adding
+        anything to the global data manager (see PreprocessedNetworkCache).
+        the equation, the relu constraint and the bounds must already be in the input query of the global data manager
+        :param equation: an equation in the input query, or NO_EQUATION
+        :param has_constraint:
+        :param has_bounds:
+        """
+        self.equation = equation
+        self.has_constraint = has_constraint
+        self.has_bounds = has_bounds
+
     def check_if_node_equation_is_valid(self):
-        return not self.global_data_manager.check_if_node_has_invalid_equations(self.layer_number,
-                                                                                self.table_number,
-                                                                                self.key_in_table,
-                                                                                is_arnode=False)
+        return not self.global_data_manager.check_if_node_has_invalid_equations(self.packed_location, is_arnode=False)
 
     def set_global_equation_to_invalid(self):
         """
         for example, if an incoming neighbor changed its global id for some reason, then the equation we calculated
         is no longer correct
         """
-        self.global_data_manager.add_location_of_node_that_dont_have_valid_equation(self.layer_number,
-                                                                                    self.table_number,
-                                                                                    self.key_in_table,
+        self.global_data_manager.add_location_of_node_that_dont_have_valid_equation(self.packed_location,
                                                                                     is_arnode=False)
 
     def _set_global_equation_to_valid(self):
@@ -103,14 +127,22 @@ class GlobalNode(Node):
         for example, if an incoming neighbor changed its global id for some reason, then the equation we calculated
         is no longer correct
         """
-        self.global_data_manager.remove_location_of_node_that_dont_have_valid_equation(self.layer_number,
-                                                                                       self.table_number,
-                                                                                       self.key_in_table,
+        self.global_data_manager.remove_location_of_node_that_dont_have_valid_equation(self.packed_location,
                                                                                        is_arnode=False)
 
     def get_node_bias(self):
         return self.bias
 
+    def get_bounds_of_value(self):
+        """
+        :return: a pair of (lower bound, upper bound) on the value this node gives to the next layer
+        """
+        return self.lower_bound_of_value, self.upper_bound_of_value
+
+    def set_bounds_of_value(self, lower_bound_of_value, upper_bound_of_value):
+        self.lower_bound_of_value = lower_bound_of_value
+        self.upper_bound_of_value = upper_bound_of_value
+
     def set_node_bias(self, bias):
         self.bias = bias
         # no need to check if if self.equation == Node.NO_EQUATION, because if so then from assumption (14)
@@ -209,14 +241,9 @@ class GlobalNode(Node):
         self.equation.addAddend(-1, self.global_incoming_id)
 
         # now go through all incoming nodes and add weight * node_id to the equation
-        iterator_over_incoming_connections = self.incoming_edges_manager.get_iterator_over_connections()
-
-        for connection_data in iterator_over_incoming_connections:
-            weight = connection_data[NodeEdges.INDEX_OF_WEIGHT_IN_DATA]
-            id_of_incoming_node = connection_data[
-                NodeEdges.INDEX_OF_REFERENCE_TO_NODE_CONNECTED_TO_IN_DATA].get_global_outgoing_id()
-
-            self.equation.addAddend(weight, id_of_incoming_node)
+        for _, _, weights, references in self.incoming_edges_manager.get_view_over_connections():
+            for weight, incoming_node in zip(weights, references):
+                self.equation.addAddend(weight, incoming_node.get_global_outgoing_id())
 
         # finally set the equation to equation to 0 and add the equation to the input query
         self.equation.setScalar(-self.bias)
@@ -280,6 +307,22 @@ class GlobalNode(Node):
 
         return global_incoming_id_to_return, global_outgoing_id_to_return
 
+    def remove_id_equation_and_constraint_and_get_ids_to_give_back(self):
+        """
+        the same as the removal of the global variables done by the destructor, but the ids are returned instead of
+        being given back, so the ids of many nodes which are destroyed together can be given back in one call to
+        give_ids_back of the global data manager
+        :return: a list of the ids of the node which should be given back (empty if the node had no ids)
+        """
+        if self.global_incoming_id == GlobalNode.NO_GLOBAL_ID and self.global_outgoing_id == GlobalNode.NO_GLOBAL_ID:
+            return []
+
+        global_incoming_id, global_outgoing_id = self.remove_id_equation_and_constraint(
+            give_back_id_to_data_manager=False)
+        if global_incoming_id == global_outgoing_id:
+            return [global_incoming_id]
+        return [global_incoming_id, global_outgoing_id]
+
     def _add_or_edit_neighbors_helper(self, direction_of_connection, list_of_connection_data,
                                       add_this_node_to_given_node_neighbors=True):
 
@@ -291,6 +334,16 @@ class GlobalNode(Node):
             # from assumption (8) the equation is affected only by incoming connections
             self.set_global_equation_to_invalid()
 
+    def add_or_edit_one_sided_neighbors_in_table_by_bulk(self, direction_of_connection, table_number,
+                                                         keys_in_table, weights, nodes_connected_to):
+
+        super().add_or_edit_one_sided_neighbors_in_table_by_bulk(direction_of_connection, table_number,
+                                                                 keys_in_table, weights, nodes_connected_to)
+
+        if direction_of_connection == Node.INCOMING_EDGE_DIRECTION:
+            # from assumption (8) the equation is affected only by incoming connections
+            self.set_global_equation_to_invalid()
+
     def remove_neighbor_from_neighbors_list(self, direction_of_connection, neighbor_location_data,
                                             remove_this_node_from_given_node_neighbors_list=True):
 
@@ -305,3 +358,15 @@ class GlobalNode(Node):
                 # an incoming connection data was edited and as such if an equation was calculated before,
                 # it is now invalid from assumption (8) the equation is affected only by incoming connections
                 self.set_global_equation_to_invalid()
+
+    def remove_neighbors_from_neighbors_list_by_bulk(self, direction_of_connection, list_of_neighbors_location_data):
+        super().remove_neighbors_from_neighbors_list_by_bulk(direction_of_connection, list_of_neighbors_location_data)
+
+        # the validity of the equation is updated once for all the connections removed, the same way as in
+        # remove_neighbor_from_neighbors_list
+        if direction_of_connection == Node.INCOMING_EDGE_DIRECTION and len(list_of_neighbors_location_data) != 0:
+            if self.incoming_edges_manager.has_no_connections():
+                # assumption (14)
+                self._set_global_equation_to_valid()
+            else:
+                self.set_global_equation_to_invalid()
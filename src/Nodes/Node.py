@@ -1,4 +1,7 @@
+import sys
+
 from src.NodeEdges import NodeEdges
+from src.PackedLocations import pack_location
 
 
 class Node:
@@ -6,20 +9,32 @@ class Node:
     this class would represent a node that would work under the assumptions detailed in
     the ASSUMPTIONS file
     """
+    # a network holds up to 4 nodes and an arnode for every neuron, so the nodes do not have a __dict__.
+    # every attribute of the node classes must be listed in the __slots__ of the class which sets it
+    __slots__ = ('layer_number', 'table_number', 'key_in_table', 'packed_location',
+                 'incoming_edges_manager', 'outgoing_edges_manager',
+                 'pointer_to_ar_node_nested_in', 'node_can_change_location', 'finished_lifetime')
+
     # its important that they would be opposite to each other
     INCOMING_EDGE_DIRECTION = -1
     OUTGOING_EDGE_DIRECTION = 1
 
     NO_TABLE_NUMBER = -1
     NO_KEY_IN_TABLE = -1
+    NO_PACKED_LOCATION = -1
 
     NO_REFERENCE = None
 
+    # the class which holds the edges of the node in each direction. it can be replaced by any class with the
+    # interface of NodeEdges (for example ArrayNodeEdges, which takes less memory) before the network is created
+    EDGES_MANAGER_CLASS = NodeEdges
+
     def __init__(self,
                  number_of_tables_in_previous_layer,
                  number_of_tables_in_next_layer,
                  layer_number,
-                 table_number, key_in_table):
+                 table_number, key_in_table,
+                 relocation_counter):
         """
 
         note that from assumption (3) we do need to care about tables in the current layer
@@ -38,9 +53,14 @@ class Node:
         self.layer_number = layer_number
         self.table_number = table_number
         self.key_in_table = key_in_table
+        self.packed_location = Node.NO_PACKED_LOCATION
+        if table_number != Node.NO_TABLE_NUMBER:
+            self.packed_location = pack_location(layer_number, table_number, key_in_table)
 
-        self.incoming_edges_manager = NodeEdges(number_of_tables_in_previous_layer)
-        self.outgoing_edges_manager = NodeEdges(number_of_tables_in_next_layer)
+        self.incoming_edges_manager = self.EDGES_MANAGER_CLASS(number_of_tables_in_previous_layer, layer_number - 1,
+                                                               relocation_counter)
+        self.outgoing_edges_manager = self.EDGES_MANAGER_CLASS(number_of_tables_in_next_layer, layer_number + 1,
+                                                               relocation_counter)
 
         # when you implement this is cpp have this be a void* pointer to avoid circular dependencies
         self.pointer_to_ar_node_nested_in = Node.NO_REFERENCE
@@ -58,34 +78,62 @@ class Node:
         if self.finished_lifetime:
             raise Exception("this node is dead and can not support any function")
 
-    def destructor(self):
+    def destructor(self, remove_this_node_from_neighbors_lists=True):
         """
         removes the node from all of its neighbors,
         and sets the node finished_lifetime to True
+
+        :param remove_this_node_from_neighbors_lists: should be false only if the node was already removed from all of
+        its neighbors, by remove_nodes_from_their_neighbors_lists_by_bulk
         """
 
         # later when moving to cpp you would have to destroy the various data structures you used
 
-        our_location = self.get_location()
-
-        def remove_from_node_by_direction_and_data(direction_of_connection, neighbor_node):
-            # I choose to simply remove the connection data from the neighbor but not from us since we are
-            # going to destroy the entire NodeEdges structure after we are done, so there is no need to remove each
-            # connection from it one by one.
+        if remove_this_node_from_neighbors_lists:
+            Node.remove_nodes_from_their_neighbors_lists_by_bulk([self])
 
-            # if an node is connected to us by an edge that is incoming to us it means that for him we are
-            # an outgoing connection
-            neighbor_node.remove_neighbor_from_neighbors_list(-direction_of_connection,
-                                                              our_location,
-                                                              remove_this_node_from_given_node_neighbors_list=False)
+        # the neighbors no longer point to this node, but this node still points to them. drop those references so
+        # that this node never keeps other nodes alive, and is freed as soon as the last reference to it is gone,
+        # without waiting for the garbage collector (see GarbageCollectionManager)
+        self.incoming_edges_manager.delete_all_connections()
+        self.outgoing_edges_manager.delete_all_connections()
+        self.pointer_to_ar_node_nested_in = Node.NO_REFERENCE
 
-        for neighbor in self.incoming_edges_manager.get_a_list_of_all_neighbors_pointers():
-            remove_from_node_by_direction_and_data(Node.INCOMING_EDGE_DIRECTION, neighbor)
+        self.finished_lifetime = True
 
-        for neighbor in self.outgoing_edges_manager.get_a_list_of_all_neighbors_pointers():
-            remove_from_node_by_direction_and_data(Node.OUTGOING_EDGE_DIRECTION, neighbor)
+    @staticmethod
+    def remove_nodes_from_their_neighbors_lists_by_bulk(nodes):
+        """
+        removes each of the given nodes from all of its neighbors in one sweep, which visits each neighbor once for
+        each direction no matter to how many of the nodes it is connected to.
+        the connections are removed only from the neighbors and not from the given nodes, since the given nodes are
+        about to be destroyed, so there is no need to remove each connection from them one by one.
+        after calling this function the given nodes must be destroyed
 
-        self.finished_lifetime = True
+        :param nodes: nodes which are not neighbors of each other
+        """
+        # map each (neighbor, direction of connection from the neighbor perspective) to the neighbor and the
+        # locations of the given nodes it should remove
+        locations_to_remove_by_neighbor_and_direction = {}
+        for node in nodes:
+            node_location = node.get_location()
+            for direction_of_connection in [Node.INCOMING_EDGE_DIRECTION, Node.OUTGOING_EDGE_DIRECTION]:
+                # if an node is connected to us by an edge that is incoming to us it means that for him we are
+                # an outgoing connection
+                direction_of_connection_for_neighbor = -direction_of_connection
+                for _, _, _, references in node.get_view_over_connections(direction_of_connection):
+                    for neighbor in references:
+                        neighbor_and_direction = (neighbor, direction_of_connection_for_neighbor)
+                        locations_to_remove = locations_to_remove_by_neighbor_and_direction.get(neighbor_and_direction)
+                        if locations_to_remove is None:
+                            locations_to_remove = []
+                            locations_to_remove_by_neighbor_and_direction[neighbor_and_direction] = locations_to_remove
+                        locations_to_remove.append(node_location)
+
+        for (neighbor, direction_of_connection_for_neighbor), locations_to_remove in \
+                locations_to_remove_by_neighbor_and_direction.items():
+            neighbor.remove_neighbors_from_neighbors_list_by_bulk(direction_of_connection_for_neighbor,
+                                                                 locations_to_remove)
 
     def set_in_stone(self):
         # from assumption (3)
@@ -95,16 +143,22 @@ class Node:
         return self.node_can_change_location
 
     def set_new_location(self, new_table_number, new_key_in_table, notify_neighbors_that_location_changed=True):
+        """
+        :param new_table_number:
+        :param new_key_in_table:
+        :param notify_neighbors_that_location_changed: should be true if the node has neighbors. the neighbors are
+        not notified one by one, the relocation is counted in the node layer and the neighbors find the new location
+        of the node the next time they use their connection to it (see NodeEdges)
+        """
         if not self.node_can_change_location:
             raise Exception("node location can not be changed")
 
-        previous_location = self.get_location()
-
         self.table_number = new_table_number
         self.key_in_table = new_key_in_table
+        self.packed_location = pack_location(self.layer_number, new_table_number, new_key_in_table)
 
         if notify_neighbors_that_location_changed:
-            self.notify_all_neighbors_that_my_location_changed(previous_location)
+            self.get_relocation_counter().count_relocation_in_layer(self.layer_number)
 
     def get_table_number(self):
         return self.table_number
@@ -118,6 +172,12 @@ class Node:
     def get_number_of_tables_in_next_layer(self):
         return self.outgoing_edges_manager.get_number_of_tables_in_layer_connected_to()
 
+    def get_relocation_counter(self):
+        """
+        :return: the RelocationCounter of the network the node is in
+        """
+        return self.incoming_edges_manager.get_relocation_counter()
+
     def set_pointer_to_ar_node_nested_in(self, pointer_to_ar_node_nested_in):
         if self.is_nested_in_ar_node():
             raise Exception("node is already nested in another ar_node. call reset_ar_node_nested_in before "
@@ -143,6 +203,14 @@ class Node:
         # in the id. hence the node id is unique only in the preview of the layer its in
         return self.table_number, self.key_in_table
 
+    def get_packed_location(self):
+        """
+        :return: the location of the node in the network, (layer_number, table_number, key_in_table), packed into a
+        single int by pack_location. use it instead of a tuple when the location is a key of a map or a set
+        """
+        self.check_if_killed_and_raise_error_if_is()
+        return self.packed_location
+
     def add_or_edit_neighbor(self, direction_of_connection, connection_data):
         """
         :param direction_of_connection: INCOMING_EDGE_DIRECTION or OUTGOING_EDGE_DIRECTION
@@ -209,6 +277,32 @@ class Node:
                                                                 [connection_data_to_feed_to_neighbor],
                                                                 add_this_node_to_given_node_neighbors=False)
 
+    def add_or_edit_one_sided_neighbors_in_table_by_bulk(self, direction_of_connection, table_number,
+                                                         keys_in_table, weights, nodes_connected_to):
+        """
+        :param direction_of_connection: INCOMING_EDGE_DIRECTION or OUTGOING_EDGE_DIRECTION
+        :param table_number: the table all the given nodes reside in
+        :param keys_in_table: the keys of the given nodes in that table
+        :param weights: the weights of the connections
+        :param nodes_connected_to: the given nodes
+
+        adds the connections only to this node, the given nodes are not told about this node.
+        TAKE GREAT CARE WHEN YOU USE IT, THE CALLER MUST ADD THE CONNECTIONS FROM THE OTHER SIDE BEFORE RELOCATING
+        THIS NODE OR THE NODES IT CONNECTED TO.
+        it is used to connect 2 whole layers at once, where each node is visited only once instead of once per edge
+        """
+        self.check_if_killed_and_raise_error_if_is()
+
+        if direction_of_connection == Node.INCOMING_EDGE_DIRECTION:
+            edges_manager_to_work_with = self.incoming_edges_manager
+        elif direction_of_connection == Node.OUTGOING_EDGE_DIRECTION:
+            edges_manager_to_work_with = self.outgoing_edges_manager
+        else:
+            raise Exception("invalid direction_of_connection")
+
+        edges_manager_to_work_with.add_or_edit_connections_by_bulk(table_number, keys_in_table, weights,
+                                                                   nodes_connected_to)
+
     def remove_neighbor_from_neighbors_list(self, direction_of_connection, neighbor_location_data,
                                             remove_this_node_from_given_node_neighbors_list=True):
         """
@@ -238,6 +332,26 @@ class Node:
             node_connected_to.remove_neighbor_from_neighbors_list(-direction_of_connection, self.get_location(),
                                                                   remove_this_node_from_given_node_neighbors_list=False)
 
+    def remove_neighbors_from_neighbors_list_by_bulk(self, direction_of_connection, list_of_neighbors_location_data):
+        """
+        the same as calling remove_neighbor_from_neighbors_list for each of the given locations with
+        remove_this_node_from_given_node_neighbors_list=False.
+        TAKE GREAT CARE WHEN YOU USE IT, YOU MUST NOT RELOCATE THIS NODE OR THE NODES YOU WERE CONNECTED TO.
+
+        :param direction_of_connection:
+        :param list_of_neighbors_location_data:
+        """
+        self.check_if_killed_and_raise_error_if_is()
+
+        if direction_of_connection == Node.INCOMING_EDGE_DIRECTION:
+            edges_manager_to_work_with = self.incoming_edges_manager
+        elif direction_of_connection == Node.OUTGOING_EDGE_DIRECTION:
+            edges_manager_to_work_with = self.outgoing_edges_manager
+        else:
+            raise Exception("invalid direction_of_connection")
+
+        edges_manager_to_work_with.delete_connections_by_bulk(list_of_neighbors_location_data)
+
     def check_if_neighbor_exists(self, direction_of_connection, neighbor_location_data):
         """
 
@@ -282,6 +396,18 @@ class Node:
         elif direction == Node.OUTGOING_EDGE_DIRECTION:
             return self.outgoing_edges_manager.get_number_of_connections()
 
+    def get_size_in_bytes_without_edges(self):
+        """
+        :return: the number of bytes taken by the node itself, not including its edges (see get_size_in_bytes_of_edges)
+        """
+        return sys.getsizeof(self)
+
+    def get_size_in_bytes_of_edges(self):
+        """
+        :return: the number of bytes taken by the 2 objects which hold the edges of the node
+        """
+        return self.incoming_edges_manager.get_size_in_bytes() + self.outgoing_edges_manager.get_size_in_bytes()
+
     def get_iterator_for_connections_data(self, direction):
         self.check_if_killed_and_raise_error_if_is()
 
@@ -290,6 +416,18 @@ class Node:
         elif direction == Node.OUTGOING_EDGE_DIRECTION:
             return self.outgoing_edges_manager.get_iterator_over_connections()
 
+    def get_view_over_connections(self, direction):
+        """
+        :param direction:
+        :return: a read only view over the connections in the given direction, see NodeEdges.get_view_over_connections
+        """
+        self.check_if_killed_and_raise_error_if_is()
+
+        if direction == Node.INCOMING_EDGE_DIRECTION:
+            return self.incoming_edges_manager.get_view_over_connections()
+        elif direction == Node.OUTGOING_EDGE_DIRECTION:
+            return self.outgoing_edges_manager.get_view_over_connections()
+
     def get_a_list_of_all_connections_data(self, direction):
         if direction == Node.INCOMING_EDGE_DIRECTION:
             return self.incoming_edges_manager.get_a_list_of_all_connections()
@@ -302,62 +440,6 @@ class Node:
         elif direction == Node.OUTGOING_EDGE_DIRECTION:
             return self.outgoing_edges_manager.get_combinations_iterator_over_connections(r)
 
-    def get_notified_that_neighbor_location_changed(self, direction_of_connection, previous_location, new_location):
-        """
-
-        :param direction_of_connection: if direction_of_connection == Node.INCOMING_EDGE_DIRECTION it means that
-        for us this node is an incoming connection, i.e. its in the self.incoming_edges_manager. exactly the same
-        for Node.OUTGOING_EDGE_DIRECTION
-
-        :param previous_location: the previous location of the node that was changed
-
-        :param new_location: the new location of the node that was changed
-        :return:
-        """
-        self.check_if_killed_and_raise_error_if_is()
-
-        if direction_of_connection == Node.INCOMING_EDGE_DIRECTION:
-            edges_manager_to_work_with = self.incoming_edges_manager
-        elif direction_of_connection == Node.OUTGOING_EDGE_DIRECTION:
-            edges_manager_to_work_with = self.outgoing_edges_manager
-        else:
-            raise Exception("invalid direction_of_connection")
-
-        previous_table_number = previous_location[0]
-        previous_key_in_table = previous_location[1]
-        new_table_number = new_location[0]
-        new_key_in_table = new_location[1]
-
-        edges_manager_to_work_with.move_connection(previous_table_number, previous_key_in_table, new_table_number,
-                                                   new_key_in_table)
-
-    def notify_all_neighbors_that_my_location_changed(self, previous_location):
-        """
-        :param previous_location:
-        goes over all neighbors of the node and notifies them that this node has been moved to another location
-        within the layer (using assumption (2))
-        """
-        self.check_if_killed_and_raise_error_if_is()
-
-        new_location = self.get_location()
-
-        # first go over all incoming edges
-        # if an node is connected to us by an edge that is incoming to us it means that for him we are
-        # an outgoing connection
-        direction_of_connection = Node.OUTGOING_EDGE_DIRECTION
-        for connection_data in self.incoming_edges_manager.get_iterator_over_connections():
-            reference_to_node_connected_to = connection_data[3]
-            reference_to_node_connected_to.get_notified_that_neighbor_location_changed(direction_of_connection,
-                                                                                       previous_location,
-                                                                                       new_location)
-
-        direction_of_connection = Node.INCOMING_EDGE_DIRECTION
-        for connection_data in self.outgoing_edges_manager.get_iterator_over_connections():
-            reference_to_node_connected_to = connection_data[3]
-            reference_to_node_connected_to.get_notified_that_neighbor_location_changed(direction_of_connection,
-                                                                                       previous_location,
-                                                                                       new_location)
-
     def __str__(self):
         def remove_node_pointer_from_list_of_all_connections(all_connections):
             return list(map(lambda lis: lis[:-1], all_connections))
@@ -0,0 +1,65 @@
+"""
+a location of a node is the triplet (layer_number, table_number, key_in_table). the hot loops use locations as keys
+of maps and sets, and a tuple key has to be created, hashed and compared item by item every time.
+instead those loops pack a location into a single int, which python hashes and compares in one operation.
+
+the packing is
+key_in_table in the lowest KEY_IN_TABLE_BITS bits
+table_number in the next TABLE_NUMBER_BITS bits
+layer_number in the bits above them
+so all the keys of the nodes in the same table are consecutive packed locations.
+the bits are chosen so that a packed location (even with a few more bits added below it) and a packed pair of keys
+in the same table are smaller than 2 ** 62 for any real network, so when moving to cpp they would fit in an int64.
+the keys in a table are dense (see TableSupportsDeletion), so they are always smaller than the number of nodes the
+table ever held at once
+"""
+
+KEY_IN_TABLE_BITS = 28
+TABLE_NUMBER_BITS = 4
+
+MAXIMAL_KEY_IN_TABLE = (1 << KEY_IN_TABLE_BITS) - 1
+MAXIMAL_TABLE_NUMBER = (1 << TABLE_NUMBER_BITS) - 1
+
+BITS_OF_LOCATION_IN_LAYER = KEY_IN_TABLE_BITS + TABLE_NUMBER_BITS
+
+
+def pack_location(layer_number, table_number, key_in_table):
+    """
+    :param layer_number: a non negative layer number
+    :param table_number: a table number between 0 and MAXIMAL_TABLE_NUMBER
+    :param key_in_table: a key between 0 and MAXIMAL_KEY_IN_TABLE
+    :return: a non negative int which represents the location
+    """
+    if not (0 <= table_number <= MAXIMAL_TABLE_NUMBER and 0 <= key_in_table <= MAXIMAL_KEY_IN_TABLE and
+            layer_number >= 0):
+        raise Exception("the location can not be packed")
+
+    return (((layer_number << TABLE_NUMBER_BITS) | table_number) << KEY_IN_TABLE_BITS) | key_in_table
+
+
+def unpack_location(packed_location):
+    """
+    :param packed_location: as returned by pack_location
+    :return: the triplet (layer_number, table_number, key_in_table)
+    """
+    return (packed_location >> BITS_OF_LOCATION_IN_LAYER,
+            (packed_location >> KEY_IN_TABLE_BITS) & MAXIMAL_TABLE_NUMBER,
+            packed_location & MAXIMAL_KEY_IN_TABLE)
+
+
+def pack_pair_of_keys_in_table(table_number, key_in_table_1, key_in_table_2):
+    """
+    :return: a non negative int which represents the pair of locations (table_number, key_in_table_1) and
+    (table_number, key_in_table_2) in the same layer. the order of the keys matters
+    """
+    return (((table_number << KEY_IN_TABLE_BITS) | key_in_table_1) << KEY_IN_TABLE_BITS) | key_in_table_2
+
+
+def unpack_pair_of_keys_in_table(packed_pair):
+    """
+    :param packed_pair: as returned by pack_pair_of_keys_in_table
+    :return: the triplet (table_number, key_in_table_1, key_in_table_2)
+    """
+    return (packed_pair >> (2 * KEY_IN_TABLE_BITS),
+            (packed_pair >> KEY_IN_TABLE_BITS) & MAXIMAL_KEY_IN_TABLE,
+            packed_pair & MAXIMAL_KEY_IN_TABLE)
@@ -0,0 +1,595 @@
+import array
+import hashlib
+import os
+import pickle
+
+from src.MarabouDataManagers.GlobalNetworkManager import GlobalNetworkManager
+from src.Network import Network
+from src.Layer import Layer
+from src.Nodes.ARNode import ARNode
+from src.Nodes.GlobalNode import GlobalNode
+from src.Nodes.Node import Node
+from src.WeightPruner import WeightPruner
+
+"""
+a persistent on disk cache of fully activated networks.
+
+building a network, preprocessing it (splitting every node by its type) and fully activating it is deterministic:
+the result depends only on the network weights, biases and input bounds, on which_acas_output and on the
+pruning_threshold. so the first job on a model and property saves the fully activated network in the cache, and every
+job after it loads the network from the cache instead of building it again.
+
+the network objects are not written as they are. the marabou equations can not be pickled, and the layout of the
+node classes changes much more often than the network itself. instead, a cache entry holds the state of the network
+as plain data: the numbers of the network, and for every table a column for every field of its nodes (biases, global
+ids, bounds and so on, in arrays of the array module), where the node with key i is at index i of every column. the
+edges of a node and the inner nodes of an arnode are kept by the locations of the nodes they refer to, so the entry is
+written and read in a single pass no matter how deeply the network is linked. the ids given by the id manager and the
+equations (by their addends and scalars, as InputQueryFacade reads them), relu constraints and bounds of the current and
+the original input queries are kept as well.
+when an entry is loaded the network is built again from that state through the interface of the network classes
+(see _create_network_from_state), with the classes which are set when it is loaded (Node.EDGES_MANAGER_CLASS,
+GlobalDataManager.ID_MANAGER_CLASS and GlobalDataManager.INPUT_QUERY_CLASS), and the equations are created again and
+added to new input queries.
+since the nodes are created again in the order of their keys, only a network whose tables have no free keys can be
+written, so a network which merged or split arnodes must call Network.compact_keys_of_arnode_tables before it is
+written. the edges of a node are added in the order they are gone over, so an ArrayNodeEdges gives them slots in that
+order, which may differ from the order of the slots of the network written.
+
+the layout of a cache entry is:
+MAGIC
+a pickle of a dict holding the state (see _get_state_of_network), which has only builtin containers, numbers and
+arrays. the pickle is read by an unpickler which refuses to create objects of any other class
+
+FORMAT_VERSION is the version of that layout, and it is a part of the key of every entry. it must be changed whenever
+the layout changes, so entries of an older layout would never be loaded.
+
+the cache keeps its total size under a bound by evicting the least recently used entries. an entry is marked as used
+by updating its modification time, so the eviction does not depend on the file system tracking access times.
+"""
+
+
+class _PlainDataUnpickler(pickle.Unpickler):
+    """
+    an unpickler which only creates builtin containers and numbers, and arrays of the array module
+    """
+
+    def find_class(self, module, name):
+        if module == 'array' and name in ('array', '_array_reconstructor'):
+            return super().find_class(module, name)
+
+        raise pickle.UnpicklingError(f"the cached network can not hold objects of {module}.{name}")
+
+
+def _get_state_of_input_query(input_query):
+    """
+    :param input_query: an InputQueryFacade
+    :return: a dict holding the equations (in the order they were added), the relu constraints and the bounds of the
+    input query
+    """
+    # the addends of equation i are at the indices addends_pointers[i], ..., addends_pointers[i + 1] - 1
+    addends_pointers = array.array('q', [0])
+    coefficients = array.array('d')
+    variables = array.array('q')
+    scalars = array.array('d')
+    for equation in input_query.equations:
+        for (c, v) in equation.addendList:
+            coefficients.append(c)
+            variables.append(v)
+        addends_pointers.append(len(variables))
+        scalars.append(equation.scalar)
+
+    relu_constraints = array.array('q')
+    for relu_constraint in input_query.relu_constraints:
+        relu_constraints.extend(relu_constraint)
+
+    return {'addends_pointers': addends_pointers,
+            'coefficients': coefficients,
+            'variables': variables,
+            'scalars': scalars,
+            'relu_constraints': relu_constraints,
+            'global_ids_with_lower_bounds': array.array('q', input_query.lowerBounds.keys()),
+            'lower_bounds': array.array('d', input_query.lowerBounds.values()),
+            'global_ids_with_upper_bounds': array.array('q', input_query.upperBounds.keys()),
+            'upper_bounds': array.array('d', input_query.upperBounds.values())}
+
+
+def _fill_input_query_from_state(input_query, state_of_input_query):
+    """
+    :param input_query: an empty InputQueryFacade
+    :param state_of_input_query: as returned by _get_state_of_input_query
+    :return: a list of the equations added to the input query, in the order they were added
+    """
+    addends_pointers = state_of_input_query['addends_pointers']
+    coefficients = state_of_input_query['coefficients']
+    variables = state_of_input_query['variables']
+
+    equations = []
+    for i, scalar in enumerate(state_of_input_query['scalars']):
+        equation = input_query.get_new_equation()
+        for k in range(addends_pointers[i], addends_pointers[i + 1]):
+            equation.addAddend(coefficients[k], variables[k])
+        equation.setScalar(scalar)
+        input_query.addEquation(equation)
+        equations.append(equation)
+
+    relu_constraints = state_of_input_query['relu_constraints']
+    for i in range(0, len(relu_constraints), 2):
+        input_query.addReluConstraint(relu_constraints[i], relu_constraints[i + 1])
+
+    for global_id, lower_bound in zip(state_of_input_query['global_ids_with_lower_bounds'],
+                                      state_of_input_query['lower_bounds']):
+        input_query.setLowerBound(global_id, lower_bound)
+    for global_id, upper_bound in zip(state_of_input_query['global_ids_with_upper_bounds'],
+                                      state_of_input_query['upper_bounds']):
+        input_query.setUpperBound(global_id, upper_bound)
+
+    return equations
+
+
+def _get_state_of_table(table, is_arnode, index_of_equation_by_id):
+    """
+    :param table: a table whose keys are exactly 0, 1, ..., n-1
+    :param is_arnode: true if the table is an arnode table
+    :param index_of_equation_by_id: a map between the id of each equation in the current input query and its index
+    :return: a dict holding the state of the nodes in the table, see the columns below
+    """
+    if table.get_list_of_all_keys() != list(range(table.get_number_of_nodes_in_table())):
+        raise Exception("can not write a network whose tables have free keys, "
+                        "call Network.compact_keys_of_arnode_tables before writing it")
+
+    # a column for every field of the nodes, the fields of the node with key i are at index i of every column.
+    # the inner nodes of arnode i are at the indices inner_nodes_pointers[i], ..., inner_nodes_pointers[i + 1] - 1 of
+    # inner_nodes, which holds their keys in the regular node table with the same number as the arnode table.
+    # the edges are kept in the same way, each by the location of the node connected to (in the previous layer for the
+    # incoming edges and in the next layer for the outgoing edges) and its weight, in the order the edges managers go
+    # over them
+    state_of_table = {name_of_column: array.array(typecode)
+                      for name_of_column, typecode in PreprocessedNetworkCache.TYPECODES_OF_COLUMNS_OF_TABLES}
+    for name_of_column in ['inner_nodes_pointers', 'incoming_edges_pointers', 'outgoing_edges_pointers']:
+        state_of_table[name_of_column].append(0)
+
+    for node in table.get_iterator_for_all_nodes():
+        # the getters of an arnode which is not fully activated give the values of its first inner node, which are not
+        # used when the arnode is created again
+        state_of_table['biases'].append(node.get_node_bias())
+        state_of_table['global_incoming_ids'].append(node.get_global_incoming_id())
+        state_of_table['global_outgoing_ids'].append(node.get_global_outgoing_id())
+        lower_bound_of_value, upper_bound_of_value = node.get_bounds_of_value()
+        state_of_table['lower_bounds_of_value'].append(lower_bound_of_value)
+        state_of_table['upper_bounds_of_value'].append(upper_bound_of_value)
+
+        flags = 0
+        if node.check_if_has_constraint():
+            flags |= PreprocessedNetworkCache.FLAG_OF_HAS_CONSTRAINT
+        if node.check_if_has_bounds():
+            flags |= PreprocessedNetworkCache.FLAG_OF_HAS_BOUNDS
+        state_of_table['flags'].append(flags)
+
+        index_of_equation = PreprocessedNetworkCache.NO_EQUATION_INDEX
+        if node.get_equation() is not GlobalNode.NO_EQUATION:
+            index_of_equation = index_of_equation_by_id[id(node.get_equation())]
+        state_of_table['indices_of_equations'].append(index_of_equation)
+
+        if is_arnode:
+            state_of_table['activation_statuses'].append(node.get_activation_status())
+            for inner_node in node.get_inner_nodes():
+                if inner_node.get_table_number() != table.table_number:
+                    raise Exception("the inner nodes of an arnode must be in the table with the same number as the "
+                                    "arnode table")
+                state_of_table['inner_nodes'].append(inner_node.get_key_in_table())
+            state_of_table['inner_nodes_pointers'].append(len(state_of_table['inner_nodes']))
+
+        for direction, name_of_direction in [(Node.INCOMING_EDGE_DIRECTION, 'incoming'),
+                                             (Node.OUTGOING_EDGE_DIRECTION, 'outgoing')]:
+            table_numbers = state_of_table[f'{name_of_direction}_table_numbers']
+            keys_in_table = state_of_table[f'{name_of_direction}_keys_in_table']
+            weights_of_edges = state_of_table[f'{name_of_direction}_weights']
+            for table_number, keys_in_table_connected_to, weights, references in \
+                    node.get_view_over_connections(direction):
+                for key_in_table, weight, reference in zip(keys_in_table_connected_to, weights, references):
+                    if isinstance(reference, ARNode) != is_arnode:
+                        raise Exception("can not write a network in which nodes are connected to arnodes")
+                    table_numbers.append(table_number)
+                    keys_in_table.append(key_in_table)
+                    weights_of_edges.append(weight)
+            state_of_table[f'{name_of_direction}_edges_pointers'].append(len(keys_in_table))
+
+    return state_of_table
+
+
+def _get_state_of_network(network):
+    """
+    :param network: a Network object whose tables have no free keys
+    :return: a dict holding the state of the network as plain data
+    """
+    global_network_manager = network.global_network_manager
+    index_of_equation_by_id = {id(equation): index_of_equation for index_of_equation, equation in
+                               enumerate(global_network_manager.input_query.equations)}
+
+    # for each layer a list of the states of its tables, the regular node tables and then the arnode tables
+    state_of_layers = []
+    for layer in network.layers:
+        state_of_layers.append(
+            [_get_state_of_table(table, False, index_of_equation_by_id) for table in layer.regular_node_tables] +
+            [_get_state_of_table(table, True, index_of_equation_by_id) for table in layer.arnode_tables])
+
+    ranges_of_free_ids = global_network_manager.id_manager.get_ranges()
+    state_of_global_network_manager = {
+        'maximum_id_used': global_network_manager.get_maximum_id_used(),
+        # the ranges of the free ids, without the last range [maximum_id_used + 1, infinity]
+        'ranges_of_hole_ids': array.array('q', ranges_of_free_ids[:-2]),
+        'input_nodes_global_incoming_ids': array.array('q', global_network_manager.input_nodes_global_incoming_ids),
+        'output_nodes_global_incoming_ids': array.array('q', global_network_manager.output_nodes_global_incoming_ids),
+        # indexed by is_arnode, in the order the sets are gone over
+        'packed_locations_of_nodes_that_dont_have_valid_equations': [
+            array.array('q', set_of_packed_locations) for set_of_packed_locations in
+            global_network_manager.sets_of_packed_locations_of_nodes_that_dont_have_valid_equations],
+        'input_query': _get_state_of_input_query(global_network_manager.input_query),
+        'input_query_of_original_network': _get_state_of_input_query(
+            global_network_manager.input_query_of_original_network)}
+
+    state_of_weight_pruner = None
+    if network.weight_pruner is not None:
+        weight_pruner = network.weight_pruner
+        state_of_weight_pruner = [weight_pruner.threshold,
+                                  list(weight_pruner.lower_bounds_of_previous_layer),
+                                  list(weight_pruner.upper_bounds_of_previous_layer),
+                                  weight_pruner.get_number_of_connections_pruned_in_each_layer()]
+
+    return {'format_version': PreprocessedNetworkCache.FORMAT_VERSION,
+            'network': [network.last_layer_of_given_network,
+                        network.last_layer_not_preprocessed,
+                        network.last_layer_not_forward_activated,
+                        network.last_layer_not_fully_activated],
+            'weight_pruner': state_of_weight_pruner,
+            'layers': state_of_layers,
+            'global_network_manager': state_of_global_network_manager}
+
+
+def _get_ranges_of_edges_by_table(table_numbers, start, end):
+    """
+    :return: an iterator over (table_number, start_of_table, end_of_table) for each run of edges with the same table
+    number in table_numbers[start:end]. the edges managers go over the connections table by table, so there is a single
+    run for each table
+    """
+    start_of_table = start
+    while start_of_table < end:
+        table_number = table_numbers[start_of_table]
+        end_of_table = start_of_table + 1
+        while end_of_table < end and table_numbers[end_of_table] == table_number:
+            end_of_table += 1
+        yield table_number, start_of_table, end_of_table
+        start_of_table = end_of_table
+
+
+def _create_network_from_state(state):
+    """
+    the network is built with the public interface of the network classes: the layers are created by
+    Network.create_network_without_nodes, the nodes by the tables (in the order of their keys, so they get the keys
+    they had), the edges by the nodes and the global values by restoring them into the nodes
+
+    :param state: as returned by _get_state_of_network
+    :return: a new Network object with the given state
+    """
+    if state['format_version'] != PreprocessedNetworkCache.FORMAT_VERSION:
+        raise ValueError("the cached network was written in another format")
+
+    global_network_manager = GlobalNetworkManager()
+    state_of_global_network_manager = state['global_network_manager']
+
+    # the ids are taken from the id manager itself and not from the global network manager, since the artificial
+    # bounds of the hole ids are a part of the bounds of the input query, which are restored below
+    id_manager = global_network_manager.id_manager
+    maximum_id_used = state_of_global_network_manager['maximum_id_used']
+    if maximum_id_used >= 0:
+        id_manager.get_new_ids(maximum_id_used + 1)
+    ranges_of_hole_ids = state_of_global_network_manager['ranges_of_hole_ids']
+    id_manager.give_ids_back([hole_id for i in range(0, len(ranges_of_hole_ids), 2)
+                              for hole_id in range(ranges_of_hole_ids[i], ranges_of_hole_ids[i + 1])])
+
+    equations = _fill_input_query_from_state(global_network_manager.input_query,
+                                             state_of_global_network_manager['input_query'])
+    input_query_of_original_network = global_network_manager.INPUT_QUERY_CLASS()
+    _fill_input_query_from_state(input_query_of_original_network,
+                                 state_of_global_network_manager['input_query_of_original_network'])
+    global_network_manager.set_original_network(
+        input_query_of_original_network,
+        list(state_of_global_network_manager['input_nodes_global_incoming_ids']),
+        list(state_of_global_network_manager['output_nodes_global_incoming_ids']))
+
+    weight_pruner = None
+    if state['weight_pruner'] is not None:
+        threshold, lower_bounds_of_previous_layer, upper_bounds_of_previous_layer, \
+            number_of_connections_pruned_in_layer = state['weight_pruner']
+        weight_pruner = WeightPruner(threshold, lower_bounds_of_previous_layer, upper_bounds_of_previous_layer,
+                                     number_of_connections_pruned_in_layer)
+
+    state_of_layers = state['layers']
+    network = Network.create_network_without_nodes(global_network_manager, len(state_of_layers), *state['network'],
+                                                   weight_pruner=weight_pruner)
+
+    # the regular nodes are created first, since every arnode is created with its inner nodes
+    for layer, state_of_tables in zip(network.layers, state_of_layers):
+        for table, state_of_table in zip(layer.regular_node_tables, state_of_tables):
+            table.create_new_nodes_and_add_to_table_by_bulk(
+                Layer.NUMBER_OF_OVERALL_TABLES, Layer.NUMBER_OF_OVERALL_TABLES, state_of_table['biases'],
+                global_network_manager,
+                ids_for_nodes=list(zip(state_of_table['global_incoming_ids'], state_of_table['global_outgoing_ids'])))
+
+        for arnode_table, regular_node_table, state_of_table in zip(layer.arnode_tables, layer.regular_node_tables,
+                                                                    state_of_tables[len(layer.regular_node_tables):]):
+            inner_nodes_pointers = state_of_table['inner_nodes_pointers']
+            inner_nodes = state_of_table['inner_nodes']
+            for i in range(len(state_of_table['biases'])):
+                arnode_table.create_new_arnode_and_add_to_table(
+                    [regular_node_table.get_node_by_key(inner_nodes[k])
+                     for k in range(inner_nodes_pointers[i], inner_nodes_pointers[i + 1])])
+
+    for layer, state_of_tables in zip(network.layers, state_of_layers):
+        for is_arnode, tables, states_of_tables_of_kind in [
+                (False, layer.regular_node_tables, state_of_tables[:len(layer.regular_node_tables)]),
+                (True, layer.arnode_tables, state_of_tables[len(layer.regular_node_tables):])]:
+            for table, state_of_table in zip(tables, states_of_tables_of_kind):
+                for key_in_table, node in enumerate(table.get_iterator_for_all_nodes()):
+                    flags = state_of_table['flags'][key_in_table]
+                    index_of_equation = state_of_table['indices_of_equations'][key_in_table]
+                    if is_arnode:
+                        node.restore_activation_status(state_of_table['activation_statuses'][key_in_table],
+                                                       state_of_table['biases'][key_in_table],
+                                                       state_of_table['global_incoming_ids'][key_in_table],
+                                                       state_of_table['global_outgoing_ids'][key_in_table])
+                    if not is_arnode or node.get_activation_status() == ARNode.FULLY_ACTIVATED_STATUS:
+                        node.restore_equation_constraint_and_bounds(
+                            GlobalNode.NO_EQUATION if index_of_equation == PreprocessedNetworkCache.NO_EQUATION_INDEX
+                            else equations[index_of_equation],
+                            bool(flags & PreprocessedNetworkCache.FLAG_OF_HAS_CONSTRAINT),
+                            bool(flags & PreprocessedNetworkCache.FLAG_OF_HAS_BOUNDS))
+                    node.set_bounds_of_value(state_of_table['lower_bounds_of_value'][key_in_table],
+                                             state_of_table['upper_bounds_of_value'][key_in_table])
+
+                    # the edges are added to each side separately, in the order they were gone over
+                    for direction, name_of_direction, layer_connected_to in [
+                            (Node.INCOMING_EDGE_DIRECTION, 'incoming', layer.previous_layer),
+                            (Node.OUTGOING_EDGE_DIRECTION, 'outgoing', layer.next_layer)]:
+                        edges_pointers = state_of_table[f'{name_of_direction}_edges_pointers']
+                        table_numbers = state_of_table[f'{name_of_direction}_table_numbers']
+                        keys_in_table = state_of_table[f'{name_of_direction}_keys_in_table']
+                        weights = state_of_table[f'{name_of_direction}_weights']
+                        for table_number, start_of_table, end_of_table in _get_ranges_of_edges_by_table(
+                                table_numbers, edges_pointers[key_in_table], edges_pointers[key_in_table + 1]):
+                            table_connected_to = layer_connected_to.arnode_tables[table_number] if is_arnode else \
+                                layer_connected_to.regular_node_tables[table_number]
+                            keys_in_table_connected_to = keys_in_table[start_of_table:end_of_table]
+                            node.add_or_edit_one_sided_neighbors_in_table_by_bulk(
+                                direction, table_number, keys_in_table_connected_to,
+                                weights[start_of_table:end_of_table],
+                                [table_connected_to.get_node_by_key(key) for key in keys_in_table_connected_to])
+
+    # adding the incoming edges marked the equations of the nodes as invalid, so all the marks are removed and the
+    # nodes whose equations were invalid when the network was written are marked again
+    for layer in network.layers:
+        for is_arnode, tables in [(False, layer.regular_node_tables), (True, layer.arnode_tables)]:
+            for table in tables:
+                for node in table.get_iterator_for_all_nodes():
+                    global_network_manager.remove_location_of_node_that_dont_have_valid_equation(
+                        node.get_packed_location(), is_arnode)
+
+    for is_arnode, packed_locations in enumerate(
+            state_of_global_network_manager['packed_locations_of_nodes_that_dont_have_valid_equations']):
+        for packed_location in packed_locations:
+            global_network_manager.add_location_of_node_that_dont_have_valid_equation(packed_location, is_arnode)
+
+    return network
+
+
+class PreprocessedNetworkCache:
+    MAGIC = b'CEGARNET'
+    # the version of the layout of the state written by write_network (see _get_state_of_network). change it whenever
+    # the layout changes, so entries of an older layout would not be loaded
+    FORMAT_VERSION = 14
+    ENTRY_SUFFIX = '.network'
+
+    DEFAULT_MAXIMUM_SIZE_IN_BYTES = 2 ** 30
+
+    # the value kept in the state for no equation
+    NO_EQUATION_INDEX = -1
+
+    # the bits of the flags column of the nodes
+    FLAG_OF_HAS_CONSTRAINT = 1
+    FLAG_OF_HAS_BOUNDS = 2
+
+    # the columns of the state of a table and the typecodes of their arrays, see _get_state_of_table
+    TYPECODES_OF_COLUMNS_OF_TABLES = (('biases', 'd'),
+                                      ('global_incoming_ids', 'q'),
+                                      ('global_outgoing_ids', 'q'),
+                                      ('lower_bounds_of_value', 'd'),
+                                      ('upper_bounds_of_value', 'd'),
+                                      ('flags', 'q'),
+                                      ('indices_of_equations', 'q'),
+                                      ('activation_statuses', 'b'),
+                                      ('inner_nodes_pointers', 'q'),
+                                      ('inner_nodes', 'q'),
+                                      ('incoming_edges_pointers', 'q'),
+                                      ('incoming_table_numbers', 'q'),
+                                      ('incoming_keys_in_table', 'q'),
+                                      ('incoming_weights', 'd'),
+                                      ('outgoing_edges_pointers', 'q'),
+                                      ('outgoing_table_numbers', 'q'),
+                                      ('outgoing_keys_in_table', 'q'),
+                                      ('outgoing_weights', 'd'))
+
+    def __init__(self, cache_directory, maximum_size_in_bytes=DEFAULT_MAXIMUM_SIZE_IN_BYTES):
+        """
+        :param cache_directory: the directory the entries are saved in, it would be created if it does not exist
+        :param maximum_size_in_bytes: the least recently used entries are evicted when the total size of the entries
+        is larger than this
+        """
+        self.cache_directory = cache_directory
+        self.maximum_size_in_bytes = maximum_size_in_bytes
+        os.makedirs(cache_directory, exist_ok=True)
+
+    @staticmethod
+    def get_key(nnet_reader_object, which_acas_output, pruning_threshold=None):
+        """
+        :param nnet_reader_object: an NNetReader (or a compatible object) holding the network
+        :param which_acas_output:
+        :param pruning_threshold:
+        :return: a key which identifies the fully activated network which would be built from the given arguments.
+        the key is a sha256 digest of the network contents (not of the name of the file it was read from), so
+        different copies of the same network share the same entry
+        """
+        digest = hashlib.sha256()
+        digest.update(repr((PreprocessedNetworkCache.FORMAT_VERSION, which_acas_output, pruning_threshold,
+                            list(nnet_reader_object.layerSizes))).encode())
+        digest.update(array.array('d', nnet_reader_object.inputMinimums).tobytes())
+        digest.update(array.array('d', nnet_reader_object.inputMaximums).tobytes())
+
+        if hasattr(nnet_reader_object, 'flat_weights'):
+            # the flat buffers of the reader are hashed as they are, without converting them
+            for layer_weights, layer_biases in zip(nnet_reader_object.flat_weights, nnet_reader_object.flat_biases):
+                digest.update(layer_weights)
+                digest.update(layer_biases)
+        else:
+            # a reader which does not hold the network (like NNetStreamingReader) gives the layers one at a time, and
+            # each layer is hashed as the flat buffers of the same network would be
+            for layer_number, biases, nonzero_connections in nnet_reader_object.get_iterator_over_layers():
+                if nonzero_connections is None:
+                    # the input layer
+                    continue
+                row_pointers, column_indices, values = nonzero_connections
+                previous_layer_size = nnet_reader_object.layerSizes[layer_number - 1]
+                layer_weights = array.array('d', bytes(8 * len(biases) * previous_layer_size))
+                for i in range(len(biases)):
+                    for k in range(row_pointers[i], row_pointers[i + 1]):
+                        layer_weights[i * previous_layer_size + column_indices[k]] = values[k]
+                digest.update(layer_weights)
+                digest.update(array.array('d', biases))
+
+        return digest.hexdigest()
+
+    def _get_file_name_of_entry(self, key):
+        return os.path.join(self.cache_directory, key + PreprocessedNetworkCache.ENTRY_SUFFIX)
+
+    @staticmethod
+    def write_network(network, f):
+        """
+        :param network: a Network object
+        :param f: a file opened for writing in binary mode
+        """
+        f.write(PreprocessedNetworkCache.MAGIC)
+        pickle.dump(_get_state_of_network(network), f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @staticmethod
+    def read_network(f):
+        """
+        :param f: a file opened for reading in binary mode, as written by write_network
+        :return: a new Network object, built from the state which was written
+        """
+        if f.read(len(PreprocessedNetworkCache.MAGIC)) != PreprocessedNetworkCache.MAGIC:
+            raise ValueError("the given file is not a cached network")
+
+        return _create_network_from_state(_PlainDataUnpickler(f).load())
+
+    def load(self, key):
+        """
+        :param key: as returned by get_key
+        :return: the network saved under the given key, or None if there is no such network.
+        an entry which can not be read (it is truncated, it is not plain data or it was written in another format) is
+        removed from the cache and treated as missing
+        """
+        file_name_of_entry = self._get_file_name_of_entry(key)
+        try:
+            with open(file_name_of_entry, 'rb') as f:
+                network = PreprocessedNetworkCache.read_network(f)
+        except FileNotFoundError:
+            return None
+        except (pickle.UnpicklingError, EOFError, ValueError, OSError):
+            self._remove_entry(file_name_of_entry)
+            return None
+
+        # mark the entry as the most recently used one
+        try:
+            os.utime(file_name_of_entry)
+        except OSError:
+            pass
+
+        return network
+
+    def save(self, key, network):
+        """
+        saves the network under the given key, and then evicts the least recently used entries until the cache fits
+        in its maximum size. the entry is written to a temporary file first and then moved into place, so that
+        processes which load it never see a partially written entry.
+        failing to write the entry (for example because the disk is full) is not an error, the network would simply be
+        built again the next time it is needed
+
+        :param key: as returned by get_key
+        :param network: a Network object
+        :return: true if the entry was written
+        """
+        file_name_of_entry = self._get_file_name_of_entry(key)
+        temporary_file_name = f'{file_name_of_entry}.{os.getpid()}.tmp'
+        try:
+            with open(temporary_file_name, 'wb') as f:
+                PreprocessedNetworkCache.write_network(network, f)
+            os.replace(temporary_file_name, file_name_of_entry)
+        except OSError:
+            self._remove_entry(temporary_file_name)
+            return False
+
+        self._evict_least_recently_used_entries(file_name_of_entry)
+        return True
+
+    @staticmethod
+    def _remove_entry(file_name_of_entry):
+        try:
+            os.remove(file_name_of_entry)
+        except OSError:
+            pass
+
+    def _evict_least_recently_used_entries(self, file_name_of_entry_to_keep):
+        """
+        removes the entries that were used the longest time ago until the total size of the entries is at most
+        self.maximum_size_in_bytes. the given entry is never removed, even if it alone is larger than the maximum size
+
+        :param file_name_of_entry_to_keep:
+        """
+        entries = []
+        for file_name in os.listdir(self.cache_directory):
+            if not file_name.endswith(PreprocessedNetworkCache.ENTRY_SUFFIX):
+                continue
+            file_name_of_entry = os.path.join(self.cache_directory, file_name)
+            try:
+                entry_stat = os.stat(file_name_of_entry)
+            except OSError:
+                # another process removed it
+                continue
+            entries.append((entry_stat.st_mtime_ns, entry_stat.st_size, file_name_of_entry))
+
+        total_size = sum(size for _, size, _ in entries)
+        for _, size, file_name_of_entry in sorted(entries):
+            if total_size <= self.maximum_size_in_bytes:
+                break
+            if file_name_of_entry == file_name_of_entry_to_keep:
+                continue
+            PreprocessedNetworkCache._remove_entry(file_name_of_entry)
+            total_size -= size
+
+    def get_fully_activated_network(self, nnet_reader_object, which_acas_output, pruning_threshold=None):
+        """
+        :param nnet_reader_object: as in the Network constructor
+        :param which_acas_output: as in the Network constructor
+        :param pruning_threshold: as in the Network constructor
+        :return: a fully activated network, as returned by Network.fully_activate_the_entire_network.
+        the network is loaded from the cache if it was saved before, otherwise it is built, fully activated and saved
+        """
+        key = PreprocessedNetworkCache.get_key(nnet_reader_object, which_acas_output, pruning_threshold)
+
+        network = self.load(key)
+        if network is None:
+            network = Network(nnet_reader_object, which_acas_output, pruning_threshold)
+            network.fully_activate_the_entire_network()
+            self.save(key, network)
+
+        return network
@@ -0,0 +1,25 @@
+class RelocationCounter:
+    """
+    counts the relocations of the nodes in each layer of a single network.
+
+    the reference to the node connected to, which every connection holds, is a handle to the node that never changes,
+    and the node itself holds its current location. so when a node changes its location it only counts the relocation
+    in its layer, and the connections to it are re-keyed by its new location the next time they are used (see
+    NodeEdges).
+    every network has its own counter (kept by its global data manager), which all its nodes and edges share, so the
+    relocations in one network never cause the connections in another network to be re-keyed
+    """
+
+    def __init__(self):
+        self.number_of_relocations_by_layer_number = {}
+
+    def get_number_of_relocations_in_layer(self, layer_number):
+        return self.number_of_relocations_by_layer_number.get(layer_number, 0)
+
+    def count_relocation_in_layer(self, layer_number):
+        """
+        must be called whenever a node changes its location after it was connected to other nodes
+        :param layer_number: the layer of the node which changed its location
+        """
+        self.number_of_relocations_by_layer_number[layer_number] = \
+            self.get_number_of_relocations_in_layer(layer_number) + 1
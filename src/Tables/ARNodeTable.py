@@ -119,9 +119,9 @@ class ARNodeTable(TableSupportsDeletion):
             # preserve arnode assumption (7)
             new_arnode.forward_activate_arnode(function_to_calculate_merger_of_outgoing_edges)
             new_arnode.fully_activate_arnode_and_recalculate_incoming_edges(
+                function_to_calculate_merger_of_incoming_edges,
                 should_recalculate_bounds,
-                function_to_calculate_arnode_bias,
-                function_to_calculate_merger_of_incoming_edges)
+                function_to_calculate_arnode_bias)
 
     def merge_list_of_arnodes(self,
                               list_of_keys_of_arnodes_to_merge,
@@ -167,8 +167,7 @@ class ARNodeTable(TableSupportsDeletion):
 
         # before continuing, delete the arnodes that needs to be merged
         # this would also reset the nodes owner arnode
-        for arnode_key in list_of_keys_of_arnodes_to_merge:
-            self.delete_node(arnode_key)
+        self.delete_nodes_by_bulk(list_of_keys_of_arnodes_to_merge)
 
         new_arnode = self.create_new_arnode_and_add_to_table(inner_nodes_for_new_arnode)
         # preserve arnode assumption (7)
@@ -83,6 +83,16 @@ class AbstractTable:
         """
         raise NotImplementedError("this is an abstract class")
 
+    def remove_nodes_from_table_and_relocate_to_other_table_by_bulk(self, list_of_node_keys, new_table_manager):
+        """
+        the same as calling remove_node_from_table_and_relocate_to_other_table for each of the keys, but the
+        relocation of all the nodes is done in one operation (see add_existing_nodes_to_table_by_bulk)
+        :param list_of_node_keys:
+        :param new_table_manager:
+        :return: a list of the new keys of the nodes in the table they were moved to, in the order of the given keys
+        """
+        raise NotImplementedError("this is an abstract class")
+
     def _add_node_to_table_without_checking(self, node):
         """
         this helper function would be implemented by the subclasses
@@ -106,6 +116,20 @@ class AbstractTable:
 
         return global_incoming_id, global_outgoing_id
 
+    def _get_ids_for_new_nodes_by_bulk(self, global_data_manager, number_of_nodes):
+        """
+        the same as calling _get_ids_for_new_node number_of_nodes times, but all the ids are taken from the
+        global_data_manager in one operation
+        :param global_data_manager:
+        :param number_of_nodes:
+        :return: a list of pairs of global_incoming_id, global_outgoing_id, one for each new node
+        """
+        if not self.layer_is_inner:
+            return [(global_id, global_id) for global_id in global_data_manager.get_new_ids(number_of_nodes)]
+
+        ids = global_data_manager.get_new_ids(2 * number_of_nodes)
+        return [(ids[i], ids[i + 1]) for i in range(0, len(ids), 2)]
+
     def create_new_node_and_add_to_table(self,
                                          number_of_tables_in_previous_layer,
                                          number_of_tables_in_next_layer,
@@ -122,12 +146,29 @@ class AbstractTable:
         # if the table is in an inner layer the node needs 2 different ids otherwise it needs only 1
         global_incoming_id, global_outgoing_id = self._get_ids_for_new_node(global_data_manager)
 
+        return self._create_new_node_with_ids_and_add_to_table(number_of_tables_in_previous_layer,
+                                                               number_of_tables_in_next_layer,
+                                                               bias_for_node,
+                                                               global_incoming_id, global_outgoing_id,
+                                                               global_data_manager)
+
+    def _create_new_node_with_ids_and_add_to_table(self,
+                                                   number_of_tables_in_previous_layer,
+                                                   number_of_tables_in_next_layer,
+                                                   bias_for_node,
+                                                   global_incoming_id, global_outgoing_id,
+                                                   global_data_manager):
+        """
+        the same as create_new_node_and_add_to_table, but the global ids of the node are given
+        :return: the node created
+        """
         new_node = GlobalNode(number_of_tables_in_previous_layer,
                               number_of_tables_in_next_layer,
                               self.layer_number,
                               GlobalNode.NO_TABLE_NUMBER, GlobalNode.NO_KEY_IN_TABLE,
                               bias_for_node,
-                              global_incoming_id, global_outgoing_id, global_data_manager)
+                              global_incoming_id, global_outgoing_id, global_data_manager,
+                              global_data_manager.get_relocation_counter())
 
         node_key = self._add_node_to_table_without_checking(new_node)
         # change the inserted node location_data so that its table number and index would correspond to its new location
@@ -136,6 +177,37 @@ class AbstractTable:
 
         return new_node
 
+    def create_new_nodes_and_add_to_table_by_bulk(self,
+                                                  number_of_tables_in_previous_layer,
+                                                  number_of_tables_in_next_layer,
+                                                  biases_for_nodes,
+                                                  global_data_manager,
+                                                  ids_for_nodes=None):
+        """
+        creates a new node for each of the given biases, in the order of the biases.
+        the nodes get the same ids as they would get by calling create_new_node_and_add_to_table for each bias, but
+        the ids are taken in one operation
+        :param number_of_tables_in_previous_layer:
+        :param number_of_tables_in_next_layer:
+        :param biases_for_nodes:
+        :param global_data_manager:
+        :param ids_for_nodes: None by default.
+        if given, a list of pairs of global_incoming_id, global_outgoing_id, one for each bias, which the nodes get
+        instead of taking new ids from the global_data_manager. the caller is responsible for the ids being taken
+        (it is used when a saved network is built again, see PreprocessedNetworkCache)
+        :return: a list of the nodes created
+        """
+        if ids_for_nodes is None:
+            ids_for_nodes = self._get_ids_for_new_nodes_by_bulk(global_data_manager, len(biases_for_nodes))
+        elif len(ids_for_nodes) != len(biases_for_nodes):
+            raise Exception("there should be a pair of ids for each bias")
+        return [self._create_new_node_with_ids_and_add_to_table(number_of_tables_in_previous_layer,
+                                                                number_of_tables_in_next_layer,
+                                                                bias_for_node,
+                                                                global_incoming_id, global_outgoing_id,
+                                                                global_data_manager)
+                for bias_for_node, (global_incoming_id, global_outgoing_id) in zip(biases_for_nodes, ids_for_nodes)]
+
     def add_existing_node_to_table(self, previous_table_manager, node):
         """
         notifies the previous_table_manager that its node is being removed from it, and adds it to this table
@@ -153,6 +225,28 @@ class AbstractTable:
 
         return new_node_key
 
+    def add_existing_nodes_to_table_by_bulk(self, previous_table_manager, nodes):
+        """
+        the same as calling add_existing_node_to_table for each of the nodes, but the relocation of all the nodes is
+        counted once, so every neighbor of the nodes would re-key its connections to them in a single pass, instead of
+        once for each node (see NodeEdges)
+        :param previous_table_manager: the current table manager of all the given nodes
+        :param nodes:
+        :return: a list of the new keys of the nodes, in the order of the nodes
+        """
+        new_node_keys = []
+        for node in nodes:
+            previous_table_manager.get_notified_node_is_being_removed_from_table(node.get_key_in_table())
+
+            new_node_key = self._add_node_to_table_without_checking(node)
+            node.set_new_location(self.table_number, new_node_key, notify_neighbors_that_location_changed=False)
+            new_node_keys.append(new_node_key)
+
+        if len(nodes) != 0:
+            nodes[0].get_relocation_counter().count_relocation_in_layer(self.layer_number)
+
+        return new_node_keys
+
     def delete_node(self, node_key):
         """
         deletes the given node from the table
@@ -167,6 +261,28 @@ class AbstractTable:
         node_to_remove.destructor()
         self._remove_node_from_table_without_affecting_the_node(node_key)
 
+    def delete_nodes_by_bulk(self, list_of_node_keys):
+        """
+        the same as calling delete_node for each of the keys, but the nodes are removed from all of their neighbors in
+        one sweep, so a neighbor connected to many of the nodes is visited once and updates its equation validity once
+        :param list_of_node_keys: keys of nodes in this table, without duplicates
+        """
+        nodes_to_remove = [self.get_node_by_key(node_key) for node_key in list_of_node_keys]
+        for node_to_remove in nodes_to_remove:
+            assert node_to_remove.get_table_number() == self.table_number
+
+        # from assumption (3) nodes in the same layer are never neighbors
+        GlobalNode.remove_nodes_from_their_neighbors_lists_by_bulk(nodes_to_remove)
+
+        # the ids of all the nodes are given back together, after the destructors (which find the nodes without ids)
+        ids_to_give_back = []
+        for node_key, node_to_remove in zip(list_of_node_keys, nodes_to_remove):
+            ids_to_give_back.extend(node_to_remove.remove_id_equation_and_constraint_and_get_ids_to_give_back())
+            node_to_remove.destructor(remove_this_node_from_neighbors_lists=False)
+            self._remove_node_from_table_without_affecting_the_node(node_key)
+
+        self.global_data_manager.give_ids_back(ids_to_give_back)
+
     def add_or_edit_neighbor_to_node(self, node_key, direction_of_connection, connection_data):
         node_to_add_connection_to = self.get_node_by_key(node_key)
         node_to_add_connection_to.add_or_edit_neighbor(direction_of_connection, connection_data)
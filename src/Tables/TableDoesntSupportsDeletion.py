@@ -28,22 +28,26 @@ class TableDoesntSupportsDeletion(AbstractTable):
         # the key of the node is simply its index in the table
         return len(self.nodes) - 1
 
-    def create_new_node_and_add_to_table(self,
-                                         number_of_tables_in_previous_layer,
-                                         number_of_tables_in_next_layer,
-                                         node_bias,
-                                         global_data_manager):
+    def _create_new_node_with_ids_and_add_to_table(self,
+                                                   number_of_tables_in_previous_layer,
+                                                   number_of_tables_in_next_layer,
+                                                   node_bias,
+                                                   global_incoming_id, global_outgoing_id,
+                                                   global_data_manager):
         """
         :param node_bias:
         :param number_of_tables_in_previous_layer:
         :param number_of_tables_in_next_layer:
+        :param global_incoming_id:
+        :param global_outgoing_id:
         :param global_data_manager:
         :return: the node created
         """
-        new_node = super().create_new_node_and_add_to_table(number_of_tables_in_previous_layer,
-                                                            number_of_tables_in_next_layer,
-                                                            node_bias,
-                                                            global_data_manager)
+        new_node = super()._create_new_node_with_ids_and_add_to_table(number_of_tables_in_previous_layer,
+                                                                      number_of_tables_in_next_layer,
+                                                                      node_bias,
+                                                                      global_incoming_id, global_outgoing_id,
+                                                                      global_data_manager)
         new_node.set_in_stone()
         return new_node
 
@@ -56,5 +60,14 @@ class TableDoesntSupportsDeletion(AbstractTable):
         node.set_in_stone()
         return new_node_key
 
+    def add_existing_nodes_to_table_by_bulk(self, previous_table_manager, nodes):
+        """
+        override the super method so that the nodes which were inserted to the table would be set in stone
+        """
+        new_node_keys = super().add_existing_nodes_to_table_by_bulk(previous_table_manager, nodes)
+        for node in nodes:
+            node.set_in_stone()
+        return new_node_keys
+
     def get_node_by_key(self, node_key):
         return self.nodes[node_key]
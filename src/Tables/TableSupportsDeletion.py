@@ -1,12 +1,27 @@
+import heapq
+
 from src.Tables.Table import AbstractTable
-from src.IDManager import IDManager
 
 
 class TableSupportsDeletion(AbstractTable):
+    """
+    the nodes are held in a slab, a list in which the node with key i is at index i and the slots of deleted nodes
+    hold None.
+    the smallest key freed is always given to the next node added, so after any number of deletions and additions
+    the keys are smaller than the largest number of nodes the table ever held at once, and compact_keys makes them
+    exactly 0, 1, ..., n-1.
+    the keys can be used directly as indices to side arrays (of weights, scores, bounds and so on), together with
+    get_bitmap_of_live_keys to tell which slots hold nodes
+    """
+
     def __init__(self, layer_number, table_number, layer_is_inner, global_data_manager):
         super().__init__(layer_number, table_number, layer_is_inner, global_data_manager)
-        self.nodes = {}
-        self.id_manager = IDManager()
+        self.nodes = []
+        # self.live_keys[key] is 1 if there is a node with that key and 0 otherwise
+        self.live_keys = bytearray()
+        # a heap of the keys smaller than len(self.nodes) which do not have a node
+        self.free_keys = []
+        self.number_of_nodes = 0
 
     def create_table_below_of_same_type(self):
         table_to_return = TableSupportsDeletion(*self.get_arguments_to_create_table_below())
@@ -14,22 +29,50 @@ class TableSupportsDeletion(AbstractTable):
         return table_to_return
 
     def get_iterator_for_all_nodes(self):
-        for key in self.nodes:
-            yield self.nodes[key]
+        for node in self.nodes:
+            if node is not None:
+                yield node
 
     def get_iterator_for_all_keys(self):
-        for key in self.nodes:
-            yield key
+        for key, node in enumerate(self.nodes):
+            if node is not None:
+                yield key
 
     def get_number_of_nodes_in_table(self):
+        return self.number_of_nodes
+
+    def get_key_capacity(self):
+        """
+        :return: a number which is larger than all the keys in the table, and is the length of the bitmap returned by
+        get_bitmap_of_live_keys
+        """
         return len(self.nodes)
 
+    def get_bitmap_of_live_keys(self):
+        """
+        :return: a bytearray of length get_key_capacity() such that bitmap[key] is 1 if there is a node with that key in
+        the table and 0 otherwise. it is the table own bitmap, so it must not be changed, and it is changed whenever a
+        node is added or removed
+        """
+        return self.live_keys
+
     def _add_node_to_table_without_checking(self, node):
-        new_key_for_node = self.id_manager.get_new_id()
-        self.nodes[new_key_for_node] = node
+        if len(self.free_keys) != 0:
+            new_key_for_node = heapq.heappop(self.free_keys)
+            self.nodes[new_key_for_node] = node
+            self.live_keys[new_key_for_node] = 1
+        else:
+            new_key_for_node = len(self.nodes)
+            self.nodes.append(node)
+            self.live_keys.append(1)
+
+        self.number_of_nodes += 1
         return new_key_for_node
 
     def get_node_by_key(self, node_key):
+        if not 0 <= node_key < len(self.nodes) or self.nodes[node_key] is None:
+            raise Exception("there is no node with the given key in the table")
+
         return self.nodes[node_key]
 
     def _remove_node_from_table_without_affecting_the_node(self, node_key):
@@ -38,8 +81,53 @@ class TableSupportsDeletion(AbstractTable):
         notifies lower tables that this table size has changed.
         :param node_key:
         """
-        self.id_manager.give_id_back(node_key)
-        del self.nodes[node_key]
+        self.get_node_by_key(node_key)
+
+        self.nodes[node_key] = None
+        self.live_keys[node_key] = 0
+        heapq.heappush(self.free_keys, node_key)
+        self.number_of_nodes -= 1
+
+    def compact_keys(self):
+        """
+        moves the nodes with the largest keys to the free keys, until the keys of the nodes are exactly
+        0, 1, ..., n-1 (where n is the number of nodes in the table).
+        the nodes moved keep the validity of their equations, and their neighbors find their new keys the next time
+        they use their connections to them (see NodeEdges)
+
+        :return: a map between the previous key and the new key of every node which was moved
+        """
+        map_of_new_keys = {}
+
+        largest_key = len(self.nodes) - 1
+        for free_key in sorted(self.free_keys):
+            while largest_key > free_key and self.nodes[largest_key] is None:
+                largest_key -= 1
+            if largest_key <= free_key:
+                break
+
+            node_to_move = self.nodes[largest_key]
+            self.nodes[free_key] = node_to_move
+            self.live_keys[free_key] = 1
+            self.nodes[largest_key] = None
+            self.live_keys[largest_key] = 0
+
+            # the global data manager knows which equations are invalid by the location of the node
+            equation_is_valid = node_to_move.check_if_node_equation_is_valid()
+            if not equation_is_valid:
+                node_to_move._set_global_equation_to_valid()
+            node_to_move.set_new_location(self.table_number, free_key, notify_neighbors_that_location_changed=True)
+            if not equation_is_valid:
+                node_to_move.set_global_equation_to_invalid()
+
+            map_of_new_keys[largest_key] = free_key
+            largest_key -= 1
+
+        del self.nodes[self.number_of_nodes:]
+        del self.live_keys[self.number_of_nodes:]
+        self.free_keys = []
+
+        return map_of_new_keys
 
     def remove_node_from_table_and_relocate_to_other_table(self, node_key, new_table_manager):
         node_to_relocate = self.get_node_by_key(node_key)
@@ -53,3 +141,11 @@ class TableSupportsDeletion(AbstractTable):
         self._reset_key_of_node_currently_being_removed_from_table()
 
         return new_node_key
+
+    def remove_nodes_from_table_and_relocate_to_other_table_by_bulk(self, list_of_node_keys, new_table_manager):
+        nodes_to_relocate = [self.get_node_by_key(node_key) for node_key in list_of_node_keys]
+        for node_to_relocate in nodes_to_relocate:
+            node_to_relocate.check_if_killed_and_raise_error_if_is()
+
+        # the new table notifies this table about each node it takes, and this table removes the node when notified
+        return new_table_manager.add_existing_nodes_to_table_by_bulk(self, nodes_to_relocate)
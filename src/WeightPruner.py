@@ -0,0 +1,143 @@
+from src.NodeEdges import NodeEdges
+
+"""
+sound pruning of connections with tiny weights, done when a layer is preprocessed.
+
+a trained network has many connections whose weight is almost 0. each of them costs an edge in both NodeEdges objects,
+an addend in the node equation and more pairs to go over when deciding which arnodes to merge, while hardly changing
+the output of the network.
+
+the WeightPruner removes the connections whose absolute weight is below a threshold, and folds what they could have
+contributed into the bias of the node they went into. since the previous node value is bounded (by the input bounds,
+propagated through the layers with interval arithmetic when the network is built), the contribution of a pruned
+connection with weight w from a node whose value is in [l, u] is in [min(w*l, w*u), max(w*l, w*u)]. summing those
+intervals gives an interval [lower_bias, upper_bias] which holds the bias the node effectively has.
+
+the connections are pruned only when a node is split by its type (see Layer.split_unprocessed_node_to_tables): the new
+inc nodes take upper_bias and the new dec nodes take lower_bias, so each of them over-approximates the node in the
+direction of its type, exactly like the abstraction itself. the layers are preprocessed from the last to the first, so
+when a node is split the nodes of the previous layer were not preprocessed yet, and their bounds are bounds of the
+given network.
+until a layer is preprocessed it keeps all its connections, so the network built (which is saved to evaluate
+counterexamples) and every layer which was not preprocessed are exactly the given network, and the network is an
+over-approximation of the given network at every stage (up to floating point rounding).
+"""
+
+
+class WeightPruner:
+    def __init__(self, threshold, input_minimums, input_maximums, number_of_connections_pruned_in_layer=None):
+        """
+        :param threshold: connections whose absolute weight is smaller than this threshold would be pruned
+        :param input_minimums: lower bounds on the input nodes
+        :param input_maximums: upper bounds on the input nodes
+        :param number_of_connections_pruned_in_layer: None by default.
+        if given, the numbers of connections pruned before, as returned by
+        get_number_of_connections_pruned_in_each_layer. used when a saved network is built again
+        (see PreprocessedNetworkCache)
+        """
+        self.threshold = threshold
+
+        # bounds on the values of the nodes in the last layer given to get_bounds_of_layer (or the input layer)
+        self.lower_bounds_of_previous_layer = list(input_minimums)
+        self.upper_bounds_of_previous_layer = list(input_maximums)
+
+        # maps a layer number to a pair of (number of connections pruned, number of connections before pruning)
+        self.number_of_connections_pruned_in_layer = {}
+        if number_of_connections_pruned_in_layer is not None:
+            self.number_of_connections_pruned_in_layer = dict(number_of_connections_pruned_in_layer)
+
+    def get_bounds_of_input_layer(self):
+        """
+        must be called before get_bounds_of_layer is called for the first time
+        :return: a pair of (lower bounds, upper bounds) on the values of the input nodes
+        """
+        return self.lower_bounds_of_previous_layer, self.upper_bounds_of_previous_layer
+
+    def get_bounds_of_layer(self, biases, nonzero_connections, is_output_layer=False):
+        """
+        the layers must be given in order, starting from the first layer after the input layer, since the bounds of
+        each layer are calculated from the bounds of the previous one
+
+        :param biases: the biases of the nodes in the layer
+        :param nonzero_connections: the connections between the layer and the previous layer in a CSR form, as returned
+        by NNetReader.get_nonzero_connections
+        :param is_output_layer: the nodes of the output layer do not go through a relu
+        :return: a pair of (lower bounds, upper bounds) on the values the nodes of the layer give to the next layer
+        """
+        row_pointers, column_indices, values = nonzero_connections
+        lower_bounds_of_previous_layer = self.lower_bounds_of_previous_layer
+        upper_bounds_of_previous_layer = self.upper_bounds_of_previous_layer
+
+        lower_bounds_of_layer = []
+        upper_bounds_of_layer = []
+        for i in range(len(biases)):
+            lower_sum = biases[i]
+            upper_sum = biases[i]
+            for k in range(row_pointers[i], row_pointers[i + 1]):
+                j = column_indices[k]
+                weight = values[k]
+                if weight >= 0:
+                    lower_sum += weight * lower_bounds_of_previous_layer[j]
+                    upper_sum += weight * upper_bounds_of_previous_layer[j]
+                else:
+                    lower_sum += weight * upper_bounds_of_previous_layer[j]
+                    upper_sum += weight * lower_bounds_of_previous_layer[j]
+
+            if is_output_layer:
+                lower_bounds_of_layer.append(lower_sum)
+                upper_bounds_of_layer.append(upper_sum)
+            else:
+                # the nodes of the layer go through a relu before they are given to the next layer
+                lower_bounds_of_layer.append(max(lower_sum, 0))
+                upper_bounds_of_layer.append(max(upper_sum, 0))
+
+        self.lower_bounds_of_previous_layer = lower_bounds_of_layer
+        self.upper_bounds_of_previous_layer = upper_bounds_of_layer
+
+        return lower_bounds_of_layer, upper_bounds_of_layer
+
+    def prune_incoming_connections(self, layer_number, bias, incoming_connections_data):
+        """
+        :param layer_number: the layer of the node whose connections are pruned
+        :param bias: the bias of the node
+        :param incoming_connections_data: the incoming connections of the node, as returned by
+        get_a_list_of_all_connections_data. the nodes connected to must have bounds on their values (see
+        GlobalNode.get_bounds_of_value), connections to nodes without finite bounds are never pruned
+        :return: a tuple of (kept_connections_data, lower_bias, upper_bias) where
+        kept_connections_data holds only the connections which were kept, in the same form
+        [lower_bias, upper_bias] holds the bias plus anything the pruned connections could have contributed
+        """
+        kept_connections_data = []
+        lower_bias = bias
+        upper_bias = bias
+        for connection_data in incoming_connections_data:
+            weight = connection_data[NodeEdges.INDEX_OF_WEIGHT_IN_DATA]
+            lower_bound_of_value, upper_bound_of_value = \
+                connection_data[NodeEdges.INDEX_OF_REFERENCE_TO_NODE_CONNECTED_TO_IN_DATA].get_bounds_of_value()
+            if abs(weight) >= self.threshold or lower_bound_of_value == float('-inf') or \
+                    upper_bound_of_value == float('inf'):
+                kept_connections_data.append(connection_data)
+                continue
+
+            if weight >= 0:
+                lower_bias += weight * lower_bound_of_value
+                upper_bias += weight * upper_bound_of_value
+            else:
+                lower_bias += weight * upper_bound_of_value
+                upper_bias += weight * lower_bound_of_value
+
+        number_of_connections_pruned, number_of_connections = \
+            self.number_of_connections_pruned_in_layer.get(layer_number, (0, 0))
+        self.number_of_connections_pruned_in_layer[layer_number] = (
+            number_of_connections_pruned + len(incoming_connections_data) - len(kept_connections_data),
+            number_of_connections + len(incoming_connections_data))
+
+        return kept_connections_data, lower_bias, upper_bias
+
+    def get_number_of_connections_pruned_in_each_layer(self):
+        """
+        :return: a map between a layer number and a pair of
+        (number of connections pruned, number of connections before pruning).
+        only the layers which were preprocessed are in the map
+        """
+        return dict(self.number_of_connections_pruned_in_layer)
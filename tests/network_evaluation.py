@@ -0,0 +1,65 @@
+"""
+helpers for the tests, which evaluate networks directly in python (without a solver)
+"""
+
+
+def evaluate_layer_matrices(weights, biases, input_values):
+    """
+    :param weights: a list which holds for each layer (not including the input layer) its dense weight matrix
+    :param biases: a list which holds for each layer (not including the input layer) the biases of its nodes
+    :param input_values: the values of the input nodes
+    :return: the values of the output nodes. every layer but the output layer goes through a relu
+    """
+    values = list(input_values)
+    for layer_index in range(len(weights)):
+        values = [sum(weight * value for weight, value in zip(row, values)) + bias
+                  for row, bias in zip(weights[layer_index], biases[layer_index])]
+        if layer_index != len(weights) - 1:
+            values = [max(value, 0) for value in values]
+    return values
+
+
+def evaluate_abstract_network(network, input_values, is_arnode=False):
+    """
+    evaluates the network object as it is now, following the incoming connections and the biases of its nodes
+
+    :param network: a Network object
+    :param input_values: the values of the input nodes, in the order of their global ids
+    :param is_arnode: if true the arnodes are evaluated, otherwise the regular nodes
+    :return: the values of the nodes of the last layer, in the order of their global ids. the nodes of the hidden
+    layers of the given network go through a relu, the y nodes and the nodes of the layers added after them by
+    hard_code_acas_output_properties do not
+    """
+    value_of_node = {}
+    values = []
+    for layer in network.layers:
+        tables = layer.arnode_tables if is_arnode else layer.regular_node_tables
+        nodes = [node for table in tables for node in table.get_iterator_for_all_nodes()]
+        nodes.sort(key=lambda node: node.get_global_incoming_id())
+        values = []
+        for i, node in enumerate(nodes):
+            if layer.layer_number == 0:
+                value = input_values[i]
+            else:
+                value = node.get_node_bias()
+                for _, _, weight, node_connected_to in node.get_a_list_of_all_connections_data(-1):
+                    value += weight * value_of_node[id(node_connected_to)]
+                if layer.layer_number < network.last_layer_of_given_network:
+                    value = max(value, 0)
+            value_of_node[id(node)] = value
+            values.append(value)
+    return values
+
+
+def evaluate_nnet_reader(nnet_reader, input_values):
+    """
+    evaluates a network the way every .nnet consumer does, every layer but the last goes through a relu
+
+    :param nnet_reader: an NNetReader compatible object
+    :param input_values: the values of the input nodes
+    :return: the values of the output nodes
+    """
+    weights = [[row.tolist() for row in nnet_reader.get_weight_matrix(layer_number)]
+               for layer_number in range(1, nnet_reader.numLayers + 1)]
+    biases = [list(nnet_reader.get_bias_vector(layer_number)) for layer_number in range(1, nnet_reader.numLayers + 1)]
+    return evaluate_layer_matrices(weights, biases, input_values)
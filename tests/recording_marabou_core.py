@@ -0,0 +1,96 @@
+"""
+a stand in for MarabouCore, whose input queries record the calls made to them, so the tests can compare the queries
+given to the solver. the mock marabou input query drops everything given to it
+"""
+
+
+class RecordingInputQuery:
+    def __init__(self):
+        self.calls = []
+
+    def setNumberOfVariables(self, number_of_variables):
+        self.calls.append(('setNumberOfVariables', number_of_variables))
+
+    def markInputVariable(self, variable, index):
+        self.calls.append(('markInputVariable', variable, index))
+
+    def markOutputVariable(self, variable, index):
+        self.calls.append(('markOutputVariable', variable, index))
+
+    def addEquation(self, equation):
+        self.calls.append(('addEquation', equation))
+
+    def setLowerBound(self, variable, lower_bound):
+        self.calls.append(('setLowerBound', variable, lower_bound))
+
+    def setUpperBound(self, variable, upper_bound):
+        self.calls.append(('setUpperBound', variable, upper_bound))
+
+
+class RecordingEquation:
+    def __init__(self, equation_type=1):
+        self.EquationType = equation_type
+        self.addendList = []
+        self.scalar = 0
+
+    def addAddend(self, weight, variable):
+        self.addendList.append((weight, variable))
+
+    def setScalar(self, scalar):
+        self.scalar = scalar
+
+
+class RecordingMarabouCore:
+    InputQuery = RecordingInputQuery
+    Equation = RecordingEquation
+
+    @staticmethod
+    def addReluConstraint(input_query, variable_1, variable_2):
+        input_query.calls.append(('addReluConstraint', variable_1, variable_2))
+
+
+NO_GLOBAL_ID = -1
+
+
+def get_contents_of_query(input_query, global_ids_of_variables):
+    """
+    :param input_query: a RecordingInputQuery
+    :param global_ids_of_variables: a list which holds at index i the global id of variable i, or NO_GLOBAL_ID if
+    variable i is free (a free variable must be bounded by 0, 0)
+    :return: the contents of the query with every variable replaced by its global id, in a form which does not depend
+    on the variables the global ids were given: a tuple of (equations, relu constraints, lower bounds, upper bounds,
+    input global ids, output global ids, live global ids)
+    """
+    equations = []
+    relu_constraints = []
+    lower_bounds = {}
+    upper_bounds = {}
+    input_global_ids = {}
+    output_global_ids = {}
+    number_of_variables = None
+    for name_of_call, *arguments in input_query.calls:
+        if name_of_call == 'setNumberOfVariables':
+            number_of_variables = arguments[0]
+        elif name_of_call == 'addEquation':
+            equation = arguments[0]
+            equations.append((equation.EquationType, equation.scalar,
+                              tuple((weight, global_ids_of_variables[variable])
+                                    for weight, variable in equation.addendList)))
+        elif name_of_call == 'addReluConstraint':
+            relu_constraints.append((global_ids_of_variables[arguments[0]], global_ids_of_variables[arguments[1]]))
+        elif name_of_call in ('setLowerBound', 'setUpperBound'):
+            variable, bound = arguments
+            if global_ids_of_variables[variable] == NO_GLOBAL_ID:
+                assert bound == 0
+                continue
+            bounds = lower_bounds if name_of_call == 'setLowerBound' else upper_bounds
+            bounds[global_ids_of_variables[variable]] = bound
+        elif name_of_call == 'markInputVariable':
+            input_global_ids[arguments[1]] = global_ids_of_variables[arguments[0]]
+        elif name_of_call == 'markOutputVariable':
+            output_global_ids[arguments[1]] = global_ids_of_variables[arguments[0]]
+
+    assert number_of_variables == len(global_ids_of_variables)
+    live_global_ids = sorted(global_id for global_id in global_ids_of_variables if global_id != NO_GLOBAL_ID)
+    return (sorted(equations), sorted(relu_constraints), lower_bounds, upper_bounds, input_global_ids,
+            output_global_ids, live_global_ids)
@@ -0,0 +1,155 @@
+import random
+
+import pytest
+
+from benchmarks.synthetic_networks import get_acas_like_layer_sizes, get_random_layer_matrices
+from src.ArrayNodeEdges import ArrayNodeEdges
+from src.Network import Network
+from src.NodeEdges import NodeEdges
+from src.Nodes.Node import Node
+from src.RelocationCounter import RelocationCounter
+
+NUMBER_OF_TABLES = 4
+LAYER_NUMBER_CONNECTED_TO = 1
+NUMBER_OF_STEPS = 500
+NUMBER_OF_MERGES = 10
+
+
+class NodeConnectedTo:
+    """
+    a stand in for the node at the other end of a connection, which is all the edges managers need from it
+    """
+
+    def __init__(self, name, table_number, key_in_table):
+        self.name = name
+        self.table_number = table_number
+        self.key_in_table = key_in_table
+
+    def get_table_number(self):
+        return self.table_number
+
+    def get_key_in_table(self):
+        return self.key_in_table
+
+    def check_if_killed_and_raise_error_if_is(self):
+        # the stand ins are never killed
+        pass
+
+
+def get_contents_of_edges(node_edges):
+    """
+    :return: the connections of the edges manager, in a form which does not depend on the order the connections are
+    gone over in within each table
+    """
+    connections = [(table_number, key_in_table, weight, node_connected_to.name)
+                   for table_number, key_in_table, weight, node_connected_to in
+                   node_edges.get_iterator_over_connections()]
+    # the connections are gone over in increasing table number
+    assert [connection[0] for connection in connections] == sorted(connection[0] for connection in connections)
+
+    pairs = sorted(tuple(sorted((key_in_table, node_connected_to.name)
+                                for _, key_in_table, _, node_connected_to in combination))
+                   for combination in node_edges.get_combinations_iterator_over_connections(2))
+
+    return sorted(connections), pairs, node_edges.get_number_of_connections(), node_edges.has_no_connections()
+
+
+def get_contents_of_arnodes(network):
+    """
+    :return: for every arnode of the network its location, ids, bias and connections
+    """
+    arnodes = []
+    for layer in network.layers:
+        for table in layer.arnode_tables:
+            for key_in_table in table.get_iterator_for_all_keys():
+                arnode = table.get_node_by_key(key_in_table)
+                connections = [sorted((table_number, key, weight) for table_number, key, weight, _ in
+                                      arnode.get_a_list_of_all_connections_data(direction))
+                               for direction in [Node.INCOMING_EDGE_DIRECTION, Node.OUTGOING_EDGE_DIRECTION]]
+                arnodes.append((layer.layer_number, table.table_number, key_in_table,
+                                arnode.get_global_incoming_id(), arnode.get_global_outgoing_id(),
+                                arnode.get_node_bias(), connections))
+    return arnodes
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_array_node_edges_behaves_as_node_edges(seed):
+    random_generator = random.Random(seed)
+    relocation_counter = RelocationCounter()
+    list_of_node_edges = [NodeEdges(NUMBER_OF_TABLES, LAYER_NUMBER_CONNECTED_TO, relocation_counter),
+                          ArrayNodeEdges(NUMBER_OF_TABLES, LAYER_NUMBER_CONNECTED_TO, relocation_counter)]
+
+    # the nodes of the layer connected to, each of them at a location of its own
+    free_locations = [(table_number, key_in_table) for table_number in range(NUMBER_OF_TABLES)
+                      for key_in_table in range(30)]
+    random_generator.shuffle(free_locations)
+    nodes = [NodeConnectedTo(name, *free_locations.pop()) for name in range(60)]
+
+    def get_random_weight():
+        return random_generator.choice([0.0, 1.0, -2.5, random_generator.uniform(-1, 1)])
+
+    for _ in range(NUMBER_OF_STEPS):
+        connections = list_of_node_edges[0].get_a_list_of_all_connections()
+        x = random_generator.random()
+        if x < 0.35:
+            node = random_generator.choice(nodes)
+            weight = get_random_weight()
+            for node_edges in list_of_node_edges:
+                node_edges.add_or_edit_connection(node.table_number, node.key_in_table, weight, node)
+        elif x < 0.5:
+            table_number = random_generator.randrange(NUMBER_OF_TABLES)
+            nodes_in_table = [node for node in nodes if node.table_number == table_number]
+            nodes_to_add = random_generator.sample(nodes_in_table, random_generator.randint(0, len(nodes_in_table)))
+            weights = [get_random_weight() for _ in nodes_to_add]
+            for node_edges in list_of_node_edges:
+                node_edges.add_or_edit_connections_by_bulk(table_number, [node.key_in_table for node in nodes_to_add],
+                                                           weights, nodes_to_add)
+        elif x < 0.7 and len(connections) != 0:
+            table_number, key_in_table, _, _ = random_generator.choice(connections)
+            results = [node_edges.delete_connection(table_number, key_in_table) for node_edges in list_of_node_edges]
+            assert results[0] == results[1]
+        elif x < 0.85:
+            # a node of the layer connected to changes its location, which the edges managers find out on their own
+            node = random_generator.choice(nodes)
+            location = (node.table_number, node.key_in_table)
+            node.table_number, node.key_in_table = free_locations.pop()
+            free_locations.insert(0, location)
+            relocation_counter.count_relocation_in_layer(LAYER_NUMBER_CONNECTED_TO)
+        elif len(connections) != 0:
+            # the same node is moved in the edges managers only, as when it is replaced by another node
+            table_number, key_in_table, _, node = random_generator.choice(connections)
+            node.table_number, node.key_in_table = free_locations.pop()
+            free_locations.insert(0, (table_number, key_in_table))
+            for node_edges in list_of_node_edges:
+                node_edges.move_connection(table_number, key_in_table, node.table_number, node.key_in_table)
+
+        assert get_contents_of_edges(list_of_node_edges[1]) == get_contents_of_edges(list_of_node_edges[0])
+        for node in random_generator.sample(nodes, 5):
+            connection_exists = list_of_node_edges[0].check_if_connection_exist(node.table_number, node.key_in_table)
+            assert list_of_node_edges[1].check_if_connection_exist(node.table_number, node.key_in_table) == \
+                connection_exists
+            if connection_exists:
+                assert list_of_node_edges[1].find_weight_of_connection(node.table_number, node.key_in_table) == \
+                    list_of_node_edges[0].find_weight_of_connection(node.table_number, node.key_in_table)
+                assert list_of_node_edges[1].get_connection_data_for_neighbor(node.table_number, node.key_in_table) == \
+                    list_of_node_edges[0].get_connection_data_for_neighbor(node.table_number, node.key_in_table)
+
+
+@pytest.mark.parametrize("which_acas_output", [1, 2])
+def test_network_with_array_node_edges_behaves_as_with_node_edges(monkeypatch, which_acas_output):
+    weights, biases, bounds = get_random_layer_matrices(get_acas_like_layer_sizes(8, 3), seed=3)
+    networks = []
+    for edges_manager_class in [NodeEdges, ArrayNodeEdges]:
+        monkeypatch.setattr(Node, 'EDGES_MANAGER_CLASS', edges_manager_class)
+        network = Network.from_layer_matrices(weights, biases, bounds, which_acas_output)
+        network.fully_activate_the_entire_network()
+        networks.append(network)
+
+    assert get_contents_of_arnodes(networks[1]) == get_contents_of_arnodes(networks[0])
+    for _ in range(NUMBER_OF_MERGES):
+        arnodes_to_merge = networks[0].decide_best_arnodes_to_merge()
+        assert networks[1].decide_best_arnodes_to_merge() == arnodes_to_merge
+        for network in networks:
+            network.merge_list_of_arnodes(*arnodes_to_merge)
+
+        assert get_contents_of_arnodes(networks[1]) == get_contents_of_arnodes(networks[0])
@@ -0,0 +1,76 @@
+import pytest
+
+from benchmarks.synthetic_networks import get_acas_like_layer_sizes, get_random_layer_matrices
+from src.Layer import Layer
+from src.Network import Network
+from src.Tables.ARNodeTable import ARNodeTable
+from tests.test_array_node_edges import get_contents_of_arnodes
+
+NUMBER_OF_MERGES = 10
+LAYER_NUMBER_TO_DELETE_FROM = 2
+
+
+def get_network(which_acas_output):
+    weights, biases, bounds = get_random_layer_matrices(get_acas_like_layer_sizes(8, 3), seed=10)
+    network = Network.from_layer_matrices(weights, biases, bounds, which_acas_output)
+    network.fully_activate_the_entire_network()
+    return network
+
+
+def get_state_of_network(network):
+    """
+    :return: the arnodes of the network, which of them have valid equations, and the state of the global data. the
+    ids given back are bounded by 0, so they are found by the bounds
+    """
+    validity_of_equations = [arnode.check_if_node_equation_is_valid()
+                             for layer in network.layers
+                             for table in layer.arnode_tables
+                             for arnode in table.get_iterator_for_all_nodes()]
+    global_network_manager = network.global_network_manager
+    input_query = global_network_manager.input_query
+    return (get_contents_of_arnodes(network), validity_of_equations,
+            sorted(global_network_manager.get_list_of_nodes_that_dont_have_valid_equations()),
+            global_network_manager.get_maximum_id_used(), input_query.lowerBounds, input_query.upperBounds,
+            sorted(input_query.relu_constraints), len(input_query.equations))
+
+
+def delete_nodes_one_by_one(table, list_of_node_keys):
+    for node_key in list_of_node_keys:
+        table.delete_node(node_key)
+
+
+@pytest.mark.parametrize("which_acas_output", [1, 2])
+def test_bulk_deletion_is_the_same_as_deleting_node_by_node(which_acas_output):
+    network_deleted_by_bulk = get_network(which_acas_output)
+    network_deleted_node_by_node = get_network(which_acas_output)
+
+    for table_number in Layer.OVERALL_ARNODE_TABLES:
+        tables = [network.layers[LAYER_NUMBER_TO_DELETE_FROM].arnode_tables[table_number]
+                  for network in [network_deleted_by_bulk, network_deleted_node_by_node]]
+        keys_to_delete = tables[0].get_list_of_all_keys()[::2]
+        if len(keys_to_delete) == 0:
+            continue
+
+        tables[0].delete_nodes_by_bulk(keys_to_delete)
+        delete_nodes_one_by_one(tables[1], keys_to_delete)
+        assert tables[0].get_list_of_all_keys() == tables[1].get_list_of_all_keys()
+
+    assert get_state_of_network(network_deleted_by_bulk) == get_state_of_network(network_deleted_node_by_node)
+
+
+@pytest.mark.parametrize("which_acas_output", [1, 2])
+def test_merges_are_the_same_as_with_deletion_node_by_node(monkeypatch, which_acas_output):
+    network_merged_with_bulk_deletion = get_network(which_acas_output)
+    with monkeypatch.context() as patch:
+        patch.setattr(ARNodeTable, 'delete_nodes_by_bulk', delete_nodes_one_by_one)
+        network_merged_with_deletion_node_by_node = get_network(which_acas_output)
+
+    for _ in range(NUMBER_OF_MERGES):
+        arnodes_to_merge = network_merged_with_bulk_deletion.decide_best_arnodes_to_merge()
+        network_merged_with_bulk_deletion.merge_list_of_arnodes(*arnodes_to_merge)
+        with monkeypatch.context() as patch:
+            patch.setattr(ARNodeTable, 'delete_nodes_by_bulk', delete_nodes_one_by_one)
+            network_merged_with_deletion_node_by_node.merge_list_of_arnodes(*arnodes_to_merge)
+
+        assert get_state_of_network(network_merged_with_bulk_deletion) == \
+            get_state_of_network(network_merged_with_deletion_node_by_node)
@@ -0,0 +1,71 @@
+import pytest
+
+from benchmarks.synthetic_networks import get_acas_like_layer_sizes, get_random_layer_matrices
+from src.Layer import Layer
+from src.Network import Network
+from src.Nodes.Node import Node
+# recording_equations is an autouse fixture, importing it applies it to the tests here too
+from tests.test_network_construction import get_contents_of_network, recording_equations
+
+LAYER_SIZES = get_acas_like_layer_sizes(7, 3)
+LAYER_NUMBER_TO_RELOCATE = 2
+
+
+def get_network():
+    weights, biases, bounds = get_random_layer_matrices(LAYER_SIZES, seed=9)
+    return Network.from_layer_matrices(weights, biases, bounds, 1)
+
+
+def get_keys_to_relocate(network):
+    # every other node, so that the nodes left in the unprocessed table are connected to the same neighbors
+    return network.layers[LAYER_NUMBER_TO_RELOCATE].regular_node_tables[Layer.INDEX_OF_UNPROCESSED_TABLE]. \
+        get_list_of_all_keys()[::2]
+
+
+def assert_connections_are_keyed_by_current_locations(network):
+    for layer in network.layers:
+        for tables in [layer.regular_node_tables, layer.arnode_tables]:
+            for table in tables:
+                for node in table.get_iterator_for_all_nodes():
+                    for direction in [Node.INCOMING_EDGE_DIRECTION, Node.OUTGOING_EDGE_DIRECTION]:
+                        for table_number, key_in_table, _, node_connected_to in \
+                                node.get_a_list_of_all_connections_data(direction):
+                            assert (table_number, key_in_table) == node_connected_to.get_location()
+                            assert node_connected_to.check_if_neighbor_exists(-direction, node.get_location())
+
+
+@pytest.mark.parametrize("table_number", [Layer.INDEX_OF_POS_INC_TABLE, Layer.INDEX_OF_NEG_DEC_TABLE])
+def test_bulk_relocation_is_the_same_as_relocating_node_by_node(table_number):
+    network_relocated_by_bulk = get_network()
+    network_relocated_node_by_node = get_network()
+    keys_to_relocate = get_keys_to_relocate(network_relocated_by_bulk)
+
+    relocation_counter = network_relocated_by_bulk.global_network_manager.get_relocation_counter()
+    number_of_relocations = relocation_counter.get_number_of_relocations_in_layer(LAYER_NUMBER_TO_RELOCATE)
+    nodes_moved = network_relocated_by_bulk.layers[LAYER_NUMBER_TO_RELOCATE]. \
+        relocate_nodes_from_unprocessed_table_by_bulk(keys_to_relocate, table_number)
+    # the whole batch is counted as a single relocation
+    assert relocation_counter.get_number_of_relocations_in_layer(LAYER_NUMBER_TO_RELOCATE) == number_of_relocations + 1
+
+    layer = network_relocated_node_by_node.layers[LAYER_NUMBER_TO_RELOCATE]
+    unprocessed_table = layer.regular_node_tables[Layer.INDEX_OF_UNPROCESSED_TABLE]
+    new_keys = [unprocessed_table.remove_node_from_table_and_relocate_to_other_table(
+        key, layer.regular_node_tables[table_number]) for key in keys_to_relocate]
+
+    assert [node.get_location() for node in nodes_moved] == [(table_number, key) for key in new_keys]
+    assert get_contents_of_network(network_relocated_by_bulk) == \
+        get_contents_of_network(network_relocated_node_by_node)
+    assert_connections_are_keyed_by_current_locations(network_relocated_by_bulk)
+
+
+def test_outer_layers_are_relocated_by_bulk_when_preprocessed():
+    network = get_network()
+    network.fully_activate_the_entire_network()
+
+    # the outer layers are moved as a whole to the pos-inc table
+    for layer_number in [0, len(network.layers) - 1]:
+        layer = network.layers[layer_number]
+        assert layer.get_number_of_nodes_in_table(False, Layer.INDEX_OF_UNPROCESSED_TABLE) == 0
+        assert layer.get_number_of_nodes_in_table(False, Layer.INDEX_OF_POS_INC_TABLE) > 0
+    assert network.layers[0].get_number_of_nodes_in_table(False, Layer.INDEX_OF_POS_INC_TABLE) == LAYER_SIZES[0]
+    assert_connections_are_keyed_by_current_locations(network)
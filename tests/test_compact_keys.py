@@ -0,0 +1,100 @@
+import pytest
+
+from benchmarks.synthetic_networks import get_acas_like_layer_sizes, get_random_layer_matrices
+from src.MarabouDataManagers.GlobalDataManager import GlobalDataManager
+from src.Network import Network
+from src.Nodes.Node import Node
+
+NUMBER_OF_MERGES_BEFORE_COMPACTION = 25
+NUMBER_OF_MERGES_AFTER_COMPACTION = 5
+
+
+def get_keys_of_arnodes(network):
+    """
+    :return: a map between every arnode and a tuple of (layer_number, table_number, key_in_table) of its location
+    """
+    return {arnode: (layer.layer_number,) + arnode.get_location()
+            for layer in network.layers
+            for table in layer.arnode_tables
+            for arnode in table.get_iterator_for_all_nodes()}
+
+
+def get_arnodes_by_global_ids(network):
+    """
+    :return: for every arnode its layer, global ids, bias and connections, with the arnodes connected to given by their
+    global ids, so it does not depend on the keys of the arnodes
+    """
+    return sorted((layer.layer_number, arnode.get_global_incoming_id(), arnode.get_global_outgoing_id(),
+                   arnode.get_node_bias(),
+                   [sorted((node_connected_to.get_global_incoming_id(), weight) for _, _, weight, node_connected_to in
+                           arnode.get_a_list_of_all_connections_data(direction))
+                    for direction in [Node.INCOMING_EDGE_DIRECTION, Node.OUTGOING_EDGE_DIRECTION]])
+                  for layer in network.layers
+                  for table in layer.arnode_tables
+                  for arnode in table.get_iterator_for_all_nodes())
+
+
+def get_arnodes_without_valid_equations(network):
+    return {arnode for arnode in get_keys_of_arnodes(network) if not arnode.check_if_node_equation_is_valid()}
+
+
+def assert_network_is_consistent(network):
+    for layer in network.layers:
+        for table in layer.arnode_tables:
+            for key_in_table in table.get_iterator_for_all_keys():
+                assert table.get_node_by_key(key_in_table).get_location() == (table.table_number, key_in_table)
+            for arnode in table.get_iterator_for_all_nodes():
+                for direction in [Node.INCOMING_EDGE_DIRECTION, Node.OUTGOING_EDGE_DIRECTION]:
+                    for table_number, key_in_table, _, arnode_connected_to in \
+                            arnode.get_a_list_of_all_connections_data(direction):
+                        assert (table_number, key_in_table) == arnode_connected_to.get_location()
+
+    # the nodes which do not have valid equations are found by their locations
+    for layer_number, table_number, key_in_table, node_code in \
+            network.global_network_manager.get_list_of_nodes_that_dont_have_valid_equations():
+        layer = network.layers[layer_number]
+        tables = layer.arnode_tables if node_code == GlobalDataManager.CODE_FOR_ARNODE else layer.regular_node_tables
+        assert not tables[table_number].get_node_by_key(key_in_table).check_if_node_equation_is_valid()
+
+
+@pytest.mark.parametrize("which_acas_output", [1, 2])
+def test_compaction_gives_the_new_key_of_every_arnode_moved(which_acas_output):
+    weights, biases, bounds = get_random_layer_matrices(get_acas_like_layer_sizes(8, 3), seed=4)
+    network = Network.from_layer_matrices(weights, biases, bounds, which_acas_output)
+    network.fully_activate_the_entire_network()
+    for _ in range(NUMBER_OF_MERGES_BEFORE_COMPACTION):
+        network.merge_list_of_arnodes(*network.decide_best_arnodes_to_merge())
+
+    arnodes_by_global_ids = get_arnodes_by_global_ids(network)
+    keys_of_arnodes = get_keys_of_arnodes(network)
+    arnodes_without_valid_equations = get_arnodes_without_valid_equations(network)
+    assert len(arnodes_without_valid_equations) != 0
+    assert any(table.get_key_capacity() != table.get_number_of_nodes_in_table()
+               for layer in network.layers for table in layer.arnode_tables)
+
+    maps_of_new_keys = network.compact_keys_of_arnode_tables()
+    for layer in network.layers:
+        for table in layer.arnode_tables:
+            number_of_nodes = table.get_number_of_nodes_in_table()
+            assert table.get_list_of_all_keys() == list(range(number_of_nodes))
+            assert table.get_key_capacity() == number_of_nodes
+            assert all(table.get_bitmap_of_live_keys())
+
+            # only the arnodes whose keys were too large were moved, into keys which were free
+            map_of_new_keys = maps_of_new_keys[layer.layer_number][table.table_number]
+            assert all(previous_key >= number_of_nodes > new_key for previous_key, new_key in map_of_new_keys.items())
+
+    for arnode, (layer_number, table_number, previous_key) in keys_of_arnodes.items():
+        assert arnode.get_location() == (table_number,
+                                         maps_of_new_keys[layer_number][table_number].get(previous_key, previous_key))
+    assert len(get_keys_of_arnodes(network)) == len(keys_of_arnodes)
+    # the arnodes moved keep the validity of their equations
+    assert get_arnodes_without_valid_equations(network) == arnodes_without_valid_equations
+
+    assert_network_is_consistent(network)
+    assert get_arnodes_by_global_ids(network) == arnodes_by_global_ids
+
+    # the network can still be changed after its keys were compacted
+    for _ in range(NUMBER_OF_MERGES_AFTER_COMPACTION):
+        network.merge_list_of_arnodes(*network.decide_best_arnodes_to_merge())
+        assert_network_is_consistent(network)
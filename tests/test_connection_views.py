@@ -0,0 +1,101 @@
+import random
+
+import pytest
+
+from benchmarks.bench_connection_views import get_all_nodes_and_arnodes, \
+    get_maximal_difference_of_pairs_with_iterator, get_maximal_difference_of_pairs_with_view, \
+    sum_weights_with_iterator, sum_weights_with_view
+from benchmarks.synthetic_networks import get_acas_like_layer_sizes, get_random_layer_matrices
+from src.ArrayNodeEdges import ArrayNodeEdges
+from src.Layer import Layer
+from src.Network import Network
+from src.NodeEdges import NodeEdges
+from src.Nodes.ARNode import ARNode
+from src.Nodes.Node import Node
+from src.RelocationCounter import RelocationCounter
+from tests.test_array_node_edges import LAYER_NUMBER_CONNECTED_TO, NodeConnectedTo
+
+NUMBER_OF_TABLES = 4
+NUMBER_OF_MERGES = 10
+
+
+def get_connections_from_view(view):
+    return [[table_number, key_in_table, weight, node_connected_to]
+            for table_number, keys_in_table, weights, references in view
+            for key_in_table, weight, node_connected_to in zip(keys_in_table, weights, references)]
+
+
+def decide_best_arnodes_to_split_with_lists(network):
+    """
+    decide_best_arnodes_to_split as it would be written with the lists of the connections data
+    """
+    best_arnode_to_split = None
+    best_arnode_to_split_m = 0
+    index_in_inner_nodes_to_take_out_of_arnode = -1
+    layer_number_of_best_arnode = -1
+    for layer_number in range(len(network.layers) - 2, network.last_layer_not_fully_activated, -1):
+        for table_number in Layer.OVERALL_ARNODE_TABLES:
+            for arnode in network.layers[layer_number].get_iterator_for_all_nodes_for_table(True, table_number):
+                inner_nodes = arnode.get_inner_nodes()
+                if len(inner_nodes) == 1:
+                    continue
+
+                for j, node in enumerate(inner_nodes):
+                    for _, _, weight, incoming_node in node.get_a_list_of_all_connections_data(
+                            Node.INCOMING_EDGE_DIRECTION):
+                        weight_between_arnodes = incoming_node.get_pointer_to_ar_node_nested_in(). \
+                            get_weight_of_connection_to_neighbor(Node.OUTGOING_EDGE_DIRECTION, arnode.get_location())
+                        if abs(weight_between_arnodes - weight) > best_arnode_to_split_m:
+                            best_arnode_to_split_m = abs(weight_between_arnodes - weight)
+                            best_arnode_to_split = arnode
+                            index_in_inner_nodes_to_take_out_of_arnode = j
+                            layer_number_of_best_arnode = layer_number
+
+    inner_nodes = best_arnode_to_split.get_inner_nodes()
+    partition = [[node for i, node in enumerate(inner_nodes) if i != index_in_inner_nodes_to_take_out_of_arnode],
+                 [inner_nodes[index_in_inner_nodes_to_take_out_of_arnode]]]
+    return (layer_number_of_best_arnode,) + best_arnode_to_split.get_location() + (partition,)
+
+
+@pytest.mark.parametrize("edges_manager_class", [NodeEdges, ArrayNodeEdges])
+@pytest.mark.parametrize("seed", range(5))
+def test_view_holds_the_connections_the_iterator_goes_over(edges_manager_class, seed):
+    random_generator = random.Random(seed)
+    node_edges = edges_manager_class(NUMBER_OF_TABLES, LAYER_NUMBER_CONNECTED_TO, RelocationCounter())
+    nodes = [NodeConnectedTo(name, random_generator.randrange(NUMBER_OF_TABLES - 1), name) for name in range(40)]
+
+    for _ in range(200):
+        node = random_generator.choice(nodes)
+        if node_edges.check_if_connection_exist(node.table_number, node.key_in_table) and \
+                random_generator.random() < 0.5:
+            node_edges.delete_connection(node.table_number, node.key_in_table)
+        else:
+            node_edges.add_or_edit_connection(node.table_number, node.key_in_table, random_generator.uniform(-1, 1),
+                                              node)
+
+        view = node_edges.get_view_over_connections()
+        # only the tables which have connections are in the view, and the last table never has connections
+        assert [table_number for table_number, _, _, _ in view] == \
+            sorted({table_number for table_number, _, _, _ in node_edges.get_iterator_over_connections()})
+        assert get_connections_from_view(view) == node_edges.get_a_list_of_all_connections()
+
+
+@pytest.mark.parametrize("edges_manager_class", [NodeEdges, ArrayNodeEdges])
+def test_views_of_network_hold_the_connections_of_its_nodes(monkeypatch, edges_manager_class):
+    monkeypatch.setattr(Node, 'EDGES_MANAGER_CLASS', edges_manager_class)
+    weights, biases, bounds = get_random_layer_matrices(get_acas_like_layer_sizes(8, 3), seed=8)
+    network = Network.from_layer_matrices(weights, biases, bounds, 2)
+    network.fully_activate_the_entire_network()
+    for _ in range(NUMBER_OF_MERGES):
+        network.merge_list_of_arnodes(*network.decide_best_arnodes_to_merge())
+
+    all_nodes = get_all_nodes_and_arnodes(network)
+    arnodes = [node for node in all_nodes if isinstance(node, ARNode)]
+    for node in all_nodes:
+        for direction in [Node.INCOMING_EDGE_DIRECTION, Node.OUTGOING_EDGE_DIRECTION]:
+            assert get_connections_from_view(node.get_view_over_connections(direction)) == \
+                node.get_a_list_of_all_connections_data(direction)
+
+    assert sum_weights_with_view(all_nodes) == sum_weights_with_iterator(all_nodes)
+    assert get_maximal_difference_of_pairs_with_view(arnodes) == get_maximal_difference_of_pairs_with_iterator(arnodes)
+    assert network.decide_best_arnodes_to_split() == decide_best_arnodes_to_split_with_lists(network)
@@ -0,0 +1,89 @@
+import random
+
+import pytest
+
+from benchmarks.synthetic_networks import get_acas_like_layer_sizes, get_random_layer_matrices
+from src.MarabouDataManagers.NNetReader import NNetReader
+from src.Network import Network
+from tests.network_evaluation import evaluate_abstract_network, evaluate_layer_matrices, evaluate_nnet_reader
+
+NUMBER_OF_RANDOM_INPUTS = 50
+NUMBER_OF_MERGES = 10
+TOLERANCE = 1e-9
+
+
+def get_random_inputs(bounds, seed=1):
+    random_generator = random.Random(seed)
+    input_minimums, input_maximums = bounds
+    return [[random_generator.uniform(lower, upper) for lower, upper in zip(input_minimums, input_maximums)]
+            for _ in range(NUMBER_OF_RANDOM_INPUTS)]
+
+
+def get_output_of_property(which_acas_output, y):
+    """
+    :return: the values of the output nodes of a network which hard_code_acas_output_properties changed
+    """
+    if which_acas_output == 1:
+        return y
+    if which_acas_output == 2:
+        return [y[0] - y[i] for i in range(1, 5)]
+    return [y[i] - y[0] for i in range(1, 5)]
+
+
+def export_and_read(network, file_name):
+    network.export_abstract_network(file_name)
+    return NNetReader(file_name, use_binary_cache=False)
+
+
+@pytest.mark.parametrize("which_acas_output", [1, 2, 3])
+def test_export_of_fully_activated_network_computes_the_given_network(tmp_path, which_acas_output):
+    weights, biases, bounds = get_random_layer_matrices(get_acas_like_layer_sizes(8, 3), seed=5)
+    network = Network.from_layer_matrices(weights, biases, bounds, which_acas_output)
+    network.fully_activate_the_entire_network()
+
+    nnet_reader = export_and_read(network, str(tmp_path / "exported.nnet"))
+
+    assert nnet_reader.numLayers == len(weights)
+    for input_values in get_random_inputs(bounds):
+        expected_output = get_output_of_property(which_acas_output,
+                                                 evaluate_layer_matrices(weights, biases, input_values))
+        output = evaluate_nnet_reader(nnet_reader, input_values)
+        assert len(output) == len(expected_output)
+        assert all(abs(a - b) <= TOLERANCE for a, b in zip(output, expected_output))
+
+
+@pytest.mark.parametrize("which_acas_output", [1, 2, 3])
+def test_export_of_merged_network_computes_the_abstract_network(tmp_path, which_acas_output):
+    weights, biases, bounds = get_random_layer_matrices(get_acas_like_layer_sizes(8, 3), seed=5)
+    network = Network.from_layer_matrices(weights, biases, bounds, which_acas_output)
+    network.fully_activate_the_entire_network()
+    for _ in range(NUMBER_OF_MERGES):
+        network.merge_list_of_arnodes(*network.decide_best_arnodes_to_merge())
+
+    nnet_reader = export_and_read(network, str(tmp_path / "exported.nnet"))
+
+    assert nnet_reader.numLayers == len(weights)
+    for input_values in get_random_inputs(bounds):
+        expected_output = evaluate_abstract_network(network, input_values, is_arnode=True)
+        output = evaluate_nnet_reader(nnet_reader, input_values)
+        assert len(output) == len(expected_output)
+        assert all(abs(a - b) <= TOLERANCE for a, b in zip(output, expected_output))
+
+
+def test_export_composes_every_layer_after_the_y_layer(tmp_path):
+    weights, biases, bounds = get_random_layer_matrices(get_acas_like_layer_sizes(8, 3), seed=5)
+    network = Network.from_layer_matrices(weights, biases, bounds, 2)
+    network.fully_activate_the_entire_network()
+    for _ in range(NUMBER_OF_MERGES):
+        network.merge_list_of_arnodes(*network.decide_best_arnodes_to_merge())
+
+    # the last hidden layer is taken as the y layer, so there are 2 layers without a relu after it
+    network.last_layer_of_given_network -= 1
+    nnet_reader = export_and_read(network, str(tmp_path / "exported.nnet"))
+
+    assert nnet_reader.numLayers == len(weights) - 1
+    for input_values in get_random_inputs(bounds):
+        expected_output = evaluate_abstract_network(network, input_values, is_arnode=True)
+        output = evaluate_nnet_reader(nnet_reader, input_values)
+        assert len(output) == len(expected_output)
+        assert all(abs(a - b) <= TOLERANCE for a, b in zip(output, expected_output))
@@ -0,0 +1,41 @@
+import gc
+
+import pytest
+
+from benchmarks.synthetic_networks import get_acas_like_layer_sizes, get_random_layer_matrices
+from src.Cegar import run_cegar_naive
+from src.GarbageCollectionManager import GarbageCollectionManager
+from src.MarabouDataManagers.NNetReader import InMemoryNNetReader
+from src.Network import Network
+
+
+def test_release_unfreezes_the_frozen_objects():
+    garbage_collection_manager = GarbageCollectionManager()
+    garbage_collection_manager.freeze_existing_objects()
+    try:
+        assert gc.get_freeze_count() > 0
+    finally:
+        garbage_collection_manager.release()
+    assert gc.get_freeze_count() == 0
+
+
+def get_nnet_reader():
+    weights, biases, bounds = get_random_layer_matrices(get_acas_like_layer_sizes(4, 2))
+    return InMemoryNNetReader(weights, biases, *bounds)
+
+
+def test_cegar_run_unfreezes_the_frozen_objects():
+    run_cegar_naive(get_nnet_reader(), 1, garbage_collection_manager=GarbageCollectionManager())
+    assert gc.get_freeze_count() == 0
+    assert gc.isenabled()
+
+
+def test_failed_cegar_run_unfreezes_the_frozen_objects(monkeypatch):
+    def fail(network):
+        raise Exception("the solver failed")
+
+    monkeypatch.setattr(Network, 'check_if_network_is_sat_or_unsat', fail)
+    with pytest.raises(Exception, match="the solver failed"):
+        run_cegar_naive(get_nnet_reader(), 1, garbage_collection_manager=GarbageCollectionManager())
+    assert gc.get_freeze_count() == 0
+    assert gc.isenabled()
@@ -0,0 +1,45 @@
+import random
+
+import pytest
+
+from src.BitmapIDManager import BitmapIDManager
+from src.IDManager import IDManager
+from src.MarabouDataManagers.GlobalDataManager import GlobalDataManager
+
+NUMBER_OF_STEPS = 500
+
+
+def get_state_of_ids(global_data_manager):
+    """
+    :return: the free ids and the bounds of the global data manager, including the artificial bounds of the hole ids
+    """
+    input_query = global_data_manager.input_query
+    return (global_data_manager.id_manager.get_ranges(), sorted(input_query.lowerBounds.items()),
+            sorted(input_query.upperBounds.items()))
+
+
+@pytest.mark.parametrize("id_manager_class", [IDManager, BitmapIDManager])
+@pytest.mark.parametrize("seed", range(10))
+def test_ids_are_taken_and_given_back_in_batches_as_one_by_one(monkeypatch, id_manager_class, seed):
+    random_generator = random.Random(seed)
+    global_data_manager = GlobalDataManager()
+    monkeypatch.setattr(GlobalDataManager, 'ID_MANAGER_CLASS', id_manager_class)
+    global_data_manager_of_batches = GlobalDataManager()
+    ids_in_use = []
+
+    # which ids get artificial bounds depends on the order they are given back in, so the ids are given back in a
+    # random order and sometimes while there are no holes
+    probability_to_give_ids_back = random_generator.choice([0.4, 0.6])
+    for _ in range(NUMBER_OF_STEPS):
+        if len(ids_in_use) != 0 and random_generator.random() < probability_to_give_ids_back:
+            ids_to_give_back = [ids_in_use.pop(random_generator.randrange(len(ids_in_use)))
+                                for _ in range(random_generator.randint(1, min(8, len(ids_in_use))))]
+            for id_to_give_back in ids_to_give_back:
+                global_data_manager.give_id_back(id_to_give_back)
+            global_data_manager_of_batches.give_ids_back(ids_to_give_back)
+        else:
+            new_ids = [global_data_manager.get_new_id() for _ in range(random_generator.randint(0, 6))]
+            assert global_data_manager_of_batches.get_new_ids(len(new_ids)) == new_ids
+            ids_in_use.extend(new_ids)
+
+        assert get_state_of_ids(global_data_manager_of_batches) == get_state_of_ids(global_data_manager)
@@ -0,0 +1,84 @@
+import random
+
+import pytest
+
+from src.BitmapIDManager import BitmapIDManager
+from src.IDManager import IDManager
+
+NUMBER_OF_STEPS = 2000
+# enough ids for the bitmap of the holes to have more than 2 levels
+NUMBER_OF_IDS_IN_LARGE_RANGE = 3 * BitmapIDManager.BITS_IN_WORD ** 2
+
+
+def assert_id_managers_are_the_same(id_manager, other_id_manager):
+    assert other_id_manager.get_ranges() == id_manager.get_ranges()
+    assert other_id_manager.check_if_ranges_has_holes() == id_manager.check_if_ranges_has_holes()
+    assert other_id_manager.get_smallest_available_id() == id_manager.get_smallest_available_id()
+    assert other_id_manager.get_maximum_id_used() == id_manager.get_maximum_id_used()
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_bitmap_id_manager_gives_the_ids_id_manager_gives(seed):
+    random_generator = random.Random(seed)
+    id_manager = IDManager()
+    bitmap_id_manager = BitmapIDManager()
+    ids_in_use = []
+
+    # the fraction of ids given back changes over the run, so that the ids in use grow, shrink and grow again
+    for step in range(NUMBER_OF_STEPS):
+        probability_to_give_id_back = 0.3 if (step // 500) % 2 == 0 else 0.7
+        if len(ids_in_use) != 0 and random_generator.random() < probability_to_give_id_back:
+            id_to_give_back = ids_in_use.pop(random_generator.randrange(len(ids_in_use)))
+            id_manager.give_id_back(id_to_give_back)
+            bitmap_id_manager.give_id_back(id_to_give_back)
+        else:
+            new_id = id_manager.get_new_id()
+            assert bitmap_id_manager.get_new_id() == new_id
+            ids_in_use.append(new_id)
+
+        assert_id_managers_are_the_same(id_manager, bitmap_id_manager)
+
+
+def test_bitmap_id_manager_finds_the_smallest_hole_in_a_large_range():
+    random_generator = random.Random(0)
+    id_manager = IDManager()
+    bitmap_id_manager = BitmapIDManager()
+    for _ in range(NUMBER_OF_IDS_IN_LARGE_RANGE):
+        id_manager.get_new_id()
+        bitmap_id_manager.get_new_id()
+
+    ids_to_give_back = random_generator.sample(range(NUMBER_OF_IDS_IN_LARGE_RANGE - 1),
+                                               NUMBER_OF_IDS_IN_LARGE_RANGE // 10)
+    # the largest id is given back last, so that the holes right below it are merged into the last range
+    ids_to_give_back.append(NUMBER_OF_IDS_IN_LARGE_RANGE - 1)
+    for id_to_give_back in ids_to_give_back:
+        id_manager.give_id_back(id_to_give_back)
+        bitmap_id_manager.give_id_back(id_to_give_back)
+    assert_id_managers_are_the_same(id_manager, bitmap_id_manager)
+
+    for _ in range(len(ids_to_give_back) + 10):
+        assert bitmap_id_manager.get_new_id() == id_manager.get_new_id()
+        assert_id_managers_are_the_same(id_manager, bitmap_id_manager)
+
+
+@pytest.mark.parametrize("id_manager_class", [IDManager, BitmapIDManager])
+@pytest.mark.parametrize("seed", range(10))
+def test_ids_are_taken_and_given_back_in_batches_as_one_by_one(id_manager_class, seed):
+    random_generator = random.Random(seed)
+    id_manager = IDManager()
+    id_manager_of_batches = id_manager_class()
+    ids_in_use = []
+
+    for _ in range(NUMBER_OF_STEPS // 4):
+        if len(ids_in_use) != 0 and random_generator.random() < 0.5:
+            ids_to_give_back = [ids_in_use.pop(random_generator.randrange(len(ids_in_use)))
+                                for _ in range(random_generator.randint(1, min(8, len(ids_in_use))))]
+            for id_to_give_back in ids_to_give_back:
+                id_manager.give_id_back(id_to_give_back)
+            id_manager_of_batches.give_ids_back(ids_to_give_back)
+        else:
+            new_ids = [id_manager.get_new_id() for _ in range(random_generator.randint(0, 6))]
+            assert id_manager_of_batches.get_new_ids(len(new_ids)) == new_ids
+            ids_in_use.extend(new_ids)
+
+        assert_id_managers_are_the_same(id_manager, id_manager_of_batches)
@@ -0,0 +1,68 @@
+import random
+
+import pytest
+
+import src.MarabouDataManagers.IncrementalInputQueryBuilder as incremental_input_query_builder_module
+import src.MarabouDataManagers.InputQueryFacade as input_query_facade_module
+from benchmarks.synthetic_networks import get_acas_like_layer_sizes, get_random_layer_matrices
+from src.MarabouDataManagers.IncrementalInputQueryBuilder import IncrementalInputQueryBuilder
+from src.MarabouDataManagers.InputQueryFacade import InputQueryFacade
+from src.Network import Network
+from tests.recording_marabou_core import RecordingMarabouCore, get_contents_of_query
+from tests.test_input_query_facade import make_random_change
+
+NUMBER_OF_CHANGES = 3000
+PROBABILITY_OF_BUILD_AFTER_CHANGE = 0.02
+
+
+@pytest.fixture(autouse=True)
+def recording_marabou_core(monkeypatch):
+    monkeypatch.setattr(input_query_facade_module, 'MarabouCore', RecordingMarabouCore)
+    monkeypatch.setattr(incremental_input_query_builder_module, 'MarabouCore', RecordingMarabouCore)
+
+
+def assert_builder_gives_the_compact_query(builder, input_query, input_global_ids, output_global_ids):
+    marabou_input_query, global_ids_of_variables = builder.build()
+    compact_marabou_input_query, compact_global_ids_of_variables = \
+        input_query.get_new_compact_marabou_input_query_object(input_global_ids, output_global_ids)
+
+    assert get_contents_of_query(marabou_input_query, global_ids_of_variables) == \
+        get_contents_of_query(compact_marabou_input_query, compact_global_ids_of_variables)
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_builder_gives_the_compact_query_after_random_changes(seed):
+    random_generator = random.Random(seed)
+    input_global_ids = [0, 1, 2]
+    output_global_ids = [3, 4]
+    input_query = InputQueryFacade()
+    builder = IncrementalInputQueryBuilder(input_query, input_global_ids, output_global_ids)
+
+    equations = []
+    relu_constraints = set()
+    for _ in range(NUMBER_OF_CHANGES):
+        make_random_change(random_generator, input_query, equations, relu_constraints)
+        if random_generator.random() < PROBABILITY_OF_BUILD_AFTER_CHANGE:
+            assert_builder_gives_the_compact_query(builder, input_query, input_global_ids, output_global_ids)
+
+    assert builder.number_of_builds_from_journal != 0
+
+
+def test_builder_gives_the_compact_query_after_merges():
+    weights, biases, bounds = get_random_layer_matrices(get_acas_like_layer_sizes(8, 3), seed=4)
+    network = Network.from_layer_matrices(weights, biases, bounds, 2)
+    network.fully_activate_the_entire_network()
+    global_network_manager = network.global_network_manager
+    input_query = global_network_manager.input_query
+    input_global_ids = global_network_manager.get_input_nodes_global_incoming_ids()
+    output_global_ids = global_network_manager.get_output_nodes_global_incoming_ids()
+    builder = IncrementalInputQueryBuilder(input_query, input_global_ids, output_global_ids)
+
+    for _ in range(10):
+        network.merge_list_of_arnodes(*network.decide_best_arnodes_to_merge())
+        # as before every verification, the equations of the nodes whose equations are no longer valid are calculated
+        # again
+        network._create_valid_equations_for_all_nodes_without_valid_equations()
+        assert_builder_gives_the_compact_query(builder, input_query, input_global_ids, output_global_ids)
+
+    assert builder.number_of_builds_from_journal != 0
@@ -0,0 +1,257 @@
+import random
+
+import pytest
+
+import src.MarabouDataManagers.GlobalNetworkManager as global_network_manager_module
+import src.MarabouDataManagers.InputQueryFacade as input_query_facade_module
+from benchmarks.synthetic_networks import get_acas_like_layer_sizes, get_random_layer_matrices
+from src.MarabouDataManagers.GlobalNetworkManager import GlobalNetworkManager
+from src.MarabouDataManagers.InputQueryFacade import InputQueryFacade
+from src.Network import Network
+from tests.network_evaluation import evaluate_abstract_network
+from tests.recording_marabou_core import RecordingEquation, RecordingMarabouCore, get_contents_of_query
+
+NUMBER_OF_GLOBAL_IDS = 300
+NUMBER_OF_CHANGES = 1000
+NUMBER_OF_MERGES = 10
+TOLERANCE = 1e-9
+
+
+class SolvingMarabouCore(RecordingMarabouCore):
+    @staticmethod
+    def solve(input_query, options, filename_to_save_log_in):
+        """
+        :return: an assignment which gives every variable of the query its own number, and empty statistics
+        """
+        number_of_variables = next(arguments[0] for name_of_call, *arguments in input_query.calls
+                                   if name_of_call == 'setNumberOfVariables')
+        return {variable: variable for variable in range(number_of_variables)}, None
+
+
+@pytest.fixture(autouse=True)
+def recording_marabou_core(monkeypatch):
+    monkeypatch.setattr(input_query_facade_module, 'MarabouCore', SolvingMarabouCore)
+    monkeypatch.setattr(global_network_manager_module, 'MarabouCore', SolvingMarabouCore)
+
+
+def make_random_change(random_generator, input_query, equations, relu_constraints):
+    global_id = random_generator.randrange(NUMBER_OF_GLOBAL_IDS)
+    kind_of_change = random_generator.random()
+    if kind_of_change < 0.3:
+        equation = RecordingEquation()
+        for _ in range(random_generator.randint(1, 4)):
+            equation.addAddend(random_generator.random(), random_generator.randrange(NUMBER_OF_GLOBAL_IDS))
+        equation.setScalar(random_generator.random())
+        input_query.addEquation(equation)
+        equations.append(equation)
+    elif kind_of_change < 0.5 and len(equations) != 0:
+        input_query.removeEquation(equations.pop(random_generator.randrange(len(equations))))
+    elif kind_of_change < 0.6:
+        relu_constraint = (global_id, random_generator.randrange(NUMBER_OF_GLOBAL_IDS))
+        input_query.addReluConstraint(*relu_constraint)
+        relu_constraints.add(relu_constraint)
+    elif kind_of_change < 0.7 and len(relu_constraints) != 0:
+        relu_constraint = random_generator.choice(sorted(relu_constraints))
+        relu_constraints.remove(relu_constraint)
+        input_query.removeReluConstraint(*relu_constraint)
+    elif kind_of_change < 0.8:
+        input_query.setLowerBound(global_id, random_generator.choice([0, 1, 5, float('-inf')]))
+    elif kind_of_change < 0.9:
+        # some of the bounds can not be satisfied
+        input_query.setUpperBound(global_id, random_generator.choice([0, 1, 3, float('inf')]))
+    else:
+        input_query.removeBounds(global_id)
+
+
+def assert_compact_query_is_the_query_of_the_live_variables(input_query, number_of_global_ids, input_global_ids,
+                                                              output_global_ids):
+    compact_marabou_input_query, global_ids_of_variables = \
+        input_query.get_new_compact_marabou_input_query_object(input_global_ids, output_global_ids)
+    equations, relu_constraints, lower_bounds, upper_bounds, compact_input_global_ids, compact_output_global_ids, \
+        live_global_ids = get_contents_of_query(compact_marabou_input_query, global_ids_of_variables)
+
+    # in the full query variable i is global id i
+    full_marabou_input_query = input_query.get_new_marabou_input_query_object(number_of_global_ids, input_global_ids,
+                                                                              output_global_ids)
+    full_equations, full_relu_constraints, full_lower_bounds, full_upper_bounds, full_input_global_ids, \
+        full_output_global_ids, _ = get_contents_of_query(full_marabou_input_query, list(range(number_of_global_ids)))
+
+    # the live variables are given the variables 0, 1, ..., n-1 by the order of their global ids
+    assert global_ids_of_variables == live_global_ids
+    assert live_global_ids == input_query.get_global_ids_of_live_variables(input_global_ids, output_global_ids)
+
+    assert (equations, relu_constraints, compact_input_global_ids, compact_output_global_ids) == \
+        (full_equations, full_relu_constraints, full_input_global_ids, full_output_global_ids)
+    # the bounds of the global ids which were left out are dropped
+    assert lower_bounds == {global_id: bound for global_id, bound in full_lower_bounds.items()
+                            if global_id in live_global_ids}
+    assert upper_bounds == {global_id: bound for global_id, bound in full_upper_bounds.items()
+                            if global_id in live_global_ids}
+
+    # a global id which was left out does not appear anywhere in the query, and its bounds can be satisfied
+    global_ids_in_query = set(full_input_global_ids.values()) | set(full_output_global_ids.values())
+    for _, _, addends in full_equations:
+        global_ids_in_query.update(global_id for _, global_id in addends)
+    for relu_constraint in full_relu_constraints:
+        global_ids_in_query.update(relu_constraint)
+    for global_id in set(full_lower_bounds) | set(full_upper_bounds) | global_ids_in_query:
+        if global_id not in live_global_ids:
+            assert global_id not in global_ids_in_query
+            assert input_query.lowerBounds.get(global_id, InputQueryFacade.INFINITE_LOWER_BOUND) <= \
+                input_query.upperBounds.get(global_id, InputQueryFacade.INFINITE_UPPER_BOUND)
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_compact_query_after_random_changes(seed):
+    random_generator = random.Random(seed)
+    input_global_ids = [0, 1, 2]
+    output_global_ids = [3, 4]
+    input_query = InputQueryFacade()
+
+    equations = []
+    relu_constraints = set()
+    for i in range(NUMBER_OF_CHANGES):
+        make_random_change(random_generator, input_query, equations, relu_constraints)
+        if i % 50 == 0:
+            assert_compact_query_is_the_query_of_the_live_variables(input_query, NUMBER_OF_GLOBAL_IDS,
+                                                                    input_global_ids, output_global_ids)
+
+
+@pytest.mark.parametrize("which_acas_output", [1, 2])
+def test_compact_query_of_network_after_merges(which_acas_output):
+    weights, biases, bounds = get_random_layer_matrices(get_acas_like_layer_sizes(8, 3), seed=4)
+    network = Network.from_layer_matrices(weights, biases, bounds, which_acas_output)
+    network.fully_activate_the_entire_network()
+    global_network_manager = network.global_network_manager
+    input_global_ids = global_network_manager.get_input_nodes_global_incoming_ids()
+    output_global_ids = global_network_manager.get_output_nodes_global_incoming_ids()
+
+    for _ in range(NUMBER_OF_MERGES):
+        network.merge_list_of_arnodes(*network.decide_best_arnodes_to_merge())
+        network._create_valid_equations_for_all_nodes_without_valid_equations()
+        for input_query in [global_network_manager.input_query, global_network_manager.input_query_of_original_network]:
+            assert_compact_query_is_the_query_of_the_live_variables(input_query,
+                                                                    global_network_manager.get_maximum_id_used() + 1,
+                                                                    input_global_ids, output_global_ids)
+
+    # the merges left hole ids, which are not given to the solver
+    assert global_network_manager.id_manager.check_if_ranges_has_holes()
+    assert len(global_network_manager.input_query.get_global_ids_of_live_variables(input_global_ids,
+                                                                                   output_global_ids)) < \
+        global_network_manager.get_maximum_id_used() + 1
+
+
+def test_assignment_of_compact_query_is_mapped_back_to_global_ids(monkeypatch):
+    monkeypatch.setattr(GlobalNetworkManager, 'SHOULD_BUILD_QUERIES_INCREMENTALLY', False)
+    weights, biases, bounds = get_random_layer_matrices(get_acas_like_layer_sizes(8, 3), seed=4)
+    network = Network.from_layer_matrices(weights, biases, bounds, 1)
+    network.fully_activate_the_entire_network()
+    for _ in range(NUMBER_OF_MERGES):
+        network.merge_list_of_arnodes(*network.decide_best_arnodes_to_merge())
+    network._create_valid_equations_for_all_nodes_without_valid_equations()
+
+    global_network_manager = network.global_network_manager
+    live_global_ids = global_network_manager.input_query.get_global_ids_of_live_variables(
+        global_network_manager.get_input_nodes_global_incoming_ids(),
+        global_network_manager.get_output_nodes_global_incoming_ids())
+    # the solver gives variable i the value i, and variable i is the i-th live global id
+    assert global_network_manager._solve_input_query(global_network_manager.input_query) == \
+        {global_id: variable for variable, global_id in enumerate(live_global_ids)}
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_equations_and_relu_constraints_are_kept_in_insertion_order(seed):
+    random_generator = random.Random(seed)
+    input_query = InputQueryFacade()
+    equations = []
+    relu_constraints = []
+
+    for _ in range(NUMBER_OF_CHANGES):
+        kind_of_change = random_generator.random()
+        if kind_of_change < 0.35:
+            equation = RecordingEquation()
+            equation.addAddend(1, random_generator.randrange(NUMBER_OF_GLOBAL_IDS))
+            input_query.addEquation(equation)
+            equations.append(equation)
+        elif kind_of_change < 0.5 and len(equations) != 0:
+            input_query.removeEquation(equations.pop(random_generator.randrange(len(equations))))
+        elif kind_of_change < 0.85:
+            relu_constraint = (random_generator.randrange(NUMBER_OF_GLOBAL_IDS),
+                               random_generator.randrange(NUMBER_OF_GLOBAL_IDS))
+            input_query.addReluConstraint(*relu_constraint)
+            # a relu constraint which was already added keeps its place
+            if relu_constraint not in relu_constraints:
+                relu_constraints.append(relu_constraint)
+        elif len(relu_constraints) != 0:
+            input_query.removeReluConstraint(*relu_constraints.pop(random_generator.randrange(len(relu_constraints))))
+
+    assert list(input_query.equations) == equations
+    assert list(input_query.relu_constraints) == relu_constraints
+
+    # the query is given the equations and the relu constraints in the order they were added
+    marabou_input_query = input_query.get_new_marabou_input_query_object(NUMBER_OF_GLOBAL_IDS, [], [])
+    assert [tuple(arguments[0].addendList) for name_of_call, *arguments in marabou_input_query.calls
+            if name_of_call == 'addEquation'] == [tuple(equation.addendList) for equation in equations]
+    assert [tuple(arguments) for name_of_call, *arguments in marabou_input_query.calls
+            if name_of_call == 'addReluConstraint'] == relu_constraints
+
+
+def test_equations_and_relu_constraints_are_kept_once():
+    input_query = InputQueryFacade()
+    equation = RecordingEquation()
+    for _ in range(2):
+        input_query.addEquation(equation)
+        input_query.addReluConstraint(1, 2)
+    assert list(input_query.equations) == [equation]
+    assert list(input_query.relu_constraints) == [(1, 2)]
+
+    # removing what is not in the query does nothing
+    for _ in range(2):
+        input_query.removeEquation(equation)
+        input_query.removeReluConstraint(1, 2)
+    assert list(input_query.equations) == []
+    assert list(input_query.relu_constraints) == []
+
+
+def test_equations_and_relu_constraints_can_be_read_as_lists():
+    input_query = InputQueryFacade()
+    equation = RecordingEquation()
+    input_query.addEquation(equation)
+    input_query.addReluConstraint(1, 2)
+    assert input_query.equList == [equation]
+    assert input_query.reluList == [(1, 2)]
+
+    # the lists are copies, changing them does not change the query
+    input_query.equList.clear()
+    input_query.reluList.append((3, 4))
+    assert list(input_query.equations) == [equation]
+    assert list(input_query.relu_constraints) == [(1, 2)]
+
+
+def test_splitting_every_merged_arnode_gives_back_the_network():
+    weights, biases, bounds = get_random_layer_matrices(get_acas_like_layer_sizes(8, 3), seed=4)
+    network = Network.from_layer_matrices(weights, biases, bounds, 1)
+    network.fully_activate_the_entire_network()
+    global_network_manager = network.global_network_manager
+    input_global_ids = global_network_manager.get_input_nodes_global_incoming_ids()
+    output_global_ids = global_network_manager.get_output_nodes_global_incoming_ids()
+
+    for _ in range(NUMBER_OF_MERGES):
+        network.merge_list_of_arnodes(*network.decide_best_arnodes_to_merge())
+
+    # every split takes a single inner node out of an arnode, so after as many splits as there were merges every
+    # arnode holds a single inner node again (decide_best_arnodes_to_split raises once none can be split)
+    for _ in range(NUMBER_OF_MERGES):
+        network.split_arnode(*network.decide_best_arnodes_to_split())
+        network._create_valid_equations_for_all_nodes_without_valid_equations()
+        assert_compact_query_is_the_query_of_the_live_variables(global_network_manager.input_query,
+                                                                global_network_manager.get_maximum_id_used() + 1,
+                                                                input_global_ids, output_global_ids)
+    with pytest.raises(Exception):
+        network.decide_best_arnodes_to_split()
+
+    # the smallest and the largest inputs
+    for input_values in bounds:
+        output = evaluate_abstract_network(network, input_values, is_arnode=True)
+        expected_output = evaluate_abstract_network(network, input_values)
+        assert all(abs(a - b) <= TOLERANCE for a, b in zip(output, expected_output))
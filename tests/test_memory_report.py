@@ -0,0 +1,79 @@
+import pytest
+
+from benchmarks.synthetic_networks import get_acas_like_layer_sizes, get_random_layer_matrices
+from src.ArrayNodeEdges import ArrayNodeEdges
+from src.Network import Network
+from src.NodeEdges import NodeEdges
+from src.Nodes.Node import Node
+from src.RelocationCounter import RelocationCounter
+
+LAYER_SIZES = get_acas_like_layer_sizes(10, 2)
+# the arrays of ArrayNodeEdges cost more than they save on nodes with only a few edges
+LAYER_SIZES_OF_WIDE_NETWORK = get_acas_like_layer_sizes(50, 2)
+
+
+def get_network(which_acas_output=1, layer_sizes=LAYER_SIZES):
+    weights, biases, bounds = get_random_layer_matrices(layer_sizes, seed=7)
+    return Network.from_layer_matrices(weights, biases, bounds, which_acas_output)
+
+
+def get_all_nodes(network):
+    return [node for layer in network.layers
+            for tables in [layer.regular_node_tables, layer.arnode_tables]
+            for table in tables
+            for node in table.get_iterator_for_all_nodes()]
+
+
+@pytest.mark.parametrize("which_acas_output", [1, 2])
+def test_memory_report_counts_the_nodes_and_edges_of_every_layer(which_acas_output):
+    network = get_network(which_acas_output)
+    network.fully_activate_the_entire_network()
+    report = network.memory_report()
+    assert len(report) == len(network.layers)
+
+    for layer, layer_report in zip(network.layers, report):
+        nodes = [node for table in layer.regular_node_tables for node in table.get_iterator_for_all_nodes()]
+        arnodes = [arnode for table in layer.arnode_tables for arnode in table.get_iterator_for_all_nodes()]
+        assert layer_report['number_of_nodes'] == len(nodes)
+        assert layer_report['number_of_arnodes'] == len(arnodes)
+        assert layer_report['number_of_edges'] == \
+            sum(node.get_number_of_connections(direction) for node in nodes + arnodes
+                for direction in [Node.INCOMING_EDGE_DIRECTION, Node.OUTGOING_EDGE_DIRECTION])
+
+        assert layer_report['bytes_per_node'] > 0 and layer_report['bytes_per_arnode'] > 0
+        assert layer_report['bytes_per_edge'] > 0
+        assert layer_report['total_bytes'] == pytest.approx(
+            layer_report['number_of_nodes'] * layer_report['bytes_per_node'] +
+            layer_report['number_of_arnodes'] * layer_report['bytes_per_arnode'] +
+            layer_report['number_of_edges'] * layer_report['bytes_per_edge'])
+
+    # the input layer is connected only to the first hidden layer, whose nodes were split into up to 4 nodes each
+    assert report[0]['number_of_nodes'] == LAYER_SIZES[0]
+    assert report[0]['number_of_edges'] >= LAYER_SIZES[0] * LAYER_SIZES[1]
+
+
+def test_memory_report_of_layer_without_arnodes_has_no_size_per_arnode():
+    report = get_network().memory_report()
+    assert all(layer_report['number_of_arnodes'] == 0 for layer_report in report)
+    assert all(layer_report['bytes_per_arnode'] == 0 for layer_report in report)
+    assert report[0]['number_of_edges'] == LAYER_SIZES[0] * LAYER_SIZES[1]
+
+
+def test_nodes_and_edges_managers_have_no_dict():
+    network = get_network()
+    network.fully_activate_the_entire_network()
+    for node in get_all_nodes(network):
+        assert not hasattr(node, '__dict__')
+    for edges_manager_class in [NodeEdges, ArrayNodeEdges]:
+        assert not hasattr(edges_manager_class(2, 0, RelocationCounter()), '__dict__')
+
+
+def test_array_node_edges_take_less_memory_per_edge(monkeypatch):
+    bytes_per_edge = []
+    for edges_manager_class in [NodeEdges, ArrayNodeEdges]:
+        monkeypatch.setattr(Node, 'EDGES_MANAGER_CLASS', edges_manager_class)
+        network = get_network(layer_sizes=LAYER_SIZES_OF_WIDE_NETWORK)
+        network.fully_activate_the_entire_network()
+        bytes_per_edge.append(network.memory_report()[1]['bytes_per_edge'])
+
+    assert bytes_per_edge[1] < bytes_per_edge[0]
@@ -0,0 +1,66 @@
+import pytest
+
+import src.MarabouDataManagers.InputQueryFacade as input_query_facade_module
+from benchmarks.bench_network_construction import NetworkBuiltNodeByNode
+from benchmarks.synthetic_networks import get_acas_like_layer_sizes, get_random_layer_matrices
+from src.MarabouDataManagers.NNetReader import InMemoryNNetReader
+from src.Network import Network
+from src.Nodes.Node import Node
+
+
+class RecordingEquation:
+    """
+    an equation which keeps its addends and scalar, the mock marabou equation drops them
+    """
+
+    def __init__(self):
+        self.EquationType = 1
+        self.addendList = []
+        self.scalar = 0
+
+    def addAddend(self, weight, variable):
+        self.addendList.append((weight, variable))
+
+    def setScalar(self, scalar):
+        self.scalar = scalar
+
+
+@pytest.fixture(autouse=True)
+def recording_equations(monkeypatch):
+    monkeypatch.setattr(input_query_facade_module.MarabouCore, 'Equation', RecordingEquation)
+
+
+def get_contents_of_network(network):
+    """
+    :return: for every node of the network its location, ids, bias and connections, and the contents of the input
+    query of the network
+    """
+    nodes = []
+    for layer in network.layers:
+        for table in layer.regular_node_tables:
+            for key_in_table in table.get_iterator_for_all_keys():
+                node = table.get_node_by_key(key_in_table)
+                connections = [sorted((table_number, key, weight) for table_number, key, weight, _ in
+                                      node.get_a_list_of_all_connections_data(direction))
+                               for direction in [Node.INCOMING_EDGE_DIRECTION, Node.OUTGOING_EDGE_DIRECTION]]
+                nodes.append((layer.layer_number, table.table_number, key_in_table, node.get_global_incoming_id(),
+                              node.get_global_outgoing_id(), node.get_node_bias(), connections))
+
+    input_query = network.global_network_manager.input_query
+    equations = [(equation.EquationType, equation.scalar, equation.addendList) for equation in input_query.equations]
+    return (nodes, equations, list(input_query.relu_constraints), input_query.lowerBounds, input_query.upperBounds,
+            network.global_network_manager.get_input_nodes_global_incoming_ids(),
+            network.global_network_manager.get_output_nodes_global_incoming_ids())
+
+
+@pytest.mark.parametrize("which_acas_output", [1, 2])
+@pytest.mark.parametrize("layer_sizes", [get_acas_like_layer_sizes(6, 2), [5, 8, 1, 7, 5]])
+def test_network_built_in_bulk_is_the_network_built_node_by_node(which_acas_output, layer_sizes):
+    weights, biases, bounds = get_random_layer_matrices(layer_sizes, seed=2)
+    nnet_reader = InMemoryNNetReader(weights, biases, *bounds)
+
+    network = Network(nnet_reader, which_acas_output)
+    assert get_contents_of_network(network) == \
+        get_contents_of_network(NetworkBuiltNodeByNode(nnet_reader, which_acas_output))
+    assert get_contents_of_network(Network.from_layer_matrices(weights, biases, bounds, which_acas_output)) == \
+        get_contents_of_network(network)
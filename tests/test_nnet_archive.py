@@ -0,0 +1,72 @@
+import os
+
+import pytest
+
+from benchmarks.synthetic_networks import write_random_nnet_file
+from src.MarabouDataManagers.NNetArchive import NNetArchive
+from src.MarabouDataManagers.NNetReader import NNetReader
+
+LAYER_SIZES = [5, 7, 6, 5]
+NUMBER_OF_NETWORKS = 3
+
+
+def get_contents_of_reader(nnet_reader):
+    return (nnet_reader.numLayers, nnet_reader.layerSizes, nnet_reader.inputSize, nnet_reader.outputSize,
+            list(nnet_reader.inputMinimums), list(nnet_reader.inputMaximums),
+            list(nnet_reader.inputMeans), list(nnet_reader.inputRanges),
+            nnet_reader.weights, nnet_reader.biases)
+
+
+@pytest.fixture
+def nnet_file_names(tmpdir):
+    nnet_file_names = [str(tmpdir.join(f'network_{i}.nnet')) for i in range(NUMBER_OF_NETWORKS)]
+    for i, nnet_file_name in enumerate(nnet_file_names):
+        write_random_nnet_file(nnet_file_name, LAYER_SIZES, seed=i)
+    return nnet_file_names
+
+
+def test_networks_are_looked_up_by_name(tmpdir, nnet_file_names):
+    archive_file_name = str(tmpdir.join('networks.nnetarchive'))
+    NNetArchive.pack(nnet_file_names, archive_file_name)
+    archive = NNetArchive(archive_file_name)
+
+    names_of_networks = [os.path.basename(nnet_file_name) for nnet_file_name in nnet_file_names]
+    assert archive.get_number_of_networks() == NUMBER_OF_NETWORKS
+    assert archive.get_names_of_networks() == names_of_networks
+
+    # the networks are gone over in reverse, so that a lookup which ignores the name would not pass
+    for nnet_file_name, name_of_network in reversed(list(zip(nnet_file_names, names_of_networks))):
+        index_of_network = archive.get_index_of_network(name_of_network)
+        archived_nnet_reader = archive.get_network(index_of_network)
+        assert archived_nnet_reader.name_of_network == name_of_network
+        assert get_contents_of_reader(archived_nnet_reader) == \
+            get_contents_of_reader(NNetReader(nnet_file_name, use_binary_cache=False))
+
+    with pytest.raises(Exception):
+        archive.get_index_of_network('no_such_network.nnet')
+    with pytest.raises(Exception):
+        archive.get_network(NUMBER_OF_NETWORKS)
+
+
+def test_networks_of_different_topologies_are_not_packed(tmpdir, nnet_file_names):
+    other_nnet_file_name = str(tmpdir.join('other_network.nnet'))
+    write_random_nnet_file(other_nnet_file_name, [5, 7, 5])
+    archive_file_name = str(tmpdir.join('networks.nnetarchive'))
+
+    with pytest.raises(Exception):
+        NNetArchive.pack(nnet_file_names + [other_nnet_file_name], archive_file_name)
+    assert not os.path.exists(archive_file_name)
+
+
+def test_file_which_is_not_an_archive_is_not_opened(tmpdir, nnet_file_names):
+    with pytest.raises(Exception):
+        NNetArchive(nnet_file_names[0])
+
+    archive_file_name = str(tmpdir.join('networks.nnetarchive'))
+    NNetArchive.pack(nnet_file_names, archive_file_name)
+    with open(archive_file_name, 'rb') as f:
+        contents_of_archive = f.read()
+    with open(archive_file_name, 'wb') as f:
+        f.write(contents_of_archive[:-NNetArchive.SIZE_OF_FLOAT])
+    with pytest.raises(Exception):
+        NNetArchive(archive_file_name)
@@ -0,0 +1,89 @@
+import os
+
+import pytest
+
+from benchmarks.synthetic_networks import write_random_nnet_file
+from src.MarabouDataManagers.NNetBinaryCache import NNetBinaryCache
+from src.MarabouDataManagers.NNetReader import NNetReader
+
+LAYER_SIZES = [5, 7, 6, 5]
+
+
+def get_contents_of_reader(nnet_reader):
+    return (nnet_reader.layerSizes, list(nnet_reader.inputMinimums), list(nnet_reader.inputMaximums),
+            nnet_reader.weights, nnet_reader.biases)
+
+
+@pytest.fixture
+def nnet_file_name(tmpdir):
+    file_name = str(tmpdir.join('network.nnet'))
+    write_random_nnet_file(file_name, LAYER_SIZES)
+    return file_name
+
+
+def forbid_parsing(monkeypatch):
+    def parse_text_file(self, file_name):
+        raise AssertionError("the text file should not be parsed")
+
+    monkeypatch.setattr(NNetReader, '_parse_text_file', parse_text_file)
+
+
+def test_sidecar_is_used_after_the_first_load(monkeypatch, nnet_file_name):
+    contents_of_reader = get_contents_of_reader(NNetReader(nnet_file_name, use_binary_cache=False))
+    assert not os.path.exists(nnet_file_name + NNetBinaryCache.SIDECAR_SUFFIX)
+
+    assert get_contents_of_reader(NNetReader(nnet_file_name, use_binary_cache=True)) == contents_of_reader
+    assert os.path.exists(nnet_file_name + NNetBinaryCache.SIDECAR_SUFFIX)
+
+    forbid_parsing(monkeypatch)
+    assert get_contents_of_reader(NNetReader(nnet_file_name, use_binary_cache=True)) == contents_of_reader
+
+    # only the mtime changed, so the contents are compared and the sidecar is still used
+    source_stat = os.stat(nnet_file_name)
+    os.utime(nnet_file_name, ns=(source_stat.st_atime_ns, source_stat.st_mtime_ns + 10 ** 9))
+    assert get_contents_of_reader(NNetReader(nnet_file_name, use_binary_cache=True)) == contents_of_reader
+
+    # the sidecar was written again with the new mtime, so the contents are not compared again
+    def get_digest_of_file(file_name):
+        raise AssertionError("the contents of the text file should not be compared")
+
+    monkeypatch.setattr(NNetBinaryCache, '_get_digest_of_file', staticmethod(get_digest_of_file))
+    assert get_contents_of_reader(NNetReader(nnet_file_name, use_binary_cache=True)) == contents_of_reader
+
+
+def test_sidecar_is_not_written_by_default(nnet_file_name):
+    NNetReader(nnet_file_name)
+    assert not os.path.exists(nnet_file_name + NNetBinaryCache.SIDECAR_SUFFIX)
+
+
+def test_sidecar_is_invalidated_when_the_file_changes(nnet_file_name):
+    NNetReader(nnet_file_name, use_binary_cache=True)
+
+    # a file of a different size
+    write_random_nnet_file(nnet_file_name, LAYER_SIZES, seed=1)
+    contents_of_reader = get_contents_of_reader(NNetReader(nnet_file_name, use_binary_cache=False))
+    assert get_contents_of_reader(NNetReader(nnet_file_name, use_binary_cache=True)) == contents_of_reader
+
+    # a file of the same size, whose mtime changed with its contents
+    with open(nnet_file_name) as f:
+        text = f.read()
+    index_of_digit = text.rindex('1')
+    with open(nnet_file_name, 'w') as f:
+        f.write(text[:index_of_digit] + '2' + text[index_of_digit + 1:])
+    source_stat = os.stat(nnet_file_name)
+    os.utime(nnet_file_name, ns=(source_stat.st_atime_ns, source_stat.st_mtime_ns + 10 ** 9))
+    changed_contents_of_reader = get_contents_of_reader(NNetReader(nnet_file_name, use_binary_cache=False))
+    assert changed_contents_of_reader != contents_of_reader
+    assert get_contents_of_reader(NNetReader(nnet_file_name, use_binary_cache=True)) == changed_contents_of_reader
+
+
+def test_sidecar_which_can_not_be_read_is_ignored(nnet_file_name):
+    contents_of_reader = get_contents_of_reader(NNetReader(nnet_file_name, use_binary_cache=True))
+    sidecar_file_name = nnet_file_name + NNetBinaryCache.SIDECAR_SUFFIX
+    with open(sidecar_file_name, 'rb') as f:
+        truncated_sidecar = f.read(100)
+
+    for contents_of_sidecar in [b'', b'not a sidecar', truncated_sidecar]:
+        with open(sidecar_file_name, 'wb') as f:
+            f.write(contents_of_sidecar)
+        assert get_contents_of_reader(NNetReader(nnet_file_name, use_binary_cache=True)) == contents_of_reader
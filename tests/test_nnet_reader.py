@@ -0,0 +1,68 @@
+import pytest
+
+from benchmarks.synthetic_networks import write_random_nnet_file
+from src.MarabouDataManagers.NNetReader import NNetReader
+
+LAYER_SIZES = [3, 4, 2]
+
+
+@pytest.fixture
+def nnet_file_name(tmpdir):
+    file_name = str(tmpdir.join('network.nnet'))
+    write_random_nnet_file(file_name, LAYER_SIZES)
+    return file_name
+
+
+def rewrite_rows_of_weights(file_name, function_to_rewrite_row_with):
+    """
+    rewrites each row of weights in the file (the rows of biases hold a single value and are kept as they are)
+    """
+    with open(file_name) as f:
+        lines = f.read().split('\n')
+
+    # the comment and the 7 lines of the header
+    number_of_header_lines = 8
+    for i in range(number_of_header_lines, len(lines)):
+        if lines[i].count(',') > 1:
+            lines[i] = function_to_rewrite_row_with(lines[i])
+
+    with open(file_name, 'w') as f:
+        f.write('\n'.join(lines))
+
+
+def get_contents_of_reader(nnet_reader):
+    return nnet_reader.weights, nnet_reader.biases
+
+
+def test_rows_may_miss_their_final_comma(nnet_file_name):
+    contents_of_reader = get_contents_of_reader(NNetReader(nnet_file_name))
+
+    rewrite_rows_of_weights(nnet_file_name, lambda row: row.rstrip(','))
+    assert get_contents_of_reader(NNetReader(nnet_file_name)) == contents_of_reader
+
+    # some rows with a final comma and some without it
+    rewrite_rows_of_weights(nnet_file_name, lambda row: row + ',' if row.startswith('-') else row)
+    assert get_contents_of_reader(NNetReader(nnet_file_name)) == contents_of_reader
+
+
+def test_values_json_does_not_accept_are_parsed(nnet_file_name):
+    # only the rows of the first layer, which hold 3 weights each
+    rewrite_rows_of_weights(nnet_file_name, lambda row: '.5,-inf,1e-3,' if row.count(',') == 3 else row)
+    weights, _ = get_contents_of_reader(NNetReader(nnet_file_name))
+    assert weights[0] == [[0.5, float('-inf'), 0.001]] * LAYER_SIZES[1]
+
+
+def test_only_the_first_values_of_long_rows_are_taken(nnet_file_name):
+    contents_of_reader = get_contents_of_reader(NNetReader(nnet_file_name))
+
+    for should_end_with_comma in [True, False]:
+        rewrite_rows_of_weights(nnet_file_name, lambda row: row.rstrip(',') + ',7.0,8.0' +
+                                (',' if should_end_with_comma else ''))
+        assert get_contents_of_reader(NNetReader(nnet_file_name)) == contents_of_reader
+        rewrite_rows_of_weights(nnet_file_name, lambda row: row.rstrip(',').rsplit(',', 2)[0] + ',')
+
+
+def test_malformed_layer_raises_an_error(nnet_file_name):
+    rewrite_rows_of_weights(nnet_file_name, lambda row: row.rstrip(',').rsplit(',', 1)[0] + ',')
+    with pytest.raises(Exception):
+        NNetReader(nnet_file_name)
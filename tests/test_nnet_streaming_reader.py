@@ -0,0 +1,47 @@
+import pytest
+
+from benchmarks.synthetic_networks import write_random_nnet_file
+from src.MarabouDataManagers.NNetReader import NNetReader
+from src.MarabouDataManagers.NNetStreamingReader import NNetStreamingReader
+from src.Network import Network
+# recording_equations is an autouse fixture, importing it applies it to the tests here too
+from tests.test_network_construction import get_contents_of_network, recording_equations
+
+LAYER_SIZES = [5, 9, 4, 7, 5]
+
+
+def get_contents_of_layers(nnet_reader):
+    return [(layer_number, list(biases),
+             None if nonzero_connections is None else [list(part) for part in nonzero_connections])
+            for layer_number, biases, nonzero_connections in nnet_reader.get_iterator_over_layers()]
+
+
+@pytest.fixture
+def nnet_file_name(tmpdir):
+    nnet_file_name = str(tmpdir.join('network.nnet'))
+    write_random_nnet_file(nnet_file_name, LAYER_SIZES, seed=5)
+    return nnet_file_name
+
+
+def test_streaming_reader_reads_what_the_in_memory_reader_reads(nnet_file_name):
+    nnet_reader = NNetReader(nnet_file_name, use_binary_cache=False)
+    streaming_reader = NNetStreamingReader(nnet_file_name)
+
+    for name_of_attribute in ['numLayers', 'layerSizes', 'inputSize', 'outputSize', 'maxLayersize', 'symmetric']:
+        assert getattr(streaming_reader, name_of_attribute) == getattr(nnet_reader, name_of_attribute)
+    for name_of_attribute in ['inputMinimums', 'inputMaximums', 'inputMeans', 'inputRanges']:
+        assert list(getattr(streaming_reader, name_of_attribute)) == list(getattr(nnet_reader, name_of_attribute))
+    assert streaming_reader.get_number_of_nodes_in_network() == nnet_reader.get_number_of_nodes_in_network()
+    assert streaming_reader.get_number_of_layers_in_network() == nnet_reader.get_number_of_layers_in_network()
+
+    layers = get_contents_of_layers(streaming_reader)
+    assert len(layers) == len(LAYER_SIZES)
+    assert layers == get_contents_of_layers(nnet_reader)
+    # the file is read again on every iteration
+    assert get_contents_of_layers(streaming_reader) == layers
+
+
+@pytest.mark.parametrize("which_acas_output", [1, 2])
+def test_network_built_from_streaming_reader_is_the_network_built_in_memory(nnet_file_name, which_acas_output):
+    assert get_contents_of_network(Network(NNetStreamingReader(nnet_file_name), which_acas_output)) == \
+        get_contents_of_network(Network(NNetReader(nnet_file_name, use_binary_cache=False), which_acas_output))
@@ -0,0 +1,81 @@
+import random
+
+import pytest
+
+from benchmarks.synthetic_networks import get_acas_like_layer_sizes, get_random_layer_matrices
+from src.ArrayNodeEdges import ArrayNodeEdges
+from src.Layer import Layer
+from src.Network import Network
+from src.NodeEdges import NodeEdges
+from src.Nodes.Node import Node
+from tests.network_evaluation import evaluate_abstract_network, evaluate_layer_matrices
+from tests.test_bulk_relocation import assert_connections_are_keyed_by_current_locations
+
+NUMBER_OF_RANDOM_INPUTS = 20
+TOLERANCE = 1e-9
+
+
+def get_random_inputs(bounds, seed=1):
+    random_generator = random.Random(seed)
+    input_minimums, input_maximums = bounds
+    return [[random_generator.uniform(lower, upper) for lower, upper in zip(input_minimums, input_maximums)]
+            for _ in range(NUMBER_OF_RANDOM_INPUTS)]
+
+
+def test_relocations_are_counted_separately_for_each_network():
+    weights, biases, bounds = get_random_layer_matrices(get_acas_like_layer_sizes(8, 3), seed=2)
+    network = Network.from_layer_matrices(weights, biases, bounds, 1)
+    other_network = Network.from_layer_matrices(weights, biases, bounds, 1)
+
+    relocation_counter = network.global_network_manager.get_relocation_counter()
+    number_of_relocations_by_layer_number = dict(relocation_counter.number_of_relocations_by_layer_number)
+    other_network.preprocess_the_entire_network()
+    assert relocation_counter.number_of_relocations_by_layer_number == number_of_relocations_by_layer_number
+
+    # the connections of each network are re-keyed by the relocations of its own nodes
+    network.preprocess_more_layers(2)
+    for current_network in [network, other_network]:
+        assert_connections_are_keyed_by_current_locations(current_network)
+    for input_values in get_random_inputs(bounds):
+        expected_output = evaluate_layer_matrices(weights, biases, input_values)
+        for current_network in [network, other_network]:
+            output = evaluate_abstract_network(current_network, input_values)
+            assert all(abs(a - b) <= TOLERANCE for a, b in zip(output, expected_output))
+
+
+@pytest.mark.parametrize('edges_manager_class', [NodeEdges, ArrayNodeEdges])
+def test_neighbors_read_their_connections_to_relocated_nodes(monkeypatch, edges_manager_class):
+    monkeypatch.setattr(Node, 'EDGES_MANAGER_CLASS', edges_manager_class)
+    weights, biases, bounds = get_random_layer_matrices(get_acas_like_layer_sizes(8, 3), seed=3)
+    network = Network.from_layer_matrices(weights, biases, bounds, 1)
+    layer = network.layers[2]
+    unprocessed_table = layer.regular_node_tables[Layer.INDEX_OF_UNPROCESSED_TABLE]
+
+    def get_weights_of_neighbors_connections(node):
+        # the weights the neighbors of the node hold for their connections to it, by its current location
+        return [[neighbor.get_weight_of_connection_to_neighbor(-direction, node.get_location())
+                 for _, _, _, neighbor in node.get_a_list_of_all_connections_data(direction)]
+                for direction in [Node.INCOMING_EDGE_DIRECTION, Node.OUTGOING_EDGE_DIRECTION]]
+
+    nodes = unprocessed_table.get_list_of_all_nodes()
+    weights_of_neighbors_connections = [get_weights_of_neighbors_connections(node) for node in nodes]
+    layer.relocate_nodes_from_unprocessed_table_by_bulk(unprocessed_table.get_list_of_all_keys()[::2],
+                                                        Layer.INDEX_OF_POS_INC_TABLE)
+    assert [get_weights_of_neighbors_connections(node) for node in nodes] == weights_of_neighbors_connections
+
+
+def test_connection_to_a_killed_node_is_not_re_keyed():
+    weights, biases, bounds = get_random_layer_matrices(get_acas_like_layer_sizes(8, 3), seed=3)
+    network = Network.from_layer_matrices(weights, biases, bounds, 1)
+    layer = network.layers[2]
+    unprocessed_table = layer.regular_node_tables[Layer.INDEX_OF_UNPROCESSED_TABLE]
+    node_to_kill, node_to_relocate = unprocessed_table.get_list_of_all_nodes()[:2]
+    neighbor = node_to_kill.get_a_list_of_all_connections_data(Node.INCOMING_EDGE_DIRECTION)[0][
+        NodeEdges.INDEX_OF_REFERENCE_TO_NODE_CONNECTED_TO_IN_DATA]
+
+    # the node is killed without being removed from its neighbors, so they still hold connections to it
+    node_to_kill.destructor(remove_this_node_from_neighbors_lists=False)
+    layer.relocate_nodes_from_unprocessed_table_by_bulk([node_to_relocate.get_key_in_table()],
+                                                        Layer.INDEX_OF_POS_INC_TABLE)
+    with pytest.raises(Exception):
+        neighbor.get_a_list_of_all_connections_data(Node.OUTGOING_EDGE_DIRECTION)
@@ -0,0 +1,93 @@
+import random
+
+import pytest
+
+from benchmarks.synthetic_networks import get_acas_like_layer_sizes, get_random_layer_matrices
+from src.MarabouDataManagers.GlobalDataManager import GlobalDataManager
+from src.Network import Network
+from src.PackedLocations import MAXIMAL_KEY_IN_TABLE, MAXIMAL_TABLE_NUMBER, pack_location, \
+    pack_pair_of_keys_in_table, unpack_location, unpack_pair_of_keys_in_table
+
+NUMBER_OF_RANDOM_LOCATIONS = 1000
+NUMBER_OF_MERGES = 10
+
+
+def get_random_locations(seed=0):
+    random_generator = random.Random(seed)
+    locations = [(layer_number, table_number, key_in_table)
+                 for layer_number in [0, 1, 1000]
+                 for table_number in [0, MAXIMAL_TABLE_NUMBER]
+                 for key_in_table in [0, 1, MAXIMAL_KEY_IN_TABLE]]
+    locations += [(random_generator.randrange(100), random_generator.randint(0, MAXIMAL_TABLE_NUMBER),
+                   random_generator.randint(0, MAXIMAL_KEY_IN_TABLE)) for _ in range(NUMBER_OF_RANDOM_LOCATIONS)]
+    return locations
+
+
+def test_packed_locations_are_unpacked_to_the_locations_packed():
+    locations = get_random_locations()
+    packed_locations = [pack_location(*location) for location in locations]
+    assert [unpack_location(packed_location) for packed_location in packed_locations] == locations
+    assert len(set(packed_locations)) == len(set(locations))
+    assert all(0 <= packed_location < 2 ** 62 for packed_location in packed_locations)
+
+
+def test_packed_pairs_are_unpacked_to_the_pairs_packed():
+    pairs = [(table_number, key_in_table, other_key_in_table)
+             for _, table_number, key_in_table in get_random_locations()
+             for other_key_in_table in [0, key_in_table // 2, MAXIMAL_KEY_IN_TABLE]]
+    packed_pairs = [pack_pair_of_keys_in_table(*pair) for pair in pairs]
+    assert [unpack_pair_of_keys_in_table(packed_pair) for packed_pair in packed_pairs] == pairs
+    assert len(set(packed_pairs)) == len(set(pairs))
+    # the order of the keys matters
+    assert pack_pair_of_keys_in_table(1, 2, 3) != pack_pair_of_keys_in_table(1, 3, 2)
+
+
+@pytest.mark.parametrize("location", [(-1, 0, 0), (0, -1, 0), (0, MAXIMAL_TABLE_NUMBER + 1, 0), (0, 0, -1),
+                                      (0, 0, MAXIMAL_KEY_IN_TABLE + 1)])
+def test_location_out_of_range_is_not_packed(location):
+    with pytest.raises(Exception):
+        pack_location(*location)
+
+
+def assert_packed_locations_of_nodes_are_their_locations(network):
+    for layer in network.layers:
+        for tables in [layer.regular_node_tables, layer.arnode_tables]:
+            for table in tables:
+                for node in table.get_iterator_for_all_nodes():
+                    assert unpack_location(node.get_packed_location()) == (layer.layer_number,) + node.get_location()
+
+
+def test_nodes_keep_their_packed_location_as_the_unprocessed_tables_are_emptied():
+    weights, biases, bounds = get_random_layer_matrices(get_acas_like_layer_sizes(8, 3), seed=11)
+    network = Network.from_layer_matrices(weights, biases, bounds, 1)
+    # the nodes are moved out of the unprocessed tables to the tables of their types one layer at a time
+    for _ in range(len(network.layers)):
+        network.preprocess_more_layers(1)
+        assert_packed_locations_of_nodes_are_their_locations(network)
+
+
+@pytest.mark.parametrize("which_acas_output", [1, 2])
+def test_nodes_keep_their_packed_location_as_they_move(which_acas_output):
+    weights, biases, bounds = get_random_layer_matrices(get_acas_like_layer_sizes(8, 3), seed=11)
+    network = Network.from_layer_matrices(weights, biases, bounds, which_acas_output)
+    network.fully_activate_the_entire_network()
+    for _ in range(NUMBER_OF_MERGES):
+        network.merge_list_of_arnodes(*network.decide_best_arnodes_to_merge())
+    assert_packed_locations_of_nodes_are_their_locations(network)
+
+    # the arnodes with the largest keys are moved to the keys the merges freed
+    assert any(len(map_of_new_keys) != 0 for maps_of_layer in network.compact_keys_of_arnode_tables()
+               for map_of_new_keys in maps_of_layer)
+    assert_packed_locations_of_nodes_are_their_locations(network)
+
+    # the locations of the nodes without valid equations are unpacked to the nodes themselves
+    nodes_without_valid_equations = network.global_network_manager.get_list_of_nodes_that_dont_have_valid_equations()
+    assert len(nodes_without_valid_equations) != 0
+    assert network.global_network_manager.get_number_of_nodes_that_dont_have_valid_equations() == \
+        len(nodes_without_valid_equations)
+    for layer_number, table_number, key_in_table, node_code in nodes_without_valid_equations:
+        layer = network.layers[layer_number]
+        tables = layer.arnode_tables if node_code == GlobalDataManager.CODE_FOR_ARNODE else layer.regular_node_tables
+        node = tables[table_number].get_node_by_key(key_in_table)
+        assert not node.check_if_node_equation_is_valid()
+        assert unpack_location(node.get_packed_location()) == (layer_number, table_number, key_in_table)
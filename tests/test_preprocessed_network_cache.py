@@ -0,0 +1,223 @@
+import io
+import os
+import pickle
+
+import pytest
+
+import src.MarabouDataManagers.InputQueryFacade as input_query_facade_module
+from benchmarks.synthetic_networks import get_acas_like_layer_sizes, get_random_layer_matrices
+from src.ArrayNodeEdges import ArrayNodeEdges
+from src.BitmapIDManager import BitmapIDManager
+from src.IDManager import IDManager
+from src.MarabouDataManagers.GlobalDataManager import GlobalDataManager
+from src.MarabouDataManagers.NNetReader import InMemoryNNetReader, NNetReader
+from src.MarabouDataManagers.NNetStreamingReader import NNetStreamingReader
+from src.MarabouDataManagers.NNetWriter import NNetWriter
+from src.Network import Network
+from src.NodeEdges import NodeEdges
+from src.Nodes.Node import Node
+from src.PreprocessedNetworkCache import PreprocessedNetworkCache
+from tests.recording_marabou_core import RecordingMarabouCore
+
+NUMBER_OF_MERGES = 10
+
+
+@pytest.fixture(autouse=True)
+def recording_marabou_core(monkeypatch):
+    # the equations of the mock marabou do not keep their addends
+    monkeypatch.setattr(input_query_facade_module, 'MarabouCore', RecordingMarabouCore)
+
+
+def get_nnet_reader(seed=0):
+    weights, biases, bounds = get_random_layer_matrices(get_acas_like_layer_sizes(8, 3), seed=seed)
+    return InMemoryNNetReader(weights, biases, *bounds)
+
+
+def get_number(value):
+    # the state of the network keeps the numbers as floats, so 0 is read as 0.0 and -0 as -0.0
+    return float(value) + 0.0
+
+
+def get_contents_of_input_query(input_query):
+    """
+    :return: the contents of the input query, in a form which does not depend on the order the equations, the relu
+    constraints and the bounds were added in
+    """
+    equations = sorted((get_number(equation.scalar),
+                        tuple((get_number(weight), variable) for weight, variable in equation.addendList))
+                       for equation in input_query.equations)
+    return (equations, sorted(input_query.relu_constraints),
+            sorted((global_id, get_number(bound)) for global_id, bound in input_query.lowerBounds.items()),
+            sorted((global_id, get_number(bound)) for global_id, bound in input_query.upperBounds.items()))
+
+
+def get_contents_of_network(network, should_sort_connections=False):
+    contents = []
+    for layer in network.layers:
+        contents.append(layer.layer_is_inner)
+        for table in layer.regular_node_tables + layer.arnode_tables:
+            contents.append((table.layer_is_inner, table.get_list_of_all_keys()))
+            for node in table.get_iterator_for_all_nodes():
+                contents.append((node.get_location(), get_number(node.get_node_bias()), node.get_global_incoming_id(),
+                                 node.get_global_outgoing_id(), node.check_if_node_is_inner(),
+                                 node.check_if_has_bounds(), node.check_if_node_equation_is_valid(),
+                                 node.get_bounds_of_value()))
+                for direction in [Node.INCOMING_EDGE_DIRECTION, Node.OUTGOING_EDGE_DIRECTION]:
+                    # the connections are compared in the order they are gone over
+                    connections = [(table_number, key_in_table, get_number(weight))
+                                   for table_number, key_in_table, weight, _ in
+                                   node.get_a_list_of_all_connections_data(direction)]
+                    contents.append(sorted(connections) if should_sort_connections else connections)
+                if node.is_nested_in_ar_node():
+                    contents.append(node.get_pointer_to_ar_node_nested_in().get_location())
+                if hasattr(node, 'get_inner_nodes'):
+                    contents.append((node.get_activation_status(),
+                                     [inner_node.get_location() for inner_node in node.get_inner_nodes()]))
+
+    global_network_manager = network.global_network_manager
+    contents.append(get_contents_of_input_query(global_network_manager.input_query))
+    contents.append(get_contents_of_input_query(global_network_manager.input_query_of_original_network))
+    contents.append(global_network_manager.id_manager.get_ranges())
+    contents.append(sorted(global_network_manager.get_list_of_nodes_that_dont_have_valid_equations()))
+    contents.append((global_network_manager.get_input_nodes_global_incoming_ids(),
+                     global_network_manager.get_output_nodes_global_incoming_ids()))
+    contents.append((network.last_layer_not_preprocessed, network.last_layer_not_forward_activated,
+                     network.last_layer_not_fully_activated, network.last_layer_of_given_network,
+                     network.get_number_of_connections_pruned_in_each_layer()))
+    return contents
+
+
+def get_copy_through_cache(network):
+    f = io.BytesIO()
+    PreprocessedNetworkCache.write_network(network, f)
+    f.seek(0)
+    return PreprocessedNetworkCache.read_network(f)
+
+
+@pytest.mark.parametrize('edges_manager_class', [NodeEdges, ArrayNodeEdges])
+@pytest.mark.parametrize('id_manager_class', [IDManager, BitmapIDManager])
+@pytest.mark.parametrize('which_acas_output, pruning_threshold', [(1, None), (2, 0.1)])
+def test_network_read_behaves_as_the_network_written(monkeypatch, edges_manager_class, id_manager_class,
+                                                     which_acas_output, pruning_threshold):
+    monkeypatch.setattr(Node, 'EDGES_MANAGER_CLASS', edges_manager_class)
+    monkeypatch.setattr(GlobalDataManager, 'ID_MANAGER_CLASS', id_manager_class)
+
+    network = Network(get_nnet_reader(), which_acas_output, pruning_threshold)
+    network.fully_activate_the_entire_network()
+    network_read = get_copy_through_cache(network)
+    assert get_contents_of_network(network_read) == get_contents_of_network(network)
+
+    for i in range(NUMBER_OF_MERGES):
+        arnodes_to_merge = network.decide_best_arnodes_to_merge()
+        assert network_read.decide_best_arnodes_to_merge() == arnodes_to_merge
+        network.merge_list_of_arnodes(*arnodes_to_merge)
+        network_read.merge_list_of_arnodes(*arnodes_to_merge)
+        if i % 3 == 2:
+            assert network_read.check_if_network_is_sat_or_unsat() == network.check_if_network_is_sat_or_unsat()
+        assert get_contents_of_network(network_read) == get_contents_of_network(network)
+
+    # a network can be written again after it was changed, once the free keys the merges left are compacted
+    with pytest.raises(Exception):
+        get_copy_through_cache(network_read)
+    assert network_read.compact_keys_of_arnode_tables() == network.compact_keys_of_arnode_tables()
+    # the connections of a node read are kept in the order they were gone over when it was written, but an
+    # ArrayNodeEdges goes over its connections by their slots after the nodes they lead to are relocated, and the slots
+    # of the network written may be in another order
+    assert get_contents_of_network(network_read, should_sort_connections=True) == \
+        get_contents_of_network(network, should_sort_connections=True)
+    assert get_contents_of_network(get_copy_through_cache(network_read)) == get_contents_of_network(network_read)
+
+
+def test_network_is_loaded_from_the_cache(tmpdir):
+    nnet_reader = get_nnet_reader()
+    cache = PreprocessedNetworkCache(str(tmpdir))
+    key = PreprocessedNetworkCache.get_key(nnet_reader, 1)
+    assert cache.load(key) is None
+
+    network = cache.get_fully_activated_network(nnet_reader, 1)
+    network_loaded = cache.load(key)
+    assert network_loaded is not None and network_loaded is not network
+    assert get_contents_of_network(network_loaded) == get_contents_of_network(network)
+    assert get_contents_of_network(cache.get_fully_activated_network(nnet_reader, 1)) == \
+        get_contents_of_network(network)
+
+    # the key depends on everything the fully activated network depends on
+    assert PreprocessedNetworkCache.get_key(nnet_reader, 2) != key
+    assert PreprocessedNetworkCache.get_key(nnet_reader, 1, 0.1) != key
+    assert PreprocessedNetworkCache.get_key(get_nnet_reader(seed=1), 1) != key
+
+
+def test_entry_which_can_not_be_read_is_removed(tmpdir):
+    nnet_reader = get_nnet_reader()
+    cache = PreprocessedNetworkCache(str(tmpdir))
+    key = PreprocessedNetworkCache.get_key(nnet_reader, 1)
+    cache.get_fully_activated_network(nnet_reader, 1)
+    file_name_of_entry = cache._get_file_name_of_entry(key)
+
+    with open(file_name_of_entry, 'rb') as f:
+        contents_of_entry = f.read()
+    with open(file_name_of_entry, 'wb') as f:
+        f.write(contents_of_entry[:len(contents_of_entry) // 2])
+    assert cache.load(key) is None
+    assert not os.path.exists(file_name_of_entry)
+
+    # an entry may hold only plain data
+    with open(file_name_of_entry, 'wb') as f:
+        f.write(PreprocessedNetworkCache.MAGIC)
+        pickle.dump(Exception("not plain data"), f)
+    assert cache.load(key) is None
+    assert not os.path.exists(file_name_of_entry)
+
+    # an entry written in another format
+    with open(file_name_of_entry, 'wb') as f:
+        f.write(PreprocessedNetworkCache.MAGIC)
+        pickle.dump({'format_version': PreprocessedNetworkCache.FORMAT_VERSION - 1}, f)
+    assert cache.load(key) is None
+    assert not os.path.exists(file_name_of_entry)
+
+
+def test_failing_to_save_an_entry_is_not_an_error(tmpdir):
+    network = Network(get_nnet_reader(), 1)
+    network.fully_activate_the_entire_network()
+    cache = PreprocessedNetworkCache(str(tmpdir))
+    key = PreprocessedNetworkCache.get_key(get_nnet_reader(), 1)
+
+    # the entry can not be moved into place, since a directory is in its way
+    os.mkdir(cache._get_file_name_of_entry(key))
+    assert not cache.save(key, network)
+    assert os.listdir(str(tmpdir)) == [os.path.basename(cache._get_file_name_of_entry(key))]
+
+    os.rmdir(cache._get_file_name_of_entry(key))
+    assert cache.save(key, network)
+    assert cache.load(key) is not None
+
+
+def test_key_does_not_depend_on_the_reader(tmpdir):
+    nnet_reader = get_nnet_reader()
+    file_name = str(tmpdir.join('network.nnet'))
+    NNetWriter.write_nnet_file(nnet_reader, file_name)
+
+    key = PreprocessedNetworkCache.get_key(nnet_reader, 1)
+    assert PreprocessedNetworkCache.get_key(NNetReader(file_name), 1) == key
+    assert PreprocessedNetworkCache.get_key(NNetStreamingReader(file_name), 1) == key
+
+
+def test_least_recently_used_entries_are_evicted(tmpdir):
+    nnet_readers = [get_nnet_reader(seed) for seed in range(3)]
+    cache = PreprocessedNetworkCache(str(tmpdir))
+    keys = [PreprocessedNetworkCache.get_key(nnet_reader, 1) for nnet_reader in nnet_readers]
+    cache.get_fully_activated_network(nnet_readers[0], 1)
+    size_of_entry = os.path.getsize(cache._get_file_name_of_entry(keys[0]))
+
+    # room for 2 entries of about the same size
+    cache.maximum_size_in_bytes = 2 * size_of_entry + size_of_entry // 2
+    cache.get_fully_activated_network(nnet_readers[1], 1)
+    os.utime(cache._get_file_name_of_entry(keys[0]), ns=(1, 1))
+    os.utime(cache._get_file_name_of_entry(keys[1]), ns=(2, 2))
+    # the entry of the first network is used, so the entry of the second one is the least recently used
+    assert cache.load(keys[0]) is not None
+
+    cache.get_fully_activated_network(nnet_readers[2], 1)
+    assert os.path.exists(cache._get_file_name_of_entry(keys[0]))
+    assert not os.path.exists(cache._get_file_name_of_entry(keys[1]))
+    assert os.path.exists(cache._get_file_name_of_entry(keys[2]))
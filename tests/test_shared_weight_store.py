@@ -0,0 +1,59 @@
+import multiprocessing
+
+import pytest
+
+from benchmarks.synthetic_networks import write_random_nnet_file
+from src.MarabouDataManagers.NNetReader import NNetReader
+from src.MarabouDataManagers.SharedWeightStore import SharedWeightStore
+from tests.test_nnet_archive import get_contents_of_reader
+
+LAYER_SIZES = [5, 8, 6, 5]
+NUMBER_OF_WORKERS = 2
+
+
+def get_contents_of_shared_network(name_of_store):
+    """
+    run by the workers, attaches to the store and reads the network from it
+    """
+    shared_weight_store = SharedWeightStore.attach(name_of_store)
+    shared_nnet_reader = shared_weight_store.get_reader()
+    contents_of_reader = get_contents_of_reader(shared_nnet_reader)
+
+    del shared_nnet_reader
+    shared_weight_store.close()
+    return contents_of_reader
+
+
+@pytest.fixture
+def nnet_reader(tmpdir):
+    nnet_file_name = str(tmpdir.join('network.nnet'))
+    write_random_nnet_file(nnet_file_name, LAYER_SIZES, seed=6)
+    return NNetReader(nnet_file_name, use_binary_cache=False)
+
+
+def test_attached_store_reads_the_network_it_was_created_from(nnet_reader):
+    shared_weight_store = SharedWeightStore.create(nnet_reader)
+    name_of_store = shared_weight_store.get_name()
+    try:
+        assert get_contents_of_shared_network(name_of_store) == get_contents_of_reader(nnet_reader)
+
+        # closing a store which is not the owner does not free the shared memory
+        assert get_contents_of_shared_network(name_of_store) == get_contents_of_reader(nnet_reader)
+    finally:
+        shared_weight_store.close()
+
+    # the owner frees the shared memory when it is closed
+    with pytest.raises(FileNotFoundError):
+        SharedWeightStore.attach(name_of_store)
+
+
+def test_workers_read_the_network_from_the_store(nnet_reader):
+    shared_weight_store = SharedWeightStore.create(nnet_reader)
+    try:
+        with multiprocessing.Pool(NUMBER_OF_WORKERS) as pool:
+            contents_read_by_workers = pool.map(get_contents_of_shared_network,
+                                                [shared_weight_store.get_name()] * NUMBER_OF_WORKERS)
+    finally:
+        shared_weight_store.close()
+
+    assert contents_read_by_workers == [get_contents_of_reader(nnet_reader)] * NUMBER_OF_WORKERS
@@ -0,0 +1,65 @@
+import random
+
+from benchmarks.synthetic_networks import get_acas_like_layer_sizes, get_random_layer_matrices
+from src.Network import Network
+from tests.network_evaluation import evaluate_abstract_network, evaluate_layer_matrices
+
+PRUNING_THRESHOLD = 0.3
+NUMBER_OF_RANDOM_INPUTS = 50
+TOLERANCE = 1e-9
+
+
+def get_random_inputs(bounds, seed=1):
+    random_generator = random.Random(seed)
+    input_minimums, input_maximums = bounds
+    return [[random_generator.uniform(lower, upper) for lower, upper in zip(input_minimums, input_maximums)]
+            for _ in range(NUMBER_OF_RANDOM_INPUTS)]
+
+
+def get_layer_matrices():
+    return get_random_layer_matrices(get_acas_like_layer_sizes(8, 3), seed=3)
+
+
+def get_equations_of_query(input_query):
+    return sorted((equation.EquationType, equation.scalar, tuple(equation.addendList))
+                  for equation in input_query.equations)
+
+
+def test_nothing_is_pruned_before_preprocessing():
+    weights, biases, bounds = get_layer_matrices()
+    network = Network.from_layer_matrices(weights, biases, bounds, 1, pruning_threshold=PRUNING_THRESHOLD)
+
+    assert network.get_number_of_connections_pruned_in_each_layer() == {}
+    for input_values in get_random_inputs(bounds):
+        expected_output = evaluate_layer_matrices(weights, biases, input_values)
+        output = evaluate_abstract_network(network, input_values)
+        assert all(abs(a - b) <= TOLERANCE for a, b in zip(output, expected_output))
+
+
+def test_pruned_network_over_approximates_the_output_at_every_stage():
+    weights, biases, bounds = get_layer_matrices()
+    number_of_layers = len(weights) + 1
+
+    for number_of_layers_to_preprocess in range(1, number_of_layers + 1):
+        network = Network.from_layer_matrices(weights, biases, bounds, 1, pruning_threshold=PRUNING_THRESHOLD)
+        network.preprocess_more_layers(number_of_layers_to_preprocess)
+
+        for input_values in get_random_inputs(bounds):
+            expected_y0 = evaluate_layer_matrices(weights, biases, input_values)[0]
+            y0 = evaluate_abstract_network(network, input_values)[0]
+            assert y0 >= expected_y0 - TOLERANCE
+
+    pruned_in_each_layer = network.get_number_of_connections_pruned_in_each_layer()
+    assert sum(number_of_connections_pruned for number_of_connections_pruned, _ in pruned_in_each_layer.values()) > 0
+    # the connections into the output layer are never pruned
+    assert number_of_layers - 1 not in pruned_in_each_layer
+
+
+def test_the_original_network_is_not_pruned():
+    weights, biases, bounds = get_layer_matrices()
+    pruned_network = Network.from_layer_matrices(weights, biases, bounds, 1, pruning_threshold=PRUNING_THRESHOLD)
+    pruned_network.preprocess_the_entire_network()
+    network = Network.from_layer_matrices(weights, biases, bounds, 1)
+
+    assert get_equations_of_query(pruned_network.global_network_manager.input_query_of_original_network) == \
+        get_equations_of_query(network.global_network_manager.input_query_of_original_network)